@@ -40,10 +40,16 @@ from backend.util.paths import get_project_root, get_data_dir, get_trade_history
 from backend.core.config.settings import config
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from backend.util.metrics import mount_flask_metrics, time_db_query
+from backend.util.auto_stop_engine import (
+    AutoStopSettings, AutoStopState, evaluate_momentum_spike, evaluate_probability_stops, trade_probability
+)
+from backend.util.probability_service import get_probability_service
 
 # Create Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
+mount_flask_metrics(app)
 
 # Global variable to track monitoring thread
 monitoring_thread = None
@@ -960,6 +966,9 @@ def get_current_closing_price_for_trade(trade_ticker: str, trade_side: str) -> O
         log(f"Error getting closing price for trade {trade_ticker}: {e}")
         return None
 
+# Shared probability engine over the production lookup artifact
+_probability_service = get_probability_service("btc")
+
 def get_current_probability(strike: float, current_price: float, ttc_seconds: float, momentum_score: Optional[float] = None) -> Optional[float]:
     """
     Get the probability for a strike from the PostgreSQL strike table.
@@ -974,15 +983,16 @@ def get_current_probability(strike: float, current_price: float, ttc_seconds: fl
         cursor = conn.cursor()
         
         # Get probability from PostgreSQL strike table
-        cursor.execute("""
-            SELECT probability 
-            FROM live_data.strike_table_btc 
-            WHERE strike = %s
-            ORDER BY timestamp DESC 
-            LIMIT 1
-        """, (strike,))
-        
-        result = cursor.fetchone()
+        with time_db_query("active_trade_supervisor.get_current_probability"):
+            cursor.execute("""
+                SELECT probability 
+                FROM live_data.strike_table_btc 
+                WHERE strike = %s
+                ORDER BY timestamp DESC 
+                LIMIT 1
+            """, (strike,))
+            
+            result = cursor.fetchone()
         conn.close()
         
         if result and result[0] is not None:
@@ -993,11 +1003,20 @@ def get_current_probability(strike: float, current_price: float, ttc_seconds: fl
     except Exception as e:
         log(f"⚠️ Probability PostgreSQL exception: {e}")
     
-    # Fallback to old API if PostgreSQL fails
+    # Fall back to the shared probability engine over the lookup artifact
+    if momentum_score is not None:
+        try:
+            probability = _probability_service.strike_probability(strike, current_price, ttc_seconds, momentum_score)
+            if probability is not None:
+                return probability
+        except Exception as e:
+            log(f"⚠️ Probability artifact exception: {e}")
+    
+    # Fallback to main.py's batch endpoint (live momentum when we have none)
     try:
         host = get_host()
         port = get_port("main_app")
-        url = f"http://{host}:{port}/api/strike_probabilities"
+        url = f"http://{host}:{port}/api/probabilities/batch"
         payload = {
             "current_price": current_price,
             "ttc_seconds": ttc_seconds,
@@ -1008,8 +1027,8 @@ def get_current_probability(strike: float, current_price: float, ttc_seconds: fl
         resp = requests.post(url, json=payload, timeout=1.5)
         if resp.status_code == 200:
             data = resp.json()
-            if data.get("status") == "ok" and data.get("probabilities"):
-                return data["probabilities"][0]["prob_within"]
+            if data.get("status") == "ok" and data.get("prob_within"):
+                return data["prob_within"][0]
         log(f"⚠️ Probability API error: {resp.status_code} {resp.text}")
     except Exception as e:
         log(f"⚠️ Probability API exception: {e}")
@@ -1098,13 +1117,8 @@ def update_active_trade_monitoring_data():
                 # Get current probability from API using the current symbol price
                 current_probability = get_current_probability(strike_price, current_symbol_price, ttc_seconds, momentum_score)
                 
-                # Apply probability logic based on buffer
-                # When buffer is positive: use probability as-is (direct passthrough)
-                # When buffer is negative: subtract probability from 100
-                if current_probability is not None:
-                    if buffer_from_strike < 0:
-                        # Negative buffer: subtract probability from 100
-                        current_probability = 100 - current_probability
+                # Flip the probability once the price has crossed the strike against the trade
+                current_probability = trade_probability(current_probability, side, strike_price, current_symbol_price)
                 
                 # Calculate PnL: 1 - current_close_price - buy_price
                 # For YES trades: PnL = 1 - current_close_price - buy_price
@@ -1183,8 +1197,7 @@ def start_monitoring_loop():
     def monitoring_worker():
         global monitoring_thread
         log("📊 MONITORING: Starting monitoring loop for active trades")
-        auto_stop_triggered_trades = set()
-        verification_pending_trades = {}  # trade_id -> (trigger_time, verification_end_time)
+        auto_stop_state = AutoStopState()
         
         try:
             while True:
@@ -1221,76 +1234,14 @@ def start_monitoring_loop():
                 
                 # === AUTO STOP LOGIC ===
                 if is_auto_stop_enabled():
-                    threshold = get_auto_stop_threshold()
-                    min_ttc_seconds = get_min_ttc_seconds()
-                    verification_enabled = get_verification_period_enabled()
-                    verification_seconds = get_verification_period_seconds()
-                    current_time = time.time()
-                    
-                    for trade in active_trades:
-                        prob = trade.get('current_probability')
-                        trade_id = trade.get('trade_id')
-                        ttc_seconds = trade.get('time_since_entry')
-                        
-                        # Check if trade is in verification period
-                        if trade_id in verification_pending_trades:
-                            trigger_time, verification_end_time = verification_pending_trades[trade_id]
-                            
-                            # Check if verification period has ended
-                            if current_time >= verification_end_time:
-                                # Verification period ended - check if conditions still met
-                                if (
-                                    prob is not None and
-                                    isinstance(prob, (int, float)) and
-                                    prob < threshold and
-                                    trade.get('status') == 'active'
-                                ):
-                                    # Conditions still met after verification - trigger auto-stop
-                                    log(f"[AUTO STOP] ✅ Verification period ended - triggering auto stop for trade {trade_id} (prob={prob}, verification_duration={verification_seconds}s)")
-                                    trigger_auto_stop_close(trade)
-                                    auto_stop_triggered_trades.add(trade_id)
-                                    del verification_pending_trades[trade_id]
-                                else:
-                                    # Conditions no longer met - cancel verification
-                                    log(f"[AUTO STOP] ❌ Verification period ended - conditions no longer met for trade {trade_id} (prob={prob}, threshold={threshold})")
-                                    del verification_pending_trades[trade_id]
-                            else:
-                                # Still in verification period - just wait, don't check conditions during wait
-                                remaining_time = verification_end_time - current_time
-                                if not hasattr(monitoring_worker, 'last_verification_log') or current_time - monitoring_worker.last_verification_log > 10:
-                                    log(f"[AUTO STOP] ⏳ Trade {trade_id} in verification period - {remaining_time:.1f}s remaining")
-                                    monitoring_worker.last_verification_log = current_time
-                                continue
-                        
-                        # Check for new auto-stop conditions
-                        if (
-                            prob is not None and
-                            isinstance(prob, (int, float)) and
-                            prob < threshold and
-                            trade.get('status') == 'active' and
-                            trade_id not in auto_stop_triggered_trades and
-                            ttc_seconds is not None and
-                            ttc_seconds >= min_ttc_seconds # Respect min_ttc_seconds setting
-                        ):
-                            if verification_enabled:
-                                # Start verification period
-                                verification_end_time = current_time + verification_seconds
-                                verification_pending_trades[trade_id] = (current_time, verification_end_time)
-                                log(f"[AUTO STOP] 🔍 Starting verification period for trade {trade_id} (prob={prob}, threshold={threshold}, verification_duration={verification_seconds}s)")
-                            else:
-                                # No verification - trigger immediately
-                                log(f"[AUTO STOP] Triggering auto stop for trade {trade_id} (prob={prob}, ttc={ttc_seconds}s, min_ttc={min_ttc_seconds}s)")
-                                trigger_auto_stop_close(trade)
-                                auto_stop_triggered_trades.add(trade_id)
-                        elif (
-                            prob is not None and
-                            isinstance(prob, (int, float)) and
-                            prob < threshold and
-                            trade.get('status') == 'active' and
-                            trade_id not in auto_stop_triggered_trades and
-                            (ttc_seconds is None or ttc_seconds < min_ttc_seconds)
-                        ):
-                            log(f"[AUTO STOP] Skipping auto stop for trade {trade_id} - TTC ({ttc_seconds}s) below minimum ({min_ttc_seconds}s)")
+                    stop_settings = AutoStopSettings(
+                        threshold=get_auto_stop_threshold(),
+                        min_ttc_seconds=get_min_ttc_seconds(),
+                        verification_enabled=get_verification_period_enabled(),
+                        verification_seconds=get_verification_period_seconds()
+                    )
+                    for trade in evaluate_probability_stops(active_trades, stop_settings, auto_stop_state, time.time(), log):
+                        trigger_auto_stop_close(trade)
                 
                 # === MOMENTUM SPIKE AUTO-STOPOUT LOGIC ===
                 # Get momentum spike settings from PostgreSQL
@@ -1325,56 +1276,12 @@ def start_monitoring_loop():
                             current_momentum = momentum_data.get('current_momentum')
                             
                             if current_momentum is not None:
-                                # Check for momentum spike conditions
-                                momentum_spike_triggered = False
-                                
-                                if current_momentum >= momentum_spike_threshold:  # Positive spike - close all NO trades
-                                    log(f"[MOMENTUM SPIKE] 🚨 POSITIVE SPIKE DETECTED: {current_momentum:.2f} >= +{momentum_spike_threshold}")
-                                    log(f"[MOMENTUM SPIKE] Closing all NO trades due to positive momentum spike")
-                                    
-                                    for trade in active_trades:
-                                        if (trade.get('status') == 'active' and 
-                                            trade.get('side', '').upper() in ['N', 'NO'] and
-                                            trade.get('trade_id') not in auto_stop_triggered_trades):
-                                            
-                                            trade_id = trade.get('trade_id')
-                                            log(f"[MOMENTUM SPIKE] Triggering close for NO trade {trade_id} (momentum: {current_momentum:.2f})")
-                                            
-                                            # Cancel any pending verification period for this trade
-                                            if trade_id in verification_pending_trades:
-                                                log(f"[MOMENTUM SPIKE] Cancelling verification period for trade {trade_id} due to momentum spike")
-                                                del verification_pending_trades[trade_id]
-                                            
-                                            trigger_auto_stop_close(trade)
-                                            auto_stop_triggered_trades.add(trade_id)
-                                            momentum_spike_triggered = True
-                                    
-                                    if momentum_spike_triggered:
-                                        log(f"[MOMENTUM SPIKE] ✅ Closed {len([t for t in active_trades if t.get('side', '').upper() in ['N', 'NO'] and t.get('status') == 'active'])} NO trades due to positive momentum spike")
-                                    
-                                elif current_momentum <= -momentum_spike_threshold:  # Negative spike - close all YES trades
-                                    log(f"[MOMENTUM SPIKE] 🚨 NEGATIVE SPIKE DETECTED: {current_momentum:.2f} <= -{momentum_spike_threshold}")
-                                    log(f"[MOMENTUM SPIKE] Closing all YES trades due to negative momentum spike")
-                                    
-                                    for trade in active_trades:
-                                        if (trade.get('status') == 'active' and 
-                                            trade.get('side', '').upper() in ['Y', 'YES'] and
-                                            trade.get('trade_id') not in auto_stop_triggered_trades):
-                                            
-                                            trade_id = trade.get('trade_id')
-                                            log(f"[MOMENTUM SPIKE] Triggering close for YES trade {trade_id} (momentum: {current_momentum:.2f})")
-                                            
-                                            # Cancel any pending verification period for this trade
-                                            if trade_id in verification_pending_trades:
-                                                log(f"[MOMENTUM SPIKE] Cancelling verification period for trade {trade_id} due to momentum spike")
-                                                del verification_pending_trades[trade_id]
-                                            
-                                            trigger_auto_stop_close(trade)
-                                            auto_stop_triggered_trades.add(trade_id)
-                                            momentum_spike_triggered = True
-                                    
-                                    if momentum_spike_triggered:
-                                        log(f"[MOMENTUM SPIKE] ✅ Closed {len([t for t in active_trades if t.get('side', '').upper() in ['Y', 'YES'] and t.get('status') == 'active'])} YES trades due to negative momentum spike")
+                                spike_settings = AutoStopSettings(
+                                    momentum_spike_enabled=True,
+                                    momentum_spike_threshold=momentum_spike_threshold
+                                )
+                                for trade in evaluate_momentum_spike(active_trades, current_momentum, spike_settings, auto_stop_state, log):
+                                    trigger_auto_stop_close(trade)
                                 
                                 # Log momentum monitoring (every 30 seconds to reduce noise)
                                 if not hasattr(monitoring_worker, 'last_momentum_log') or current_time - monitoring_worker.last_momentum_log > 30:
@@ -21,6 +21,10 @@ import base64
 
 # Import from backend modules
 from backend.util.paths import get_kalshi_data_dir, ensure_data_dirs
+from backend.core.port_config import get_port
+from backend.util.metrics import (
+    WEBSOCKET_QUEUE_DEPTH, get_websocket_backlog, start_metrics_server, time_db_query
+)
 from backend.account_mode import get_account_mode
 from backend.core.config.feature_flags import (
     websocket_timeout, websocket_max_retries, 
@@ -546,7 +550,8 @@ class KalshiWebSocketWatchdog:
             if data.get("type") == "ticker_v2":
                 market_data = data.get("msg", {})
                 if market_data:
-                    self.save_market_data(market_data)
+                    with time_db_query("kalshi_websocket_watchdog.save_market_data"):
+                        self.save_market_data(market_data)
                     self.save_json_snapshot(data)
                     self.write_heartbeat()
                     
@@ -603,6 +608,9 @@ class KalshiWebSocketWatchdog:
                 
                 # Listen for messages
                 async for message in self.websocket:
+                    backlog = get_websocket_backlog(self.websocket)
+                    if backlog is not None:
+                        WEBSOCKET_QUEUE_DEPTH.set(backlog, feed="kalshi_ticker_v2")
                     await self.handle_message(message)
                     self.write_heartbeat()
                     
@@ -628,6 +636,10 @@ class KalshiWebSocketWatchdog:
 
 async def main():
     """Main entry point"""
+    try:
+        start_metrics_server(get_port("kalshi_websocket_watchdog"))
+    except OSError as e:
+        print(f"[{datetime.now(EST)}] ⚠️ Metrics server not started: {e}")
     watchdog = KalshiWebSocketWatchdog()
     await watchdog.run()
 
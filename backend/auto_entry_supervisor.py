@@ -21,6 +21,16 @@ from flask_cors import CORS
 # Import the universal centralized port system
 from backend.core.port_config import get_port
 from backend.util.paths import get_host, get_data_dir, get_service_url, get_trade_history_dir
+from backend.util.auto_entry_engine import (
+    ACTIVE_TRADE_STATUSES,
+    TRADES_CHANNEL,
+    NotificationListener,
+    TradedStrikeIndex,
+    evaluate_watchlist,
+    get_watchlist_channel
+)
+from backend.util.metrics import REGISTRY, mount_flask_metrics
+from backend.util import trade_trace
 
 # Get port from centralized system
 AUTO_ENTRY_SUPERVISOR_PORT = get_port("auto_entry_supervisor")
@@ -29,17 +39,60 @@ print(f"[AUTO_ENTRY_SUPERVISOR] 🚀 Using centralized port: {AUTO_ENTRY_SUPERVI
 # Create Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
+mount_flask_metrics(app)
 
 # Global variable to track monitoring thread
 monitoring_thread = None
 monitoring_thread_lock = threading.Lock()
 
-# SIMPLIFIED: Track last trade time per strike (atomic)
-last_trade_times = {}  # strike_key -> timestamp
-
 # Cooldown period (seconds)
 TRADE_COOLDOWN = 10
 
+# Open/pending trades and per-strike cooldowns, kept in memory so eligibility
+# checks never hit the database. Warmed on listener connect, then maintained
+# from users.trades_0001 change notifications.
+traded_index = TradedStrikeIndex(TRADE_COOLDOWN)
+
+# How long cached trade preferences (position size, strategy) are reused
+TRADE_PREFERENCES_TTL = 5
+
+# Serializes trade decisions between the watchlist listener and the polling loop
+entry_lock = threading.Lock()
+
+# Listener for published watchlists and trade changes
+watchlist_listener = None
+
+# In-memory view of the settings the entry engine decides against.
+# Refreshed by the monitoring loop so ladder events never wait on the database.
+cached_entry_state = {
+    "enabled": False,
+    "settings": {},
+    "spike_alert_active": False,
+    "trade_preferences": None,
+    "trade_preferences_loaded_at": 0.0
+}
+
+# Decision latency stages
+LATENCY_STAGES = (
+    # Ladder commit in strike_table_generator -> entry decision made
+    "publish_to_decision",
+    # Time spent evaluating one ladder in this process
+    "evaluation",
+    # Ladder commit -> trade accepted by trade_manager
+    "publish_to_trigger"
+)
+
+AUTO_ENTRY_LATENCY_SECONDS = REGISTRY.histogram(
+    "auto_entry_latency_seconds",
+    "Auto entry decision latency by stage",
+    ("stage",),
+    buckets=(0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+def record_latency(stage, elapsed_ms):
+    """Record a decision latency in the /metrics registry."""
+    AUTO_ENTRY_LATENCY_SECONDS.observe(elapsed_ms / 1000.0, stage=stage)
+
 # Global state for auto entry indicator (for frontend display)
 auto_entry_indicator_state = {
     "enabled": False,
@@ -61,7 +114,6 @@ auto_entry_indicator_state = {
 previous_indicator_state = None
 
 # State tracking for logging reduction
-previous_watchlist_settings = None
 previous_auto_entry_status = None
 
 # SPIKE ALERT constants - NO DEFAULTS, must get from settings
@@ -514,215 +566,8 @@ def get_watchlist_path():
     """Get the path to the watchlist JSON file"""
     return os.path.join(get_data_dir(), "live_data", "markets", "kalshi", "strike_tables", "btc_watchlist.json")
 
-def get_master_strike_table_data():
-    """Get current master strike table data from PostgreSQL"""
-    try:
-        import psycopg2
-        conn = psycopg2.connect(
-            host=os.getenv('POSTGRES_HOST', 'localhost'),
-            database=os.getenv('POSTGRES_DB', 'rec_io_db'),
-            user=os.getenv('POSTGRES_USER', 'rec_io_user'),
-            password=os.getenv('POSTGRES_PASSWORD', 'rec_io_password')
-        )
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT
-                    symbol,
-                    current_price,
-                    ttc_seconds,
-                    event_ticker,
-                    market_title,
-                    strike_tier,
-                    market_status
-                FROM live_data.strike_table_btc
-                LIMIT 1
-            """)
-            header_data = cursor.fetchone()
-            if not header_data:
-                log(f"[WATCHLIST] No strike table data found in PostgreSQL")
-                return None
-            cursor.execute("""
-                SELECT
-                    strike,
-                    buffer,
-                    buffer_pct,
-                    probability,
-                    yes_ask,
-                    no_ask,
-                    volume,
-                    ticker,
-                    yes_diff,
-                    no_diff,
-                    active_side
-                FROM live_data.strike_table_btc
-                ORDER BY strike
-            """)
-            strikes_data = cursor.fetchall()
-            response = {
-                "symbol": header_data[0],
-                "current_price": float(header_data[1]) if header_data[1] else None,
-                "ttc": int(header_data[2]) if header_data[2] else None,
-                "event_ticker": header_data[3],
-                "market_title": header_data[4],
-                "strike_tier": header_data[5],
-                "market_status": header_data[6],
-                "strikes": []
-            }
-            for strike_row in strikes_data:
-                strike_data = {
-                    "strike": float(strike_row[0]) if strike_row[0] else None,
-                    "buffer": float(strike_row[1]) if strike_row[1] else None,
-                    "buffer_pct": float(strike_row[2]) if strike_row[2] else None,
-                    "probability": float(strike_row[3]) if strike_row[3] else None,
-                    "yes_ask": int(strike_row[4]) if strike_row[4] else None,
-                    "no_ask": int(strike_row[5]) if strike_row[5] else None,
-                    "volume": int(strike_row[6]) if strike_row[6] else None,
-                    "ticker": strike_row[7],
-                    "yes_diff": float(strike_row[8]) if strike_row[8] else None,
-                    "no_diff": float(strike_row[9]) if strike_row[9] else None,
-                    "active_side": strike_row[10]
-                }
-                response["strikes"].append(strike_data)
-            conn.close()
-            return response
-    except Exception as e:
-        log(f"[WATCHLIST] Error reading master strike table data from PostgreSQL: {e}")
-        return None
-
-def generate_watchlist_from_strike_table():
-    """Generate watchlist by filtering the master strike table based on auto entry settings"""
-    try:
-        # Get master strike table data
-        strike_table_data = get_master_strike_table_data()
-        if not strike_table_data or "strikes" not in strike_table_data:
-            log(f"[WATCHLIST] No master strike table data available")
-            return False
-        
-        btc_price = strike_table_data.get("current_price")
-        ttc_seconds = strike_table_data.get("ttc")
-        strikes = strike_table_data["strikes"]
-        market_data = {
-            "event_ticker": strike_table_data.get("event_ticker"),
-            "event_title": strike_table_data.get("market_title"),
-            "strike_tier": strike_table_data.get("strike_tier"),
-            "market_status": strike_table_data.get("market_status")
-        }
-        
-        # Load auto entry settings for filter parameters
-        settings = get_auto_entry_settings()
-        if not settings:
-            log(f"[WATCHLIST] No auto entry settings available")
-            return False
-        
-        min_volume = settings.get("watchlist_min_volume", 1000)
-        max_ask = settings.get("watchlist_max_ask", 98)
-        min_probability = settings.get("min_probability", 0) - 5  # Subtract 5 from min_probability
-        min_differential = settings.get("min_differential", 0) - 3  # Subtract 3 from min_differential
-        
-        # Check if settings have changed
-        current_settings = f"min_prob={min_probability}, min_diff={min_differential}, min_vol={min_volume}, max_ask={max_ask}"
-        global previous_watchlist_settings
-        if previous_watchlist_settings != current_settings:
-            log(f"[WATCHLIST] Filtering with settings: {current_settings}")
-            previous_watchlist_settings = current_settings
-        
-        # Filter strikes for watchlist
-        filtered_strikes = []
-        for strike in strikes:
-            volume = strike.get("volume")
-            probability = strike.get("probability")
-            yes_ask = strike.get("yes_ask")
-            no_ask = strike.get("no_ask")
-            yes_diff = strike.get("yes_diff")
-            no_diff = strike.get("no_diff")
-            
-            if (volume is None or probability is None or 
-                yes_ask is None or no_ask is None or
-                yes_diff is None or no_diff is None):
-                continue
-            
-            # Get the higher of yes_ask and no_ask
-            max_ask_price = max(yes_ask, no_ask)
-            
-            # Determine which side would be the active buy button
-            is_above_money_line = strike.get("strike", 0) > btc_price
-            
-            # Get the active button's differential
-            active_diff = no_diff if is_above_money_line else yes_diff
-            
-            # Check if at least one side meets the differential requirement
-            yes_diff_ok = yes_diff >= min_differential
-            no_diff_ok = no_diff >= min_differential
-            at_least_one_diff_ok = yes_diff_ok or no_diff_ok
-            
-            # Apply filter criteria from auto entry settings
-            volume_ok = volume >= min_volume
-            probability_ok = probability > min_probability
-            ask_ok = max_ask_price <= max_ask
-            
-            if (volume_ok and probability_ok and ask_ok and at_least_one_diff_ok):
-                filtered_strikes.append(strike)
-        
-        # Sort by probability (highest to lowest)
-        filtered_strikes.sort(key=lambda x: x.get("probability", 0), reverse=True)
-        
-        # Create watchlist output
-        watchlist_output = {
-            "symbol": "BTC",
-            "current_price": btc_price,
-            "ttc": ttc_seconds,
-            "broker": "Kalshi",
-            "event_ticker": market_data.get("event_ticker"),
-            "market_title": market_data.get("event_title"),
-            "strike_tier": market_data.get("strike_tier"),
-            "market_status": market_data.get("market_status"),
-            "last_updated": datetime.now().isoformat(),
-            "strikes": filtered_strikes
-        }
-        
-        # Write watchlist to PostgreSQL
-        try:
-            import psycopg2
-            conn = psycopg2.connect(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                database=os.getenv('POSTGRES_DB', 'rec_io_db'),
-                user=os.getenv('POSTGRES_USER', 'rec_io_user'),
-                password=os.getenv('POSTGRES_PASSWORD', 'rec_io_password')
-            )
-            with conn.cursor() as cursor:
-                # Clear existing watchlist data
-                cursor.execute("DELETE FROM live_data.watchlist_btc")
-                # Insert filtered strikes into watchlist table
-                for strike in filtered_strikes:
-                    cursor.execute("""
-                        INSERT INTO live_data.watchlist_btc (
-                            symbol, current_price, ttc_seconds, broker, event_ticker,
-                            market_title, strike_tier, market_status, strike, buffer,
-                            buffer_pct, probability, yes_ask, no_ask, yes_diff, no_diff,
-                            volume, ticker, active_side
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        "BTC", btc_price, ttc_seconds, "Kalshi", market_data.get("event_ticker"),
-                        market_data.get("event_title"), market_data.get("strike_tier"),
-                        market_data.get("market_status"), strike.get("strike"), strike.get("buffer"),
-                        strike.get("buffer_pct"), strike.get("probability"), strike.get("yes_ask"),
-                        strike.get("no_ask"), strike.get("yes_diff"), strike.get("no_diff"),
-                        strike.get("volume"), strike.get("ticker"), strike.get("active_side")
-                    ))
-                conn.commit()
-                conn.close()
-                # Generated watchlist with {len(filtered_strikes)} filtered strikes in PostgreSQL
-                return True
-        except Exception as e:
-            log(f"[WATCHLIST] Error writing to PostgreSQL: {e}")
-            return False
-        
-    except Exception as e:
-        log(f"[WATCHLIST] Error generating watchlist: {e}")
-        return False
-
 def get_watchlist_data():
-    """Get current watchlist data from PostgreSQL"""
+    """Get current watchlist data from PostgreSQL (published by strike_table_generator)"""
     try:
         import psycopg2
         conn = psycopg2.connect(
@@ -854,8 +699,28 @@ def get_trade_strategy():
         if conn:
             conn.close()
 
-def trigger_auto_entry_trade(strike_data):
-    """Trigger a buy trade by calling the trade_manager service directly"""
+def get_cached_trade_preferences():
+    """Get (position_size, trade_strategy), re-reading PostgreSQL at most every TRADE_PREFERENCES_TTL seconds"""
+    now = time.monotonic()
+    cached = cached_entry_state["trade_preferences"]
+    if cached is not None and now - cached_entry_state["trade_preferences_loaded_at"] < TRADE_PREFERENCES_TTL:
+        return cached
+    
+    position_size = get_position_size()
+    trade_strategy = get_trade_strategy()
+    if position_size is not None:
+        cached_entry_state["trade_preferences"] = (position_size, trade_strategy)
+        cached_entry_state["trade_preferences_loaded_at"] = now
+    return position_size, trade_strategy
+
+def trigger_auto_entry_trade(strike_data, contract_name=None, symbol_open=None, trace=None):
+    """
+    Trigger a buy trade by calling the trade_manager service directly
+    
+    contract_name and symbol_open may be supplied from the published ladder,
+    which skips the watchlist read and BTC price request. trace is the
+    ladder's latency trace, forwarded with the ticket.
+    """
     import requests
     import uuid
     from datetime import datetime
@@ -868,11 +733,12 @@ def trigger_auto_entry_trade(strike_data):
         url = f"http://localhost:{port}/trades"
         
         # Get contract name from watchlist market_title
-        watchlist_data = get_watchlist_data()
-        contract_name = watchlist_data.get("market_title", "BTC Market") if watchlist_data else "BTC Market"
+        if contract_name is None:
+            watchlist_data = get_watchlist_data()
+            contract_name = watchlist_data.get("market_title", "BTC Market") if watchlist_data else "BTC Market"
         
-        # Get position size from trade preferences
-        position_size = get_position_size()
+        # Get position size and strategy from (cached) trade preferences
+        position_size, trade_strategy = get_cached_trade_preferences()
         if position_size is None:
             log(f"[AUTO ENTRY] ❌ Cannot trigger trade - no valid position size found")
             return False
@@ -895,21 +761,16 @@ def trigger_auto_entry_trade(strike_data):
             converted_side = "N"
         
         # Get current BTC price for symbol_open from main app API
-        try:
-            main_port = get_port("main_app")
-            btc_url = f"http://localhost:{main_port}/api/btc_price"
-            btc_response = requests.get(btc_url, timeout=2)
-            if btc_response.ok:
-                btc_data = btc_response.json()
-                symbol_open = btc_data.get("price")
-            else:
-                symbol_open = None
-        except Exception as e:
-            log(f"[AUTO ENTRY] ⚠️ Could not get BTC price: {e}")
-            symbol_open = None
-        
-        # Get trade strategy from PostgreSQL
-        trade_strategy = get_trade_strategy()
+        if symbol_open is None:
+            try:
+                main_port = get_port("main_app")
+                btc_url = f"http://localhost:{main_port}/api/btc_price"
+                btc_response = requests.get(btc_url, timeout=2)
+                if btc_response.ok:
+                    btc_data = btc_response.json()
+                    symbol_open = btc_data.get("price")
+            except Exception as e:
+                log(f"[AUTO ENTRY] ⚠️ Could not get BTC price: {e}")
         
         # Prepare the trade data exactly like trade_initiator does
         trade_payload = {
@@ -933,9 +794,12 @@ def trigger_auto_entry_trade(strike_data):
             "win_loss": None,
             "entry_method": "auto"
         }
+        if trace is not None:
+            trade_payload["trace"] = trace
         
         log(f"[AUTO ENTRY] 📤 Sending trade to trade_manager: {trade_payload}")
         
+        trade_trace.stamp(trace, "entry_sent")
         response = requests.post(url, json=trade_payload, timeout=10)
         
         if response.status_code == 201:
@@ -981,21 +845,17 @@ def trigger_auto_entry_trade(strike_data):
 
 def can_trade_strike(strike_key):
     """ATOMIC: Check if we can trade this strike (cooldown check)"""
-    current_time = time.time()
-    
-    if strike_key in last_trade_times:
-        time_since_last_trade = current_time - last_trade_times[strike_key]
-        if time_since_last_trade < TRADE_COOLDOWN:
-            # Skipping {strike_key} - traded {time_since_last_trade:.1f}s ago (cooldown: {TRADE_COOLDOWN}s)
-            return False
-    
-    # ATOMIC: Add to cooldown immediately
-    last_trade_times[strike_key] = current_time
-            # {strike_key} passed cooldown check - added to cooldown
-    return True
+    return traded_index.try_start_cooldown(strike_key)
 
 def is_strike_already_traded(strike_data):
-    """Check if we already have an open or pending trade on this strike by querying trades_0001 table directly"""
+    """Check if we already have an open or pending trade on this strike"""
+    if traded_index.ready:
+        traded = traded_index.is_traded(strike_data.get('ticker'), strike_data.get('side'))
+        if traded:
+            log(f"[AUTO ENTRY] ⚠️ Found open/pending trade on {strike_data.get('strike')} {strike_data.get('side')}")
+        return traded
+    
+    # Index not warmed (listener down) - query trades_0001 table directly
     try:
         import psycopg2
         conn = psycopg2.connect(
@@ -1043,15 +903,149 @@ def is_strike_already_traded(strike_data):
         log(f"[AUTO ENTRY] Error checking trades_0001 table: {e}")
         return False
 
+def process_watchlist(watchlist_data, min_probability, min_differential, published_at=None):
+    """
+    Evaluate a watchlist against the entry thresholds and trigger qualifying trades.
+    
+    Args:
+        watchlist_data: Watchlist dict (published ladder or table read)
+        min_probability: Minimum probability setting
+        min_differential: Minimum differential setting
+        published_at: Epoch seconds the ladder was committed, for latency tracking
+    """
+    with entry_lock:
+        eval_start = time.perf_counter()
+        candidates = evaluate_watchlist(watchlist_data, min_probability, min_differential)
+        record_latency("evaluation", (time.perf_counter() - eval_start) * 1000)
+        if published_at is not None:
+            record_latency("publish_to_decision", (time.time() - published_at) * 1000)
+        
+        contract_name = watchlist_data.get("market_title") or "BTC Market"
+        symbol_open = watchlist_data.get("current_price")
+        
+        for candidate in candidates:
+            strike_key = candidate["strike_key"]
+            try:
+                # STEP 1: ATOMIC cooldown check
+                if not can_trade_strike(strike_key):
+                    continue
+                
+                strike_data = {
+                    'strike': f"${int(candidate['strike']):,}",
+                    'side': candidate['side'],
+                    'ticker': candidate['ticker'],
+                    'buy_price': candidate['buy_price'],
+                    'probability': candidate['probability']
+                }
+                
+                # STEP 2: Check if strike is already traded
+                if is_strike_already_traded(strike_data):
+                    log(f"[AUTO ENTRY] ⏸️ Skipping {strike_key} - already has open/pending trade")
+                    continue
+                
+                # STEP 3: Trigger the trade
+                trace = trade_trace.stamp(trade_trace.fork(watchlist_data.get("trace")), "entry_decided")
+                # Block re-entry right away; the trades_0001 notification replaces this
+                # placeholder, so it is set before the POST in case that arrives first
+                traded_index.mark_pending(strike_data['ticker'], strike_data['side'])
+                try:
+                    triggered = trigger_auto_entry_trade(strike_data, contract_name=contract_name,
+                                                         symbol_open=symbol_open, trace=trace)
+                except Exception:
+                    traded_index.clear_pending(strike_data['ticker'], strike_data['side'])
+                    raise
+                if triggered:
+                    log(f"[AUTO ENTRY] ✅ Trade triggered for {strike_key}")
+                    if published_at is not None:
+                        record_latency("publish_to_trigger", (time.time() - published_at) * 1000)
+                else:
+                    # Rejected or failed: no trade row will be notified to clear the placeholder
+                    traded_index.clear_pending(strike_data['ticker'], strike_data['side'])
+                    # Remove from cooldown if trade failed
+                    traded_index.release_cooldown(strike_key)
+                
+            except Exception as e:
+                log(f"[AUTO ENTRY] Error processing strike {candidate.get('strike')}: {e}")
+
+def on_new_watchlist(watchlist_data):
+    """
+    Handle a watchlist published by strike_table_generator.
+    
+    Decides entirely from cached_entry_state and the published ladder, so no
+    database or HTTP call sits between a new ladder and the trade trigger.
+    """
+    trade_trace.stamp(watchlist_data.get("trace"), "entry_received")
+    try:
+        if not cached_entry_state["enabled"] or cached_entry_state["spike_alert_active"]:
+            return
+        settings = cached_entry_state["settings"]
+        if not settings:
+            return
+        
+        if watchlist_data.get("strikes") is None:
+            # Payload too large to inline - fall back to the published table
+            published_at = watchlist_data.get("published_at")
+            trace = watchlist_data.get("trace")
+            watchlist_data = get_watchlist_data()
+            if not watchlist_data:
+                return
+            watchlist_data["published_at"] = published_at
+            watchlist_data["trace"] = trace
+        
+        # TTC from the ladder, advanced by the time since it was published
+        published_at = watchlist_data.get("published_at")
+        ttc = watchlist_data.get("ttc") or 0
+        if published_at is not None:
+            ttc = max(0, ttc - int(time.time() - published_at))
+        if not settings["min_time"] <= ttc <= settings["max_time"]:
+            return
+        
+        process_watchlist(watchlist_data, settings["min_probability"], settings["min_differential"], published_at)
+    except Exception as e:
+        log(f"[AUTO ENTRY] Error handling published watchlist: {e}")
+
+def on_trade_event(event):
+    """Apply a users.trades_0001 change notification to the traded strike index"""
+    traded_index.apply_trade_event(event.get("id"), event.get("ticker"), event.get("side"), event.get("status"))
+
+def warm_traded_index(conn):
+    """Load open/pending trades into the index (trade_manager installs the notify trigger)"""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT id, ticker, side FROM users.trades_0001 WHERE status = ANY(%s)",
+            (list(ACTIVE_TRADE_STATUSES),)
+        )
+        trades = cursor.fetchall()
+    traded_index.warm(trades)
+    log(f"[AUTO ENTRY] ✅ Traded strike index warmed with {len(trades)} open/pending trades")
+
+def start_watchlist_listener():
+    """Start listening for published watchlists and trade changes"""
+    global watchlist_listener
+    db_config = {
+        'host': os.getenv('POSTGRES_HOST', 'localhost'),
+        'port': int(os.getenv('POSTGRES_PORT', '5432')),
+        'database': os.getenv('POSTGRES_DB', 'rec_io_db'),
+        'user': os.getenv('POSTGRES_USER', 'rec_io_user'),
+        'password': os.getenv('POSTGRES_PASSWORD', 'rec_io_password')
+    }
+    watchlist_listener = NotificationListener(
+        "auto-entry-listener",
+        db_config,
+        {get_watchlist_channel("btc"): on_new_watchlist, TRADES_CHANNEL: on_trade_event},
+        deliver_all=(TRADES_CHANNEL,),
+        on_connect=warm_traded_index,
+        on_disconnect=traded_index.invalidate,
+        log=log
+    )
+    watchlist_listener.start()
+
 def check_auto_entry_conditions():
     """SIMPLIFIED: Check if auto entry conditions are met and trigger trades"""
     global auto_entry_indicator_state
     
     try:
-        # ALWAYS generate watchlist first (regardless of scanning status)
-        watchlist_generated = generate_watchlist_from_strike_table()
-        if not watchlist_generated:
-            log(f"[AUTO ENTRY] Failed to generate watchlist")
+        # Watchlist is generated and published by strike_table_generator
         
         # Check spike alert conditions first
         check_spike_alert_conditions()
@@ -1065,6 +1059,9 @@ def check_auto_entry_conditions():
         # Check if spike alert is active (blocks all trades)
         spike_alert_active = auto_entry_indicator_state.get("spike_alert_active", False)
         
+        cached_entry_state["enabled"] = auto_entry_enabled
+        cached_entry_state["spike_alert_active"] = spike_alert_active
+        
         if not auto_entry_enabled:
             auto_entry_indicator_state.update({
                 "enabled": False,
@@ -1085,6 +1082,7 @@ def check_auto_entry_conditions():
         # Check if all required settings exist
         required_settings = ["min_time", "max_time", "min_probability", "min_differential"]
         missing_settings = [setting for setting in required_settings if setting not in settings]
+        cached_entry_state["settings"] = {} if missing_settings else settings
         if missing_settings:
             log(f"[AUTO ENTRY] ❌ Missing required settings: {missing_settings}")
             log(f"[AUTO ENTRY] Cannot proceed without complete settings configuration")
@@ -1132,108 +1130,28 @@ def check_auto_entry_conditions():
             log(f"[AUTO ENTRY] ⏸️ SPIKE ALERT ACTIVE - Skipping all trade processing")
             return
         
+        # Ladders published by strike_table_generator are handled by on_new_watchlist
+        # as they arrive; only poll the watchlist table if the listener is down
+        if watchlist_listener is not None and watchlist_listener.connected:
+            return
+        
         # Get watchlist data
         watchlist_data = get_watchlist_data()
         if not watchlist_data or "strikes" not in watchlist_data:
             return
         
-        # Process each strike ONCE
-        processed_strikes = set()  # Prevent duplicate processing
-        
-        for i, strike in enumerate(watchlist_data["strikes"]):
-            try:
-                # Use active_side for strike_key generation
-                active_side = strike.get('active_side')
-                if not active_side:
-                    continue
-                    
-                strike_key = f"{strike.get('strike')}-{active_side}"
-                
-                # Prevent duplicate processing
-                if strike_key in processed_strikes:
-                    continue
-                
-                processed_strikes.add(strike_key)
-                
-                # STEP 1: ATOMIC cooldown check
-                if not can_trade_strike(strike_key):
-                    continue
-                
-                # STEP 2: Check if we already have an active trade on this strike
-                strike_data_for_check = {
-                    'strike': strike.get('strike'),
-                    'side': active_side
-                }
-                
-                if is_strike_already_traded(strike_data_for_check):
-                    continue
-                
-                # STEP 3: Check probability threshold
-                prob = strike.get('probability')
-                if prob is None or prob < min_probability:
-                    continue
-                
-                # STEP 4: Check differential threshold (if applicable)
-                if min_differential is not None:
-                    diff = strike.get('yes_diff') if active_side == 'yes' else strike.get('no_diff')
-                    # Strike differential: {diff} (min required: {min_differential})
-                    if diff is None or diff < (min_differential - 0.5):
-                        # Skipping {strike_key} - differential {diff} below threshold {min_differential}
-                        continue
-                
-                # STEP 5: Determine buy price based on active_side
-                if active_side == 'yes':
-                    side = 'yes'
-                    buy_price = strike.get('yes_ask', 0) / 100.0  # Convert cents to decimal
-                elif active_side == 'no':
-                    side = 'no'
-                    buy_price = strike.get('no_ask', 0) / 100.0  # Convert cents to decimal
-                else:
-                    continue
-                
-                # STEP 6: Prepare strike data for trade trigger
-                strike_data = {
-                    'strike': f"${int(strike.get('strike')):,}",
-                    'side': side,
-                    'ticker': strike.get('ticker'),
-                    'buy_price': buy_price,
-                    'probability': prob
-                }
-                
-                # STEP 7: Check if strike is already traded
-                if is_strike_already_traded(strike_data):
-                    log(f"[AUTO ENTRY] ⏸️ Skipping {strike_key} - already has open/pending trade")
-                    continue
-                
-                # STEP 8: Trigger the trade
-                if trigger_auto_entry_trade(strike_data):
-                    log(f"[AUTO ENTRY] ✅ Trade triggered for {strike_key}")
-                else:
-                    # Remove from cooldown if trade failed
-                    if strike_key in last_trade_times:
-                        del last_trade_times[strike_key]
-                
-            except Exception as e:
-                log(f"[AUTO ENTRY] Error processing strike {strike.get('strike')}: {e}")
+        process_watchlist(watchlist_data, min_probability, min_differential)
                 
     except Exception as e:
         log(f"[AUTO ENTRY] Error checking auto entry conditions: {e}")
 
 def cleanup_old_cooldowns():
     """Clean up old cooldown entries"""
-    current_time = time.time()
-    keys_to_remove = []
-    
-    for strike_key, last_trade_time in last_trade_times.items():
-        if current_time - last_trade_time >= TRADE_COOLDOWN:
-            keys_to_remove.append(strike_key)
+    removed = traded_index.prune_cooldowns()
     
-    for key in keys_to_remove:
-        del last_trade_times[key]
-    
-            # Only log if we actually cleaned up something (and only if significant)
-        if len(keys_to_remove) > 5:
-            log(f"[AUTO ENTRY] Cleaned up {len(keys_to_remove)} old cooldowns")
+    # Only log if we actually cleaned up something (and only if significant)
+    if removed > 5:
+        log(f"[AUTO ENTRY] Cleaned up {removed} old cooldowns")
 
 def start_monitoring_loop():
     """Start the monitoring loop for auto entry conditions"""
@@ -1333,12 +1251,23 @@ def get_auto_entry_status():
             "enabled": enabled,
             "settings": settings,
             "current_ttc": current_ttc,
-            "cooldown_entries_count": len(last_trade_times),
+            "cooldown_entries_count": traded_index.cooldown_count(),
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Decision latency endpoint
+@app.route("/api/auto_entry_latency")
+def get_auto_entry_latency():
+    """Get auto entry decision latency histograms"""
+    return jsonify({
+        "listener_connected": watchlist_listener is not None and watchlist_listener.connected,
+        "last_notification_at": watchlist_listener.last_notification_at if watchlist_listener else None,
+        "histograms": {stage: AUTO_ENTRY_LATENCY_SECONDS.snapshot(stage=stage) for stage in LATENCY_STAGES},
+        "timestamp": datetime.now().isoformat()
+    })
+
 # Auto entry indicator endpoint (for frontend display)
 @app.route("/api/auto_entry_indicator")
 def get_auto_entry_indicator():
@@ -1376,7 +1305,9 @@ def get_auto_entry_scanning_status():
                 "cooldown_threshold": settings.get("spike_alert_cooldown_threshold"),
                 "cooldown_minutes": settings.get("spike_alert_cooldown_minutes")
             },
-            "cooldown_entries_count": len(last_trade_times),
+            "cooldown_entries_count": traded_index.cooldown_count(),
+            "traded_index_ready": traded_index.ready,
+            "traded_index_active_count": traded_index.active_count(),
             "monitoring_thread_alive": service_healthy,
             "timestamp": datetime.now().isoformat()
         })
@@ -1468,6 +1399,9 @@ def start_event_driven_supervisor():
     # Start monitoring loop
     start_monitoring_loop()
     
+    # React to each new ladder as soon as it is published
+    start_watchlist_listener()
+    
     # Start HTTP server
     def start_http_server():
         try:
@@ -7,7 +7,6 @@ Detects truly catastrophic system failures only.
 import os
 import sys
 import time
-import subprocess
 import psutil
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
@@ -24,6 +23,8 @@ sys.path.insert(0, get_project_root())
 # Add scripts directory for user_notifications
 sys.path.insert(0, os.path.join(get_project_root(), 'scripts'))
 
+from backend.util.supervisor_status import get_supervisor_status_poller
+
 class FailureLevel:
     NONE = "none"
     WARNING = "warning"
@@ -57,6 +58,9 @@ class CascadingFailureDetector:
             "kalshi_market_watchdog" # Kalshi market data
         ]
         
+        # One supervisord XML-RPC snapshot per detection cycle
+        self.supervisor = get_supervisor_status_poller()
+        
         # Service health tracking
         self.service_health = {}
         self.failure_history = []
@@ -83,13 +87,10 @@ class CascadingFailureDetector:
     def check_service_health(self, service_name: str) -> Dict[str, Any]:
         """Check health of a specific service."""
         try:
-            from backend.util.paths import get_supervisorctl_path, get_supervisor_config_path
-            result = subprocess.run(
-                [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status", service_name],
-                capture_output=True, text=True, timeout=5
-            )
+            if self.supervisor.get_state(service_name) is None and self.supervisor.error:
+                raise RuntimeError(self.supervisor.error)
             
-            if "RUNNING" in result.stdout:
+            if self.supervisor.is_running(service_name):
                 return {
                     "service": service_name,
                     "status": "healthy",
@@ -114,6 +115,7 @@ class CascadingFailureDetector:
     
     def update_service_health(self):
         """Update health status for all critical services."""
+        self.supervisor.refresh()
         for service in self.critical_services:
             current_health = self.check_service_health(service)
             
@@ -134,16 +136,17 @@ class CascadingFailureDetector:
     def check_supervisor_status(self) -> Dict[str, Any]:
         """Check if supervisor is running and healthy."""
         try:
-            # Check if supervisor is running
+            # Ask supervisord for its own pid instead of walking every process
             supervisor_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            supervisord_pid = self.supervisor.get_supervisord_pid()
+            if supervisord_pid:
                 try:
-                    if 'supervisord' in proc.info['name'] or 'supervisor' in str(proc.info['cmdline']):
-                        supervisor_processes.append({
-                            "pid": proc.info['pid'],
-                            "name": proc.info['name'],
-                            "status": proc.status()
-                        })
+                    proc = psutil.Process(supervisord_pid)
+                    supervisor_processes.append({
+                        "pid": supervisord_pid,
+                        "name": proc.name(),
+                        "status": proc.status()
+                    })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
             
@@ -340,13 +343,9 @@ class CascadingFailureDetector:
             all_running = True
             failed_services = []
             
+            self.supervisor.refresh()
             for service in critical_services:
-                from backend.util.paths import get_supervisorctl_path, get_supervisor_config_path
-                result = subprocess.run(
-                    [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status", service],
-                    capture_output=True, text=True, timeout=5
-                )
-                if "RUNNING" not in result.stdout:
+                if not self.supervisor.is_running(service):
                     all_running = False
                     failed_services.append(service)
             
@@ -121,7 +121,9 @@ def init_database():
                 delta_3m DECIMAL(10,4),
                 delta_4m DECIMAL(10,4),
                 delta_15m DECIMAL(10,4),
-                delta_30m DECIMAL(10,4)
+                delta_30m DECIMAL(10,4),
+                momentum_percentile DECIMAL(7,3),
+                momentum_zscore DECIMAL(10,4)
             );
         """)
         
@@ -136,7 +138,9 @@ def init_database():
                 delta_3m DECIMAL(10,4),
                 delta_4m DECIMAL(10,4),
                 delta_15m DECIMAL(10,4),
-                delta_30m DECIMAL(10,4)
+                delta_30m DECIMAL(10,4),
+                momentum_percentile DECIMAL(7,3),
+                momentum_zscore DECIMAL(10,4)
             );
         """)
         
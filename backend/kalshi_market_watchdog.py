@@ -16,6 +16,9 @@ import pytz
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from backend.core.port_config import get_port
+from backend.util.metrics import REGISTRY, start_metrics_server, time_db_query
+
 # Config
 BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
 API_HEADERS = {
@@ -36,6 +39,11 @@ DB_CONFIG = {
 
 last_failed_ticker = None  # Global tracker
 
+KALSHI_FETCH_SECONDS = REGISTRY.histogram(
+    "kalshi_event_fetch_seconds",
+    "Kalshi REST event fetch round trip"
+)
+
 def get_watchdog_port():
     return 5432  # Default PostgreSQL port
 
@@ -154,7 +162,8 @@ def get_current_event_ticker():
 def fetch_event_json(event_ticker):
     url = f"{BASE_URL}/events/{event_ticker}"
     try:
-        response = requests.get(url, headers=API_HEADERS, timeout=10)
+        with KALSHI_FETCH_SECONDS.time():
+            response = requests.get(url, headers=API_HEADERS, timeout=10)
         response.raise_for_status()
         data = response.json()
         if "error" in data:
@@ -233,6 +242,11 @@ def save_market_data_to_postgresql(event_ticker, markets_data):
 def main():
     print(f"[{datetime.now(EST)}] 🚀 Starting Kalshi API Market Kalshi BTC Watchdog")
     
+    try:
+        start_metrics_server(get_port("kalshi_market_watchdog"))
+    except OSError as e:
+        print(f"[{datetime.now(EST)}] ⚠️ Metrics server not started: {e}")
+    
     # Initialize database table
     connection = connect_database()
     if connection:
@@ -248,7 +262,8 @@ def main():
                 print(f"[{datetime.now(EST)}] 📊 Processing event: {event_ticker}")
                 
                 # Save to PostgreSQL
-                success = save_market_data_to_postgresql(event_ticker, event_data["markets"])
+                with time_db_query("kalshi_market_watchdog.save_market_data"):
+                    success = save_market_data_to_postgresql(event_ticker, event_data["markets"])
                 
                 if not success:
                     print(f"[{datetime.now(EST)}] ❌ Failed to save data for {event_ticker}")
@@ -52,6 +52,11 @@ print(f"[MAIN] 🚀 Active Trade Supervisor port: {ACTIVE_TRADE_SUPERVISOR_PORT}
 # Import centralized path utilities
 from backend.util.paths import get_data_dir, get_trade_history_dir, get_accounts_data_dir
 from backend.account_mode import get_account_mode
+from backend.util.metrics import WEBSOCKET_QUEUE_DEPTH, mount_fastapi_metrics, timed_cursor
+from backend.util.probability_service import get_probability_service
+
+# Vectorized, cached lookups on the memory-mapped probability artifact, shared with the other consumers
+probability_service = get_probability_service("btc")
 
 # Global set of connected websocket clients for preferences
 connected_clients = set()
@@ -668,11 +673,14 @@ async def broadcast_preferences_update():
         print(f"[Broadcast Preferences Error] {e}")
 
 async def send_to_client(client, data):
+    WEBSOCKET_QUEUE_DEPTH.inc(feed="preferences")
     try:
         await client.send_text(data)
     except Exception:
         # Client will be removed in the main function
         pass
+    finally:
+        WEBSOCKET_QUEUE_DEPTH.dec(feed="preferences")
 
 # Broadcast helper function for account mode updates
 async def broadcast_account_mode(mode: str):
@@ -694,15 +702,19 @@ async def broadcast_db_change(db_name: str, change_data: dict):
         "timestamp": datetime.now().isoformat()
     })
     to_remove = set()
+    # Sends still outstanding in this broadcast
+    WEBSOCKET_QUEUE_DEPTH.inc(len(db_change_clients), feed="db_changes")
     for client in db_change_clients:
         try:
             await client.send_text(message)
         except Exception:
             to_remove.add(client)
+        WEBSOCKET_QUEUE_DEPTH.dec(feed="db_changes")
     db_change_clients.difference_update(to_remove)
 
 # Create FastAPI app
 app = FastAPI(title="Trading System Main App")
+mount_fastapi_metrics(app)
 
 # Import universal host system
 from backend.util.paths import get_host
@@ -1641,12 +1653,31 @@ async def set_account_mode(mode_data: dict):
     return {"status": "error", "message": "Invalid mode"}
 
 # Trade data endpoints
+def _with_trade_frontend_fields(trade_dict):
+    """Add the combined fields the trade tables expect."""
+    # Create a combined timestamp field for frontend compatibility
+    if 'date' in trade_dict and 'time' in trade_dict:
+        trade_dict['timestamp'] = f"{trade_dict['date']} {trade_dict['time']}"
+    
+    # Create a combined price field for frontend compatibility
+    if 'buy_price' in trade_dict:
+        trade_dict['price'] = trade_dict['buy_price']
+    return trade_dict
+
 @app.get("/trades")
-async def get_trades(status: Optional[str] = None):
-    """Get trade data from PostgreSQL database."""
+async def get_trades(status: Optional[str] = None, since_id: Optional[int] = None, before_id: Optional[int] = None,
+                     date_from: Optional[str] = None, date_to: Optional[str] = None,
+                     ticker: Optional[str] = None, limit: Optional[int] = None):
+    """Get trade data from PostgreSQL database.
+    
+    Without paging parameters every trade is returned (newest first). With
+    since_id, before_id or limit one keyset page is returned instead; see
+    backend/util/trade_query.py.
+    """
     try:
         import psycopg2
         from psycopg2.extras import RealDictCursor
+        from backend.util.trade_query import build_trades_query, clamp_limit
         
         # Connect to PostgreSQL
         conn = psycopg2.connect(
@@ -1657,8 +1688,15 @@ async def get_trades(status: Optional[str] = None):
         )
         
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            paged = since_id is not None or before_id is not None or limit is not None
+            if paged or date_from or date_to or ticker:
+                query, params = build_trades_query(
+                    since_id=since_id, before_id=before_id, status=status, date_from=date_from,
+                    date_to=date_to, ticker=ticker, limit=clamp_limit(limit) if paged else None
+                )
+                cursor.execute(query, params)
             # Build query based on status filter
-            if status:
+            elif status:
                 cursor.execute("""
                     SELECT * FROM users.trades_0001 
                     WHERE status = %s 
@@ -1673,19 +1711,7 @@ async def get_trades(status: Optional[str] = None):
             trades = cursor.fetchall()
             
             # Convert RealDictRow objects to regular dictionaries
-            result = []
-            for trade in trades:
-                trade_dict = dict(trade)
-                
-                # Create a combined timestamp field for frontend compatibility
-                if 'date' in trade_dict and 'time' in trade_dict:
-                    trade_dict['timestamp'] = f"{trade_dict['date']} {trade_dict['time']}"
-                
-                # Create a combined price field for frontend compatibility
-                if 'buy_price' in trade_dict:
-                    trade_dict['price'] = trade_dict['buy_price']
-                
-                result.append(trade_dict)
+            result = [_with_trade_frontend_fields(dict(trade)) for trade in trades]
             
             conn.close()
             return result
@@ -1694,6 +1720,54 @@ async def get_trades(status: Optional[str] = None):
         print(f"Error getting trades from PostgreSQL: {e}")
         return []
 
+@app.get("/api/trades/changes")
+async def get_trade_changes(since_version: int = 0, limit: Optional[int] = None):
+    """Trades inserted, updated or deleted since a version, for incremental table refreshes."""
+    try:
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+        from backend.util.trade_query import fetch_trade_changes
+        
+        conn = psycopg2.connect(
+            host="localhost",
+            database="rec_io_db",
+            user="rec_io_user",
+            password="rec_io_password"
+        )
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                changes = fetch_trade_changes(cursor, since_version, limit)
+        finally:
+            conn.close()
+        changes["trades"] = [_with_trade_frontend_fields(trade) for trade in changes["trades"]]
+        return changes
+    except Exception as e:
+        print(f"Error getting trade changes from PostgreSQL: {e}")
+        return {"error": str(e)}
+
+@app.get("/api/trades/stats")
+async def get_trade_stats(dimension: Optional[str] = None):
+    """Closed-trade P&L and win/loss aggregates overall and per day, strategy, close method and momentum."""
+    try:
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+        from backend.util.trade_stats import fetch_trade_stats
+
+        conn = psycopg2.connect(
+            host="localhost",
+            database="rec_io_db",
+            user="rec_io_user",
+            password="rec_io_password"
+        )
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                return fetch_trade_stats(cursor, dimension)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error getting trade stats from PostgreSQL: {e}")
+        return {"error": str(e)}
+
 @app.get("/trades/{trade_id}")
 async def get_trade(trade_id: int):
     """Forward trade GET request to trade_manager."""
@@ -2053,11 +2127,13 @@ def get_system_health_from_db():
         return {"error": "Database error"}
 
 @app.get("/api/db/trades")
-def get_trades_from_postgresql():
-    """Get trades data from PostgreSQL database."""
+def get_trades_from_postgresql(since_id: Optional[int] = None, before_id: Optional[int] = None,
+                               limit: Optional[int] = None):
+    """Get trades data from PostgreSQL database; since_id, before_id or limit return one keyset page."""
     try:
         import psycopg2
         from psycopg2.extras import RealDictCursor
+        from backend.util.trade_query import build_trades_query, clamp_limit
         
         # Connect to PostgreSQL
         conn = psycopg2.connect(
@@ -2068,11 +2144,15 @@ def get_trades_from_postgresql():
         )
         
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            # Get all trades from PostgreSQL
-            cursor.execute("""
-                SELECT * FROM users.trades_0001 
-                ORDER BY id DESC
-            """)
+            if since_id is not None or before_id is not None or limit is not None:
+                query, params = build_trades_query(since_id=since_id, before_id=before_id, limit=clamp_limit(limit))
+                cursor.execute(query, params)
+            else:
+                # Get all trades from PostgreSQL
+                cursor.execute("""
+                    SELECT * FROM users.trades_0001 
+                    ORDER BY id DESC
+                """)
             trades = cursor.fetchall()
             
             # Convert RealDictRow objects to regular dictionaries
@@ -2173,6 +2253,66 @@ async def get_current_momentum():
             "error": "Unable to get momentum from PostgreSQL"
         }
 
+@app.post("/api/strike_probabilities")
+async def get_strike_probabilities(request: Request):
+    """prob_within for each strike from the probability lookup artifact.
+    
+    Body: {"current_price", "ttc_seconds", "strikes": [...], "momentum_score" (optional, live momentum if omitted)}
+    """
+    try:
+        data = await request.json()
+        current_price = float(data["current_price"])
+        ttc_seconds = float(data["ttc_seconds"])
+        strikes = [float(strike) for strike in data.get("strikes", [])]
+        momentum_score = data.get("momentum_score")
+        if momentum_score is None:
+            momentum_score = (await get_current_momentum()).get("momentum_score", 0)
+        
+        result = probability_service.evaluate(current_price, strikes, ttc_seconds, float(momentum_score))
+        if result is None:
+            return {"status": "error", "error": "No probability lookup artifact published"}
+        probabilities = []
+        for strike, within, pos, neg in zip(strikes, result["prob_within"].tolist(),
+                                            result["prob_within_positive"].tolist(),
+                                            result["prob_within_negative"].tolist()):
+            probabilities.append({
+                "strike": strike,
+                "buffer": abs(current_price - strike),
+                "prob_within": within,
+                "prob_within_positive": pos,
+                "prob_within_negative": neg
+            })
+        return {"status": "ok", "artifact_version": probability_service.artifact_version,
+                "probabilities": probabilities}
+    except Exception as e:
+        print(f"Error calculating strike probabilities: {e}")
+        return {"status": "error", "error": str(e)}
+
+@app.post("/api/probabilities/batch")
+async def get_batch_probabilities(request: Request):
+    """Probabilities for arrays of (current_price, strike, ttc_seconds, momentum_score).
+    
+    Body: {"current_price", "strikes", "ttc_seconds", "momentum_score"}, each a number or a list;
+    numbers are broadcast against the lists. momentum_score defaults to live momentum.
+    Returns parallel lists prob_within, prob_within_positive and prob_within_negative.
+    """
+    try:
+        data = await request.json()
+        momentum_score = data.get("momentum_score")
+        if momentum_score is None:
+            momentum_score = (await get_current_momentum()).get("momentum_score", 0)
+        
+        result = probability_service.evaluate(data["current_price"], data["strikes"], data["ttc_seconds"],
+                                              momentum_score)
+        if result is None:
+            return {"status": "error", "error": "No probability lookup artifact published"}
+        response = {"status": "ok", "artifact_version": probability_service.artifact_version}
+        response.update({name: values.ravel().tolist() for name, values in result.items()})
+        return response
+    except Exception as e:
+        print(f"Error calculating batch probabilities: {e}")
+        return {"status": "error", "error": str(e)}
+
 @app.get("/api/btc_price")
 async def get_btc_price():
     """Get current BTC price directly from PostgreSQL live_data.live_price_log_1s_btc."""
@@ -2912,7 +3052,10 @@ async def get_strike_table(symbol: str):
             password="rec_io_password"
         )
         
-        with conn.cursor() as cursor:
+        # Header and rows must come from the same strike table generation
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        
+        with conn.cursor(cursor_factory=timed_cursor("main.get_strike_table")) as cursor:
             # Get header data
             cursor.execute(f"""
                 SELECT 
@@ -3004,7 +3147,10 @@ async def get_postgresql_strike_table(symbol: str):
             password="rec_io_password"
         )
         
-        with conn.cursor() as cursor:
+        # Header and rows must come from the same strike table generation
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        
+        with conn.cursor(cursor_factory=timed_cursor("main.get_postgresql_strike_table")) as cursor:
             # Get the latest strike table data from PostgreSQL
             cursor.execute(f"""
                 SELECT 
@@ -3101,7 +3247,10 @@ async def get_watchlist(symbol: str):
             password=db_config.get('password', 'rec_io_password')
         )
         
-        with conn.cursor() as cursor:
+        # Header and rows must come from the same watchlist generation
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        
+        with conn.cursor(cursor_factory=timed_cursor("main.get_watchlist")) as cursor:
             # Get header data
             cursor.execute(f"""
                 SELECT 
@@ -3246,14 +3395,17 @@ async def get_auto_entry_indicator():
         return {"error": f"Error getting auto entry indicator: {str(e)}"}
 
 # Log event endpoint
-from backend.util.trade_logger import log_trade_event, get_trade_logs
+from backend.util.trade_logger import log_trade_event, get_trade_logs, flush_trade_logs
 
 @app.get("/api/trade_logs")
-async def get_trade_logs_endpoint(ticket_id: str = None, service: str = None, limit: int = 100):
-    """Get trade logs from PostgreSQL"""
+async def get_trade_logs_endpoint(ticket_id: str = None, service: str = None, limit: int = 100,
+                                  since_id: Optional[int] = None, before_id: Optional[int] = None):
+    """Get trade logs from PostgreSQL, newest first (oldest first after since_id)"""
     try:
-        logs = get_trade_logs(ticket_id=ticket_id, service=service, limit=limit)
-        return {"status": "ok", "logs": logs}
+        logs = get_trade_logs(ticket_id=ticket_id, service=service, limit=limit,
+                              since_id=since_id, before_id=before_id)
+        return {"status": "ok", "logs": logs, "max_id": max((log["id"] for log in logs), default=None),
+                "min_id": min((log["id"] for log in logs), default=None)}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -3727,6 +3879,7 @@ async def startup_event():
 async def shutdown_event():
     """Called when the application shuts down."""
     print("[MAIN] 🛑 Main app shutting down")
+    flush_trade_logs()
     # No port release needed for static ports
 
 @app.post("/api/admin/supervisor-status")
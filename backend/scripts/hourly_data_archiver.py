@@ -13,6 +13,15 @@ import time
 from datetime import datetime, timedelta
 import pytz
 
+from backend.util.strike_archive import (
+    HEADER_SNAPSHOTS_TABLE,
+    STRIKE_SNAPSHOTS_TABLE,
+    ensure_archive_tables,
+    migrate_legacy_event_tables,
+    move_event_header,
+    move_event_strikes,
+)
+
 EST = pytz.timezone("America/New_York")
 
 # Database configuration
@@ -58,14 +67,14 @@ def get_previous_hour_event_ticker():
         return None
 
 def create_historical_schema():
-    """Create historical_data schema if it doesn't exist"""
+    """Create historical_data schema and the partitioned snapshot tables if they don't exist"""
     try:
         connection = connect_database()
         if not connection:
             return False
             
         cursor = connection.cursor()
-        cursor.execute("CREATE SCHEMA IF NOT EXISTS historical_data")
+        ensure_archive_tables(cursor)
         connection.commit()
         connection.close()
         
@@ -80,7 +89,7 @@ def create_historical_schema():
         return False
 
 def archive_strikes_data(event_ticker):
-    """Archive strikes data to historical table"""
+    """Move strikes data into historical_data.strike_snapshots"""
     try:
         connection = connect_database()
         if not connection:
@@ -88,49 +97,13 @@ def archive_strikes_data(event_ticker):
             
         cursor = connection.cursor()
         
-        # Create historical table name (replace hyphens with underscores)
-        historical_table = f"historical_data.{event_ticker.lower().replace('-', '_')}_strikes"
-        
-        # Check if historical table exists
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'historical_data' 
-                AND table_name = %s
-            )
-        """, (f"{event_ticker.lower().replace('-', '_')}_strikes",))
-        
-        table_exists = cursor.fetchone()[0]
-        
-        if not table_exists:
-            # Create historical table with same structure
-            cursor.execute(f"""
-                CREATE TABLE {historical_table} AS 
-                SELECT * FROM live_data.btc_live_strikes 
-                WHERE event_ticker = %s
-            """, (event_ticker,))
-            
-            print(f"[{datetime.now(EST)}] ✅ Created historical table: {historical_table}")
-        else:
-            # Table exists, just copy data
-            cursor.execute(f"""
-                INSERT INTO {historical_table} 
-                SELECT * FROM live_data.btc_live_strikes 
-                WHERE event_ticker = %s
-            """, (event_ticker,))
-            
-            print(f"[{datetime.now(EST)}] ✅ Copied data to existing table: {historical_table}")
-        
-        # Delete from live table
-        cursor.execute("""
-            DELETE FROM live_data.btc_live_strikes 
-            WHERE event_ticker = %s
-        """, (event_ticker,))
+        # Single DELETE ... RETURNING -> INSERT, so rows move in one pass and one transaction
+        moved = move_event_strikes(cursor, event_ticker)
         
         connection.commit()
         connection.close()
         
-        print(f"[{datetime.now(EST)}] ✅ Archived strikes data for {event_ticker}")
+        print(f"[{datetime.now(EST)}] ✅ Archived {moved} strike rows for {event_ticker} into {STRIKE_SNAPSHOTS_TABLE}")
         return True
         
     except Exception as e:
@@ -141,7 +114,7 @@ def archive_strikes_data(event_ticker):
         return False
 
 def archive_header_data(event_ticker):
-    """Archive header data to historical table"""
+    """Move header data into historical_data.header_snapshots"""
     try:
         connection = connect_database()
         if not connection:
@@ -149,49 +122,12 @@ def archive_header_data(event_ticker):
             
         cursor = connection.cursor()
         
-        # Create historical table name (replace hyphens with underscores)
-        historical_table = f"historical_data.{event_ticker.lower().replace('-', '_')}_header"
-        
-        # Check if historical table exists
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'historical_data' 
-                AND table_name = %s
-            )
-        """, (f"{event_ticker.lower().replace('-', '_')}_header",))
-        
-        table_exists = cursor.fetchone()[0]
-        
-        if not table_exists:
-            # Create historical table with same structure
-            cursor.execute(f"""
-                CREATE TABLE {historical_table} AS 
-                SELECT * FROM live_data.btc_live_header 
-                WHERE event_ticker = %s
-            """, (event_ticker,))
-            
-            print(f"[{datetime.now(EST)}] ✅ Created historical table: {historical_table}")
-        else:
-            # Table exists, just copy data
-            cursor.execute(f"""
-                INSERT INTO {historical_table} 
-                SELECT * FROM live_data.btc_live_header 
-                WHERE event_ticker = %s
-            """, (event_ticker,))
-            
-            print(f"[{datetime.now(EST)}] ✅ Copied data to existing table: {historical_table}")
-        
-        # Delete from live table
-        cursor.execute("""
-            DELETE FROM live_data.btc_live_header 
-            WHERE event_ticker = %s
-        """, (event_ticker,))
+        moved = move_event_header(cursor, event_ticker)
         
         connection.commit()
         connection.close()
         
-        print(f"[{datetime.now(EST)}] ✅ Archived header data for {event_ticker}")
+        print(f"[{datetime.now(EST)}] ✅ Archived {moved} header rows for {event_ticker} into {HEADER_SNAPSHOTS_TABLE}")
         return True
         
     except Exception as e:
@@ -201,6 +137,29 @@ def archive_header_data(event_ticker):
             connection.close()
         return False
 
+def migrate_legacy_tables():
+    """Fold any old per-event historical_data.<event>_strikes/_header tables into the snapshot tables"""
+    try:
+        connection = connect_database()
+        if not connection:
+            return False
+            
+        cursor = connection.cursor()
+        moved = migrate_legacy_event_tables(cursor)
+        connection.commit()
+        connection.close()
+        
+        for table_name, rows in moved.items():
+            print(f"[{datetime.now(EST)}] ✅ Migrated {rows} rows from historical_data.{table_name}")
+        return True
+        
+    except Exception as e:
+        print(f"[{datetime.now(EST)}] ❌ Error migrating legacy tables: {e}")
+        if 'connection' in locals():
+            connection.rollback()
+            connection.close()
+        return False
+
 def main():
     print(f"[{datetime.now(EST)}] 🚀 Starting Hourly Data Archiver")
     
@@ -209,6 +168,9 @@ def main():
         print(f"[{datetime.now(EST)}] ❌ Failed to create historical schema")
         return
     
+    if "--migrate-legacy" in sys.argv:
+        migrate_legacy_tables()
+    
     # Get previous hour event ticker
     event_ticker = get_previous_hour_event_ticker()
     if not event_ticker:
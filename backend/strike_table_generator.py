@@ -11,16 +11,23 @@ import os
 import sys
 import psycopg2
 import json
+import time
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from decimal import Decimal
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.core.config.config_manager import config
+from backend.core.port_config import get_port
 from backend.util.paths import get_data_dir, get_kalshi_data_dir
+from backend.util.watchlist import WATCHLIST_COLUMNS, filter_watchlist, get_watchlist_filters, price_strike
+from backend.util.auto_entry_engine import build_watchlist_notification, get_watchlist_channel
+from backend.util.metrics import STRIKE_GENERATION_SECONDS, start_metrics_server, time_db_query
+from backend.util.probability_service import get_probability_service
+from backend.util import trade_trace
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +45,17 @@ POSTGRES_CONFIG = {
     'password': os.getenv('POSTGRES_PASSWORD', '')
         }
 
+# Column order for rows written by StrikeTableGenerator.write_strike_rows
+STRIKE_TABLE_COLUMNS = (
+    "symbol", "current_price", "ttc_seconds", "broker", "event_ticker", "market_title",
+    "strike_tier", "market_status", "strike", "buffer", "buffer_pct", "probability",
+    "yes_ask", "no_ask", "yes_diff", "no_diff", "volume", "ticker", "active_side",
+    "momentum_weighted_score"
+)
+
+# How long auto entry settings are reused before being re-read for watchlist filtering
+WATCHLIST_SETTINGS_TTL_SECONDS = 5
+
 class LookupProbabilityCalculator:
     """Probability calculator using the lookup table instead of live interpolation."""
     
@@ -45,11 +63,15 @@ class LookupProbabilityCalculator:
         self.symbol = symbol.lower()
         self.db_config = POSTGRES_CONFIG
         self.lookup_table_name = f"probability_lookup_{self.symbol}"
+        self.service = get_probability_service(self.symbol)
     
     def get_probability(self, ttc_seconds: int, buffer_points: int, momentum_bucket: int) -> tuple[float, float]:
         """
         Get probability values from lookup table with bilinear interpolation.
         
+        Reads the memory-mapped lookup artifact through the shared probability
+        service when one is published and queries the table otherwise.
+        
         Args:
             ttc_seconds: Time to close in seconds
             buffer_points: Buffer distance in points
@@ -63,6 +85,13 @@ class LookupProbabilityCalculator:
             logger.info(f"Buffer {buffer_points} outside lookup table range (0-2000), returning 99.9")
             return 99.9, 99.9
         
+        try:
+            probabilities = self.service.probability(ttc_seconds, buffer_points, momentum_bucket)
+            if probabilities is not None:
+                return probabilities
+        except Exception as e:
+            logger.error(f"Error reading lookup artifact, falling back to table: {e}")
+        
         conn = None
         try:
             conn = psycopg2.connect(**self.db_config)
@@ -230,6 +259,8 @@ class StrikeTableGenerator:
         self.symbol = symbol.lower()
         self.db_config = POSTGRES_CONFIG
         self.calculator = LookupProbabilityCalculator(symbol)
+        self._watchlist_settings = None
+        self._watchlist_settings_loaded_at = 0.0
     
     def generate_market_title(self, event_ticker: str) -> str:
         """
@@ -340,6 +371,35 @@ class StrikeTableGenerator:
             """
             cursor.execute(strike_index_sql)
             
+            # Create watchlist table, published alongside the strike table
+            watchlist_sql = f"""
+            CREATE TABLE IF NOT EXISTS live_data.watchlist_{self.symbol.lower()} (
+                id SERIAL PRIMARY KEY,
+                timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                symbol VARCHAR(10),
+                current_price DECIMAL(10,2),
+                ttc_seconds INTEGER,
+                broker VARCHAR(20),
+                event_ticker VARCHAR(50),
+                market_title TEXT,
+                strike_tier INTEGER,
+                market_status VARCHAR(20),
+                strike INTEGER,
+                buffer DECIMAL(10,2),
+                buffer_pct DECIMAL(5,2),
+                probability DECIMAL(5,2),
+                yes_ask DECIMAL(5,2),
+                no_ask DECIMAL(5,2),
+                yes_diff DECIMAL(5,2),
+                no_diff DECIMAL(5,2),
+                volume INTEGER,
+                ticker VARCHAR(50),
+                active_side VARCHAR(10),
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            )
+            """
+            cursor.execute(watchlist_sql)
+            
             conn.commit()
             logger.info(f"✅ Live data schema and tables created for {self.symbol.upper()}")
             
@@ -354,16 +414,17 @@ class StrikeTableGenerator:
         """Get current market data from live_data.live_price_log_1s_btc and Kalshi snapshot."""
         try:
             # Get current price and momentum from PostgreSQL
-            conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-            SELECT price, momentum FROM live_data.live_price_log_1s_btc 
-            ORDER BY timestamp DESC 
-            LIMIT 1
-            """)
-            
-            result = cursor.fetchone()
+            with time_db_query("strike_table_generator.current_price"):
+                conn = psycopg2.connect(**self.db_config)
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                SELECT price, momentum, timestamp FROM live_data.live_price_log_1s_btc 
+                ORDER BY timestamp DESC 
+                LIMIT 1
+                """)
+                
+                result = cursor.fetchone()
             if not result:
                 raise ValueError("No price data found in live_data.live_price_log_1s_btc")
             
@@ -378,6 +439,7 @@ class StrikeTableGenerator:
             return {
                 "current_price": current_price,
                 "momentum_score": momentum_score,
+                "tick_timestamp": result[2],
                 "market_data": market_data
             }
             
@@ -554,11 +616,16 @@ class StrikeTableGenerator:
         Returns:
             True if successful
         """
-        conn = None
+        started = time.perf_counter()
+        ladder_started_at = time.time()
         try:
             # Get current market data
             logger.info("📊 Getting current market data...")
             market_info = self.get_current_market_data()
+            
+            # Trace this ladder version from its tick through to any trade it triggers
+            trace = trade_trace.new_trace(self.symbol.upper(), trade_trace.tick_epoch(market_info.get("tick_timestamp")))
+            trade_trace.stamp(trace, "ladder_started", ladder_started_at)
             current_price = market_info["current_price"]
             momentum_score = market_info["momentum_score"]
             market_data = market_info["market_data"]
@@ -595,14 +662,18 @@ class StrikeTableGenerator:
             # momentum_score is like 0.043 (4.3%), convert to bucket like 4
             momentum_bucket = round(momentum_score * 100)
             
-            # Write to database
-            conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor()
+            # Generate market title from event ticker
+            market_title = self.generate_market_title(market_data.get("event_ticker"))
             
-            # Clear ALL previous strike table data - only keep current iteration
-            cursor.execute(f"DELETE FROM live_data.strike_table_{self.symbol.lower()}")
+            # Index markets by strike so each lookup is O(1)
+            markets_by_strike = {}
+            for market in markets:
+                floor_strike = market.get("floor_strike")
+                if floor_strike is not None:
+                    markets_by_strike.setdefault(round(float(floor_strike), 2), market)
             
-            # Process each strike
+            # Build the full ladder in memory before touching the database
+            rows = []
             strike_data = []
             for strike in strikes:
                 try:
@@ -615,60 +686,24 @@ class StrikeTableGenerator:
                         ttc_seconds, int(buffer), momentum_bucket
                     )
                     
-                    # Determine probability based on strike position
-                    if strike < current_price:
-                        probability = pos_prob
-                    else:
-                        probability = neg_prob
-                    
                     # Get market data for this strike
                     # Convert strike back to the format used in market data
-                    market_strike = f"{strike - 0.01:.2f}"
-                    
-                    yes_ask = None
-                    no_ask = None
-                    volume = None
-                    ticker = None
-                    
-                    # Find the matching market
-                    for market in markets:
-                        floor_strike = market.get("floor_strike")
-                        if floor_strike is not None:
-                            # Compare as floats to handle precision issues
-                            if abs(float(floor_strike) - float(market_strike)) < 0.01:
-                                yes_ask = market.get("yes_ask")
-                                no_ask = market.get("no_ask")
-                                volume = market.get("volume")
-                                ticker = market.get("ticker")
-                                break
+                    market = markets_by_strike.get(round(strike - 0.01, 2), {})
+                    yes_ask = market.get("yes_ask")
+                    no_ask = market.get("no_ask")
+                    volume = market.get("volume")
+                    ticker = market.get("ticker")
                     
                     if yes_ask is None or no_ask is None:
                         logger.warning(f"⚠️ Missing ask prices for strike {strike}, skipping")
                         continue
                     
-                    # Calculate yes_diff and no_diff based on money line position
-                    if strike < current_price:
-                        # Strike is BELOW current price (money line)
-                        yes_diff = probability - yes_ask
-                        no_diff = 100 - probability - no_ask
-                        active_side = 'yes'
-                    else:
-                        # Strike is ABOVE current price (money line)
-                        yes_diff = 100 - probability - yes_ask
-                        no_diff = probability - no_ask
-                        active_side = 'no'
-                    
-                    # Generate market title from event ticker
-                    market_title = self.generate_market_title(market_data.get("event_ticker"))
+                    # Probability, differentials and side based on money line position
+                    probability, yes_diff, no_diff, active_side = price_strike(
+                        strike, current_price, pos_prob, neg_prob, yes_ask, no_ask
+                    )
                     
-                    # Insert into database
-                    cursor.execute(f"""
-                    INSERT INTO live_data.strike_table_{self.symbol.lower()} 
-                    (symbol, current_price, ttc_seconds, broker, event_ticker, market_title,
-                     strike_tier, market_status, strike, buffer, buffer_pct, probability,
-                     yes_ask, no_ask, yes_diff, no_diff, volume, ticker, active_side, momentum_weighted_score)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
+                    rows.append((
                         self.symbol.upper(), current_price, ttc_seconds, "Kalshi",
                         market_data.get("event_ticker"), market_title,
                         market_data.get("strike_tier"), market_data.get("market_status"),
@@ -680,27 +715,152 @@ class StrikeTableGenerator:
                     strike_data.append({
                         "strike": strike,
                         "buffer": buffer,
+                        "buffer_pct": buffer_pct,
                         "probability": probability,
                         "yes_ask": yes_ask,
                         "no_ask": no_ask,
-                        "active_side": active_side
+                        "yes_diff": yes_diff,
+                        "no_diff": no_diff,
+                        "volume": volume,
+                        "ticker": ticker,
+                        "active_side": active_side,
+                        "row": rows[-1]
                     })
                     
                 except Exception as e:
                     logger.error(f"❌ Error processing strike {strike}: {e}")
                     continue
             
-            conn.commit()
+            if not rows:
+                raise ValueError("No strike rows generated, keeping previous strike table")
+            
+            # Derive the watchlist from the ladder we just built
+            watchlist_rows = None
+            notification = None
+            settings = self.get_auto_entry_settings()
+            if settings:
+                filters = get_watchlist_filters(settings)
+                watchlist = filter_watchlist(strike_data, **filters)
+                watchlist_rows = [entry["row"][:len(WATCHLIST_COLUMNS)] for entry in watchlist]
+                
+                # Payload for the auto entry engine, built once the swap has committed
+                # so published_at and the ladder_published stamp are commit times
+                def notification():
+                    trade_trace.stamp(trace, "ladder_published")
+                    return build_watchlist_notification(
+                        {
+                            "symbol": self.symbol.upper(),
+                            "current_price": current_price,
+                            "ttc": ttc_seconds,
+                            "event_ticker": market_data.get("event_ticker"),
+                            "market_title": market_title,
+                            "strike_tier": market_data.get("strike_tier"),
+                            "market_status": market_data.get("market_status"),
+                            "trace": trace
+                        },
+                        [{k: v for k, v in entry.items() if k != "row"} for entry in watchlist]
+                    )
+            
+            self.write_strike_rows(rows, watchlist_rows, notification)
+            STRIKE_GENERATION_SECONDS.observe(time.perf_counter() - started, symbol=self.symbol.upper())
             logger.info(f"✅ Generated {len(strike_data)} strike table records for {self.symbol.upper()}")
             return True
         
         except Exception as e:
             logger.error(f"❌ Error generating strike table: {e}")
             return False
+    
+    def get_auto_entry_settings(self) -> Dict[str, Any]:
+        """
+        Get auto entry settings used to filter the watchlist.
+        
+        Settings are cached for WATCHLIST_SETTINGS_TTL_SECONDS so the 1s
+        generation loop does not re-read them on every iteration.
+        """
+        now = time.monotonic()
+        if (self._watchlist_settings is not None and
+                now - self._watchlist_settings_loaded_at < WATCHLIST_SETTINGS_TTL_SECONDS):
+            return self._watchlist_settings
+        
+        conn = None
+        try:
+            conn = psycopg2.connect(**self.db_config)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT min_probability, min_differential
+                FROM users.auto_trade_settings_0001 WHERE id = 1
+            """)
+            result = cursor.fetchone()
+            settings = {}
+            if result:
+                settings = {
+                    "min_probability": result[0],
+                    "min_differential": float(result[1]) if result[1] is not None else 0.0
+                }
+            self._watchlist_settings = settings
+            self._watchlist_settings_loaded_at = now
+            return settings
+        except Exception as e:
+            logger.error(f"❌ Error loading auto entry settings for watchlist: {e}")
+            # Keep serving the last known settings rather than dropping the watchlist
+            return self._watchlist_settings or {}
         finally:
             if conn:
                 conn.close()
     
+    def write_strike_rows(self, rows: List[Tuple], watchlist_rows: Optional[List[Tuple]] = None,
+                          notification: Optional[Callable[[], str]] = None):
+        """
+        Atomically replace the strike table (and watchlist) with a freshly built ladder.
+        
+        The DELETEs and one multi-row INSERT per table are sent as a single
+        statement batch wrapped in BEGIN/COMMIT, so the swap costs one round trip
+        and readers only ever see the previous ladder or the complete new one.
+        
+        Args:
+            rows: Tuples ordered like STRIKE_TABLE_COLUMNS
+            watchlist_rows: Tuples ordered like WATCHLIST_COLUMNS, or None to
+                leave the watchlist untouched
+            notification: Builds the watchlist payload to NOTIFY, if any. It is
+                called after the swap commits, so listeners are only woken
+                for a committed ladder and the payload's timestamps are
+                taken after the commit.
+        """
+        strike_table = f"live_data.strike_table_{self.symbol.lower()}"
+        watchlist_table = f"live_data.watchlist_{self.symbol.lower()}"
+        conn = None
+        try:
+            conn = psycopg2.connect(**self.db_config)
+            conn.autocommit = True
+            cursor = conn.cursor()
+            
+            statements = [b"BEGIN"]
+            statements += self._replace_table_sql(cursor, strike_table, STRIKE_TABLE_COLUMNS, rows)
+            if watchlist_rows is not None:
+                statements += self._replace_table_sql(cursor, watchlist_table, WATCHLIST_COLUMNS, watchlist_rows)
+            statements.append(b"COMMIT")
+            
+            with time_db_query("strike_table_generator.write_strike_rows"):
+                cursor.execute(b"; ".join(statements))
+            if notification is not None:
+                cursor.execute("SELECT pg_notify(%s, %s)", (get_watchlist_channel(self.symbol), notification()))
+        finally:
+            if conn:
+                conn.close()
+    
+    @staticmethod
+    def _replace_table_sql(cursor, table: str, columns: Tuple[str, ...], rows: List[Tuple]) -> List[bytes]:
+        """Build the DELETE and multi-row INSERT statements that replace a table's contents."""
+        statements = [b"DELETE FROM " + table.encode()]
+        if rows:
+            placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+            values_sql = b",".join(cursor.mogrify(placeholders, row) for row in rows)
+            statements.append(
+                b"INSERT INTO " + table.encode() +
+                b" (" + ", ".join(columns).encode() + b") VALUES " + values_sql
+            )
+        return statements
+    
     def get_latest_strike_table_json(self) -> Optional[Dict[str, Any]]:
         """Get the latest strike table data in JSON format compatible with frontend."""
         try:
@@ -784,6 +944,11 @@ def run_continuous_generation(interval_seconds: int = 30):
     # Setup schema
     generator.setup_live_data_schema()
     
+    try:
+        start_metrics_server(get_port("strike_table_generator"))
+    except OSError as e:
+        logger.warning(f"⚠️ Metrics server not started: {e}")
+    
     iteration = 0
     while True:
         try:
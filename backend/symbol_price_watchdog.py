@@ -23,6 +23,11 @@ print('DEBUG sys.path:', sys.path)
 from backend.core.config.settings import config
 from backend.core.port_config import get_port
 from backend.util.paths import get_btc_price_history_dir, ensure_data_dirs
+from backend.util.metrics import (
+    TICK_INGEST_LAG_SECONDS, WEBSOCKET_QUEUE_DEPTH, get_websocket_backlog,
+    start_metrics_server, time_db_query
+)
+from backend.util.momentum_sketch import MomentumSketch, ensure_sketch_table, load_sketch, save_sketch
 
 # Ensure all data directories exist
 ensure_data_dirs()
@@ -59,6 +64,91 @@ def get_postgres_connection():
     """Get a PostgreSQL connection"""
     return psycopg2.connect(**POSTGRES_CONFIG)
 
+# Live momentum percentile ranking. The sketch is built from 1m history, so
+# it takes one live momentum value per minute and is saved every few minutes.
+SKETCH_SAVE_INTERVAL_MINUTES = 15
+_momentum_sketches: Dict[str, Optional[MomentumSketch]] = {}
+_sketch_last_minute: Dict[str, str] = {}
+_sketch_minutes_added: Dict[str, int] = {}
+
+def load_momentum_sketch(symbol: str) -> Optional[MomentumSketch]:
+    """
+    Load the symbol's momentum sketch, building it from history if none is saved.
+    Live ranking is disabled (None) if neither is available.
+    """
+    try:
+        conn = get_postgres_connection()
+        try:
+            cursor = conn.cursor()
+            ensure_sketch_table(cursor)
+            sketch = load_sketch(cursor, symbol)
+            conn.commit()
+        finally:
+            conn.close()
+        if sketch is None:
+            from backend.util.momentum_profiler import MomentumProfiler
+            profiler = MomentumProfiler(symbol)
+            sketch = profiler.build_sketch(profiler.load_momentum_data())
+            profiler.save_sketch(sketch)
+        print(f"📈 {symbol} momentum sketch loaded ({sketch.count:,} values)")
+    except Exception as e:
+        print(f"⚠️ Momentum percentile ranking disabled for {symbol}: {e}")
+        sketch = None
+    _momentum_sketches[symbol] = sketch
+    return sketch
+
+def persist_momentum_sketch(symbol: str):
+    sketch = _momentum_sketches.get(symbol)
+    if sketch is None:
+        return
+    try:
+        conn = get_postgres_connection()
+        try:
+            save_sketch(conn.cursor(), symbol, sketch)
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️ Failed to save {symbol} momentum sketch: {e}")
+
+def rank_momentum(symbol: str, timestamp: str, momentum: Optional[float]) -> Dict[str, Optional[float]]:
+    """
+    Percentile (0-100) and z-score of momentum against the symbol's history,
+    adding it to the sketch if it is the first value of a new minute.
+    """
+    sketch = _momentum_sketches.get(symbol)
+    if sketch is None or momentum is None:
+        return {'momentum_percentile': None, 'momentum_zscore': None}
+    
+    momentum = float(momentum)
+    minute = timestamp[:16]
+    if _sketch_last_minute.get(symbol) != minute:
+        _sketch_last_minute[symbol] = minute
+        sketch.add(momentum, datetime.now(timezone.utc))
+        _sketch_minutes_added[symbol] = _sketch_minutes_added.get(symbol, 0) + 1
+        if _sketch_minutes_added[symbol] % SKETCH_SAVE_INTERVAL_MINUTES == 0:
+            persist_momentum_sketch(symbol)
+    
+    return {
+        'momentum_percentile': sketch.percentile(momentum),
+        'momentum_zscore': sketch.z_score(momentum)
+    }
+
+def ensure_momentum_rank_columns(symbol: str):
+    """Add the percentile and z-score columns to live tables created before they existed."""
+    table_name = SYMBOL_CONFIG[symbol]['table_name']
+    conn = get_postgres_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            ALTER TABLE live_data.{table_name}
+                ADD COLUMN IF NOT EXISTS momentum_percentile DECIMAL(7,3),
+                ADD COLUMN IF NOT EXISTS momentum_zscore DECIMAL(10,4)
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
 def get_1m_avg_price(symbol: str) -> float:
     """
     Calculate the average price of the last 60 seconds from the PostgreSQL database.
@@ -266,6 +356,10 @@ def insert_tick(symbol: str, timestamp: str, price: float):
     Insert symbol price tick with 1-minute average and momentum data into PostgreSQL.
     Maintains only the last 30 days of price data to prevent unlimited database growth.
     """
+    with time_db_query("symbol_price_watchdog.insert_tick"):
+        _insert_tick(symbol, timestamp, price)
+
+def _insert_tick(symbol: str, timestamp: str, price: float):
     conn = get_postgres_connection()
     cursor = conn.cursor()
     
@@ -294,13 +388,17 @@ def insert_tick(symbol: str, timestamp: str, price: float):
                 'delta_30m': None
             }
         
+        # Where this momentum sits in the symbol's historical distribution
+        momentum_rank = rank_momentum(symbol, timestamp, momentum_data.get('momentum'))
+        
         table_name = SYMBOL_CONFIG[symbol]['table_name']
         
         # Insert the data with all columns
         cursor.execute(f'''
             INSERT INTO live_data.{table_name} 
-            (timestamp, price, one_minute_avg, momentum, delta_1m, delta_2m, delta_3m, delta_4m, delta_15m, delta_30m) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            (timestamp, price, one_minute_avg, momentum, delta_1m, delta_2m, delta_3m, delta_4m, delta_15m, delta_30m,
+             momentum_percentile, momentum_zscore) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (timestamp) DO UPDATE SET
                 price = EXCLUDED.price,
                 one_minute_avg = EXCLUDED.one_minute_avg,
@@ -310,7 +408,9 @@ def insert_tick(symbol: str, timestamp: str, price: float):
                 delta_3m = EXCLUDED.delta_3m,
                 delta_4m = EXCLUDED.delta_4m,
                 delta_15m = EXCLUDED.delta_15m,
-                delta_30m = EXCLUDED.delta_30m
+                delta_30m = EXCLUDED.delta_30m,
+                momentum_percentile = EXCLUDED.momentum_percentile,
+                momentum_zscore = EXCLUDED.momentum_zscore
         ''', (
             timestamp, 
             price, 
@@ -321,7 +421,9 @@ def insert_tick(symbol: str, timestamp: str, price: float):
             momentum_data.get('delta_3m'),
             momentum_data.get('delta_4m'),
             momentum_data.get('delta_15m'),
-            momentum_data.get('delta_30m')
+            momentum_data.get('delta_30m'),
+            momentum_rank['momentum_percentile'],
+            momentum_rank['momentum_zscore']
         ))
         
         # ROLLING WINDOW: Clean up data older than 30 days
@@ -342,6 +444,19 @@ def insert_tick(symbol: str, timestamp: str, price: float):
     finally:
         conn.close()
 
+def record_tick_metrics(symbol: str, exchange_time: Optional[str], websocket) -> None:
+    """Record ingest lag for a committed tick and the feed's unread backlog."""
+    if exchange_time:
+        try:
+            tick_time = datetime.fromisoformat(exchange_time.replace("Z", "+00:00"))
+            lag = (datetime.now(timezone.utc) - tick_time).total_seconds()
+            TICK_INGEST_LAG_SECONDS.observe(max(lag, 0.0), symbol=symbol)
+        except ValueError:
+            pass
+    backlog = get_websocket_backlog(websocket)
+    if backlog is not None:
+        WEBSOCKET_QUEUE_DEPTH.set(backlog, feed=f"coinbase_{symbol.lower()}")
+
 async def log_symbol_price(symbol: str):
     """Log price data for the specified symbol"""
     global last_logged_second
@@ -379,6 +494,7 @@ async def log_symbol_price(symbol: str):
                         formatted_price = f"${price:,.2f}"
 
                         insert_tick(symbol, rounded_timestamp, price)
+                        record_tick_metrics(symbol, data.get("time"), websocket)
 
                         # Ensure the directory exists before writing to the heartbeat file
                         heartbeat_path = os.path.join(get_btc_price_history_dir(), symbol_config['heartbeat_file'])
@@ -465,6 +581,12 @@ async def main():
         return
     
     print(f"Starting {symbol} Price Watchdog (PostgreSQL)")
+    ensure_momentum_rank_columns(symbol)
+    load_momentum_sketch(symbol)
+    try:
+        start_metrics_server(get_port(f"symbol_price_watchdog_{symbol.lower()}"))
+    except OSError as e:
+        print(f"⚠️ Metrics server not started: {e}")
     await asyncio.gather(
         log_symbol_price(symbol),
         poll_kraken_price_changes(symbol)
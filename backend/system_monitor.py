@@ -28,6 +28,7 @@ sys.path.insert(0, os.path.join(get_project_root(), 'scripts'))
 
 from backend.core.port_config import get_port, get_port_info, list_all_ports
 from backend.util.paths import get_data_dir, get_trade_history_dir, get_price_history_dir
+from backend.util.supervisor_status import get_supervisor_status_poller
 
 class SystemMonitor:
     def __init__(self):
@@ -69,17 +70,15 @@ class SystemMonitor:
             "trade_executor",
             "active_trade_supervisor"
         ]
+        
+        # One supervisord XML-RPC snapshot per monitoring cycle
+        self.supervisor = get_supervisor_status_poller()
     
     def check_service_health(self, service_name: str, port: int) -> Dict[str, Any]:
         """Check health of a specific service using supervisor status only."""
         try:
-            from backend.util.paths import get_supervisorctl_path, get_supervisor_config_path
             # Use supervisor status check instead of HTTP health endpoint
-            result = subprocess.run(
-                [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status", service_name],
-                capture_output=True, text=True, timeout=5
-            )
-            if "RUNNING" in result.stdout:
+            if self.supervisor.is_running(service_name):
                 return {
                     "service": service_name,
                     "status": "healthy",
@@ -92,7 +91,7 @@ class SystemMonitor:
                     "service": service_name,
                     "status": "unhealthy",
                     "port": port,
-                    "error": "Service not running in supervisor",
+                    "error": self.supervisor.error or "Service not running in supervisor",
                     "timestamp": datetime.now().isoformat()
                 }
         except Exception as e:
@@ -287,16 +286,17 @@ class SystemMonitor:
     def check_supervisor_status(self) -> Dict[str, Any]:
         """Check supervisor process status."""
         try:
-            # Check if supervisor is running
+            # Ask supervisord for its own pid instead of walking every process
             supervisor_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            supervisord_pid = self.supervisor.get_supervisord_pid()
+            if supervisord_pid:
                 try:
-                    if 'supervisord' in proc.info['name'] or 'supervisor' in str(proc.info['cmdline']):
-                        supervisor_processes.append({
-                            "pid": proc.info['pid'],
-                            "name": proc.info['name'],
-                            "status": proc.status()
-                        })
+                    proc = psutil.Process(supervisord_pid)
+                    supervisor_processes.append({
+                        "pid": supervisord_pid,
+                        "name": proc.name(),
+                        "status": proc.status()
+                    })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
             
@@ -336,38 +336,21 @@ class SystemMonitor:
         service_status = {}
         
         for service in all_services:
-            try:
-                from backend.util.paths import get_supervisorctl_path, get_supervisor_config_path
-                result = subprocess.run(
-                    [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status", service],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                if "RUNNING" in result.stdout:
-                    service_status[service] = {
-                        "status": "running",
-                        "supervisor_status": result.stdout.strip()
-                    }
-                elif "STOPPED" in result.stdout:
-                    service_status[service] = {
-                        "status": "stopped",
-                        "supervisor_status": result.stdout.strip()
-                    }
-                elif "FATAL" in result.stdout:
-                    service_status[service] = {
-                        "status": "fatal",
-                        "supervisor_status": result.stdout.strip()
-                    }
-                else:
-                    service_status[service] = {
-                        "status": "unknown",
-                        "supervisor_status": result.stdout.strip()
-                    }
-                    
-            except Exception as e:
+            state = self.supervisor.get_state(service)
+            if state is None and self.supervisor.error:
                 service_status[service] = {
                     "status": "error",
-                    "error": str(e)
+                    "error": self.supervisor.error
+                }
+            elif state in ("RUNNING", "STOPPED", "FATAL"):
+                service_status[service] = {
+                    "status": state.lower(),
+                    "supervisor_status": self.supervisor.status_line(service)
+                }
+            else:
+                service_status[service] = {
+                    "status": "unknown",
+                    "supervisor_status": self.supervisor.status_line(service)
                 }
         
         return {
@@ -381,6 +364,7 @@ class SystemMonitor:
     
     def generate_health_report(self) -> Dict[str, Any]:
         """Generate comprehensive health report."""
+        self.supervisor.refresh()
         report = {
             "timestamp": datetime.now().isoformat(),
             "system_resources": self.check_system_resources(),
@@ -589,13 +573,9 @@ class SystemMonitor:
             all_running = True
             failed_services = []
             
+            self.supervisor.refresh()
             for service in critical_services:
-                from backend.util.paths import get_supervisorctl_path, get_supervisor_config_path
-                result = subprocess.run(
-                    [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status", service],
-                    capture_output=True, text=True, timeout=5
-                )
-                if "RUNNING" not in result.stdout:
+                if not self.supervisor.is_running(service):
                     all_running = False
                     failed_services.append(service)
             
@@ -798,15 +778,10 @@ class SystemMonitor:
                                 
                                 # Check if all services are now healthy
                                 all_healthy = True
+                                self.supervisor.refresh()
                                 for check_service in self.service_urls.keys():
                                     try:
-                                        result = subprocess.run(
-                                            [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status", check_service],
-                                            capture_output=True,
-                                            text=True,
-                                            timeout=10
-                                        )
-                                        if "RUNNING" not in result.stdout:
+                                        if not self.supervisor.is_running(check_service):
                                             all_healthy = False
                                             break
                                     except Exception as e:
@@ -36,9 +36,12 @@ TRADE_EXECUTOR_PORT = get_port("trade_executor")
 # Import centralized path utilities
 from backend.util.paths import get_accounts_data_dir, get_host
 from backend.account_mode import get_account_mode
+from backend.util.metrics import ORDER_ROUND_TRIP_SECONDS, mount_flask_metrics
+from backend.util import trade_trace
 
 # Create Flask app
 app = Flask(__name__)
+mount_flask_metrics(app)
 
 def get_base_url():
     BASE_URLS = {
@@ -134,6 +137,7 @@ def trigger_trade():
     """Execute a trade."""
     try:
         data = request.get_json()
+        trace = trade_trace.stamp(data.get("trace"), "executor_received")
         ticket_id = data.get("ticket_id", "UNKNOWN")
         # Normalize ticket_id to avoid double "TICKET-" prefixing
         if ticket_id.count("TICKET-") > 1:
@@ -186,7 +190,16 @@ def trigger_trade():
         log_event(ticket_id, f"📤 REQUEST PAYLOAD: {json.dumps(order_payload, indent=2)}")
         
         try:
-            response = requests.post(url, headers=headers, json=order_payload, timeout=10)
+            trade_trace.stamp(trace, "order_sent")
+            with ORDER_ROUND_TRIP_SECONDS.time(stage="kalshi", action=data.get("intent", "open")):
+                response = requests.post(url, headers=headers, json=order_payload, timeout=10)
+            trade_trace.stamp(trace, "order_acked")
+            if trace is not None:
+                threading.Thread(
+                    target=trade_trace.record_trace,
+                    args=(trace, ticket_id, ticker, str(response.status_code)),
+                    daemon=True
+                ).start()
             
             # Log the complete response details
             log_event(ticket_id, f"📥 RESPONSE STATUS: {response.status_code}")
@@ -1,14 +1,19 @@
 
+import asyncio
 import threading
 import time
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import re
 import requests
+import aiohttp
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 
 # Import the universal centralized port system
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -18,6 +23,8 @@ from apscheduler.triggers.cron import CronTrigger
 from backend.util.paths import get_project_root, get_trade_history_dir, get_logs_dir, get_host, get_data_dir
 from backend.account_mode import get_account_mode
 from backend.util.paths import get_accounts_data_dir
+from backend.util.metrics import ORDER_ROUND_TRIP_SECONDS, mount_fastapi_metrics, time_db_query
+from backend.util import trade_trace
 # Function to get momentum data from PostgreSQL (replacement for archived unified_production_coordinator)
 def get_momentum_data_from_postgresql():
     """Get current momentum data directly from PostgreSQL."""
@@ -56,6 +63,22 @@ TRADE_MANAGER_PORT = get_port("trade_manager")
 processing_trades = set()
 processing_lock = threading.Lock()
 
+# Connection pool shared by ticket handling; callers wait for a free connection
+# instead of opening a new one per query
+POSTGRES_POOL_MAX_CONNECTIONS = 10
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+_pg_pool_slots = threading.BoundedSemaphore(POSTGRES_POOL_MAX_CONNECTIONS)
+
+# Bounded worker pool for follow-up work (confirmations, expiration checks,
+# settlement polling, notifications) that used to get a raw thread each
+FOLLOWUP_WORKERS = 8
+_followup_pool = ThreadPoolExecutor(max_workers=FOLLOWUP_WORKERS, thread_name_prefix="trade-followup")
+
+# Shared HTTP session for the executor, created in the app lifespan
+EXECUTOR_TIMEOUT_SECONDS = 5
+_executor_session = None
+
 # PostgreSQL connection function
 def get_postgresql_connection():
     """Get a connection to the PostgreSQL database"""
@@ -71,84 +94,169 @@ def get_postgresql_connection():
         print(f"❌ Failed to connect to PostgreSQL: {e}")
         return None
 
+def get_postgresql_pool():
+    """Get the shared PostgreSQL connection pool, creating it on first use"""
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is None or _pg_pool.closed:
+            _pg_pool = ThreadedConnectionPool(
+                1, POSTGRES_POOL_MAX_CONNECTIONS,
+                host="localhost",
+                database="rec_io_db",
+                user="rec_io_user",
+                password="rec_io_password"
+            )
+        return _pg_pool
+
+@contextmanager
+def pooled_transaction():
+    """Run a single transaction on a pooled connection, yielding its cursor.
+
+    Commits when the block exits normally and rolls back on error. Blocks while
+    all pooled connections are in use rather than failing.
+    """
+    with _pg_pool_slots:
+        pool = get_postgresql_pool()
+        conn = pool.getconn()
+        discard = False
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            pool.putconn(conn, close=discard or bool(conn.closed))
+
+def close_postgresql_pool():
+    """Close all pooled connections"""
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is not None and not _pg_pool.closed:
+            _pg_pool.closeall()
+        _pg_pool = None
+
+def submit_followup(fn, *args, key=None):
+    """Run follow-up work on the bounded worker pool.
+
+    When key is given, work for the same key is skipped while an earlier
+    submission is still queued or running.
+    """
+    if key is not None:
+        with processing_lock:
+            if key in processing_trades:
+                return None
+            processing_trades.add(key)
+
+    def run():
+        try:
+            fn(*args)
+        except Exception as e:
+            log(f"FOLLOW-UP ERROR in {getattr(fn, '__name__', fn)}: {e}")
+        finally:
+            if key is not None:
+                with processing_lock:
+                    processing_trades.discard(key)
+
+    return _followup_pool.submit(run)
+
 def get_executor_port():
     return get_port("trade_executor")
 
+async def send_to_executor(payload):
+    """POST a trade ticket to the executor without blocking the event loop.
+
+    Returns the HTTP status code.
+    """
+    global _executor_session
+    if _executor_session is None or _executor_session.closed:
+        _executor_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=EXECUTOR_TIMEOUT_SECONDS))
+    url = f"http://localhost:{get_executor_port()}/trigger_trade"
+    with ORDER_ROUND_TRIP_SECONDS.time(stage="executor", action=payload.get("intent", "open")):
+        async with _executor_session.post(url, json=payload) as response:
+            await response.read()
+            return response.status
+
 # ---------- CORE TRADE FUNCTIONS ----------------------------------------------------
 
 def insert_trade(trade):
-    """Insert a new trade with BTC price from unified endpoint"""
+    """Insert a new trade with BTC price and momentum from the live price log.
 
-    
-    # Get current BTC price directly from PostgreSQL live_data table - INSTANT
-    try:
-        pg_conn = get_postgresql_connection()
-        if pg_conn:
-            with pg_conn.cursor() as cursor:
-                cursor.execute("SELECT price FROM live_data.live_price_log_1s_btc ORDER BY timestamp DESC LIMIT 1")
-                result = cursor.fetchone()
-            
-            if result and result[0] is not None:
-                symbol_open = int(float(result[0]))
-            else:
-                symbol_open = None
-        else:
-            symbol_open = None
-    except Exception as e:
-        symbol_open = None
-    
-    # Get current momentum from API and format it correctly for database
-    momentum_for_db = 0
-    try:
-        momentum_data = get_momentum_data_from_postgresql()
-        momentum_score = momentum_data.get('weighted_momentum_score', 0)
-        
-        if momentum_score != 0:
-            momentum_for_db = round(momentum_score * 100)
-        else:
-            momentum_for_db = 0
-    except Exception as e:
-        momentum_for_db = 0
-    
+    The price/momentum lookup and the insert run as one transaction on a
+    pooled connection.
+    """
     contract_name = truncate_contract_name(trade.get('contract'))
-    
-    # Write to PostgreSQL only
+
     try:
-        pg_conn = get_postgresql_connection()
-        if pg_conn:
-            with pg_conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO users.trades_0001 (
-                        status, date, time, symbol, market, trade_strategy,
-                        contract, strike, side, prob, diff, buy_price, position,
-                        sell_price, closed_at, fees, pnl, symbol_open, symbol_close,
-                        momentum, volatility, win_loss, ticker, ticket_id, market_id,
-                        momentum_delta, entry_method, close_method
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (
-                    trade.get('status', 'pending'), trade['date'], trade['time'], 
-                    trade.get('symbol', 'BTC'), trade.get('market', 'Kalshi'), trade.get('trade_strategy', 'Hourly HTC'),
-                    contract_name, trade['strike'], trade['side'], trade.get('prob'),
-                    trade.get('diff'), trade['buy_price'], trade['position'], None, None,
-                    None, None, symbol_open, None, momentum_for_db, trade.get('volatility'),
-                    None, trade.get('ticker'), trade.get('ticket_id'), trade.get('market_id', 'BTC-USD'),
-                    trade.get('momentum_delta'), trade.get('entry_method', 'manual'), trade.get('close_method')
-                ))
-                last_id = cursor.fetchone()[0]
-                pg_conn.commit()
-                print(f"💾 Trade written to PostgreSQL users.trades_0001 with ID {last_id}")
-            pg_conn.close()
-        else:
-            print(f"⚠️ Skipping PostgreSQL write - no connection available")
-            return None
+        with time_db_query("trade_manager.insert_trade"), pooled_transaction() as cursor:
+            # Current BTC price and momentum come from the same live_data row
+            cursor.execute("SELECT price, momentum FROM live_data.live_price_log_1s_btc ORDER BY timestamp DESC LIMIT 1")
+            result = cursor.fetchone()
+            symbol_open = int(float(result[0])) if result and result[0] is not None else None
+            momentum_score = float(result[1]) if result and result[1] is not None else 0
+            momentum_for_db = round(momentum_score * 100) if momentum_score != 0 else 0
+
+            cursor.execute("""
+                INSERT INTO users.trades_0001 (
+                    status, date, time, symbol, market, trade_strategy,
+                    contract, strike, side, prob, diff, buy_price, position,
+                    sell_price, closed_at, fees, pnl, symbol_open, symbol_close,
+                    momentum, volatility, win_loss, ticker, ticket_id, market_id,
+                    momentum_delta, entry_method, close_method
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
+                trade.get('status', 'pending'), trade['date'], trade['time'], 
+                trade.get('symbol', 'BTC'), trade.get('market', 'Kalshi'), trade.get('trade_strategy', 'Hourly HTC'),
+                contract_name, trade['strike'], trade['side'], trade.get('prob'),
+                trade.get('diff'), trade['buy_price'], trade['position'], None, None,
+                None, None, symbol_open, None, momentum_for_db, trade.get('volatility'),
+                None, trade.get('ticker'), trade.get('ticket_id'), trade.get('market_id', 'BTC-USD'),
+                trade.get('momentum_delta'), trade.get('entry_method', 'manual'), trade.get('close_method')
+            ))
+            last_id = cursor.fetchone()[0]
+        print(f"💾 Trade written to PostgreSQL users.trades_0001 with ID {last_id}")
     except Exception as pg_err:
         print(f"❌ Failed to write trade to PostgreSQL: {pg_err}")
         return None
     
-    notify_frontend_trade_change()
+    submit_followup(notify_frontend_trade_change)
     return last_id
 
+def mark_trade_closing(ticker, symbol_close, close_method):
+    """Mark a trade as closing and check it against the positions table.
+
+    The lookup, update and position check run as one transaction on a pooled
+    connection. Returns the trade id, or None if no trade matches the ticker.
+    """
+    with time_db_query("trade_manager.mark_trade_closing"), pooled_transaction() as cursor:
+        cursor.execute("""
+            UPDATE users.trades_0001 SET status = 'closing', symbol_close = %s, close_method = %s
+            WHERE ticker = %s
+            RETURNING id, position
+        """, (symbol_close, close_method, ticker))
+        trade_rows = cursor.fetchall()
+        if not trade_rows:
+            return None
+        print(f"💾 Manual close trade also marked as 'closing' in PostgreSQL users.trades_0001")
+
+        cursor.execute("SELECT position FROM users.positions_0001 WHERE ticker = %s", (ticker,))
+        row = cursor.fetchone()
+
+    trade_id, trade_position = trade_rows[0]
+    if row:
+        if trade_position is not None and abs(trade_position) == abs(row[0]):
+            log(f"CLOSE POSITION CONFIRMED: {ticker}")
+        else:
+            log(f"CLOSE CHECK MISMATCH")
+    else:
+        log(f"NO MATCHING ENTRY IN POSITIONS TABLE")
+    return trade_id
+
 def confirm_open_trade(id: int, ticket_id: str) -> None:
     """Confirms a PENDING trade has been opened in the market account"""
     # Get initial trade info
@@ -533,7 +641,9 @@ def log(msg):
     timestamp = datetime.now(ZoneInfo("America/New_York")).strftime("%H:%M:%S")
     print(f"[TRADE_MANAGER {timestamp}] {msg}", flush=True)
 
-from backend.util.trade_logger import log_trade_event
+from backend.util.trade_logger import log_trade_event, flush_trade_logs
+from backend.util.trade_query import build_trades_query, clamp_limit, ensure_trade_query_schema
+from backend.util.trade_stats import CLOSED_TRADE_COLUMNS, ensure_trade_stats_schema, forget_trades, record_closed_trades
 
 def log_event(ticket_id, message):
     """Log trade events to PostgreSQL instead of text files"""
@@ -761,6 +871,12 @@ def init_trades_db():
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_0001_ticker ON users.positions_0001(ticker)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_btc_price_log_timestamp ON live_data.btc_price_log(timestamp)")
             
+            # Composite keyset indexes and row versions for paginated/incremental trade queries
+            ensure_trade_query_schema(cursor)
+            
+            # P&L aggregates, maintained as trades close
+            ensure_trade_stats_schema(cursor)
+            
             pg_conn.commit()
             print("✅ PostgreSQL database structure initialized successfully")
             
@@ -820,16 +936,18 @@ def update_trade_status(trade_id, status, closed_at=None, sell_price=None, symbo
             with pg_conn.cursor() as cursor:
                 # First try to update by ID
                 if status == 'closed':
-                    cursor.execute("""
+                    cursor.execute(f"""
                         UPDATE users.trades_0001 
                         SET status = %s, closed_at = %s, sell_price = %s, symbol_close = %s, win_loss = %s, pnl = %s, close_method = %s 
                         WHERE id = %s
+                        RETURNING {CLOSED_TRADE_COLUMNS}
                     """, (status, closed_at, sell_price, symbol_close, win_loss, calculated_pnl, close_method, trade_id))
                 else:
                     cursor.execute("""
                         UPDATE users.trades_0001 
                         SET status = %s 
                         WHERE id = %s
+                        RETURNING id
                     """, (status, trade_id))
                 
                 # If no rows were updated, try to find by ticker
@@ -846,16 +964,18 @@ def update_trade_status(trade_id, status, closed_at=None, sell_price=None, symbo
                     if ticker_row and ticker_row[0]:
                         ticker = ticker_row[0]
                         if status == 'closed':
-                            cursor.execute("""
+                            cursor.execute(f"""
                                 UPDATE users.trades_0001 
                                 SET status = %s, closed_at = %s, sell_price = %s, symbol_close = %s, win_loss = %s, pnl = %s, close_method = %s 
                                 WHERE ticker = %s
+                                RETURNING {CLOSED_TRADE_COLUMNS}
                             """, (status, closed_at, sell_price, symbol_close, win_loss, calculated_pnl, close_method, ticker))
                         else:
                             cursor.execute("""
                                 UPDATE users.trades_0001 
                                 SET status = %s 
                                 WHERE ticker = %s
+                                RETURNING id
                             """, (status, ticker))
                         
                         if cursor.rowcount > 0:
@@ -867,6 +987,13 @@ def update_trade_status(trade_id, status, closed_at=None, sell_price=None, symbo
                 else:
                     print(f"💾 Trade status update written to PostgreSQL users.trades_0001")
                 
+                # Keep the P&L aggregates in step with the trades this update touched
+                updated_rows = cursor.fetchall()
+                if status == 'closed':
+                    record_closed_trades(cursor, updated_rows)
+                else:
+                    forget_trades(cursor, [row[0] for row in updated_rows])
+                
                 pg_conn.commit()
                 pg_conn.close()
         else:
@@ -904,15 +1031,23 @@ async def get_ports():
     return get_port_info()
 
 @router.get("/trades")
-def get_trades(status: str = None, recent_hours: int = None):
-    """Get trades with optional filtering by status"""
+def get_trades(status: str = None, recent_hours: int = None, since_id: int = None, before_id: int = None,
+               limit: int = None):
+    """Get trades with optional filtering by status; since_id, before_id or limit return one keyset page"""
     pg_conn = get_postgresql_connection()
     if not pg_conn:
         return []
     
     try:
         with pg_conn.cursor() as cursor:
-            if status == "open":
+            if since_id is not None or before_id is not None or limit is not None:
+                query, params = build_trades_query(since_id=since_id, before_id=before_id, status=status,
+                                                   limit=clamp_limit(limit))
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                columns = [desc[0] for desc in cursor.description]
+                result = [dict(zip(columns, row)) for row in rows]
+            elif status == "open":
                 cursor.execute("SELECT id, date, time, strike, side, buy_price, position, status, contract FROM users.trades_0001 WHERE status = 'open'")
                 rows = cursor.fetchall()
                 result = [dict(zip(["id","date","time","strike","side","buy_price","position","status","contract"], row)) for row in rows]
@@ -947,9 +1082,15 @@ def get_trades(status: str = None, recent_hours: int = None):
 
 @router.post("/trades", status_code=status.HTTP_201_CREATED)
 async def add_trade(request: Request):
-    """Create a new trade - handles both open and close intents"""
+    """Create a new trade - handles both open and close intents.
+
+    The executor call is awaited on a shared async HTTP session and database
+    work runs on a pooled connection in a worker thread, so concurrent tickets
+    do not serialize behind each other on the event loop.
+    """
     data = await request.json()
     intent = data.get("intent", "open").lower()
+    trace = trade_trace.stamp(data.get("trace"), "manager_received")
     
     if intent == "close":
         log(f"CLOSE TICKET RECEIVED")
@@ -957,8 +1098,6 @@ async def add_trade(request: Request):
         if ticker:
             # IMMEDIATELY send to executor FIRST
             try:
-                import requests
-                executor_port = get_executor_port()
                 log(f"SENDING CLOSE TO EXECUTOR")
                 close_payload = {
                     "ticker": ticker,
@@ -971,75 +1110,25 @@ async def add_trade(request: Request):
                     "symbol_close": None,
                     "intent": "close"
                 }
-                response = requests.post(f"http://localhost:{executor_port}/trigger_trade", json=close_payload, timeout=5)
-                log(f"EXECUTOR RESPONSE: {response.status_code}")
+                if trace is not None:
+                    close_payload["trace"] = trade_trace.stamp(trace, "executor_sent")
+                response_status = await send_to_executor(close_payload)
+                log(f"EXECUTOR RESPONSE: {response_status}")
             except Exception as e:
                 log(f"CLOSE EXECUTOR ERROR: {e}")
             
-            # Get trade_id for notifications
-            pg_conn = get_postgresql_connection()
-            if pg_conn:
-                with pg_conn.cursor() as cursor:
-                    cursor.execute("SELECT id FROM users.trades_0001 WHERE ticker = %s", (ticker,))
-                    row = cursor.fetchone()
-            else:
-                row = None
+            # Mark the trade closing and check positions in one transaction
+            symbol_close = None
+            close_method = data.get("close_method", "manual")
+            try:
+                trade_id = await asyncio.to_thread(mark_trade_closing, ticker, symbol_close, close_method)
+            except Exception as pg_err:
+                print(f"❌ Failed to update manual close trade in PostgreSQL: {pg_err}")
+                trade_id = None
             
-            if row:
-                trade_id = row[0]
-                # Update database status
-                symbol_close = None
-                sell_price = data.get("buy_price")
-                close_method = data.get("close_method", "manual")
-                
-                # Update PostgreSQL
-                try:
-                    pg_conn_update = get_postgresql_connection()
-                    if pg_conn_update:
-                        with pg_conn_update.cursor() as cursor:
-                            cursor.execute("UPDATE users.trades_0001 SET status = 'closing', symbol_close = %s, close_method = %s WHERE ticker = %s", (symbol_close, close_method, ticker))
-                            pg_conn_update.commit()
-                            print(f"💾 Manual close trade also marked as 'closing' in PostgreSQL users.trades_0001")
-                        pg_conn_update.close()
-                    else:
-                        print(f"⚠️ Skipping PostgreSQL manual close update - no connection available")
-                except Exception as pg_err:
-                    print(f"❌ Failed to update manual close trade in PostgreSQL: {pg_err}")
-                
+            if trade_id is not None:
                 # Notify active trade supervisor
-                notify_active_trade_supervisor_direct(trade_id, data.get('ticket_id'), "closing")
-                
-                # Check positions
-                try:
-                    mode = get_account_mode()
-                    pg_conn = get_postgresql_connection()
-                    
-                    if pg_conn:
-                        with pg_conn.cursor() as cursor_pos:
-                            cursor_pos.execute("SELECT position FROM users.positions_0001 WHERE ticker = %s", (ticker,))
-                            row = cursor_pos.fetchone()
-
-                        if row:
-                            pos_db = abs(row[0])
-                            pg_conn_trade = get_postgresql_connection()
-                            if pg_conn_trade:
-                                with pg_conn_trade.cursor() as cursor:
-                                    cursor.execute("SELECT position FROM users.trades_0001 WHERE ticker = %s", (ticker,))
-                                    trade_row = cursor.fetchone()
-                            else:
-                                trade_row = None
-
-                            if trade_row and abs(trade_row[0]) == pos_db:
-                                log(f"CLOSE POSITION CONFIRMED: {ticker}")
-                            else:
-                                log(f"CLOSE CHECK MISMATCH")
-                        else:
-                            log(f"NO MATCHING ENTRY IN POSITIONS TABLE")
-                    else:
-                        log(f"CANNOT CONNECT TO POSTGRESQL POSITIONS TABLE")
-                except Exception as e:
-                    log(f"CLOSE CHECK ERROR: {e}")
-
+                submit_followup(notify_active_trade_supervisor_direct, trade_id, data.get('ticket_id'), "closing")
                 log(f"CLOSE TICKET SENT - WAITING FOR CONFIRMATION")
             else:
                 log(f"COULD NOT FIND TRADE ID FOR TICKER")
@@ -1057,25 +1146,24 @@ async def add_trade(request: Request):
 
     # IMMEDIATELY send to executor first
     try:
-        import requests
-        executor_port = get_executor_port()
         log(f"SENDING TO EXECUTOR")
-        response = requests.post(f"http://localhost:{executor_port}/trigger_trade", json=data, timeout=5)
-        log(f"EXECUTOR RESPONSE: {response.status_code}")
+        trade_trace.stamp(trace, "executor_sent")
+        response_status = await send_to_executor(data)
+        log(f"EXECUTOR RESPONSE: {response_status}")
     except Exception as e:
         log(f"EXECUTOR ERROR: {e}")
-        log_event(data["ticket_id"], f"EXECUTOR ERROR: {e}")
+        submit_followup(log_event, data["ticket_id"], f"EXECUTOR ERROR: {e}")
 
     # Log immediately after executor call, before heavy database operations
     log(f"TRADE SENT TO EXECUTOR - PROCESSING DATABASE")
 
     # Ensure the trade is inserted with 'pending' status
     data['status'] = 'pending'
-    trade_id = insert_trade(data)
-    log_event(data["ticket_id"], "MANAGER: SENT TO EXECUTOR — CONFIRMED")
+    trade_id = await asyncio.to_thread(insert_trade, data)
+    submit_followup(log_event, data["ticket_id"], "MANAGER: SENT TO EXECUTOR — CONFIRMED")
     
     # Notify active trade supervisor about the new pending trade
-    notify_active_trade_supervisor_direct(trade_id, data["ticket_id"], "pending")
+    submit_followup(notify_active_trade_supervisor_direct, trade_id, data["ticket_id"], "pending")
 
     return {"id": trade_id}
 
@@ -1181,7 +1269,7 @@ async def positions_updated_api(request: Request):
             if pending_trades:
                 log(f"[🔔 POSITIONS UPDATED] Found {len(pending_trades)} pending trades to confirm")
                 for id, ticket_id in pending_trades:
-                    threading.Thread(target=confirm_open_trade, args=(id, ticket_id), daemon=True).start()
+                    submit_followup(confirm_open_trade, id, ticket_id, key=("confirm_open", id))
         
         # Handle closing trades (only when fills database is updated)
         if db_name == "fills":
@@ -1219,8 +1307,8 @@ async def manual_expiration_check():
     try:
         log("[MANUAL] Manual expiration check triggered")
         
-        # Run the expiration check in a separate thread to avoid blocking
-        threading.Thread(target=check_expired_trades, daemon=True).start()
+        # Run the expiration check on the follow-up pool to avoid blocking
+        submit_followup(check_expired_trades, key="check_expired_trades")
         
         return {"message": "Manual expiration check triggered"}
     except Exception as e:
@@ -1246,8 +1334,8 @@ async def manual_settlement_poll():
             expired_tickers = [trade[0] for trade in expired_trades]
             log(f"[MANUAL] Found {len(expired_tickers)} expired trades to poll settlements for")
             
-            # Run settlement polling in a separate thread
-            threading.Thread(target=poll_settlements_for_matches, args=(expired_tickers,), daemon=True).start()
+            # Run settlement polling on the follow-up pool
+            submit_followup(poll_settlements_for_matches, expired_tickers, key="poll_settlements")
             
             return {"message": f"Manual settlement polling triggered for {len(expired_tickers)} expired trades"}
         else:
@@ -1420,14 +1508,16 @@ def poll_settlements_for_matches(expired_tickers):
                         pg_conn = get_postgresql_connection()
                         if pg_conn:
                             with pg_conn.cursor() as cursor:
-                                cursor.execute("""
+                                cursor.execute(f"""
                                     UPDATE users.trades_0001 
                                     SET status = 'closed',
                                         sell_price = %s,
                                         win_loss = %s,
                                         pnl = %s
                                     WHERE ticker = %s AND status = 'expired'
+                                    RETURNING {CLOSED_TRADE_COLUMNS}
                                 """, (sell_price, 'W' if sell_price > 0 else 'L', pnl, ticker))
+                                record_closed_trades(cursor, cursor.fetchall())
                                 pg_conn.commit()
                                 print(f"💾 Settlement trade update also written to PostgreSQL users.trades_0001")
                             pg_conn.close()
@@ -1471,10 +1561,16 @@ async def lifespan(app: FastAPI):
         _scheduler.shutdown()
     except Exception as e:
         pass
+    if _executor_session is not None and not _executor_session.closed:
+        await _executor_session.close()
+    _followup_pool.shutdown(wait=False, cancel_futures=True)
+    flush_trade_logs()
+    close_postgresql_pool()
 
 app = FastAPI(lifespan=lifespan)
 
 app.include_router(router)
+mount_fastapi_metrics(app)
 
 if __name__ == "__main__":
     import uvicorn
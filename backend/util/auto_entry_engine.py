@@ -0,0 +1,375 @@
+"""
+Event-driven auto entry decision engine.
+
+strike_table_generator publishes every new watchlist on a PostgreSQL NOTIFY
+channel right after the transaction that writes it commits. NotificationListener
+LISTENs on that channel and hands each ladder to the auto entry supervisor, and evaluate_watchlist picks the strikes that meet the entry
+thresholds using only in-memory data. TradedStrikeIndex answers "already
+traded?" and cooldown checks without touching the database.
+"""
+
+import json
+import select
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg2
+
+from backend.util.trade_query import TRADES_CHANNEL
+
+# NOTIFY payloads are limited to 8000 bytes; leave room for the header
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+# Trade statuses that block another entry on the same ticker/side
+ACTIVE_TRADE_STATUSES = ("open", "pending")
+
+# How long a trade this process has sent, but not yet seen persisted, blocks re-entry.
+# Covers the trade_manager POST timeout plus the trades_0001 notification.
+PENDING_TRADE_TTL_SECONDS = 30
+
+
+def get_watchlist_channel(symbol: str) -> str:
+    """Get the NOTIFY channel a symbol's watchlist is published on."""
+    return f"watchlist_{symbol.lower()}"
+
+
+def build_watchlist_notification(header: Dict[str, Any], strikes: List[Dict[str, Any]]) -> str:
+    """
+    Build the JSON payload published with each new watchlist.
+
+    If the strikes do not fit in a NOTIFY payload they are left out and
+    "strikes" is null, which tells listeners to read the watchlist table.
+
+    Args:
+        header: Ladder header (current_price, ttc, event_ticker, market_title...)
+        strikes: Watchlist strike dicts
+
+    Returns:
+        JSON payload string
+    """
+    payload = dict(header)
+    payload["published_at"] = time.time()
+    payload["strikes"] = strikes
+    encoded = json.dumps(payload, separators=(",", ":"), default=float)
+    if len(encoded.encode()) > MAX_NOTIFY_PAYLOAD_BYTES:
+        payload["strikes"] = None
+        encoded = json.dumps(payload, separators=(",", ":"), default=float)
+    return encoded
+
+
+def evaluate_watchlist(watchlist: Dict[str, Any], min_probability: float,
+                       min_differential: Optional[float]) -> List[Dict[str, Any]]:
+    """
+    Select the watchlist strikes that meet the auto entry thresholds.
+
+    Applies the same per-strike rules as the original polling loop: the
+    active side's probability must reach min_probability and its differential
+    must be within 0.5 of min_differential.
+
+    Args:
+        watchlist: Watchlist dict with a "strikes" list
+        min_probability: Minimum probability for the active side
+        min_differential: Minimum differential, or None to skip the check
+
+    Returns:
+        Candidate dicts with strike_key, strike, side, ticker, buy_price and probability
+    """
+    candidates = []
+    seen = set()
+    for strike in watchlist.get("strikes") or []:
+        active_side = strike.get("active_side")
+        if active_side not in ("yes", "no"):
+            continue
+
+        strike_key = f"{strike.get('strike')}-{active_side}"
+        if strike_key in seen:
+            continue
+        seen.add(strike_key)
+
+        prob = strike.get("probability")
+        if prob is None or prob < min_probability:
+            continue
+
+        if min_differential is not None:
+            diff = strike.get("yes_diff") if active_side == "yes" else strike.get("no_diff")
+            if diff is None or diff < (min_differential - 0.5):
+                continue
+
+        ask = strike.get("yes_ask") if active_side == "yes" else strike.get("no_ask")
+        candidates.append({
+            "strike_key": strike_key,
+            "strike": strike.get("strike"),
+            "side": active_side,
+            "ticker": strike.get("ticker"),
+            "buy_price": (ask or 0) / 100.0,  # Convert cents to decimal
+            "probability": prob
+        })
+    return candidates
+
+
+def normalize_side(side: Any) -> str:
+    """Normalize a trade side (Y/N/yes/no) to 'YES' or 'NO'."""
+    side = str(side or "").strip().upper()
+    if side == "Y":
+        return "YES"
+    if side == "N":
+        return "NO"
+    return side
+
+
+def get_event_ticker(ticker: str) -> str:
+    """Get the event ticker a market ticker belongs to (KXBTCD-25AUG1515-T118499.99 -> KXBTCD-25AUG1515)."""
+    return ticker.rsplit("-", 1)[0] if ticker and "-" in ticker else (ticker or "")
+
+
+class TradedStrikeIndex:
+    """
+    In-memory index of open/pending trades and strike cooldowns.
+
+    Trades are grouped by event ticker so a whole ladder can be checked with
+    set lookups. The index is warmed from users.trades_0001 and then kept
+    current from trade events (NOTIFY payloads and trades this process
+    triggers itself). Until it has been warmed, ``ready`` is False and callers
+    should fall back to the database.
+
+    Trades this process sends before their row exists are held as pending
+    placeholders. The trade's first notification replaces its placeholder,
+    a failed send clears it, and otherwise it expires after pending_ttl_seconds
+    so a trade that was never inserted cannot block its strike for good.
+    """
+
+    def __init__(self, cooldown_seconds: float, clock: Callable[[], float] = time.monotonic,
+                 pending_ttl_seconds: float = PENDING_TRADE_TTL_SECONDS):
+        self.cooldown_seconds = cooldown_seconds
+        self.pending_ttl_seconds = pending_ttl_seconds
+        # Injectable so replays can run cooldowns on simulated time
+        self.clock = clock
+        self.ready = False
+        self._lock = threading.Lock()
+        # event_ticker -> {(ticker, side)}
+        self._active_by_event = {}
+        # trade id -> (ticker, side) for trades currently counted as active
+        self._active_trades = {}
+        # strike_key -> clock time the cooldown started
+        self._cooldowns = {}
+        # (ticker, side) -> clock time a not yet persisted trade was sent
+        self._pending = {}
+
+    def warm(self, trades: List[tuple]):
+        """
+        Replace the index contents with the given active trades.
+
+        Args:
+            trades: (id, ticker, side) rows for open/pending trades
+        """
+        with self._lock:
+            self._active_by_event = {}
+            self._active_trades = {}
+            for trade_id, ticker, side in trades:
+                self._add(trade_id, ticker, side)
+            self.ready = True
+
+    def invalidate(self):
+        """Mark the index stale, e.g. while the trade event feed is disconnected."""
+        with self._lock:
+            self.ready = False
+
+    def apply_trade_event(self, trade_id: Any, ticker: str, side: Any, status: Optional[str]):
+        """
+        Apply one trade insert/update/delete.
+
+        Args:
+            trade_id: Trade id, or None for trades not yet persisted
+                (recorded as a pending placeholder, see mark_pending)
+            ticker: Market ticker
+            side: Trade side
+            status: New trade status, or None if the trade was deleted
+        """
+        if trade_id is None:
+            if status in ACTIVE_TRADE_STATUSES:
+                self.mark_pending(ticker, side)
+            return
+        with self._lock:
+            self._pending.pop((ticker, normalize_side(side)), None)
+            self._remove(trade_id)
+            if status in ACTIVE_TRADE_STATUSES:
+                self._add(trade_id, ticker, side)
+
+    def mark_pending(self, ticker: str, side: Any):
+        """Block a ticker/side while a trade sent for it has not been persisted yet."""
+        if not ticker:
+            return
+        with self._lock:
+            self._pending[(ticker, normalize_side(side))] = self.clock()
+
+    def clear_pending(self, ticker: str, side: Any):
+        """Drop a pending placeholder, e.g. after trade_manager rejected the trade."""
+        with self._lock:
+            self._pending.pop((ticker, normalize_side(side)), None)
+
+    def _expire_pending(self):
+        now = self.clock()
+        expired = [key for key, sent in self._pending.items() if now - sent >= self.pending_ttl_seconds]
+        for key in expired:
+            del self._pending[key]
+
+    def is_traded(self, ticker: str, side: Any) -> bool:
+        """Check whether an open or pending trade exists on this ticker/side."""
+        key = (ticker, normalize_side(side))
+        with self._lock:
+            self._expire_pending()
+            return key in self._pending or key in self._active_by_event.get(get_event_ticker(ticker), ())
+
+    def active_for_event(self, event_ticker: str) -> set:
+        """Get the (ticker, side) pairs with open/pending trades in an event."""
+        with self._lock:
+            self._expire_pending()
+            active = set(self._active_by_event.get(event_ticker, ()))
+            active.update(key for key in self._pending if get_event_ticker(key[0]) == event_ticker)
+            return active
+
+    def try_start_cooldown(self, strike_key: str) -> bool:
+        """
+        ATOMIC: start a cooldown for strike_key unless one is already running.
+
+        Returns:
+            True if the strike may be traded (and is now in cooldown)
+        """
+        now = self.clock()
+        with self._lock:
+            started = self._cooldowns.get(strike_key)
+            if started is not None and now - started < self.cooldown_seconds:
+                return False
+            self._cooldowns[strike_key] = now
+            return True
+
+    def release_cooldown(self, strike_key: str):
+        """Clear a cooldown, e.g. after a failed trade attempt."""
+        with self._lock:
+            self._cooldowns.pop(strike_key, None)
+
+    def prune_cooldowns(self) -> int:
+        """Drop expired cooldowns and return how many were removed."""
+        now = self.clock()
+        with self._lock:
+            expired = [k for k, started in self._cooldowns.items() if now - started >= self.cooldown_seconds]
+            for key in expired:
+                del self._cooldowns[key]
+        return len(expired)
+
+    def cooldown_count(self) -> int:
+        with self._lock:
+            return len(self._cooldowns)
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(len(pairs) for pairs in self._active_by_event.values())
+
+    def _add(self, trade_id, ticker, side):
+        if not ticker:
+            return
+        key = (ticker, normalize_side(side))
+        self._active_by_event.setdefault(get_event_ticker(ticker), set()).add(key)
+        if trade_id is not None:
+            self._active_trades[trade_id] = key
+
+    def _remove(self, trade_id):
+        key = self._active_trades.pop(trade_id, None) if trade_id is not None else None
+        if key is None:
+            return
+        # Another active trade may hold the same ticker/side
+        if key in self._active_trades.values():
+            return
+        event = get_event_ticker(key[0])
+        pairs = self._active_by_event.get(event)
+        if pairs is not None:
+            pairs.discard(key)
+            if not pairs:
+                del self._active_by_event[event]
+
+
+class NotificationListener(threading.Thread):
+    """
+    Background thread that LISTENs on one or more NOTIFY channels.
+
+    Each notification payload is JSON-decoded and passed to the callback
+    registered for its channel. When several notifications for a channel
+    arrive together only the newest is delivered unless the channel is
+    registered with deliver_all. The connection is re-established after errors
+    so a database restart does not silently stop auto entry; on_connect runs
+    after every successful LISTEN (e.g. to re-warm caches) and on_disconnect
+    whenever the connection is lost.
+    """
+
+    def __init__(self, name: str, db_config: Dict[str, Any],
+                 channels: Dict[str, Callable[[Dict[str, Any]], None]],
+                 deliver_all: tuple = (),
+                 on_connect: Optional[Callable[[Any], None]] = None,
+                 on_disconnect: Optional[Callable[[], None]] = None,
+                 log: Callable[[str], None] = print, reconnect_delay: float = 5.0):
+        super().__init__(daemon=True, name=name)
+        self.db_config = db_config
+        self.channels = dict(channels)
+        self.deliver_all = set(deliver_all)
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.log = log
+        self.reconnect_delay = reconnect_delay
+        self.connected = False
+        self.last_notification_at = {}
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.db_config)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    for channel in self.channels:
+                        cursor.execute(f"LISTEN {channel}")
+                # LISTEN first so nothing committed during on_connect is missed
+                if self.on_connect:
+                    self.on_connect(conn)
+                self.connected = True
+                self.log(f"[AUTO ENTRY ENGINE] 👂 Listening on {', '.join(self.channels)}")
+
+                while not self._stop_event.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    self._dispatch(conn.notifies)
+                    conn.notifies.clear()
+            except Exception as e:
+                self.log(f"[AUTO ENTRY ENGINE] ❌ Listener error on {', '.join(self.channels)}: {e}")
+            finally:
+                self.connected = False
+                if self.on_disconnect:
+                    self.on_disconnect()
+                if conn:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            self._stop_event.wait(self.reconnect_delay)
+
+    def _dispatch(self, notifies):
+        latest = {}
+        ordered = []
+        for notify in notifies:
+            if notify.channel in self.deliver_all:
+                ordered.append(notify)
+            else:
+                latest[notify.channel] = notify
+        for notify in ordered + list(latest.values()):
+            self.last_notification_at[notify.channel] = time.time()
+            try:
+                payload = json.loads(notify.payload)
+            except ValueError as e:
+                self.log(f"[AUTO ENTRY ENGINE] ⚠️ Invalid payload on {notify.channel}: {e}")
+                continue
+            self.channels[notify.channel](payload)
@@ -0,0 +1,165 @@
+"""
+Auto stop decision rules for open trades.
+
+active_trade_supervisor's monitoring loop runs these once per second against
+the active trades it has just refreshed; the replay engine runs the same
+functions against simulated positions. Decisions depend only on the trades,
+the settings, the caller's clock and AutoStopState, so they behave the same
+live and in replay.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class AutoStopSettings:
+    """Auto stop settings as stored in users.auto_trade_settings_0001."""
+    enabled: bool = True
+    threshold: float = 40
+    min_ttc_seconds: float = 0
+    verification_enabled: bool = False
+    verification_seconds: float = 0
+    momentum_spike_enabled: bool = True
+    momentum_spike_threshold: float = 0.35  # Decimal, compared with the momentum score
+
+
+class AutoStopState:
+    """Trades already stopped and trades waiting out their verification period."""
+
+    def __init__(self):
+        self.triggered = set()
+        # trade_id -> (trigger_time, verification_end_time)
+        self.verification_pending: Dict[Any, Tuple[float, float]] = {}
+
+
+def _noop(message: str):
+    pass
+
+
+def trade_probability(probability: Optional[float], side: str, strike: float, symbol_price: float) -> Optional[float]:
+    """
+    Probability that an open trade finishes in the money.
+
+    The strike table probability is for the price staying on its current
+    side of the strike, so it is flipped once the price has crossed the
+    strike against the trade.
+    """
+    if probability is None:
+        return None
+    raw_buffer = symbol_price - strike
+    buffer_from_strike = raw_buffer if str(side).upper() in ("Y", "YES") else -raw_buffer
+    return 100 - probability if buffer_from_strike < 0 else probability
+
+
+def _below_threshold(trade: Dict[str, Any], threshold: float) -> bool:
+    prob = trade.get('current_probability')
+    return (
+        prob is not None and
+        isinstance(prob, (int, float)) and
+        prob < threshold and
+        trade.get('status') == 'active'
+    )
+
+
+def evaluate_probability_stops(trades: List[Dict[str, Any]], settings: AutoStopSettings, state: AutoStopState,
+                               now: float, log: Callable[[str], None] = _noop) -> List[Dict[str, Any]]:
+    """
+    Decide which trades to stop because their probability fell below the threshold.
+
+    A trade must have been open at least min_ttc_seconds. With verification
+    enabled, the first breach only starts a verification period and the trade
+    is stopped if it is still below the threshold when the period ends.
+
+    Args:
+        trades: Active trade dicts with trade_id, current_probability,
+            time_since_entry and status
+        settings: Auto stop settings
+        state: State carried between calls
+        now: Current time in seconds (wall clock live, simulated in replay)
+        log: Callback for decision log lines
+
+    Returns:
+        Trades to close; they are also recorded in state.triggered
+    """
+    to_close = []
+    if not settings.enabled:
+        return to_close
+    threshold = settings.threshold
+
+    for trade in trades:
+        prob = trade.get('current_probability')
+        trade_id = trade.get('trade_id')
+        ttc_seconds = trade.get('time_since_entry')
+
+        # Check if trade is in verification period
+        if trade_id in state.verification_pending:
+            trigger_time, verification_end_time = state.verification_pending[trade_id]
+
+            if now >= verification_end_time:
+                if _below_threshold(trade, threshold):
+                    # Conditions still met after verification - trigger auto-stop
+                    log(f"[AUTO STOP] ✅ Verification period ended - triggering auto stop for trade {trade_id} (prob={prob}, verification_duration={settings.verification_seconds}s)")
+                    to_close.append(trade)
+                    state.triggered.add(trade_id)
+                else:
+                    log(f"[AUTO STOP] ❌ Verification period ended - conditions no longer met for trade {trade_id} (prob={prob}, threshold={threshold})")
+                del state.verification_pending[trade_id]
+            else:
+                # Still in verification period - just wait, don't check conditions during wait
+                continue
+
+        if not _below_threshold(trade, threshold) or trade_id in state.triggered:
+            continue
+
+        if ttc_seconds is not None and ttc_seconds >= settings.min_ttc_seconds:
+            if settings.verification_enabled:
+                state.verification_pending[trade_id] = (now, now + settings.verification_seconds)
+                log(f"[AUTO STOP] 🔍 Starting verification period for trade {trade_id} (prob={prob}, threshold={threshold}, verification_duration={settings.verification_seconds}s)")
+            else:
+                log(f"[AUTO STOP] Triggering auto stop for trade {trade_id} (prob={prob}, ttc={ttc_seconds}s, min_ttc={settings.min_ttc_seconds}s)")
+                to_close.append(trade)
+                state.triggered.add(trade_id)
+        else:
+            log(f"[AUTO STOP] Skipping auto stop for trade {trade_id} - TTC ({ttc_seconds}s) below minimum ({settings.min_ttc_seconds}s)")
+
+    return to_close
+
+
+def evaluate_momentum_spike(trades: List[Dict[str, Any]], current_momentum: Optional[float],
+                            settings: AutoStopSettings, state: AutoStopState,
+                            log: Callable[[str], None] = _noop) -> List[Dict[str, Any]]:
+    """
+    Decide which trades to close because of a momentum spike against them.
+
+    A positive spike closes every active NO trade, a negative spike every
+    active YES trade. Pending verifications for those trades are cancelled.
+    """
+    if not settings.momentum_spike_enabled or current_momentum is None:
+        return []
+    spike_threshold = settings.momentum_spike_threshold
+
+    if current_momentum >= spike_threshold:
+        log(f"[MOMENTUM SPIKE] 🚨 POSITIVE SPIKE DETECTED: {current_momentum:.2f} >= +{spike_threshold}")
+        sides, label = ('N', 'NO'), "NO"
+    elif current_momentum <= -spike_threshold:
+        log(f"[MOMENTUM SPIKE] 🚨 NEGATIVE SPIKE DETECTED: {current_momentum:.2f} <= -{spike_threshold}")
+        sides, label = ('Y', 'YES'), "YES"
+    else:
+        return []
+
+    to_close = []
+    for trade in trades:
+        trade_id = trade.get('trade_id')
+        if (trade.get('status') == 'active' and
+                str(trade.get('side', '')).upper() in sides and
+                trade_id not in state.triggered):
+            log(f"[MOMENTUM SPIKE] Triggering close for {label} trade {trade_id} (momentum: {current_momentum:.2f})")
+            if state.verification_pending.pop(trade_id, None) is not None:
+                log(f"[MOMENTUM SPIKE] Cancelling verification period for trade {trade_id} due to momentum spike")
+            to_close.append(trade)
+            state.triggered.add(trade_id)
+
+    if to_close:
+        log(f"[MOMENTUM SPIKE] ✅ Closed {len(to_close)} {label} trades due to momentum spike")
+    return to_close
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Vectorized backtest engine for 1-minute price/momentum bars.
+
+Signals are evaluated over whole numpy arrays, and "first bar after i where
+X holds" questions are answered with np.searchsorted over the sorted indices
+of bars where X holds, so no Python code runs per bar:
+
+    hits = np.flatnonzero(momentum <= 0)
+    exit_idx = hits[np.searchsorted(hits, entry_idx, side="right")]
+
+Strategies that hold one position at a time loop once per trade (not per
+bar), and each iteration only touches numpy slices of that trade.
+
+Parameter sweeps run in a process pool; the bar arrays are sent to each
+worker once via the pool initializer instead of once per parameter set.
+
+Usage:
+    python backend/util/backtest_engine.py scalp btc_1m_master_5y.csv
+    python backend/util/backtest_engine.py reversals btc_1m_master_5y.csv
+    python backend/util/backtest_engine.py sweep btc_1m_master_5y.csv --entry 10 15 20 25 --stop 0.1 0.2
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.parquet_store import load_frame
+
+NO_INDEX = -1
+
+
+@dataclass
+class Bars:
+    """Column arrays for one backtest; every array has one entry per bar."""
+    timestamp: np.ndarray
+    open: np.ndarray
+    close: np.ndarray
+    momentum: np.ndarray
+    volume: Optional[np.ndarray] = None
+
+    def __len__(self):
+        return len(self.close)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Bars":
+        def column(name):
+            return df[name].to_numpy() if name in df.columns else None
+        close = column("close")
+        return cls(
+            timestamp=column("timestamp") if "timestamp" in df.columns else np.arange(len(df)),
+            open=column("open") if "open" in df.columns else close,
+            close=close if close is not None else column("open"),
+            momentum=df["momentum"].to_numpy(dtype=float),
+            volume=column("volume"),
+        )
+
+    @classmethod
+    def load(cls, path: str, columns: Sequence[str] = ("timestamp", "open", "close", "momentum")) -> "Bars":
+        """Load bars from a CSV file or exported Parquet dataset, reading only the needed columns."""
+        return cls.from_frame(load_frame(path, columns=list(columns)))
+
+
+def next_true_index(mask: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """
+    For each index in after, the first index j > after[k] with mask[j] True.
+
+    Returns NO_INDEX where no such bar exists.
+    """
+    hits = np.flatnonzero(mask)
+    after = np.asarray(after)
+    pos = np.searchsorted(hits, after, side="right")
+    result = np.full(after.shape, NO_INDEX, dtype=np.int64)
+    found = pos < len(hits)
+    result[found] = hits[pos[found]]
+    return result
+
+
+def _first_in_slice(mask_slice: np.ndarray) -> int:
+    hits = np.flatnonzero(mask_slice)
+    return int(hits[0]) if len(hits) else NO_INDEX
+
+
+# ---------- MOMENTUM REVERSALS ---------------------------------------------------------
+
+def momentum_reversal_stats(bars: Bars, low_levels: Iterable[int] = range(-30, -9),
+                            high_levels: Iterable[int] = range(10, 31),
+                            overflow: int = 30) -> pd.DataFrame:
+    """
+    Price change from each momentum reading until momentum first crosses zero.
+
+    Negative levels (and "<-overflow") measure until momentum >= 0, positive
+    levels (and ">+overflow") until momentum <= 0, using open prices.
+    Matches the output of tests/momentum_track_backtester.py.
+    """
+    momentum = bars.momentum
+    price = bars.open.astype(float)
+    up_cross = next_true_index(momentum >= 0, np.arange(len(bars)))
+    down_cross = next_true_index(momentum <= 0, np.arange(len(bars)))
+
+    def stats(label, starts, exits):
+        exits = exits[starts]
+        starts = starts[exits != NO_INDEX]
+        exits = exits[exits != NO_INDEX]
+        if len(starts) == 0:
+            return [label, 0, None, None, None]
+        changes = (price[exits] - price[starts]) / price[starts] * 100
+        return [label, len(changes), float(changes.mean()), float(changes.min()), float(changes.max())]
+
+    rows = [stats(level, np.flatnonzero(momentum == level), up_cross) for level in low_levels]
+    rows += [stats(level, np.flatnonzero(momentum == level), down_cross) for level in high_levels]
+    rows.append(stats(f"<-{overflow}", np.flatnonzero(momentum < -overflow), up_cross))
+    rows.append(stats(f">+{overflow}", np.flatnonzero(momentum > overflow), down_cross))
+    return pd.DataFrame(rows, columns=["momentum_level", "count", "avg_price_change_pct",
+                                       "min_price_change_pct", "max_price_change_pct"])
+
+
+# ---------- MOMENTUM SCALP -------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ScalpParams:
+    """Enter long at momentum >= entry, short at <= -entry; exit on zero cross or stop."""
+    entry_threshold: float = 20
+    stop_pct: float = 0.20
+    notional: float = 10000.0
+
+
+def run_momentum_scalp(bars: Bars, params: ScalpParams = ScalpParams()) -> pd.DataFrame:
+    """
+    Simulate the momentum scalp strategy and return one row per closed trade.
+
+    Same rules as tests/btc_scalp_backtest.py: one position at a time, entries
+    on close, no re-entry on the exit bar, positions still open at the end
+    are not reported.
+    """
+    momentum, price = bars.momentum, bars.close.astype(float)
+    entries = np.flatnonzero((momentum >= params.entry_threshold) | (momentum <= -params.entry_threshold))
+    long_exit = next_true_index(momentum <= 0, entries)
+    short_exit = next_true_index(momentum >= 0, entries)
+
+    trades = []
+    k = 0
+    while k < len(entries):
+        i = int(entries[k])
+        entry_price = price[i]
+        is_long = momentum[i] >= params.entry_threshold
+        exit_idx = int(long_exit[k] if is_long else short_exit[k])
+        stop_end = exit_idx if exit_idx != NO_INDEX else len(price) - 1
+        window = price[i + 1:stop_end + 1]
+        if is_long:
+            stop = _first_in_slice(window <= entry_price * (1 - params.stop_pct))
+        else:
+            stop = _first_in_slice(window >= entry_price * (1 + params.stop_pct))
+        if stop != NO_INDEX:
+            exit_idx = i + 1 + stop
+        if exit_idx == NO_INDEX:
+            break
+        quantity = params.notional / entry_price
+        pnl = (price[exit_idx] - entry_price if is_long else entry_price - price[exit_idx]) * quantity
+        trades.append((bars.timestamp[i], bars.timestamp[exit_idx], "long" if is_long else "short",
+                       entry_price, price[exit_idx], quantity, pnl))
+        k = int(np.searchsorted(entries, exit_idx, side="right"))
+
+    return pd.DataFrame(trades, columns=["entry_time", "exit_time", "side", "entry_price",
+                                         "exit_price", "quantity", "pnl"])
+
+
+def summarize_trades(trades: pd.DataFrame) -> Dict[str, Any]:
+    """Headline numbers for a trade list."""
+    pnl = trades["pnl"].to_numpy() if len(trades) else np.zeros(0)
+    equity = np.cumsum(pnl)
+    drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity if len(pnl) else np.zeros(0)
+    return {
+        "trades": int(len(pnl)),
+        "total_pnl": float(pnl.sum()),
+        "win_rate": float((pnl > 0).mean()) if len(pnl) else None,
+        "avg_pnl": float(pnl.mean()) if len(pnl) else None,
+        "max_drawdown": float(drawdown.max()) if len(pnl) else 0.0,
+    }
+
+
+# ---------- VOLUME ---------------------------------------------------------------------
+
+def volume_by_momentum(bars: Bars) -> pd.DataFrame:
+    """Average volume per rounded momentum level."""
+    levels = np.round(bars.momentum).astype(int)
+    grouped = pd.Series(bars.volume).groupby(levels).mean()
+    return pd.DataFrame({"momentum_level": grouped.index, "average_volume": grouped.to_numpy()})
+
+
+# ---------- PARAMETER SWEEPS -----------------------------------------------------------
+
+_worker_bars: Optional[Bars] = None
+
+
+def _init_sweep_worker(bars: Bars):
+    global _worker_bars
+    _worker_bars = bars
+
+
+def _run_sweep_point(strategy: Callable, params) -> Dict[str, Any]:
+    result = summarize_trades(strategy(_worker_bars, params))
+    return {**asdict(params), **result}
+
+
+def param_grid(base, **values: Sequence[Any]) -> List[Any]:
+    """Every combination of the given field values applied to a params dataclass."""
+    names = list(values)
+    return [replace(base, **dict(zip(names, combo))) for combo in itertools.product(*values.values())]
+
+
+def sweep(bars: Bars, grid: Sequence[Any], strategy: Callable = run_momentum_scalp,
+          max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Run strategy for every params object in grid and summarize each run.
+
+    strategy must be a module-level function (it is pickled to the workers).
+    With max_workers=1 everything runs in this process.
+    """
+    if max_workers is None:
+        max_workers = min(multiprocessing.cpu_count(), len(grid)) or 1
+    if max_workers == 1:
+        _init_sweep_worker(bars)
+        rows = [_run_sweep_point(strategy, params) for params in grid]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_sweep_worker,
+                                 initargs=(bars,)) as pool:
+            rows = list(pool.map(_run_sweep_point, itertools.repeat(strategy), grid))
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized momentum backtests.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name in ("scalp", "reversals", "volume", "sweep"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("path", help="CSV file or exported Parquet dataset")
+        if name == "sweep":
+            sub.add_argument("--entry", nargs="+", type=float, default=[10, 15, 20, 25, 30])
+            sub.add_argument("--stop", nargs="+", type=float, default=[0.05, 0.10, 0.20])
+            sub.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    if args.command == "reversals":
+        print(momentum_reversal_stats(Bars.load(args.path, ("open", "momentum"))).to_string(index=False))
+    elif args.command == "volume":
+        print(volume_by_momentum(Bars.load(args.path, ("close", "volume", "momentum"))).to_string(index=False))
+    elif args.command == "scalp":
+        trades = run_momentum_scalp(Bars.load(args.path, ("timestamp", "close", "momentum")))
+        print(summarize_trades(trades))
+    else:
+        bars = Bars.load(args.path, ("timestamp", "close", "momentum"))
+        grid = param_grid(ScalpParams(), entry_threshold=args.entry, stop_pct=args.stop)
+        results = sweep(bars, grid, max_workers=args.workers)
+        print(results.sort_values("total_pnl", ascending=False).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ import multiprocessing as mp
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from backend.util.probability_calculator import ProbabilityCalculator
+from backend.util.fingerprint_store import load_fingerprint_cubes
 
 class ChunkedMasterTableGenerator:
     def __init__(self, symbol: str = "btc"):
@@ -42,6 +43,9 @@ class ChunkedMasterTableGenerator:
         self.num_chunks = 10
         self.chunk_progress_file = f"chunk_progress_{symbol}.json"
         
+        # analytics.fingerprints, read once per process on first use
+        self._fingerprint_cubes = None
+        
     def calculate_chunk_parameters(self) -> List[Dict]:
         """Calculate the parameters for each of the 10 chunks"""
         total_ttc = self.ttc_range[1] - self.ttc_range[0] + 1  # 901
@@ -120,6 +124,23 @@ class ChunkedMasterTableGenerator:
     
     def load_fingerprint_data(self, momentum_bucket: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """Load fingerprint data for a specific momentum bucket"""
+        if self._fingerprint_cubes is None:
+            conn = psycopg2.connect(**self.db_config)
+            try:
+                self._fingerprint_cubes = load_fingerprint_cubes(conn.cursor(), self.symbol) or False
+            except psycopg2.Error as e:
+                print(f"Long-format fingerprints unavailable, reading per-bucket tables: {e}")
+                self._fingerprint_cubes = False
+            finally:
+                conn.close()
+        if self._fingerprint_cubes:
+            data = self._fingerprint_cubes.fingerprint_data(momentum_bucket)
+            if data is None:
+                raise ValueError(f"No data found for momentum bucket {momentum_bucket}")
+            shape = (len(data['ttc_values']), len(data['positive_move_percentages']))
+            return (data['ttc_values'], data['positive_move_percentages'], data['negative_move_percentages'],
+                    data['positive_interp_values'].reshape(shape), data['negative_interp_values'].reshape(shape))
+        
         conn = psycopg2.connect(**self.db_config)
         cursor = conn.cursor()
         
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Additive weighted counts behind the directional fingerprints.
+
+A directional fingerprint cell is positive_successes / totals for one
+(momentum bucket, minutes to close, threshold), where every pair of bars
+(i, i + t) adds the year weight of bar i to the counts. The counts are plain
+sums over pairs, so a rolling dataset update can be applied to saved counts
+without rescanning five years of bars:
+
+    counts -= pairs starting at rows that fell out of the window
+    counts += pairs ending at rows that were appended
+
+The rates derived from the counts match generate_directional_fingerprint in
+fingerprint_generator.py.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+THRESHOLDS = [0.00, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40, 0.45, 0.50, 0.55, 0.60, 0.65, 0.70, 0.75, 0.80, 0.85, 0.90, 0.95, 1.00, 1.05, 1.10, 1.15, 1.20, 1.25, 1.30, 1.35, 1.40, 1.45, 1.50, 1.55, 1.60, 1.65, 1.75, 1.80, 1.85, 1.90, 1.95, 2.00]  # in percent
+MAX_LOOKAHEAD = 60
+YEAR_WEIGHTS = {2025: 5, 2024: 4, 2023: 3, 2022: 2, 2021: 1, 2020: 1}
+MOMENTUM_BUCKETS = list(range(-30, 31))
+
+# Rows whose momentum is outside the buckets still count toward the baseline
+OTHER_BUCKET = len(MOMENTUM_BUCKETS)
+N_BUCKETS = OTHER_BUCKET + 1
+
+# Last axis of the counts array
+POSITIVE, NEGATIVE, TOTAL = 0, 1, 2
+
+# Base rows processed per vectorized block
+BASE_CHUNK_ROWS = 200_000
+
+
+def row_weights(timestamps) -> np.ndarray:
+    """Year weight of each bar."""
+    years = pd.DatetimeIndex(pd.to_datetime(timestamps)).year
+    return pd.Series(years).map(YEAR_WEIGHTS).fillna(1).to_numpy(dtype=float)
+
+
+def bucket_ids(momentum) -> np.ndarray:
+    """Index into MOMENTUM_BUCKETS for each bar, or OTHER_BUCKET."""
+    values = pd.to_numeric(pd.Series(momentum), errors="coerce").to_numpy(dtype=float)
+    ids = np.full(len(values), OTHER_BUCKET, dtype=np.int64)
+    in_range = (np.isfinite(values) & (values == np.round(values)) &
+                (values >= MOMENTUM_BUCKETS[0]) & (values <= MOMENTUM_BUCKETS[-1]))
+    ids[in_range] = values[in_range].astype(np.int64) - MOMENTUM_BUCKETS[0]
+    return ids
+
+
+def pair_counts(close: np.ndarray, weight: np.ndarray, bucket: np.ndarray,
+                base_start: int = 0, base_stop: Optional[int] = None, min_target: int = 0) -> np.ndarray:
+    """
+    Weighted counts over pairs (i, i + t) of one bar series.
+
+    Only pairs with base_start <= i < base_stop, 1 <= t <= MAX_LOOKAHEAD,
+    min_target <= i + t < len(close) are counted.
+
+    Returns:
+        Array of shape (N_BUCKETS, MAX_LOOKAHEAD, len(THRESHOLDS), 3)
+    """
+    n = len(close)
+    base_stop = n if base_stop is None else base_stop
+    thresholds = np.asarray(THRESHOLDS)
+    n_th = len(thresholds)
+    th_index = np.arange(n_th)
+    counts = np.zeros((N_BUCKETS, MAX_LOOKAHEAD, n_th, 3))
+
+    for chunk_start in range(base_start, base_stop, BASE_CHUNK_ROWS):
+        base = np.arange(chunk_start, min(chunk_start + BASE_CHUNK_ROWS, base_stop))
+        for t in range(1, MAX_LOOKAHEAD + 1):
+            target = base + t
+            valid = (target < n) & (target >= min_target)
+            if not valid.any():
+                continue
+            i, j = base[valid], target[valid]
+            percent_move = ((close[j] - close[i]) / close[i]) * 100  # Keep sign for direction
+            w, b = weight[i], bucket[i]
+            cells = (b[:, None] * n_th + th_index).ravel()
+            for side, hit in ((POSITIVE, percent_move[:, None] >= thresholds),
+                              (NEGATIVE, percent_move[:, None] <= -thresholds)):
+                sums = np.bincount(cells, weights=(hit * w[:, None]).ravel(), minlength=N_BUCKETS * n_th)
+                counts[:, t - 1, :, side] += sums.reshape(N_BUCKETS, n_th)
+            counts[:, t - 1, :, TOTAL] += np.bincount(b, weights=w, minlength=N_BUCKETS)[:, None]
+    return counts
+
+
+def _frame_arrays(df: pd.DataFrame):
+    momentum = df["momentum"] if "momentum" in df.columns else np.full(len(df), np.nan)
+    return df["close"].to_numpy(dtype=float), row_weights(df["timestamp"]), bucket_ids(momentum)
+
+
+@dataclass
+class FingerprintCounts:
+    """Counts for one symbol's master dataset plus the window they cover."""
+    counts: np.ndarray
+    first_timestamp: pd.Timestamp
+    last_timestamp: pd.Timestamp
+    rows: int
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "FingerprintCounts":
+        """Count every pair in df (timestamp, close and momentum columns)."""
+        close, weight, bucket = _frame_arrays(df)
+        return cls(pair_counts(close, weight, bucket), pd.Timestamp(df["timestamp"].iloc[0]),
+                   pd.Timestamp(df["timestamp"].iloc[-1]), len(df))
+
+    def apply_update(self, dropped: pd.DataFrame, df: pd.DataFrame, appended_rows: int):
+        """
+        Move the counts from the previous window to df.
+
+        Args:
+            dropped: Rows removed from the front of the previous window
+            df: The updated dataset (kept rows followed by appended rows)
+            appended_rows: Number of rows at the end of df that are new
+        """
+        kept_rows = len(df) - appended_rows
+        if len(dropped):
+            # Pairs from dropped rows reached at most MAX_LOOKAHEAD rows into the kept ones
+            previous_head = pd.concat([dropped, df.iloc[:min(kept_rows, MAX_LOOKAHEAD)]], ignore_index=True)
+            close, weight, bucket = _frame_arrays(previous_head)
+            self.counts -= pair_counts(close, weight, bucket, base_stop=len(dropped))
+        if appended_rows:
+            close, weight, bucket = _frame_arrays(df)
+            self.counts += pair_counts(close, weight, bucket, base_start=max(0, kept_rows - MAX_LOOKAHEAD),
+                                       min_target=kept_rows)
+        self.first_timestamp = pd.Timestamp(df["timestamp"].iloc[0])
+        self.last_timestamp = pd.Timestamp(df["timestamp"].iloc[-1])
+        self.rows = len(df)
+
+    def fingerprint(self, momentum_value: Optional[int] = None) -> pd.DataFrame:
+        """Fingerprint frame for one momentum bucket, or the baseline when momentum_value is None."""
+        if momentum_value is None:
+            cells = self.counts.sum(axis=0)
+        else:
+            cells = self.counts[MOMENTUM_BUCKETS.index(momentum_value)]
+        output_data = []
+        for t in range(MAX_LOOKAHEAD):
+            row = []
+            for k in range(len(THRESHOLDS)):
+                positive_successes, negative_successes, totals = cells[t, k]
+                positive_rate = (positive_successes / totals * 100) if totals > 0 else 0.0
+                negative_rate = (negative_successes / totals * 100) if totals > 0 else 0.0
+                row.extend([round(positive_rate, 2), round(negative_rate, 2)])
+            output_data.append(row)
+
+        columns = []
+        for th in THRESHOLDS:
+            columns.extend([f">= +{th:.2f}%", f"<= -{th:.2f}%"])
+        output_df = pd.DataFrame(output_data, columns=columns, dtype=float)
+        output_df.index = [f"{t}m TTC" for t in range(1, MAX_LOOKAHEAD + 1)]
+        return output_df
+
+    def weight_totals(self, momentum_value: Optional[int] = None) -> np.ndarray:
+        """Pair weight behind each (minutes to close, threshold) cell of fingerprint(momentum_value)."""
+        if momentum_value is None:
+            return self.counts[..., TOTAL].sum(axis=0)
+        return self.counts[MOMENTUM_BUCKETS.index(momentum_value), ..., TOTAL]
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, counts=self.counts, first_timestamp=str(self.first_timestamp),
+                 last_timestamp=str(self.last_timestamp), rows=self.rows)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["FingerprintCounts"]:
+        """Saved counts, or None if there are none or they were saved with other thresholds."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if data["counts"].shape != (N_BUCKETS, MAX_LOOKAHEAD, len(THRESHOLDS), 3):
+                return None
+            return cls(data["counts"], pd.Timestamp(str(data["first_timestamp"])),
+                       pd.Timestamp(str(data["last_timestamp"])), int(data["rows"]))
@@ -12,6 +12,8 @@ from typing import Dict, List, Optional, Tuple
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from backend.util.paths import get_project_root, get_data_dir
+from backend.util.parquet_store import load_frame
+from backend.util.fingerprint_store import ensure_fingerprint_table, write_fingerprints
 
 # Database imports
 try:
@@ -331,8 +333,8 @@ Examples:
         print(f"Error: File {args.csv_path} not found")
         return
 
-    # Load the CSV file
-    df = pd.read_csv(args.csv_path)
+    # Load the CSV file or exported Parquet dataset
+    df = load_frame(args.csv_path)
     df["timestamp"] = pd.to_datetime(df["timestamp"])
 
     # Check if momentum column exists
@@ -392,9 +394,12 @@ Examples:
             momentum_buckets = list(range(-30, 31))  # -30 to +30
             print("Using default momentum range: -30 to +30")
         
+        momentum_frames = {}
         for momentum_value in momentum_buckets:
             print(f"Processing momentum bucket: {momentum_value}")
             bucket_df = generate_directional_fingerprint(df, momentum_value, f"momentum {momentum_value}")
+            if bucket_df is not None:
+                momentum_frames[momentum_value] = bucket_df
             
             if bucket_df is not None:
                 # Create filename with momentum value (no date)
@@ -409,6 +414,14 @@ Examples:
                     create_fingerprint_table(db_conn, table_name, bucket_df)
                     insert_fingerprint_data(db_conn, table_name, bucket_df)
 
+        # Long-format copy read by the calculators and table generators
+        if db_conn and momentum_frames:
+            cursor = db_conn.cursor()
+            ensure_fingerprint_table(cursor)
+            write_fingerprints(cursor, symbol, momentum_frames)
+            db_conn.commit()
+            cursor.close()
+
     # Close database connection
     if db_conn:
         db_conn.close()
@@ -14,6 +14,7 @@ from backend.util.paths import get_project_root
 sys.path.insert(0, get_project_root())
 
 from backend.util.paths import get_data_dir
+from backend.util.parquet_store import load_frame
 
 def generate_directional_fingerprint(df, momentum_value=None, description=""):
     """
@@ -149,8 +150,8 @@ Examples:
         print(f"Error: File {args.csv_path} not found")
         return
 
-    # Load the CSV file
-    df = pd.read_csv(args.csv_path)
+    # Load the CSV file or exported Parquet dataset
+    df = load_frame(args.csv_path)
     df["timestamp"] = pd.to_datetime(df["timestamp"])
 
     # Check if momentum column exists
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Long-format storage for the directional fingerprints.
+
+Fingerprints used to be stored as one analytics table per momentum bucket,
+keyed by a TEXT label ("05m TTC") with one column per threshold ("pos_0_25",
+"neg_1_00"). Every reader had to find the tables through information_schema
+and parse labels and column names. analytics.fingerprints holds every cell of
+every symbol and bucket as a row:
+
+    (symbol, bucket, ttc_seconds, direction, threshold, prob, weight_total)
+
+where prob is the percent of weighted pairs that moved at least threshold in
+direction, and weight_total is the weight those pairs carried (NULL for rows
+migrated from the wide tables, which did not keep it).
+
+load_fingerprint_cubes() reads a symbol in one query into dense arrays,
+and FingerprintCubes.fingerprint_data() gives the per-bucket structures the
+calculators and table generators interpolate over.
+
+    python backend/util/fingerprint_store.py migrate btc
+"""
+
+import argparse
+import os
+import re
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+FINGERPRINT_TABLE = "analytics.fingerprints"
+DIRECTIONS = ("positive", "negative")
+
+# Wide layouts: CSV columns ">= +0.25%" / "<= -0.25%" and table columns pos_0_25 / neg_0_25
+_CSV_COLUMN = re.compile(r"^(>= \+|<= -)(\d+(?:\.\d+)?)%$")
+_TABLE_COLUMN = re.compile(r"^(pos|neg)_(\d+)_(\d+)$")
+_LEGACY_TABLE = re.compile(r"^(?P<symbol>[a-z0-9]+)_fingerprint_directional_momentum_(?P<bucket>-?\d+)$")
+
+
+def ensure_fingerprint_table(cursor):
+    cursor.execute("CREATE SCHEMA IF NOT EXISTS analytics")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} (
+            symbol TEXT NOT NULL,
+            bucket SMALLINT NOT NULL,
+            ttc_seconds INTEGER NOT NULL,
+            direction TEXT NOT NULL CHECK (direction IN ('positive', 'negative')),
+            threshold NUMERIC(5,2) NOT NULL,
+            prob NUMERIC(5,2) NOT NULL,
+            weight_total DOUBLE PRECISION,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (symbol, bucket, ttc_seconds, direction, threshold)
+        )
+    """)
+
+
+def ttc_label_seconds(label: str) -> int:
+    """Seconds for a fingerprint row label like "5m TTC" or "05m TTC"."""
+    label = str(label)
+    return int(label.split('m')[0]) * 60 if 'm TTC' in label else 0
+
+
+def _parse_column(column: str):
+    """(direction, threshold) of a wide fingerprint column, or None."""
+    match = _CSV_COLUMN.match(column)
+    if match:
+        return ("positive" if match.group(1) == ">= +" else "negative"), float(match.group(2))
+    match = _TABLE_COLUMN.match(column)
+    if match:
+        return ("positive" if match.group(1) == "pos" else "negative"), float(f"{match.group(2)}.{match.group(3)}")
+    return None
+
+
+def fingerprint_rows(symbol: str, bucket: int, frame: pd.DataFrame,
+                     weight_totals: Optional[np.ndarray] = None) -> List[tuple]:
+    """
+    Long rows for one bucket's wide fingerprint frame.
+
+    Args:
+        frame: Rows labelled "Xm TTC", columns in either wide layout
+        weight_totals: Optional (rows, thresholds) array of pair weights, in the
+            frame's row order and the order thresholds first appear in its columns
+    """
+    symbol = symbol.lower()
+    thresholds = []
+    rows = []
+    for column in frame.columns:
+        parsed = _parse_column(column)
+        if parsed is None:
+            continue
+        direction, threshold = parsed
+        if threshold not in thresholds:
+            thresholds.append(threshold)
+        k = thresholds.index(threshold)
+        for i, (label, prob) in enumerate(frame[column].items()):
+            if pd.isna(prob):
+                continue
+            weight = None if weight_totals is None else float(weight_totals[i, k])
+            rows.append((symbol, int(bucket), ttc_label_seconds(label), direction, threshold, float(prob), weight))
+    return rows
+
+
+def write_fingerprints(cursor, symbol: str, frames: Dict[int, pd.DataFrame],
+                       weight_totals: Optional[Dict[int, np.ndarray]] = None) -> int:
+    """
+    Replace the symbol's rows for the given buckets.
+
+    Returns:
+        Number of rows written
+    """
+    rows = []
+    for bucket, frame in frames.items():
+        rows.extend(fingerprint_rows(symbol, bucket, frame, (weight_totals or {}).get(bucket)))
+    cursor.execute(f"DELETE FROM {FINGERPRINT_TABLE} WHERE symbol = %s AND bucket = ANY(%s)",
+                   (symbol.lower(), [int(b) for b in frames]))
+    execute_values(cursor, f"""
+        INSERT INTO {FINGERPRINT_TABLE} (symbol, bucket, ttc_seconds, direction, threshold, prob, weight_total)
+        VALUES %s
+    """, rows, page_size=10000)
+    return len(rows)
+
+
+@dataclass
+class FingerprintCubes:
+    """Every fingerprint of a symbol as dense arrays."""
+    symbol: str
+    buckets: np.ndarray          # (B,)
+    ttc_seconds: np.ndarray      # (T,)
+    thresholds: np.ndarray       # (K,)
+    prob: np.ndarray             # (B, T, K, 2), NaN where a cell is missing
+    weight_total: np.ndarray     # (B, T, K, 2), NaN where unknown
+
+    def __contains__(self, bucket: int) -> bool:
+        return int(bucket) in self.buckets
+
+    def fingerprint_data(self, bucket: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        One bucket in the form ProbabilityCalculator keeps per bucket: sorted TTC
+        and move axes plus flattened (ttc, move) interpolation points and values.
+        """
+        index = np.flatnonzero(self.buckets == int(bucket))
+        if not len(index):
+            return None
+        cells = self.prob[index[0]]
+        # Thresholds present for this bucket (both directions have the same set)
+        present = ~np.isnan(cells[..., 0]).all(axis=0)
+        rows = ~np.isnan(cells[..., 0]).all(axis=1)
+        ttc_values = self.ttc_seconds[rows]
+        move_percentages = self.thresholds[present]
+        ttc_grid, move_grid = np.meshgrid(ttc_values, move_percentages, indexing="ij")
+        points = np.column_stack([ttc_grid.ravel(), move_grid.ravel()]).astype(float)
+        data = {
+            'ttc_values': ttc_values,
+            'positive_move_percentages': move_percentages,
+            'negative_move_percentages': move_percentages.copy(),
+        }
+        for side, name in enumerate(DIRECTIONS):
+            data[f'{name}_interp_points'] = points
+            data[f'{name}_interp_values'] = cells[np.ix_(rows, present)][..., side].ravel().astype(float)
+        return data
+
+
+def load_fingerprint_cubes(cursor, symbol: str, buckets: Optional[Iterable[int]] = None) -> Optional[FingerprintCubes]:
+    """Every fingerprint cell of a symbol (optionally only some buckets) in one query; None if there are none."""
+    query = f"""
+        SELECT bucket, ttc_seconds, direction, threshold::float8, prob::float8, weight_total
+        FROM {FINGERPRINT_TABLE}
+        WHERE symbol = %s
+    """
+    params = [symbol.lower()]
+    if buckets is not None:
+        query += " AND bucket = ANY(%s)"
+        params.append([int(b) for b in buckets])
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+
+    bucket_col, ttc_col, direction_col, threshold_col, prob_col, weight_col = zip(*rows)
+    bucket_values, b = np.unique(np.asarray(bucket_col, dtype=np.int64), return_inverse=True)
+    ttc_values, t = np.unique(np.asarray(ttc_col, dtype=np.int64), return_inverse=True)
+    threshold_values, k = np.unique(np.round(np.asarray(threshold_col, dtype=float), 2), return_inverse=True)
+    side = (np.asarray(direction_col) == "negative").astype(np.int64)
+
+    shape = (len(bucket_values), len(ttc_values), len(threshold_values), 2)
+    prob = np.full(shape, np.nan)
+    weight_total = np.full(shape, np.nan)
+    prob[b, t, k, side] = np.asarray(prob_col, dtype=float)
+    weight_total[b, t, k, side] = np.asarray([np.nan if w is None else w for w in weight_col], dtype=float)
+    return FingerprintCubes(symbol.lower(), bucket_values, ttc_values, threshold_values, prob, weight_total)
+
+
+def legacy_fingerprint_tables(cursor, symbol: str) -> Dict[int, str]:
+    """Wide per-bucket fingerprint tables of a symbol, by bucket."""
+    cursor.execute("""
+        SELECT table_name FROM information_schema.tables
+        WHERE table_schema = 'analytics' AND table_name LIKE %s
+    """, (f"{symbol.lower()}_fingerprint_directional_momentum_%",))
+    tables = {}
+    for (table_name,) in cursor.fetchall():
+        match = _LEGACY_TABLE.match(table_name)
+        if match and match.group("symbol") == symbol.lower():
+            tables[int(match.group("bucket"))] = table_name
+    return tables
+
+
+def migrate_legacy_tables(conn, symbol: str) -> int:
+    """Copy a symbol's wide per-bucket tables into the long table. Returns rows written."""
+    cursor = conn.cursor()
+    ensure_fingerprint_table(cursor)
+    frames = {}
+    for bucket, table_name in sorted(legacy_fingerprint_tables(cursor, symbol).items()):
+        frame = pd.read_sql_query(f'SELECT * FROM analytics."{table_name}"', conn)
+        frames[bucket] = frame.set_index("time_to_close")
+    rows = write_fingerprints(cursor, symbol, frames) if frames else 0
+    conn.commit()
+    cursor.close()
+    print(f"✅ Migrated {len(frames)} {symbol.upper()} fingerprint tables ({rows:,} rows) into {FINGERPRINT_TABLE}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-format fingerprint storage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Copy wide per-bucket fingerprint tables into the long table")
+    migrate.add_argument("symbol", nargs='?', default="btc", help="Symbol to migrate")
+    args = parser.parse_args()
+
+    from backend.core.config.database import get_postgresql_connection
+    conn = get_postgresql_connection()
+    if conn is None:
+        sys.exit(1)
+    try:
+        if args.command == "migrate":
+            migrate_legacy_tables(conn, args.symbol)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,26 +2,41 @@
 """
 MASTER PROBABILITY TABLE GENERATOR
 
-This script generates a master lookup table containing pre-computed probability values
-that match the live calculator's interpolation results exactly.
+This script generates master lookup tables containing pre-computed probability values
+that match the live calculator's interpolation results exactly, for every contract
+horizon in one pass.
 
-The master table will contain:
+Each horizon's master table will contain:
 - ttc_seconds: Time to close in seconds
 - buffer_points: Distance from current price in points
 - momentum_bucket: Momentum bucket (-30 to +30)
-- prob_positive: Interpolated positive probability
-- prob_negative: Interpolated negative probability
+- prob_within_positive: Interpolated positive probability (within buffer)
+- prob_within_negative: Interpolated negative probability (within buffer)
+
+and the same grid is written as a memory-mapped lookup artifact (see
+probability_artifact.py).
+
+Horizons are entries in HORIZONS. Their TTC windows overlap (the 15-minute window
+is the first quarter of the hourly one), so each fingerprint bucket is loaded and
+interpolated once over the union of the windows and every horizon takes its rows
+from that one result.
 
 This allows the lookup calculator to return identical results to the live calculator
 without performing interpolation calculations.
+
+Usage:
+    python backend/util/master_probability_table_generator.py [--horizons hourly 15min] [--ttc-step 1]
 """
 
+import argparse
+import io
 import os
 import sys
 import psycopg2
 import logging
 import numpy as np
-from scipy.interpolate import griddata
+from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator, griddata
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import time
@@ -31,6 +46,8 @@ import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from backend.util.paths import get_data_dir
+from backend.util.fingerprint_store import FingerprintCubes, load_fingerprint_cubes
+from backend.util.probability_artifact import create_artifact_cube, finish_artifact, new_version, publish_artifact
 
 # Configure logging
 logging.basicConfig(
@@ -39,6 +56,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Contract horizons: table/artifact name suffix and TTC window in seconds.
+# Another contract length is another entry here.
+HORIZONS = {
+    "hourly": {"suffix": "", "ttc_range": (0, 3600)},
+    "15min": {"suffix": "_15min", "ttc_range": (0, 900)},
+}
+
+# Buffer points are converted to move percent at this price
+BASE_PRICE = 120000
+
+# TTC values interpolated per call, which bounds memory at 1-second / 1-point steps
+TTC_CHUNK = 120
+
+
+def rows_to_copy_buffer(ttc_values: np.ndarray, buffer_values: np.ndarray, momentum_bucket: int,
+                        pos: np.ndarray, neg: np.ndarray) -> io.StringIO:
+    """Tab-separated COPY input for a (ttc, buffer) block of one momentum bucket."""
+    ttc_grid, buffer_grid = np.meshgrid(ttc_values, buffer_values, indexing="ij")
+    rows = np.column_stack([ttc_grid.ravel(), buffer_grid.ravel(), np.full(ttc_grid.size, momentum_bucket),
+                            pos.ravel(), neg.ravel()])
+    buffer = io.StringIO()
+    np.savetxt(buffer, rows, fmt=["%d", "%d", "%d", "%.2f", "%.2f"], delimiter="\t")
+    buffer.seek(0)
+    return buffer
+
+
 class MasterProbabilityTableGenerator:
     """
     Generates master probability lookup tables using the same methodology as the live calculator.
@@ -57,10 +100,37 @@ class MasterProbabilityTableGenerator:
         self.master_table_name = f"master_probability_lookup_{self.symbol}"
         self.fingerprint_table_prefix = f"{self.symbol}_fingerprint_directional_momentum_"
         
+        # Buckets are interpolated in parallel; LinearNDInterpolator releases the GIL
+        self.max_workers = min(os.cpu_count() or 1, 6)
+        
+        # analytics.fingerprints, read on first use
+        self._fingerprint_cubes = None
+        self._fingerprint_cubes_loaded = False
+        
         logger.info(f"✅ Initialized master table generator for {self.symbol.upper()}")
     
+    def get_fingerprint_cubes(self) -> Optional[FingerprintCubes]:
+        """
+        Every fingerprint of the symbol from analytics.fingerprints, in one query
+        on first use. None if the long-format table is missing or empty, in which
+        case the per-bucket tables are read.
+        """
+        if not self._fingerprint_cubes_loaded:
+            conn = psycopg2.connect(**self.db_config)
+            try:
+                self._fingerprint_cubes = load_fingerprint_cubes(conn.cursor(), self.symbol)
+            except psycopg2.Error as e:
+                logger.warning(f"⚠️ Long-format fingerprints unavailable, reading per-bucket tables: {e}")
+            finally:
+                conn.close()
+            self._fingerprint_cubes_loaded = True
+        return self._fingerprint_cubes
+    
     def get_available_momentum_buckets(self) -> List[int]:
         """Get list of available momentum buckets from PostgreSQL."""
+        cubes = self.get_fingerprint_cubes()
+        if cubes is not None:
+            return [int(b) for b in cubes.buckets]
         try:
             conn = psycopg2.connect(**self.db_config)
             cursor = conn.cursor()
@@ -100,6 +170,10 @@ class MasterProbabilityTableGenerator:
     
     def load_fingerprint_data(self, momentum_bucket: int) -> Dict:
         """Load fingerprint data for a specific momentum bucket."""
+        cubes = self.get_fingerprint_cubes()
+        if cubes is not None:
+            return cubes.fingerprint_data(momentum_bucket)
+        conn = None
         try:
             conn = psycopg2.connect(**self.db_config)
             
@@ -257,161 +331,284 @@ class MasterProbabilityTableGenerator:
             logger.error(f"❌ Error interpolating probabilities: {e}")
             return 0.0, 0.0
     
-    def create_master_table(self, ttc_range: Tuple[int, int], buffer_range: Tuple[int, int], 
-                          momentum_buckets: List[int], ttc_step: int = 30, buffer_step: int = 10):
+    def table_name(self, horizon: str) -> str:
+        return f"{self.master_table_name}{HORIZONS[horizon]['suffix']}"
+    
+    def artifact_symbol(self, horizon: str) -> str:
+        """Name the horizon's artifacts are written under, e.g. btc_master_15min."""
+        return f"{self.symbol}_master{HORIZONS[horizon]['suffix']}"
+    
+    def interpolate_grid(self, fingerprint_data: Dict, ttc_seconds: np.ndarray, buffer_points: np.ndarray,
+                         interpolators: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Create the master probability lookup table.
+        interpolate_probabilities() over a whole (ttc, buffer) grid.
+        
+        Points the linear interpolation cannot reach take the nearest fingerprint
+        value, as interpolate_probabilities() does when griddata fails.
         
         Args:
-            ttc_range: (min_ttc_seconds, max_ttc_seconds)
+            fingerprint_data: Loaded fingerprint data
+            ttc_seconds: TTC values in seconds
+            buffer_points: Buffer values in points
+            interpolators: Cache for the bucket's triangulations, filled on first use
+            
+        Returns:
+            (prob_within_positive, prob_within_negative), each shaped
+            (len(ttc_seconds), len(buffer_points)) and rounded like NUMERIC(5,2)
+        """
+        if interpolators is None:
+            interpolators = {}
+        if not interpolators:
+            for name in ("positive", "negative"):
+                points = fingerprint_data[f'{name}_interp_points']
+                values = fingerprint_data[f'{name}_interp_values']
+                interpolators[name] = (LinearNDInterpolator(points, values), NearestNDInterpolator(points, values))
+        
+        # Clamp TTC to valid range and move percentage to max fingerprint range
+        fingerprint_ttc = fingerprint_data['ttc_values']
+        ttc = np.clip(np.asarray(ttc_seconds, dtype=float), fingerprint_ttc[0], fingerprint_ttc[-1])
+        move = np.minimum(np.asarray(buffer_points, dtype=float) / BASE_PRICE * 100,
+                          max(fingerprint_data['positive_move_percentages']))
+        ttc_grid, move_grid = np.meshgrid(ttc, move, indexing="ij")
+        points = np.column_stack([ttc_grid.ravel(), move_grid.ravel()])
+        
+        results = []
+        for name in ("positive", "negative"):
+            linear, nearest = interpolators[name]
+            prob = linear(points)
+            missing = np.isnan(prob)
+            if missing.any():
+                prob[missing] = nearest(points[missing])
+            results.append(np.round(100.0 - prob, 2).reshape(ttc_grid.shape))
+        return results[0], results[1]
+    
+    def create_horizon_table(self, cursor, horizon: str):
+        table_name = self.table_name(horizon)
+        cursor.execute(f"DROP TABLE IF EXISTS analytics.{table_name}")
+        cursor.execute(f"""
+        CREATE TABLE analytics.{table_name} (
+            ttc_seconds INTEGER NOT NULL,
+            buffer_points INTEGER NOT NULL,
+            momentum_bucket INTEGER NOT NULL,
+            prob_within_positive NUMERIC(5,2) NOT NULL,
+            prob_within_negative NUMERIC(5,2) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+    
+    def generate_master_tables(self, horizons: List[str], buffer_range: Tuple[int, int],
+                               momentum_buckets: List[int], ttc_step: int = 1, buffer_step: int = 1,
+                               write_tables: bool = True, write_artifacts: bool = True,
+                               publish: bool = False, artifact_dir: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Generate the master table and lookup artifact of every horizon in one pass.
+        
+        Args:
+            horizons: Names from HORIZONS
             buffer_range: (min_buffer_points, max_buffer_points)
             momentum_buckets: List of momentum buckets to include
             ttc_step: Step size for TTC in seconds
             buffer_step: Step size for buffer in points
-        """
-        try:
-            logger.info(f"🚀 Creating master probability table")
-            logger.info(f"📊 TTC range: {ttc_range[0]}s to {ttc_range[1]}s (step: {ttc_step}s)")
-            logger.info(f"📊 Buffer range: {buffer_range[0]} to {buffer_range[1]} points (step: {buffer_step})")
-            logger.info(f"📊 Momentum buckets: {momentum_buckets}")
-            
-            # Calculate total combinations
-            ttc_count = (ttc_range[1] - ttc_range[0]) // ttc_step + 1
-            buffer_count = (buffer_range[1] - buffer_range[0]) // buffer_step + 1
-            total_combinations = ttc_count * buffer_count * len(momentum_buckets)
-            
-            logger.info(f"📊 Total combinations to generate: {total_combinations:,}")
+            write_tables: Load analytics.master_probability_lookup_<symbol><suffix>
+            write_artifacts: Write a lookup artifact version per horizon
+            publish: Make the new artifact versions production
+            artifact_dir: Artifact directory (default data/probability_lookup)
             
-            # Create table
+        Returns:
+            {horizon: {"table": ..., "rows": ..., "artifact_version": ...}}
+        """
+        unknown = [h for h in horizons if h not in HORIZONS]
+        if unknown:
+            raise ValueError(f"Unknown horizons {unknown}; expected some of {list(HORIZONS)}")
+        ttc_start = min(HORIZONS[h]['ttc_range'][0] for h in horizons)
+        ttc_end = max(HORIZONS[h]['ttc_range'][1] for h in horizons)
+        for horizon in horizons:
+            if (HORIZONS[horizon]['ttc_range'][0] - ttc_start) % ttc_step:
+                raise ValueError(f"Horizon {horizon} does not start on the {ttc_step}s TTC grid")
+        
+        # One TTC grid covering every horizon; each horizon is a slice of it
+        ttc_values = np.arange(ttc_start, ttc_end + 1, ttc_step)
+        buffer_values = np.arange(buffer_range[0], buffer_range[1] + 1, buffer_step)
+        slices = {}
+        for horizon in horizons:
+            low, high = HORIZONS[horizon]['ttc_range']
+            slices[horizon] = slice(int(np.searchsorted(ttc_values, low)),
+                                    int(np.searchsorted(ttc_values, high, side="right")))
+        
+        logger.info(f"🚀 Creating master probability tables for {', '.join(horizons)}")
+        logger.info(f"📊 TTC range: {ttc_start}s to {ttc_end}s (step: {ttc_step}s)")
+        logger.info(f"📊 Buffer range: {buffer_range[0]} to {buffer_range[1]} points (step: {buffer_step})")
+        logger.info(f"📊 Momentum buckets: {momentum_buckets}")
+        
+        # Load fingerprint data for all momentum buckets once, for every horizon
+        fingerprint_data_cache = {}
+        for momentum_bucket in momentum_buckets:
+            fingerprint_data = self.load_fingerprint_data(momentum_bucket)
+            if fingerprint_data:
+                fingerprint_data_cache[momentum_bucket] = fingerprint_data
+            else:
+                logger.warning(f"⚠️ Skipping momentum bucket {momentum_bucket} - no data")
+        
+        if not fingerprint_data_cache:
+            raise ValueError("No fingerprint data available for any momentum bucket")
+        
+        if write_tables:
             conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor()
-            
-            # Drop existing table if it exists
-            cursor.execute(f"DROP TABLE IF EXISTS analytics.{self.master_table_name}")
-            
-            # Create table
-            create_table_sql = f"""
-            CREATE TABLE analytics.{self.master_table_name} (
-                ttc_seconds INTEGER NOT NULL,
-                buffer_points INTEGER NOT NULL,
-                momentum_bucket INTEGER NOT NULL,
-                prob_within_positive NUMERIC(5,2) NOT NULL,
-                prob_within_negative NUMERIC(5,2) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (ttc_seconds, buffer_points, momentum_bucket)
-            )
-            """
-            cursor.execute(create_table_sql)
-            
-            # Load fingerprint data for all momentum buckets
-            fingerprint_data_cache = {}
-            for momentum_bucket in momentum_buckets:
-                fingerprint_data = self.load_fingerprint_data(momentum_bucket)
-                if fingerprint_data:
-                    fingerprint_data_cache[momentum_bucket] = fingerprint_data
-                else:
-                    logger.warning(f"⚠️ Skipping momentum bucket {momentum_bucket} - no data")
-            
-            if not fingerprint_data_cache:
-                raise ValueError("No fingerprint data available for any momentum bucket")
-            
-            # Generate all combinations
-            total_generated = 0
-            start_time = time.time()
-            
-            for ttc_seconds in range(ttc_range[0], ttc_range[1] + 1, ttc_step):
-                for buffer_points in range(buffer_range[0], buffer_range[1] + 1, buffer_step):
-                    for momentum_bucket in momentum_buckets:
-                        if momentum_bucket not in fingerprint_data_cache:
+            try:
+                cursor = conn.cursor()
+                for horizon in horizons:
+                    self.create_horizon_table(cursor, horizon)
+                conn.commit()
+            finally:
+                conn.close()
+        
+        version = new_version()
+        low_bucket, high_bucket = min(fingerprint_data_cache), max(fingerprint_data_cache)
+        cubes, axes = {}, {}
+        if write_artifacts:
+            for horizon in horizons:
+                horizon_ttc = ttc_values[slices[horizon]]
+                axes[horizon] = {
+                    "momentum": [low_bucket, 1, high_bucket - low_bucket + 1],
+                    "ttc": [int(horizon_ttc[0]), ttc_step, len(horizon_ttc)],
+                    "buffer": [buffer_range[0], buffer_step, len(buffer_values)],
+                }
+                cubes[horizon] = create_artifact_cube(self.artifact_symbol(horizon), version, axes[horizon], artifact_dir)
+        
+        start_time = time.time()
+        
+        def process_bucket(momentum_bucket: int):
+            fingerprint_data = fingerprint_data_cache[momentum_bucket]
+            interpolators = {}
+            conn = psycopg2.connect(**self.db_config) if write_tables else None
+            try:
+                cursor = conn.cursor() if conn else None
+                for chunk_start in range(0, len(ttc_values), TTC_CHUNK):
+                    chunk = slice(chunk_start, min(chunk_start + TTC_CHUNK, len(ttc_values)))
+                    pos, neg = self.interpolate_grid(fingerprint_data, ttc_values[chunk], buffer_values, interpolators)
+                    for horizon in horizons:
+                        # Rows of this chunk inside the horizon's window
+                        low = max(chunk.start, slices[horizon].start)
+                        high = min(chunk.stop, slices[horizon].stop)
+                        if low >= high:
                             continue
-                        
-                        # Calculate move percentage (assuming $120,000 base price for now)
-                        base_price = 120000
-                        move_percent = (buffer_points / base_price) * 100
-                        
-                        # Interpolate both positive and negative probabilities
-                        prob_within_positive, prob_within_negative = self.interpolate_probabilities(
-                            fingerprint_data_cache[momentum_bucket], ttc_seconds, move_percent
-                        )
-                        
-                        # Insert into table
-                        insert_sql = f"""
-                        INSERT INTO analytics.{self.master_table_name} 
-                        (ttc_seconds, buffer_points, momentum_bucket, prob_within_positive, prob_within_negative)
-                        VALUES (%s, %s, %s, %s, %s)
-                        """
-                        cursor.execute(insert_sql, (ttc_seconds, buffer_points, momentum_bucket, prob_within_positive, prob_within_negative))
-                        
-                        total_generated += 1
-                        
-                        # Progress update every 1000 combinations
-                        if total_generated % 1000 == 0:
-                            elapsed = time.time() - start_time
-                            rate = total_generated / elapsed
-                            remaining = (total_combinations - total_generated) / rate if rate > 0 else 0
-                            logger.info(f"📊 Generated {total_generated:,}/{total_combinations:,} combinations "
-                                      f"({total_generated/total_combinations*100:.1f}%) "
-                                      f"Rate: {rate:.0f}/s, ETA: {remaining/60:.1f}min")
-            
-            # Commit and create index
-            conn.commit()
-            
-            # Create index for faster lookups
-            index_sql = f"""
-            CREATE INDEX idx_{self.master_table_name}_lookup 
-            ON analytics.{self.master_table_name} (ttc_seconds, buffer_points, momentum_bucket)
-            """
-            cursor.execute(index_sql)
-            conn.commit()
-            
+                        block = slice(low - chunk.start, high - chunk.start)
+                        if cursor:
+                            cursor.copy_expert(
+                                f"COPY analytics.{self.table_name(horizon)} (ttc_seconds, buffer_points, "
+                                f"momentum_bucket, prob_within_positive, prob_within_negative) FROM STDIN",
+                                rows_to_copy_buffer(ttc_values[low:high], buffer_values, momentum_bucket,
+                                                    pos[block], neg[block])
+                            )
+                        if horizon in cubes:
+                            target = slice(low - slices[horizon].start, high - slices[horizon].start)
+                            cubes[horizon][momentum_bucket - low_bucket, target, :, 0] = pos[block]
+                            cubes[horizon][momentum_bucket - low_bucket, target, :, 1] = neg[block]
+                if conn:
+                    conn.commit()
+            finally:
+                if conn:
+                    conn.close()
             elapsed = time.time() - start_time
-            logger.info(f"✅ Master table created successfully!")
-            logger.info(f"📊 Total combinations generated: {total_generated:,}")
-            logger.info(f"📊 Total time: {elapsed/60:.1f} minutes")
-            logger.info(f"📊 Average rate: {total_generated/elapsed:.0f} combinations/second")
-            
+            logger.info(f"✅ Momentum bucket {momentum_bucket} completed in {elapsed/60:.1f}min")
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [executor.submit(process_bucket, b) for b in sorted(fingerprint_data_cache)]:
+                future.result()
+        
+        results = {}
+        for horizon in horizons:
+            rows = len(fingerprint_data_cache) * (slices[horizon].stop - slices[horizon].start) * len(buffer_values)
+            results[horizon] = {"table": f"analytics.{self.table_name(horizon)}" if write_tables else None,
+                                "rows": rows, "artifact_version": None}
+        
+        if write_tables:
+            conn = psycopg2.connect(**self.db_config)
+            try:
+                cursor = conn.cursor()
+                for horizon in horizons:
+                    table_name = self.table_name(horizon)
+                    cursor.execute(f"""
+                    ALTER TABLE analytics.{table_name}
+                    ADD PRIMARY KEY (ttc_seconds, buffer_points, momentum_bucket)
+                    """)
+                conn.commit()
+            finally:
+                conn.close()
+        
+        for horizon in cubes:
+            symbol = self.artifact_symbol(horizon)
+            finish_artifact(symbol, version, cubes[horizon], axes[horizon],
+                            source=f"analytics.{self.table_name(horizon)}", directory=artifact_dir)
+            if publish:
+                publish_artifact(symbol, version, artifact_dir)
+            results[horizon]["artifact_version"] = version
+        
+        elapsed = time.time() - start_time
+        total_generated = len(fingerprint_data_cache) * len(ttc_values) * len(buffer_values)
+        logger.info(f"✅ Master tables created successfully!")
+        for horizon, result in results.items():
+            logger.info(f"📊 {horizon}: {result['rows']:,} rows, artifact {result['artifact_version']}")
+        logger.info(f"📊 Interpolated {total_generated:,} combinations in {elapsed/60:.1f} minutes "
+                    f"({total_generated/max(elapsed, 1e-9):.0f}/second)")
+        return results
+    
+    def create_master_table(self, ttc_range: Tuple[int, int], buffer_range: Tuple[int, int], 
+                          momentum_buckets: List[int], ttc_step: int = 30, buffer_step: int = 10):
+        """
+        Create the hourly master probability lookup table.
+        
+        Kept for existing callers; ttc_range must be the hourly window.
+        """
+        if tuple(ttc_range) != HORIZONS["hourly"]["ttc_range"]:
+            raise ValueError(f"TTC range {ttc_range} is not a configured horizon; add it to HORIZONS")
+        try:
+            self.generate_master_tables(["hourly"], buffer_range, momentum_buckets, ttc_step, buffer_step,
+                                        write_artifacts=False)
             return True
-            
         except Exception as e:
             logger.error(f"❌ Error creating master table: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the master table generator."""
+    parser = argparse.ArgumentParser(description="Generate master probability lookup tables for contract horizons")
+    parser.add_argument("--symbol", default="btc", help="Symbol to generate for")
+    parser.add_argument("--horizons", nargs="+", default=list(HORIZONS), choices=list(HORIZONS),
+                        help="Contract horizons to generate (default: all)")
+    parser.add_argument("--ttc-step", type=int, default=1, help="TTC step in seconds (default: 1)")
+    parser.add_argument("--buffer-max", type=int, default=2000, help="Largest buffer in points (default: 2000)")
+    parser.add_argument("--buffer-step", type=int, default=1, help="Buffer step in points (default: 1)")
+    parser.add_argument("--no-tables", action="store_true", help="Only write lookup artifacts")
+    parser.add_argument("--no-artifacts", action="store_true", help="Only write master tables")
+    parser.add_argument("--publish", action="store_true", help="Make the new artifacts production")
+    args = parser.parse_args(argv)
+    
     logger.info("🚀 Starting Master Probability Table Generator")
     
     # Initialize generator
-    generator = MasterProbabilityTableGenerator("btc")
-    
-    # Generate full master table
-    logger.info("🚀 Generating full master probability table...")
-    
-    # Full generation parameters (0-60 minutes, 0-2000 buffer, all momentum buckets)
-    ttc_range = (0, 3600)  # 0 to 60 minutes (3600 seconds)
-    buffer_range = (0, 2000)   # 0 to 2000 points
+    generator = MasterProbabilityTableGenerator(args.symbol)
     momentum_buckets = generator.get_available_momentum_buckets()  # All 61 momentum buckets
-    ttc_step = 1  # 1-second steps
-    buffer_step = 1  # 1-point steps
-    
-    success = generator.create_master_table(
-        ttc_range=ttc_range,
-        buffer_range=buffer_range,
-        momentum_buckets=momentum_buckets,
-        ttc_step=ttc_step,
-        buffer_step=buffer_step
-    )
     
-    if success:
-        logger.info("🎉 Full master table created successfully!")
-        logger.info("📁 Ready for production use")
-    else:
-        logger.error("❌ Failed to create full master table")
+    try:
+        generator.generate_master_tables(
+            horizons=args.horizons,
+            buffer_range=(0, args.buffer_max),
+            momentum_buckets=momentum_buckets,
+            ttc_step=args.ttc_step,
+            buffer_step=args.buffer_step,
+            write_tables=not args.no_tables,
+            write_artifacts=not args.no_artifacts,
+            publish=args.publish
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to create master tables: {e}")
+        return 1
     
-    return 0 if success else 1
+    logger.info("🎉 Master tables created successfully!")
+    logger.info("📁 Ready for production use")
+    return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,367 @@
+"""
+Prometheus-style runtime metrics shared by all services.
+
+Each service records into the process-wide registry and exposes it as
+/metrics in the Prometheus text format, either on its existing web app
+(mount_fastapi_metrics / mount_flask_metrics) or, for services without one,
+on a small background HTTP server (start_metrics_server).
+
+The hot-path metrics every service shares are defined at the bottom of this
+module so dashboards see the same names everywhere.
+"""
+
+import bisect
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond DB calls up to slow multi-second generations
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape_label(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return sum(state[0]) if state else 0
+
+    def get_sum(self, **labels) -> float:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[1] if state else 0.0
+
+    def snapshot(self, **labels) -> Dict[str, Any]:
+        """Count, sum and cumulative bucket counts ({"0.1": n, ..., "+Inf": n}) for one label set."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            counts, total = (list(state[0]), state[1]) if state else ([0] * (len(self.buckets) + 1), 0.0)
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            buckets[_format_value(bound)] = cumulative
+        return {"count": cumulative, "sum": total, "buckets": buckets}
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together at /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, cls) or existing.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} already registered with a different type or labels")
+                return existing
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def render_metrics(registry: MetricsRegistry = REGISTRY) -> str:
+    """Render the registry in the Prometheus text exposition format."""
+    return registry.render()
+
+
+def mount_fastapi_metrics(app, registry: MetricsRegistry = REGISTRY):
+    """Add a GET /metrics route to a FastAPI app."""
+    from fastapi.responses import Response
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(content=render_metrics(registry), media_type=CONTENT_TYPE_LATEST)
+
+    return app
+
+
+def mount_flask_metrics(app, registry: MetricsRegistry = REGISTRY):
+    """Add a GET /metrics route to a Flask app."""
+    from flask import Response
+
+    def metrics():
+        return Response(render_metrics(registry), mimetype="text/plain",
+                        headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+    app.add_url_rule("/metrics", "metrics", metrics)
+    return app
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread for services without a web app."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_metrics(registry).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE_LATEST)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+# ---------- SHARED HOT-PATH METRICS ----------------------------------------------------
+
+TICK_INGEST_LAG_SECONDS = REGISTRY.histogram(
+    "tick_ingest_lag_seconds",
+    "Delay from exchange tick timestamp until the tick is committed to live_data",
+    ("symbol",)
+)
+
+STRIKE_GENERATION_SECONDS = REGISTRY.histogram(
+    "strike_generation_seconds",
+    "Time to build and publish one strike ladder",
+    ("symbol",)
+)
+
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_seconds",
+    "Database round trip time per call site",
+    ("call_site",)
+)
+
+DB_QUERY_ERRORS = REGISTRY.counter(
+    "db_query_errors_total",
+    "Database calls that raised, per call site",
+    ("call_site",)
+)
+
+WEBSOCKET_QUEUE_DEPTH = REGISTRY.gauge(
+    "websocket_queue_depth",
+    "Messages or clients waiting on a websocket feed",
+    ("feed",)
+)
+
+ORDER_ROUND_TRIP_SECONDS = REGISTRY.histogram(
+    "order_round_trip_seconds",
+    "Time from sending an order request until its response arrives",
+    ("stage", "action")
+)
+
+
+def get_websocket_backlog(websocket) -> Optional[int]:
+    """
+    Count frames received on a websockets client connection but not yet read.
+
+    Supports both the asyncio implementation (websockets >= 13) and the legacy
+    one; returns None if the connection exposes neither.
+    """
+    try:
+        return len(websocket.recv_messages.frames)
+    except (AttributeError, TypeError):
+        pass
+    try:
+        return len(websocket.messages)
+    except (AttributeError, TypeError):
+        return None
+
+
+@contextmanager
+def time_db_query(call_site: str):
+    """Record the duration (and any failure) of a database call."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DB_QUERY_ERRORS.inc(call_site=call_site)
+        raise
+    finally:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - start, call_site=call_site)
+
+
+@functools.lru_cache(maxsize=None)
+def timed_cursor(call_site: str):
+    """psycopg2 cursor_factory that records every execute() under call_site."""
+    import psycopg2.extensions
+
+    class TimedCursor(psycopg2.extensions.cursor):
+        def execute(self, query, vars=None):
+            with time_db_query(call_site):
+                return super().execute(query, vars)
+
+    return TimedCursor
@@ -1,10 +1,24 @@
 
 
+import numpy as np
 import pandas as pd
 import os
 import argparse
 import sys
 
+# (lag in minutes, weight) pairs of the momentum score
+MOMENTUM_WEIGHTS = ((1, 0.30), (2, 0.25), (3, 0.20), (4, 0.15), (15, 0.05), (30, 0.05))
+MOMENTUM_LOOKBACK = 30
+
+def momentum_at(close, indices):
+    """Momentum scores for the rows at indices; each row needs MOMENTUM_LOOKBACK rows of history."""
+    close = np.asarray(close, dtype=float)
+    indices = np.asarray(indices, dtype=np.int64)
+    p_now = close[indices]
+    score = sum(((p_now - close[indices - lag]) / close[indices - lag]) * weight
+                for lag, weight in MOMENTUM_WEIGHTS) * 10000
+    return np.round(score).astype(np.int64)
+
 def calculate_momentum(df):
     print(f"Processing {len(df)} rows...")
     
@@ -44,41 +58,30 @@ def calculate_momentum(df):
     print("Momentum calculation complete!")
     return momentum_scores
 
-def fill_missing_momentum_inplace(csv_path):
-    print(f"Filling missing momentum in-place for: {csv_path}")
-    df = pd.read_csv(csv_path)
+def fill_missing_momentum(df):
+    """Fill missing momentum values of df in place, leaving existing values untouched; returns rows filled."""
     if 'momentum' not in df.columns:
         print("No 'momentum' column found. Adding it.")
         df['momentum'] = ''
     # Find rows where momentum is empty or null
     mask = (df['momentum'].isnull()) | (df['momentum'] == '')
-    indices = df[mask].index
+    indices = np.flatnonzero(mask.to_numpy())
     print(f"Found {len(indices)} rows with missing momentum.")
-    if len(indices) == 0:
+    # Skip the first rows, as momentum needs history
+    indices = indices[indices >= MOMENTUM_LOOKBACK]
+    if len(indices):
+        df.iloc[indices, df.columns.get_loc('momentum')] = momentum_at(df['close'].to_numpy(), indices)
+    return len(indices)
+
+def fill_missing_momentum_inplace(csv_path):
+    print(f"Filling missing momentum in-place for: {csv_path}")
+    df = pd.read_csv(csv_path)
+    filled = fill_missing_momentum(df)
+    if filled == 0:
         print("No missing momentum values to fill.")
         return
-    # Only compute for these rows (skip first 30 rows, as momentum needs history)
-    for i in indices:
-        if i < 30:
-            continue  # Not enough history
-        P_now = df.loc[i, 'close']
-        P_1m  = df.loc[i - 1, 'close']
-        P_2m  = df.loc[i - 2, 'close']
-        P_3m  = df.loc[i - 3, 'close']
-        P_4m  = df.loc[i - 4, 'close']
-        P_15m = df.loc[i - 15, 'close']
-        P_30m = df.loc[i - 30, 'close']
-        score = (
-            ((P_now - P_1m)  / P_1m)  * 0.30 +
-            ((P_now - P_2m)  / P_2m)  * 0.25 +
-            ((P_now - P_3m)  / P_3m)  * 0.20 +
-            ((P_now - P_4m)  / P_4m)  * 0.15 +
-            ((P_now - P_15m) / P_15m) * 0.05 +
-            ((P_now - P_30m) / P_30m) * 0.05
-        ) * 10000
-        df.at[i, 'momentum'] = int(round(score))
     df.to_csv(csv_path, index=False)
-    print(f"Filled missing momentum for {len(indices)} rows and updated file in-place.")
+    print(f"Filled missing momentum for {filled} rows and updated file in-place.")
 
 def main():
     parser = argparse.ArgumentParser(description="Generate momentum scores for 1m BTC data.")
@@ -21,6 +21,7 @@ from typing import Dict, List, Tuple, Optional
 
 # Add backend to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.momentum_sketch import MomentumSketch, SKETCH_TABLE, ensure_sketch_table, save_sketch
 
 # Configure logging
 logging.basicConfig(
@@ -163,27 +164,14 @@ class MomentumProfiler:
         # Calculate percentiles (0.5th to 99.5th percentile in 0.5 increments)
         percentiles = np.arange(0.5, 100, 0.5)  # 0.5, 1.0, 1.5, ..., 99.5
         
-        # Calculate weighted percentiles
-        weighted_percentiles = []
-        for p in percentiles:
-            # Use weighted quantile calculation
-            sorted_indices = np.argsort(momentum_values)
-            sorted_weights = weights[sorted_indices]
-            sorted_values = momentum_values[sorted_indices]
-            
-            # Calculate cumulative weights
-            cumsum_weights = np.cumsum(sorted_weights)
-            
-            # Find the index where cumulative weight reaches the percentile
-            target_weight = p / 100.0
-            idx = np.searchsorted(cumsum_weights, target_weight)
-            
-            if idx >= len(sorted_values):
-                percentile_value = sorted_values[-1]
-            else:
-                percentile_value = sorted_values[idx]
-            
-            weighted_percentiles.append(percentile_value)
+        # Calculate weighted percentiles from one sort of the history
+        sorted_indices = np.argsort(momentum_values)
+        sorted_values = momentum_values[sorted_indices]
+        cumsum_weights = np.cumsum(weights[sorted_indices])
+        
+        # Index where cumulative weight reaches each percentile
+        idx = np.searchsorted(cumsum_weights, percentiles / 100.0)
+        weighted_percentiles = list(sorted_values[np.minimum(idx, len(sorted_values) - 1)])
         
         # Create profile DataFrame
         profile_df = pd.DataFrame({
@@ -200,6 +188,36 @@ class MomentumProfiler:
         logger.info(f"📈 Calculated percentile profile: mean={weighted_mean:.4f}, std={weighted_std:.4f}")
         return profile_df
     
+    def build_sketch(self, df: pd.DataFrame) -> MomentumSketch:
+        """
+        Streaming quantile sketch of the same history, for live percentile ranking.
+        
+        Uses the same exponential time decay as calculate_time_weights.
+        """
+        sketch = MomentumSketch()
+        sketch.add_many(df['momentum'].values, df['timestamp'])
+        logger.info(f"🧮 Built momentum sketch from {sketch.count} values")
+        return sketch
+    
+    def save_sketch(self, sketch: MomentumSketch):
+        """Store the sketch in analytics.momentum_sketches for symbol_price_watchdog."""
+        conn = self.get_postgresql_connection()
+        if not conn:
+            raise Exception("Failed to connect to PostgreSQL")
+        
+        try:
+            cursor = conn.cursor()
+            ensure_sketch_table(cursor)
+            save_sketch(cursor, self.symbol, sketch)
+            conn.commit()
+            logger.info(f"✅ Saved momentum sketch for {self.symbol.upper()} to {SKETCH_TABLE}")
+        except Exception as e:
+            logger.error(f"❌ Error saving momentum sketch: {e}")
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
     def create_profile_table(self):
         """Create the momentum profile table in the analytics schema."""
         conn = self.get_postgresql_connection()
@@ -298,6 +316,10 @@ class MomentumProfiler:
             # Insert profile data
             self.insert_profile_data(profile_df)
             
+            # Live percentile ranking starts from the full history only
+            if not start_date and not end_date:
+                self.save_sketch(self.build_sketch(df))
+            
             # Log summary statistics
             logger.info(f"📊 Profile Summary:")
             logger.info(f"   - Total records analyzed: {len(df)}")
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Mergeable, time-weighted quantile sketch of a symbol's momentum.
+
+A merging t-digest: the distribution is kept as at most about
+compression / 2 weighted centroids, small at the tails and larger near the
+median, so percentiles of extreme momentum stay accurate. Adding a value,
+merging two sketches and looking up a percentile or z-score cost the same
+however much history the sketch has seen.
+
+Weights decay like MomentumProfiler.calculate_time_weights, exp(-decay_rate
+* days_ago), but are applied forward: a value observed at day t gets weight
+exp(decay_rate * (t - reference_day)). The relative weights are the same, and
+nothing already in the sketch has to be re-weighted as time moves on.
+
+The sketch for each symbol is built by momentum_profiler.py from
+historical_data.<symbol>_price_history and saved in analytics.momentum_sketches.
+symbol_price_watchdog.py loads it and adds each live minute's momentum.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+SKETCH_TABLE = "analytics.momentum_sketches"
+DEFAULT_COMPRESSION = 200
+DEFAULT_DECAY_RATE = 0.001  # per day, as in MomentumProfiler.calculate_time_weights
+
+# Re-base forward-decay weights once the reference is this old, long before they could overflow
+REBASE_AFTER_DAYS = 365.0
+DAY_NS = 86400 * 10**9
+
+
+def to_days(timestamps) -> np.ndarray:
+    """Days since the epoch; naive timestamps are taken as UTC."""
+    index = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(timestamps)))
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.asi8 / DAY_NS
+
+
+class MomentumSketch:
+    """Weighted t-digest of momentum values with running weighted mean and variance."""
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION, decay_rate: float = DEFAULT_DECAY_RATE,
+                 reference_day: Optional[float] = None):
+        self.compression = compression
+        self.decay_rate = decay_rate
+        self.reference_day = reference_day
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self.count = 0
+        # Weighted sums of 1, x and x^2 for the mean and standard deviation
+        self.moments = np.zeros(3)
+        self._buffer_means = []
+        self._buffer_weights = []
+        self._cdf_points = None
+
+    # ---------- Building ------------------------------------------------------
+
+    def _decayed(self, days: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        if self.reference_day is None:
+            self.reference_day = float(days.min())
+        if days.max() - self.reference_day > REBASE_AFTER_DAYS:
+            self._rebase(float(days.max()))
+        return weights * np.exp(self.decay_rate * (days - self.reference_day))
+
+    def _rebase(self, reference_day: float):
+        factor = np.exp(-self.decay_rate * (reference_day - self.reference_day))
+        self._flush()
+        self.weights = self.weights * factor
+        self.moments = self.moments * factor
+        self.reference_day = reference_day
+        self._cdf_points = None
+
+    def add_many(self, values, timestamps, weights=None):
+        """Add values observed at timestamps; NaN values are skipped."""
+        values = np.asarray(values, dtype=float)
+        days = to_days(timestamps)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+        keep = np.isfinite(values)
+        values, days, weights = values[keep], days[keep], weights[keep]
+        if not len(values):
+            return
+        weights = self._decayed(days, weights)
+        self.moments += [weights.sum(), (weights * values).sum(), (weights * values ** 2).sum()]
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.count += len(values)
+        self._buffer_means.append(values)
+        self._buffer_weights.append(weights)
+        self._cdf_points = None
+        if sum(len(b) for b in self._buffer_means) >= self.compression * 5:
+            self._flush()
+
+    def add(self, value: float, timestamp, weight: float = 1.0):
+        self.add_many([value], [timestamp], [weight])
+
+    def merge(self, other: "MomentumSketch"):
+        """Fold another sketch (for example one built on a different date range) into this one."""
+        if other.count == 0:
+            return
+        other._flush()
+        if self.reference_day is None:
+            self.reference_day = other.reference_day
+        factor = np.exp(self.decay_rate * (other.reference_day - self.reference_day))
+        self.moments += other.moments * factor
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self._buffer_means.append(other.means)
+        self._buffer_weights.append(other.weights * factor)
+        self._cdf_points = None
+        self._flush()
+
+    def _flush(self):
+        """Merge buffered values into the centroids."""
+        if not self._buffer_means:
+            return
+        means = np.concatenate([self.means, *self._buffer_means])
+        weights = np.concatenate([self.weights, *self._buffer_weights])
+        self._buffer_means, self._buffer_weights = [], []
+
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2) / cumulative[-1]
+        # k1 scale function: each centroid spans at most one unit of k
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q_mid - 1, -1, 1))
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(weights * means, starts) / self.weights
+        self._cdf_points = None
+
+    # ---------- Queries -------------------------------------------------------
+
+    def _points(self):
+        if self._cdf_points is None:
+            self._flush()
+            cumulative = np.cumsum(self.weights) - self.weights / 2
+            total = self.weights.sum()
+            xs = np.r_[self.min, self.means, self.max]
+            ys = np.r_[0.0, cumulative, total] / total
+            self._cdf_points = (xs, ys)
+        return self._cdf_points
+
+    def cdf(self, value: float) -> Optional[float]:
+        """Weighted fraction of momentum at or below value."""
+        if self.count == 0:
+            return None
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        xs, ys = self._points()
+        return float(np.interp(value, xs, ys))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Momentum at weighted quantile q (0-1)."""
+        if self.count == 0:
+            return None
+        xs, ys = self._points()
+        return float(np.interp(q, ys, xs))
+
+    def percentile(self, value: float) -> Optional[float]:
+        """Percentile rank (0-100) of value."""
+        fraction = self.cdf(value)
+        return None if fraction is None else fraction * 100
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.moments[1] / self.moments[0] if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return float(np.sqrt(max(self.moments[2] / self.moments[0] - self.mean ** 2, 0.0)))
+
+    def z_score(self, value: float) -> Optional[float]:
+        std = self.std
+        return (value - self.mean) / std if std else None
+
+    # ---------- Persistence ---------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._flush()
+        return {
+            "compression": self.compression,
+            "decay_rate": self.decay_rate,
+            "reference_day": self.reference_day,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "count": self.count,
+            "moments": self.moments.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MomentumSketch":
+        sketch = cls(data["compression"], data["decay_rate"], data["reference_day"])
+        sketch.means = np.asarray(data["means"], dtype=float)
+        sketch.weights = np.asarray(data["weights"], dtype=float)
+        if data["count"]:
+            sketch.min, sketch.max = data["min"], data["max"]
+        sketch.count = data["count"]
+        sketch.moments = np.asarray(data["moments"], dtype=float)
+        return sketch
+
+
+def ensure_sketch_table(cursor):
+    cursor.execute("CREATE SCHEMA IF NOT EXISTS analytics")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SKETCH_TABLE} (
+            symbol TEXT PRIMARY KEY,
+            sketch JSONB NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def save_sketch(cursor, symbol: str, sketch: MomentumSketch):
+    cursor.execute(f"""
+        INSERT INTO {SKETCH_TABLE} (symbol, sketch) VALUES (%s, %s)
+        ON CONFLICT (symbol) DO UPDATE SET sketch = EXCLUDED.sketch, updated_at = NOW()
+    """, (symbol.lower(), json.dumps(sketch.to_dict())))
+
+
+def load_sketch(cursor, symbol: str) -> Optional[MomentumSketch]:
+    cursor.execute(f"SELECT sketch FROM {SKETCH_TABLE} WHERE symbol = %s", (symbol.lower(),))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    data = row[0] if isinstance(row[0], dict) else json.loads(row[0])
+    return MomentumSketch.from_dict(data)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Parquet export and reader for research jobs.
+
+Exports historical_data.<symbol>_price_history and the archived strike
+snapshots (historical_data.strike_snapshots) to Hive-partitioned Parquet:
+
+    backend/data/parquet/price_history/<symbol>/year=YYYY/month=MM/data.parquet
+    backend/data/parquet/strike_snapshots/year=YYYY/month=MM/data.parquet
+
+Rows are streamed from a server-side cursor in timestamp order, so each month
+file is written chunk by chunk as row groups with tight min/max statistics.
+Readers pass columns and filters down to pyarrow, which skips partitions and
+row groups that cannot match and memory-maps what it does read.
+
+Usage:
+    python backend/util/parquet_store.py export-prices btc
+    python backend/util/parquet_store.py export-prices btc --since 2025-08-01
+    python backend/util/parquet_store.py export-strikes
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, datetime
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.paths import get_data_dir
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Rows per fetch from the server-side cursor; also the Parquet row group size
+EXPORT_CHUNK_ROWS = 50000
+
+PRICE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume", "momentum")
+
+# NUMERIC columns come back as Decimal, which pyarrow stores with a precision
+# inferred per chunk; cast them so every chunk of a month has the same schema
+_PRICE_HISTORY_SELECT = "SELECT timestamp, " + ", ".join(f"{column}::float8" for column in PRICE_COLUMNS[1:])
+
+STRIKE_SNAPSHOT_COLUMNS = (
+    "event_ticker", "strike", "ts", "yes_bid", "yes_ask", "no_bid", "no_ask",
+    "last_price", "volume", "snapshot"
+)
+
+# Common strike fields are lifted out of the JSONB snapshot so research jobs can project them
+_STRIKE_SNAPSHOT_SELECT = """
+    SELECT event_ticker, strike::float8, ts,
+           (snapshot->>'yes_bid')::float8, (snapshot->>'yes_ask')::float8,
+           (snapshot->>'no_bid')::float8, (snapshot->>'no_ask')::float8,
+           (snapshot->>'last_price')::float8, (snapshot->>'volume')::float8,
+           snapshot::text
+    FROM historical_data.strike_snapshots
+"""
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('POSTGRES_HOST', 'localhost'),
+    'port': os.getenv('POSTGRES_PORT', '5432'),
+    'database': os.getenv('POSTGRES_DB', 'rec_io_db'),
+    'user': os.getenv('POSTGRES_USER', 'rec_io_user'),
+    'password': os.getenv('POSTGRES_PASSWORD', 'rec_io_password')
+}
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet export/read (pip install pyarrow)")
+
+
+def get_parquet_root() -> str:
+    """Root directory of all exported Parquet datasets."""
+    return os.path.join(get_data_dir(), "parquet")
+
+
+def price_history_path(symbol: str, root: Optional[str] = None) -> str:
+    return os.path.join(root or get_parquet_root(), "price_history", symbol.lower())
+
+
+def strike_snapshots_path(root: Optional[str] = None) -> str:
+    return os.path.join(root or get_parquet_root(), "strike_snapshots")
+
+
+def month_partition_dir(dataset_path: str, year: int, month: int) -> str:
+    return os.path.join(dataset_path, f"year={year:04d}", f"month={month:02d}")
+
+
+def write_monthly_partitions(chunks: Iterator[pd.DataFrame], dataset_path: str, time_column: str) -> List[str]:
+    """
+    Write time-ordered DataFrame chunks as one Parquet file per month.
+
+    Each month is written to a temporary file and renamed into place when the
+    month is complete, so readers never see half-written partitions and
+    re-exporting a month replaces it. Returns the written file paths.
+    """
+    _require_pyarrow()
+    written = []
+    writer = None
+    current = None
+    tmp_path = final_path = None
+
+    def close_month():
+        nonlocal writer
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.replace(tmp_path, final_path)
+            written.append(final_path)
+
+    try:
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            if not pd.api.types.is_datetime64_dtype(chunk[time_column]):
+                # timestamptz values carry the session's UTC offset, which changes across DST
+                chunk = chunk.assign(**{time_column: pd.to_datetime(chunk[time_column], utc=True)})
+            months = chunk[time_column].dt.year * 100 + chunk[time_column].dt.month
+            for key in months.unique():
+                month = (int(key) // 100, int(key) % 100)
+                if month != current:
+                    close_month()
+                    current = month
+                    month_dir = month_partition_dir(dataset_path, *month)
+                    os.makedirs(month_dir, exist_ok=True)
+                    final_path = os.path.join(month_dir, "data.parquet")
+                    tmp_path = final_path + ".tmp"
+                table = pa.Table.from_pandas(chunk[months == key], preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+                writer.write_table(table, row_group_size=EXPORT_CHUNK_ROWS)
+        close_month()
+    finally:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+    return written
+
+
+def _stream_query(conn, query: str, params: Sequence[Any], columns: Sequence[str]) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame chunks from a server-side (named) cursor."""
+    with conn.cursor(name="parquet_export") as cursor:
+        cursor.itersize = EXPORT_CHUNK_ROWS
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+            if not rows:
+                break
+            yield pd.DataFrame.from_records(rows, columns=columns)
+
+
+def _since_clause(column: str, since: Optional[date]) -> Tuple[str, List[Any]]:
+    # Exports always restart at a month boundary so whole month files are rewritten
+    if since is None:
+        return "", []
+    return f" WHERE {column} >= %s", [date(since.year, since.month, 1)]
+
+
+def export_price_history(conn, symbol: str, since: Optional[date] = None, root: Optional[str] = None) -> List[str]:
+    """Export historical_data.<symbol>_price_history to monthly Parquet partitions."""
+    where, params = _since_clause("timestamp", since)
+    query = (
+        f"{_PRICE_HISTORY_SELECT} FROM historical_data.{symbol.lower()}_price_history"
+        f"{where} ORDER BY timestamp"
+    )
+    chunks = _stream_query(conn, query, params, PRICE_COLUMNS)
+    return write_monthly_partitions(chunks, price_history_path(symbol, root), "timestamp")
+
+
+def export_strike_snapshots(conn, since: Optional[date] = None, root: Optional[str] = None) -> List[str]:
+    """Export historical_data.strike_snapshots to monthly Parquet partitions."""
+    where, params = _since_clause("ts", since)
+    query = f"{_STRIKE_SNAPSHOT_SELECT}{where} ORDER BY ts"
+    chunks = _stream_query(conn, query, params, STRIKE_SNAPSHOT_COLUMNS)
+    return write_monthly_partitions(chunks, strike_snapshots_path(root), "ts")
+
+
+def time_range_filters(column: str, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> List[Tuple[str, str, Any]]:
+    """
+    Filters selecting start <= column < end.
+
+    Year bounds are added as well so whole year partitions are pruned before
+    any file footer is read.
+    """
+    filters = []
+    if start is not None:
+        filters += [("year", ">=", start.year), (column, ">=", pd.Timestamp(start))]
+    if end is not None:
+        filters += [("year", "<=", end.year), (column, "<", pd.Timestamp(end))]
+    return filters
+
+
+def read_dataset(path: str, columns: Optional[Sequence[str]] = None, filters: Optional[List] = None,
+                 memory_map: bool = True, as_pandas: bool = True):
+    """
+    Read a Parquet dataset (or single file) with projection and predicate pushdown.
+
+    Args:
+        path: Dataset directory or .parquet file
+        columns: Columns to read; None reads all
+        filters: pyarrow filters, e.g. [("momentum", ">=", 10)]
+        memory_map: Memory-map files instead of reading them into buffers
+        as_pandas: Return a DataFrame (default) or the pyarrow Table
+    """
+    _require_pyarrow()
+    table = pq.read_table(
+        path,
+        columns=list(columns) if columns is not None else None,
+        filters=filters or None,
+        memory_map=memory_map,
+        partitioning="hive",
+    )
+    return table.to_pandas() if as_pandas else table
+
+
+def read_price_history(symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       columns: Optional[Sequence[str]] = None, filters: Optional[List] = None,
+                       root: Optional[str] = None, **kwargs):
+    """Read exported price history for symbol between start (inclusive) and end (exclusive)."""
+    filters = time_range_filters("timestamp", start, end) + list(filters or [])
+    return read_dataset(price_history_path(symbol, root), columns, filters, **kwargs)
+
+
+def read_strike_snapshots(event_tickers: Optional[Sequence[str]] = None, start: Optional[datetime] = None,
+                          end: Optional[datetime] = None, columns: Optional[Sequence[str]] = None,
+                          filters: Optional[List] = None, root: Optional[str] = None, **kwargs):
+    """Read exported strike snapshots, optionally limited to some events and a time range."""
+    filters = time_range_filters("ts", start, end) + list(filters or [])
+    if event_tickers:
+        filters.append(("event_ticker", "in", list(event_tickers)))
+    return read_dataset(strike_snapshots_path(root), columns, filters, **kwargs)
+
+
+def is_parquet_path(path: str) -> bool:
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+def load_frame(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Load a price frame from either a CSV file or a Parquet dataset.
+
+    Research scripts call this instead of pd.read_csv so they accept exported
+    datasets too; with Parquet only the requested columns are read.
+    """
+    if is_parquet_path(path):
+        df = read_dataset(path, columns=columns)
+        # Hive partition keys come back as columns unless a projection excluded them
+        return df if columns else df.drop(columns=["year", "month"], errors="ignore")
+    return pd.read_csv(path, usecols=list(columns) if columns else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export historical data to partitioned Parquet.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    prices = subparsers.add_parser("export-prices", help="Export historical_data.<symbol>_price_history")
+    prices.add_argument("symbol", help="Symbol, e.g. btc")
+    strikes = subparsers.add_parser("export-strikes", help="Export historical_data.strike_snapshots")
+    for sub in (prices, strikes):
+        sub.add_argument("--since", type=date.fromisoformat,
+                         help="Only re-export months from this date on (YYYY-MM-DD)")
+        sub.add_argument("--root", help=f"Output root (default {get_parquet_root()})")
+    args = parser.parse_args()
+
+    import psycopg2
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        if args.command == "export-prices":
+            written = export_price_history(conn, args.symbol, args.since, args.root)
+        else:
+            written = export_strike_snapshots(conn, args.since, args.root)
+    finally:
+        conn.close()
+
+    for path in written:
+        print(f"✅ Wrote {path}")
+    print(f"Exported {len(written)} monthly partitions")
+
+
+if __name__ == "__main__":
+    main()
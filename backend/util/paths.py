@@ -32,6 +32,14 @@ def get_btc_price_history_dir():
     """Get the BTC price history directory path."""
     return os.path.join(get_price_history_dir(), "btc")
 
+def get_probability_lookup_dir():
+    """Get the directory for dense probability lookup artifacts."""
+    return os.path.join(get_data_dir(), "probability_lookup")
+
+def get_fingerprint_cache_dir():
+    """Get the directory for prepared fingerprint caches."""
+    return os.path.join(get_data_dir(), "fingerprint_cache")
+
 def get_trade_history_dir():
     """Get the trade history directory path."""
     # Only use user-specific trade history location
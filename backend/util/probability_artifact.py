@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Dense binary probability lookup artifacts.
+
+analytics.probability_lookup_<symbol> is a regular grid over
+(momentum_bucket, ttc_seconds, buffer_points). The same grid is also written
+as one float32 .npy array,
+
+    cube[momentum_index, ttc_index, buffer_index] = (prob_within_positive, prob_within_negative)
+
+with a JSON manifest holding the axes and the array's sha256. Artifacts are
+immutable and named by version; a small pointer file names the production
+version:
+
+    probability_lookup_btc_<version>.npy
+    probability_lookup_btc_<version>.json
+    probability_lookup_btc.current
+
+Consumers np.load the production array with mmap_mode='r', so every process
+on the host shares one page-cache copy and opening it is instant. Publishing
+a version writes a new pointer and os.replace()s it over the old one, which is
+atomic: a reader sees either the old version or the new one.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.paths import get_probability_lookup_dir
+
+ARTIFACT_FORMAT = 1
+POSITIVE, NEGATIVE = 0, 1
+
+# Same answers as LookupProbabilityCalculator for buffers past the grid and missing cells
+OUT_OF_RANGE_PROBABILITY = 99.9
+MISSING_PROBABILITY = 50.0
+
+
+def _artifact_dir(directory: Optional[str]) -> str:
+    return directory or get_probability_lookup_dir()
+
+
+def artifact_paths(symbol: str, version: str, directory: Optional[str] = None) -> Tuple[str, str]:
+    """(.npy path, manifest path) of one artifact version."""
+    base = os.path.join(_artifact_dir(directory), f"probability_lookup_{symbol.lower()}_{version}")
+    return f"{base}.npy", f"{base}.json"
+
+
+def pointer_path(symbol: str, directory: Optional[str] = None) -> str:
+    return os.path.join(_artifact_dir(directory), f"probability_lookup_{symbol.lower()}.current")
+
+
+def new_version() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def empty_cube(axes: Dict[str, List[int]]) -> np.ndarray:
+    """NaN-filled cube for axes as stored in the manifest."""
+    shape = (axes["momentum"][2], axes["ttc"][2], axes["buffer"][2], 2)
+    return np.full(shape, np.nan, dtype=np.float32)
+
+
+def fill_cube(cube: np.ndarray, axes: Dict[str, List[int]], ttc_seconds, buffer_points, momentum_buckets,
+              prob_within_positive, prob_within_negative):
+    """Place lookup table rows into their cells; rows off the grid are ignored."""
+    indices = []
+    for name, values in (("momentum", momentum_buckets), ("ttc", ttc_seconds), ("buffer", buffer_points)):
+        start, step, count = axes[name]
+        offset = np.asarray(values, dtype=np.int64) - start
+        indices.append((offset // step, (offset % step == 0) & (offset >= 0) & (offset // step < count)))
+    on_grid = indices[0][1] & indices[1][1] & indices[2][1]
+    m, t, b = (index[on_grid] for index, _ in indices)
+    cube[m, t, b, POSITIVE] = np.asarray(prob_within_positive, dtype=np.float32)[on_grid]
+    cube[m, t, b, NEGATIVE] = np.asarray(prob_within_negative, dtype=np.float32)[on_grid]
+
+
+def write_artifact(symbol: str, version: str, cube: np.ndarray, axes: Dict[str, List[int]],
+                   source: Optional[str] = None, directory: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write a cube and its manifest as a new artifact version.
+
+    Args:
+        cube: float32 array (momentum, ttc, buffer, 2)
+        axes: {"momentum": [start, step, count], "ttc": [...], "buffer": [...]}
+        source: Where the values came from, e.g. the lookup table name
+
+    Returns:
+        The manifest
+    """
+    expected_shape = (axes["momentum"][2], axes["ttc"][2], axes["buffer"][2], 2)
+    if cube.shape != expected_shape:
+        raise ValueError(f"Cube shape {cube.shape} does not match axes {expected_shape}")
+    npy_path, _ = artifact_paths(symbol, version, directory)
+    os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+
+    tmp_path = f"{npy_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(cube, dtype=np.float32))
+    os.replace(tmp_path, npy_path)
+    return _write_manifest(symbol, version, axes, int(np.isnan(cube[..., POSITIVE]).sum()), source, directory)
+
+
+def create_artifact_cube(symbol: str, version: str, axes: Dict[str, List[int]],
+                         directory: Optional[str] = None) -> np.memmap:
+    """
+    A NaN-filled cube backed by the version's .npy file, for artifacts too
+    large to build in memory. Fill it, then call finish_artifact().
+    """
+    npy_path, _ = artifact_paths(symbol, version, directory)
+    os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+    shape = (axes["momentum"][2], axes["ttc"][2], axes["buffer"][2], 2)
+    cube = np.lib.format.open_memmap(f"{npy_path}.tmp", mode="w+", dtype=np.float32, shape=shape)
+    for m in range(shape[0]):
+        cube[m] = np.nan
+    return cube
+
+
+def finish_artifact(symbol: str, version: str, cube: np.memmap, axes: Dict[str, List[int]],
+                    source: Optional[str] = None, directory: Optional[str] = None) -> Dict[str, Any]:
+    """Flush a cube from create_artifact_cube() into place and write its manifest."""
+    cube.flush()
+    missing_cells = sum(int(np.isnan(cube[m, ..., POSITIVE]).sum()) for m in range(cube.shape[0]))
+    npy_path, _ = artifact_paths(symbol, version, directory)
+    os.replace(f"{npy_path}.tmp", npy_path)
+    return _write_manifest(symbol, version, axes, missing_cells, source, directory)
+
+
+def _write_manifest(symbol: str, version: str, axes: Dict[str, List[int]], missing_cells: int,
+                    source: Optional[str], directory: Optional[str]) -> Dict[str, Any]:
+    npy_path, manifest_path = artifact_paths(symbol, version, directory)
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "symbol": symbol.lower(),
+        "version": version,
+        "axes": axes,
+        "sha256": file_sha256(npy_path),
+        "missing_cells": missing_cells,
+        "source": source,
+        "created_at": datetime.now().isoformat(),
+    }
+    _write_json(manifest_path, manifest)
+    return manifest
+
+
+def read_manifest(symbol: str, version: str, directory: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    _, manifest_path = artifact_paths(symbol, version, directory)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def verify_artifact(symbol: str, version: str, directory: Optional[str] = None) -> bool:
+    """True if the version's array exists and matches its manifest checksum."""
+    manifest = read_manifest(symbol, version, directory)
+    npy_path, _ = artifact_paths(symbol, version, directory)
+    return bool(manifest) and os.path.exists(npy_path) and file_sha256(npy_path) == manifest["sha256"]
+
+
+def production_version(symbol: str, directory: Optional[str] = None) -> Optional[str]:
+    try:
+        with open(pointer_path(symbol, directory)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_artifact(symbol: str, version: str, directory: Optional[str] = None):
+    """Make a verified version the production artifact in one atomic rename."""
+    if not verify_artifact(symbol, version, directory):
+        raise ValueError(f"Artifact {symbol.lower()} {version} is missing or fails its checksum")
+    path = pointer_path(symbol, directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, path)
+
+
+def list_artifact_versions(symbol: str, directory: Optional[str] = None) -> List[str]:
+    """Versions on disk, newest first."""
+    prefix = f"probability_lookup_{symbol.lower()}_"
+    try:
+        names = os.listdir(_artifact_dir(directory))
+    except FileNotFoundError:
+        return []
+    return sorted((name[len(prefix):-len(".json")] for name in names
+                   if name.startswith(prefix) and name.endswith(".json")), reverse=True)
+
+
+class ProbabilityLookupArtifact:
+    """A memory-mapped artifact with vectorized bilinear lookups."""
+
+    def __init__(self, manifest: Dict[str, Any], cube: np.ndarray):
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.cube = cube
+        self.axes = manifest["axes"]
+
+    @classmethod
+    def load(cls, symbol: str, version: Optional[str] = None, directory: Optional[str] = None,
+             verify: bool = False) -> Optional["ProbabilityLookupArtifact"]:
+        """
+        Map an artifact version (production by default) read-only.
+
+        Returns None if there is no such artifact. verify re-checks the
+        checksum, which reads the whole file.
+        """
+        version = version or production_version(symbol, directory)
+        if version is None:
+            return None
+        manifest = read_manifest(symbol, version, directory)
+        if manifest is None:
+            return None
+        if verify and not verify_artifact(symbol, version, directory):
+            raise ValueError(f"Artifact {symbol.lower()} {version} fails its checksum")
+        npy_path, _ = artifact_paths(symbol, version, directory)
+        return cls(manifest, np.load(npy_path, mmap_mode="r"))
+
+    def _grid_position(self, name: str, values) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start, step, count = self.axes[name]
+        position = np.clip((np.asarray(values, dtype=float) - start) / step, 0, count - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, count - 1)
+        return lower, upper, position - lower
+
+    def lookup(self, ttc_seconds, buffer_points, momentum_buckets) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bilinear (prob_within_positive, prob_within_negative) for arrays of inputs.
+
+        TTC is clamped to the grid and momentum to the nearest bucket present.
+        Buffers past the grid return OUT_OF_RANGE_PROBABILITY.
+        """
+        ttc_seconds, buffer_points, momentum_buckets = np.broadcast_arrays(
+            np.asarray(ttc_seconds, dtype=float), np.asarray(buffer_points, dtype=float),
+            np.asarray(momentum_buckets, dtype=float))
+        m_start, m_step, m_count = self.axes["momentum"]
+        m = np.clip(np.round((momentum_buckets - m_start) / m_step), 0, m_count - 1).astype(np.int64)
+        t0, t1, ft = self._grid_position("ttc", ttc_seconds)
+        b0, b1, fb = self._grid_position("buffer", buffer_points)
+
+        ft, fb = ft[..., None], fb[..., None]
+        values = ((1 - ft) * (1 - fb) * self.cube[m, t0, b0] + ft * (1 - fb) * self.cube[m, t1, b0] +
+                  (1 - ft) * fb * self.cube[m, t0, b1] + ft * fb * self.cube[m, t1, b1])
+        values = np.where(np.isnan(values), MISSING_PROBABILITY, values)
+
+        b_start, b_step, b_count = self.axes["buffer"]
+        past_grid = (buffer_points > b_start + b_step * (b_count - 1))[..., None]
+        values = np.where(past_grid, OUT_OF_RANGE_PROBABILITY, values)
+        return values[..., POSITIVE], values[..., NEGATIVE]
+
+    def probability(self, ttc_seconds: float, buffer_points: float, momentum_bucket: int) -> Tuple[float, float]:
+        pos, neg = self.lookup(ttc_seconds, buffer_points, momentum_bucket)
+        return float(pos), float(neg)
+
+    def strike_probability(self, strike: float, current_price: float, ttc_seconds: float,
+                           momentum_score: float) -> float:
+        """
+        prob_within for one strike, choosing the side the way the strike table does:
+        the positive-move probability below the current price, negative at or above it.
+        """
+        pos, neg = self.probability(ttc_seconds, abs(current_price - strike), round(momentum_score * 100))
+        return pos if strike < current_price else neg
+
+
+class ProductionArtifact:
+    """
+    The production artifact for a symbol, reopened after a new version is published.
+
+    Checking for a new version is one stat() of the pointer file.
+    """
+
+    def __init__(self, symbol: str, directory: Optional[str] = None):
+        self.symbol = symbol.lower()
+        self.directory = directory
+        self._pointer_id = None
+        self._artifact = None
+
+    def get(self) -> Optional[ProbabilityLookupArtifact]:
+        try:
+            stat = os.stat(pointer_path(self.symbol, self.directory))
+        except FileNotFoundError:
+            return None
+        # Publishing replaces the pointer with a new file
+        pointer_id = (stat.st_ino, stat.st_mtime_ns)
+        if pointer_id != self._pointer_id:
+            self._artifact = ProbabilityLookupArtifact.load(self.symbol, directory=self.directory)
+            self._pointer_id = pointer_id
+        return self._artifact
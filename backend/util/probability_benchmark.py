@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Reproducible accuracy and performance benchmark for the probability lookup engines.
+
+Synthetic directional fingerprints are generated from a closed-form model
+(a drifting random walk whose drift follows the momentum bucket), written in
+the same CSV layout fingerprint_generator_directional.py produces, and loaded
+by the real engines:
+
+    griddata        ProbabilityCalculator, live scipy griddata interpolation
+    sql             LookupProbabilityCalculator against a benchmark lookup table
+                    (only when Postgres is reachable)
+    artifact        ProbabilityLookupArtifact.probability(), one lookup per call
+    artifact_batch  ProbabilityLookupArtifact.lookup() over every query at once
+
+The lookup grid is built from the fingerprints the way
+ProbabilityLookupGenerator builds analytics.probability_lookup_<symbol>. Each
+engine answers the same random queries; the report gives throughput, latency
+percentiles and the maximum error against the model itself (the reference
+surface) and against the live griddata answer.
+
+Results can be saved as a baseline and later runs compared against it.
+Throughput varies between machines, so keep one baseline per machine.
+
+    python backend/util/probability_benchmark.py
+    python backend/util/probability_benchmark.py --engines griddata artifact --save-baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import griddata
+from scipy.special import ndtr
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.paths import get_data_dir
+from backend.util.probability_artifact import ProbabilityLookupArtifact, write_artifact
+from backend.util.probability_service import ProbabilityService
+from backend.util.probability_calculator import ProbabilityCalculator
+
+ENGINES = ["griddata", "sql", "artifact", "artifact_batch"]
+
+# ProbabilityLookupGenerator converts buffer points to move percent at this price
+BASE_PRICE = 120000
+
+# Synthetic fingerprint grid: 1-60 minute rows and 0.00-2.00% move columns
+FINGERPRINT_MINUTES = np.arange(1, 61)
+FINGERPRINT_THRESHOLDS = np.round(np.arange(0, 2.0001, 0.05), 2)
+
+# Model volatility (% per sqrt(minute)) and drift (% per minute per momentum bucket)
+MODEL_VOLATILITY = 0.06
+MODEL_DRIFT_PER_BUCKET = 0.0004
+
+DEFAULT_BUCKETS = list(range(-5, 6))
+DEFAULT_QUERIES = 1000
+# griddata rebuilds its triangulation on every call and the sql engine connects per
+# lookup, so both answer only the first of the queries
+DEFAULT_LIVE_QUERIES = 200
+DEFAULT_SQL_QUERIES = 200
+BATCH_REPEATS = 20
+TTC_STEP = 5
+BUFFER_STEP = 10
+MAX_BUFFER = 2000
+
+# A run regresses if throughput falls below this fraction of the baseline ...
+THROUGHPUT_TOLERANCE = 0.5
+# ... or its maximum error grows by more than this many probability points
+ERROR_TOLERANCE = 0.05
+
+
+def get_baseline_path() -> str:
+    return os.path.join(get_data_dir(), "benchmarks", "probability_lookup_baseline.json")
+
+
+# ---------- Synthetic fingerprints ----------------------------------------------
+
+def model_prob_beyond(ttc_seconds, move_percent, momentum_bucket, direction: str) -> np.ndarray:
+    """Model probability (0-100) that price moves at least move_percent in one direction before close."""
+    minutes = np.maximum(np.asarray(ttc_seconds, dtype=float) / 60, 1e-9)
+    drift = np.asarray(momentum_bucket, dtype=float) * MODEL_DRIFT_PER_BUCKET * minutes
+    if direction == "negative":
+        drift = -drift
+    z = (np.asarray(move_percent, dtype=float) - drift) / (MODEL_VOLATILITY * np.sqrt(minutes))
+    return 100 * np.minimum(2 * (1 - ndtr(z)), 1.0)
+
+
+def synthetic_fingerprint(momentum_bucket: int) -> pd.DataFrame:
+    """One momentum bucket's directional fingerprint in the generator's CSV layout."""
+    ttc = FINGERPRINT_MINUTES[:, None] * 60
+    columns, data = [], []
+    for th in FINGERPRINT_THRESHOLDS:
+        columns.extend([f">= +{th:.2f}%", f"<= -{th:.2f}%"])
+        data.append(model_prob_beyond(ttc, th, momentum_bucket, "positive")[:, 0])
+        data.append(model_prob_beyond(ttc, th, momentum_bucket, "negative")[:, 0])
+    df = pd.DataFrame(np.round(np.column_stack(data), 2), columns=columns)
+    df.index = [f"{t}m TTC" for t in FINGERPRINT_MINUTES]
+    return df
+
+
+def write_synthetic_fingerprints(directory: str, symbol: str, buckets: Sequence[int]) -> Dict[int, str]:
+    """Write one fingerprint CSV per bucket, named like get_fingerprint_filename()."""
+    paths = {}
+    for bucket in buckets:
+        path = os.path.join(directory, f"{symbol}_fingerprint_directional_momentum_{int(bucket):03d}.csv")
+        synthetic_fingerprint(bucket).to_csv(path)
+        paths[bucket] = path
+    return paths
+
+
+def model_prob_within(ttc_seconds, buffer_points, momentum_buckets) -> np.ndarray:
+    """Reference (prob_within_positive, prob_within_negative), clamped to the fingerprint grid like the engines."""
+    ttc = np.clip(ttc_seconds, FINGERPRINT_MINUTES[0] * 60, FINGERPRINT_MINUTES[-1] * 60)
+    move = np.minimum(np.asarray(buffer_points, dtype=float) / BASE_PRICE * 100, FINGERPRINT_THRESHOLDS[-1])
+    return np.column_stack([100 - model_prob_beyond(ttc, move, momentum_buckets, side)
+                            for side in ("positive", "negative")])
+
+
+# ---------- Engines -------------------------------------------------------------
+
+def live_calculator(symbol: str, fingerprint_paths: Dict[int, str]) -> ProbabilityCalculator:
+    """A ProbabilityCalculator loaded from the given files instead of the symbol's fingerprint directory."""
+    calculator = ProbabilityCalculator.__new__(ProbabilityCalculator)
+    calculator.symbol = symbol
+    calculator.momentum_fingerprints = {}
+    calculator.current_momentum_bucket = None
+    calculator.load_momentum_fingerprints = True
+    for bucket, path in fingerprint_paths.items():
+        calculator._load_momentum_fingerprint(path, bucket)
+    calculator._switch_to_momentum_fingerprint(min(fingerprint_paths) / 100)
+    return calculator
+
+
+def build_lookup_cube(calculator: ProbabilityCalculator, buckets: Sequence[int]):
+    """
+    The lookup grid for the buckets as ProbabilityLookupGenerator computes it,
+    interpolating every grid point of a bucket in one griddata call.
+
+    Returns (cube, axes) in the layout of probability_artifact.
+    """
+    ttc_start = int(FINGERPRINT_MINUTES[0] * 60)
+    axes = {
+        "momentum": [min(buckets), 1, max(buckets) - min(buckets) + 1],
+        "ttc": [ttc_start, TTC_STEP, (int(FINGERPRINT_MINUTES[-1] * 60) - ttc_start) // TTC_STEP + 1],
+        "buffer": [0, BUFFER_STEP, MAX_BUFFER // BUFFER_STEP + 1],
+    }
+    ttc = ttc_start + TTC_STEP * np.arange(axes["ttc"][2])
+    move = BUFFER_STEP * np.arange(axes["buffer"][2]) / BASE_PRICE * 100
+    ttc_grid, move_grid = np.meshgrid(ttc, move, indexing="ij")
+
+    cube = np.full((axes["momentum"][2], len(ttc), len(move), 2), np.nan, dtype=np.float32)
+    for bucket in buckets:
+        data = calculator.momentum_fingerprints[bucket]
+        points = np.column_stack([
+            np.clip(ttc_grid.ravel(), data["ttc_values"][0], data["ttc_values"][-1]),
+            np.minimum(move_grid.ravel(), data["positive_move_percentages"][-1]),
+        ])
+        for side, name in enumerate(("positive", "negative")):
+            beyond = griddata(data[f"{name}_interp_points"], data[f"{name}_interp_values"], points, method="linear")
+            # Stored as NUMERIC(5,2) in the lookup table
+            cube[bucket - axes["momentum"][0], :, :, side] = np.round(100 - beyond, 2).reshape(ttc_grid.shape)
+    return cube, axes
+
+
+def griddata_engine(calculator: ProbabilityCalculator):
+    def lookup(ttc_seconds, buffer_points, momentum_bucket):
+        calculator._switch_to_momentum_fingerprint(momentum_bucket / 100)
+        pos, neg = calculator.interpolate_directional_probability(
+            ttc_seconds, buffer_points / BASE_PRICE * 100, "both")
+        return 100 - pos, 100 - neg
+    return lookup
+
+
+def artifact_engine(artifact: ProbabilityLookupArtifact):
+    return artifact.probability
+
+
+def sql_engine(symbol: str, cube: np.ndarray, axes: Dict[str, List[int]], directory: str):
+    """
+    A LookupProbabilityCalculator reading a benchmark copy of the lookup table.
+
+    Returns (lookup, cleanup), or None if Postgres is not reachable.
+    """
+    import psycopg2
+    from psycopg2.extras import execute_values
+    from backend.strike_table_generator import LookupProbabilityCalculator
+
+    calculator = LookupProbabilityCalculator(symbol)
+    try:
+        conn = psycopg2.connect(**calculator.db_config, connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        print(f"⚠️ Postgres not reachable, skipping sql engine: {e}")
+        return None
+
+    table_name = f"probability_lookup_{symbol}_benchmark"
+    calculator.lookup_table_name = table_name
+    # Point the service at an empty directory so every lookup goes to the table
+    calculator.service = ProbabilityService(symbol, directory=directory)
+
+    m, t, b = np.nonzero(~np.isnan(cube[..., 0]))
+    rows = zip((axes["ttc"][0] + axes["ttc"][1] * t).tolist(), (axes["buffer"][0] + axes["buffer"][1] * b).tolist(),
+               (axes["momentum"][0] + axes["momentum"][1] * m).tolist(),
+               cube[m, t, b, 0].tolist(), cube[m, t, b, 1].tolist())
+    cursor = conn.cursor()
+    cursor.execute("CREATE SCHEMA IF NOT EXISTS analytics")
+    cursor.execute(f"DROP TABLE IF EXISTS analytics.{table_name}")
+    cursor.execute(f"""
+        CREATE TABLE analytics.{table_name} (
+            ttc_seconds INTEGER NOT NULL,
+            buffer_points INTEGER NOT NULL,
+            momentum_bucket INTEGER NOT NULL,
+            prob_within_positive NUMERIC(5,2) NOT NULL,
+            prob_within_negative NUMERIC(5,2) NOT NULL
+        )
+    """)
+    execute_values(cursor, f"""
+        INSERT INTO analytics.{table_name}
+        (ttc_seconds, buffer_points, momentum_bucket, prob_within_positive, prob_within_negative) VALUES %s
+    """, rows, page_size=10000)
+    cursor.execute(f"CREATE INDEX ON analytics.{table_name} (ttc_seconds, buffer_points, momentum_bucket)")
+    conn.commit()
+
+    def cleanup():
+        cursor.execute(f"DROP TABLE IF EXISTS analytics.{table_name}")
+        conn.commit()
+        conn.close()
+
+    return calculator.get_probability, cleanup
+
+
+# ---------- Measurement ---------------------------------------------------------
+
+def random_queries(count: int, buckets: Sequence[int], seed: int) -> np.ndarray:
+    """(ttc_seconds, buffer_points, momentum_bucket) rows inside the fingerprint and lookup ranges."""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(FINGERPRINT_MINUTES[0] * 60, FINGERPRINT_MINUTES[-1] * 60 + 1, count),
+        rng.integers(0, MAX_BUFFER + 1, count),
+        rng.choice(np.asarray(buckets), count),
+    ])
+
+
+def measure(lookup, queries: np.ndarray) -> Dict[str, Any]:
+    """Time one lookup call per query."""
+    answers = np.empty((len(queries), 2))
+    latencies = np.empty(len(queries))
+    for i, (ttc, buffer, bucket) in enumerate(queries.tolist()):
+        start = time.perf_counter()
+        answers[i] = lookup(ttc, buffer, bucket)
+        latencies[i] = time.perf_counter() - start
+    return summarize(answers, latencies, len(queries))
+
+
+def measure_batch(artifact: ProbabilityLookupArtifact, queries: np.ndarray,
+                  repeats: int = BATCH_REPEATS) -> Dict[str, Any]:
+    """Time vectorized lookups of the whole query set."""
+    latencies = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        pos, neg = artifact.lookup(queries[:, 0], queries[:, 1], queries[:, 2])
+        latencies[i] = time.perf_counter() - start
+    result = summarize(np.column_stack([pos, neg]), latencies, len(queries) * repeats)
+    result["batch_size"] = len(queries)
+    return result
+
+
+def summarize(answers: np.ndarray, latencies: np.ndarray, lookups: int) -> Dict[str, Any]:
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1e6
+    return {
+        "answers": answers,
+        "lookups": lookups,
+        "lookups_per_second": round(lookups / latencies.sum(), 1),
+        "latency_us": {"p50": round(p50, 1), "p95": round(p95, 1), "p99": round(p99, 1),
+                       "max": round(latencies.max() * 1e6, 1)},
+    }
+
+
+def run_benchmark(engines: Sequence[str] = ("griddata", "sql", "artifact", "artifact_batch"),
+                  buckets: Sequence[int] = DEFAULT_BUCKETS, queries: int = DEFAULT_QUERIES,
+                  live_queries: int = DEFAULT_LIVE_QUERIES, sql_queries: int = DEFAULT_SQL_QUERIES,
+                  seed: int = 7, symbol: str = "btc") -> Dict[str, Any]:
+    """
+    Benchmark the engines on synthetic fingerprints.
+
+    Returns {"config": ..., "engines": {engine: stats}}. Engines that cannot
+    run here (sql without Postgres) are left out.
+    """
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown engines {sorted(unknown)}; expected some of {ENGINES}")
+    buckets = sorted(set(int(b) for b in buckets))
+    query_set = random_queries(queries, buckets, seed)
+    reference = model_prob_within(query_set[:, 0], query_set[:, 1], query_set[:, 2])
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        calculator = live_calculator(symbol, write_synthetic_fingerprints(directory, symbol, buckets))
+        # Errors against the live calculator need its answers even if griddata is not benchmarked
+        live = measure(griddata_engine(calculator), query_set[:live_queries])
+        live_answers = live["answers"]
+        if "griddata" in engines:
+            results["griddata"] = live
+
+        cube, axes = build_lookup_cube(calculator, buckets)
+        write_artifact(symbol, "benchmark", cube, axes, source="synthetic", directory=directory)
+        artifact = ProbabilityLookupArtifact.load(symbol, "benchmark", directory=directory)
+        if "artifact" in engines:
+            results["artifact"] = measure(artifact_engine(artifact), query_set)
+        if "artifact_batch" in engines:
+            results["artifact_batch"] = measure_batch(artifact, query_set)
+
+        if "sql" in engines:
+            engine = sql_engine(symbol, cube, axes, os.path.join(directory, "no_artifact"))
+            if engine is not None:
+                lookup, cleanup = engine
+                try:
+                    results["sql"] = measure(lookup, query_set[:sql_queries])
+                finally:
+                    cleanup()
+
+    for stats in results.values():
+        answers = stats.pop("answers")
+        errors = np.abs(answers - reference[:len(answers)])
+        stats["max_error"] = round(float(errors.max()), 4)
+        stats["mean_error"] = round(float(errors.mean()), 4)
+        count = min(len(answers), len(live_answers))
+        stats["max_error_vs_live"] = round(float(np.abs(answers[:count] - live_answers[:count]).max()), 4)
+
+    return {
+        "config": {"symbol": symbol, "buckets": buckets, "queries": queries, "live_queries": live_queries,
+                   "sql_queries": sql_queries, "seed": seed, "ttc_step": TTC_STEP, "buffer_step": BUFFER_STEP},
+        "created_at": datetime.now().isoformat(),
+        "engines": {name: results[name] for name in ENGINES if name in results},
+    }
+
+
+# ---------- Baselines -----------------------------------------------------------
+
+def save_baseline(report: Dict[str, Any], path: Optional[str] = None):
+    path = path or get_baseline_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_baseline(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    path = path or get_baseline_path()
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        throughput_tolerance: float = THROUGHPUT_TOLERANCE,
+                        error_tolerance: float = ERROR_TOLERANCE) -> List[str]:
+    """Regressions of a report against a baseline, one message each; empty if there are none."""
+    regressions = []
+    if report["config"] != baseline["config"]:
+        regressions.append(f"config differs from baseline: {baseline['config']}")
+    for name, stats in report["engines"].items():
+        before = baseline["engines"].get(name)
+        if before is None:
+            continue
+        if stats["lookups_per_second"] < before["lookups_per_second"] * throughput_tolerance:
+            regressions.append(f"{name}: {stats['lookups_per_second']:,.0f} lookups/s, "
+                               f"baseline {before['lookups_per_second']:,.0f}")
+        for key in ("max_error", "max_error_vs_live"):
+            if stats[key] > before[key] + error_tolerance:
+                regressions.append(f"{name}: {key} {stats[key]} > baseline {before[key]}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n📊 Probability lookup benchmark ({report['config']['queries']} queries, "
+          f"buckets {report['config']['buckets'][0]}..{report['config']['buckets'][-1]})")
+    print(f"{'engine':<16}{'lookups/s':>12}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}"
+          f"{'max err':>10}{'vs live':>10}")
+    for name, stats in report["engines"].items():
+        latency = stats["latency_us"]
+        print(f"{name:<16}{stats['lookups_per_second']:>12,.0f}{latency['p50']:>10}{latency['p95']:>10}"
+              f"{latency['p99']:>10}{stats['max_error']:>10}{stats['max_error_vs_live']:>10}")
+    if "artifact_batch" in report["engines"]:
+        print(f"   artifact_batch latencies are per call of "
+              f"{report['engines']['artifact_batch']['batch_size']} lookups")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark probability lookup engines on synthetic fingerprints")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES, help="Engines to benchmark")
+    parser.add_argument("--buckets", nargs="+", type=int, default=DEFAULT_BUCKETS, help="Momentum buckets")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Random queries per engine")
+    parser.add_argument("--live-queries", type=int, default=DEFAULT_LIVE_QUERIES,
+                        help="Queries for the griddata engine, which is slow by design")
+    parser.add_argument("--sql-queries", type=int, default=DEFAULT_SQL_QUERIES,
+                        help="Queries for the sql engine, which opens a connection per lookup")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the queries")
+    parser.add_argument("--baseline", help=f"Baseline file (default {get_baseline_path()})")
+    parser.add_argument("--save-baseline", action="store_true", help="Save this run as the baseline")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.engines, args.buckets, args.queries, args.live_queries, args.sql_queries, args.seed)
+    print_report(report)
+
+    if args.save_baseline:
+        save_baseline(report, args.baseline)
+        print(f"\n✅ Saved baseline to {args.baseline or get_baseline_path()}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("\nℹ️ No baseline to compare against; run with --save-baseline to create one")
+        return
+    regressions = compare_to_baseline(report, baseline)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ import numpy as np
 import os
 import json
 import time
+import hashlib
+import pickle
 import threading
 import fcntl
 from typing import List, Dict, Tuple, Optional, Union, Sequence, Callable
-from scipy.interpolate import griddata
+import scipy
+from scipy.interpolate import LinearNDInterpolator, griddata
 from datetime import datetime
 import pytz
 import glob
@@ -17,7 +20,16 @@ from .fingerprint_generator_directional import get_fingerprint_dir, get_fingerpr
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.util.paths import get_project_root, get_data_dir
+from backend.util.paths import get_project_root, get_data_dir, get_fingerprint_cache_dir
+from backend.util.fingerprint_store import FINGERPRINT_TABLE, load_fingerprint_cubes
+
+# Bump when the layout of the cached per-bucket structures changes
+FINGERPRINT_CACHE_FORMAT = 1
+
+
+def get_fingerprint_cache_path(symbol: str) -> str:
+    """Path of the prepared fingerprint cache for a symbol."""
+    return os.path.join(get_fingerprint_cache_dir(), f"{symbol.lower()}_fingerprints.pkl")
 
 
 def safe_write_json(data: dict, filepath: str, timeout: float = 0.1):
@@ -60,7 +72,11 @@ class ProbabilityCalculatorPostgreSQL:
         self.load_momentum_fingerprints = True
         self.conn = None
         self._connect_to_database()
-        self._load_all_momentum_fingerprints()
+        fingerprint_version = self._fingerprint_set_version()
+        if not self._load_fingerprint_cache(fingerprint_version):
+            self._load_all_momentum_fingerprints()
+            self._prepare_interpolators()
+            self._save_fingerprint_cache(fingerprint_version)
         if not self.momentum_fingerprints:
             raise RuntimeError("No momentum fingerprints found! The system cannot operate without them.")
         
@@ -76,6 +92,7 @@ class ProbabilityCalculatorPostgreSQL:
             self.positive_interp_values = fingerprint_data['positive_interp_values']
             self.negative_interp_points = fingerprint_data['negative_interp_points']
             self.negative_interp_values = fingerprint_data['negative_interp_values']
+            self.interpolators = fingerprint_data['interpolators']
             self.current_momentum_bucket = default_bucket
             self.last_used_momentum_bucket = default_bucket
     
@@ -94,6 +111,8 @@ class ProbabilityCalculatorPostgreSQL:
     
     def _load_all_momentum_fingerprints(self):
         """Load all momentum-based directional fingerprints from PostgreSQL for hot-swapping."""
+        if self._load_fingerprints_from_store():
+            return
         try:
             cursor = self.conn.cursor()
             
@@ -125,6 +144,123 @@ class ProbabilityCalculatorPostgreSQL:
         except Exception as e:
             raise RuntimeError(f"Failed to load momentum fingerprints: {e}")
     
+    def _load_fingerprints_from_store(self) -> bool:
+        """
+        Load every bucket from analytics.fingerprints in one query.
+        
+        Returns False, leaving the per-bucket tables to be read instead, if the
+        long-format table is missing or has no rows for this symbol.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cubes = load_fingerprint_cubes(cursor, self.symbol)
+            cursor.close()
+        except psycopg2.Error as e:
+            self.conn.rollback()
+            print(f"Long-format fingerprints unavailable, reading per-bucket tables: {e}")
+            return False
+        if cubes is None:
+            return False
+        for momentum_bucket in cubes.buckets:
+            self.momentum_fingerprints[int(momentum_bucket)] = cubes.fingerprint_data(momentum_bucket)
+        print(f"Successfully loaded {len(self.momentum_fingerprints)} momentum fingerprints for {self.symbol.upper()}")
+        return True
+    
+    def _fingerprint_set_version(self) -> Optional[str]:
+        """
+        Identify the current set of fingerprints without reading them.
+        
+        The long-format table is summarised by its row count and latest write;
+        the per-bucket tables by their names, OIDs, storage files and
+        insert/update/delete counters.
+        Returns None if neither can be read, in which case nothing is cached.
+        """
+        state = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(f"SELECT COUNT(*), MAX(updated_at) FROM {FINGERPRINT_TABLE} WHERE symbol = %s",
+                           (self.symbol,))
+            row_count, last_update = cursor.fetchone()
+            cursor.close()
+            if row_count:
+                state = ["store", row_count, str(last_update)]
+        except psycopg2.Error:
+            self.conn.rollback()
+        if state is None:
+            try:
+                cursor = self.conn.cursor()
+                # Regeneration drops and recreates the tables, which resets their counters
+                # but always gives them a new OID
+                cursor.execute("""
+                    SELECT c.relname, c.oid, c.relfilenode, s.n_tup_ins, s.n_tup_upd, s.n_tup_del
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                    WHERE n.nspname = 'analytics' AND c.relkind = 'r' AND c.relname LIKE %s
+                    ORDER BY c.relname
+                """, (f"{self.symbol}_fingerprint_directional_momentum_%",))
+                state = ["tables", [list(row) for row in cursor.fetchall()]]
+                cursor.close()
+            except psycopg2.Error as e:
+                self.conn.rollback()
+                print(f"Fingerprint version unavailable, not using the cache: {e}")
+                return None
+        return hashlib.sha256(json.dumps([self.symbol, state]).encode()).hexdigest()
+    
+    def _prepare_interpolators(self):
+        """
+        Triangulate each bucket once so lookups don't rebuild it per call.
+        
+        griddata(method='linear') is a LinearNDInterpolator over the Delaunay
+        triangulation of the points, so answers are unchanged.
+        """
+        for fingerprint_data in self.momentum_fingerprints.values():
+            fingerprint_data['interpolators'] = {
+                direction: LinearNDInterpolator(fingerprint_data[f'{direction}_interp_points'],
+                                                fingerprint_data[f'{direction}_interp_values'])
+                for direction in ('positive', 'negative')
+            }
+    
+    def _load_fingerprint_cache(self, fingerprint_version: Optional[str]) -> bool:
+        """Load prepared buckets from the cache if it was built from the current fingerprint set."""
+        if fingerprint_version is None:
+            return False
+        cache_path = get_fingerprint_cache_path(self.symbol)
+        try:
+            with open(cache_path, 'rb') as f:
+                cache = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring unreadable fingerprint cache {cache_path}: {e}")
+            return False
+        header = (FINGERPRINT_CACHE_FORMAT, scipy.__version__, self.symbol, fingerprint_version)
+        if cache.get('header') != header:
+            return False
+        self.momentum_fingerprints = cache['momentum_fingerprints']
+        print(f"Loaded {len(self.momentum_fingerprints)} momentum fingerprints for {self.symbol.upper()} from cache")
+        return True
+    
+    def _save_fingerprint_cache(self, fingerprint_version: Optional[str]):
+        """Write the prepared buckets atomically; a failed write only costs the next start a rebuild."""
+        if fingerprint_version is None or not self.momentum_fingerprints:
+            return
+        cache_path = get_fingerprint_cache_path(self.symbol)
+        temp_path = cache_path + '.tmp'
+        cache = {
+            'header': (FINGERPRINT_CACHE_FORMAT, scipy.__version__, self.symbol, fingerprint_version),
+            'momentum_fingerprints': self.momentum_fingerprints,
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            print(f"Failed to write fingerprint cache {cache_path}: {e}")
+    
     def _extract_momentum_bucket(self, table_name: str) -> Optional[int]:
         """Extract momentum bucket number from table name."""
         try:
@@ -277,6 +413,7 @@ class ProbabilityCalculatorPostgreSQL:
         self.positive_interp_values = fingerprint_data['positive_interp_values']
         self.negative_interp_points = fingerprint_data['negative_interp_points']
         self.negative_interp_values = fingerprint_data['negative_interp_values']
+        self.interpolators = fingerprint_data['interpolators']
         self.current_momentum_bucket = closest_bucket
         self.last_used_momentum_bucket = closest_bucket
     
@@ -300,8 +437,8 @@ class ProbabilityCalculatorPostgreSQL:
         point = np.array([[ttc_seconds, move_percent]])
         
         try:
-            pos_prob = griddata(self.positive_interp_points, self.positive_interp_values, point, method='linear')[0]
-            neg_prob = griddata(self.negative_interp_points, self.negative_interp_values, point, method='linear')[0]
+            pos_prob = self.interpolators['positive'](point)[0]
+            neg_prob = self.interpolators['negative'](point)[0]
         except:
             pos_prob = griddata(self.positive_interp_points, self.positive_interp_values, point, method='nearest')[0]
             neg_prob = griddata(self.negative_interp_points, self.negative_interp_values, point, method='nearest')[0]
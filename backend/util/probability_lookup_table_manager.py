@@ -5,6 +5,8 @@ Handles versioned probability lookup tables with validation and production swapp
 
 This manager works with tables generated by probability_lookup_generator.py
 and provides safe versioning and swapping capabilities for production use.
+Each production table is also exported as a dense binary artifact (see
+probability_artifact.py) that consumers memory-map instead of querying.
 """
 
 import os
@@ -16,6 +18,12 @@ from typing import Dict, Any, Optional, List
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.util.probability_artifact import (
+    empty_cube, fill_cube, list_artifact_versions, new_version, production_version, publish_artifact,
+    write_artifact,
+)
 
 # Import config if available, otherwise use environment variables
 try:
@@ -227,10 +235,83 @@ class ProbabilityLookupTableManager:
             if conn:
                 conn.close()
     
+    def export_artifact(self, table_name: Optional[str] = None, version: Optional[str] = None) -> Optional[str]:
+        """
+        Write a lookup table as a new dense artifact version.
+        
+        Args:
+            table_name: Table to export (defaults to the production table)
+            version: Artifact version (defaults to the current timestamp)
+            
+        Returns:
+            The artifact version, or None on failure
+        """
+        table_name = table_name or self.base_table_name
+        version = version or new_version()
+        conn = None
+        try:
+            conn = psycopg2.connect(**self.db_config)
+            cursor = conn.cursor()
+            
+            # The table is a regular grid; derive each axis from its range and distinct values
+            axes = {}
+            for name, column in (("momentum", "momentum_bucket"), ("ttc", "ttc_seconds"), ("buffer", "buffer_points")):
+                cursor.execute(f"SELECT MIN({column}), MAX({column}), COUNT(DISTINCT {column}) FROM {self.analytics_schema}.{table_name}")
+                low, high, count = cursor.fetchone()
+                step = (high - low) // (count - 1) if count > 1 else 1
+                axes[name] = [int(low), int(step), int((high - low) // step + 1)]
+            
+            cube = empty_cube(axes)
+            with conn.cursor(name=f"export_{table_name}") as rows_cursor:
+                rows_cursor.itersize = 200000
+                rows_cursor.execute(f"""
+                    SELECT ttc_seconds, buffer_points, momentum_bucket, prob_within_positive, prob_within_negative
+                    FROM {self.analytics_schema}.{table_name}
+                """)
+                while True:
+                    rows = rows_cursor.fetchmany(200000)
+                    if not rows:
+                        break
+                    ttc, buffer, momentum, pos, neg = zip(*rows)
+                    fill_cube(cube, axes, ttc, buffer, momentum,
+                              [float(p) for p in pos], [float(n) for n in neg])
+            
+            manifest = write_artifact(self.symbol, version, cube, axes,
+                                      source=f"{self.analytics_schema}.{table_name}")
+            print(f"✅ Exported {self.analytics_schema}.{table_name} to artifact {version} "
+                  f"({cube.nbytes / 1e6:.1f} MB, {manifest['missing_cells']:,} missing cells)")
+            return version
+            
+        except Exception as e:
+            print(f"❌ Error exporting artifact: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
+    def swap_production_artifact(self, version: str) -> bool:
+        """Point consumers at another artifact version (e.g. to roll back) with one atomic rename."""
+        try:
+            previous = production_version(self.symbol)
+            publish_artifact(self.symbol, version)
+            print(f"✅ Production artifact for {self.symbol.upper()}: {previous} -> {version}")
+            return True
+        except Exception as e:
+            print(f"❌ Error swapping artifact: {e}")
+            return False
+    
+    def list_artifact_versions(self) -> List[str]:
+        """List artifact versions on disk for this symbol, newest first."""
+        return list_artifact_versions(self.symbol)
+    
     def swap_production_table(self, new_table: str, backup_old: bool = True) -> bool:
         """
         Swap the production table with a new validated table.
         
+        The table is exported as an artifact first; after the table rename
+        commits, the artifact is published with an atomic file rename. Older
+        artifact versions stay on disk for swap_production_artifact.
+        
         Args:
             new_table: Name of the new table to make production
             backup_old: Whether to backup the old production table
@@ -248,6 +329,11 @@ class ProbabilityLookupTableManager:
                 print("❌ Cannot swap: new table validation failed")
                 return False
             
+            artifact_version = self.export_artifact(new_table)
+            if artifact_version is None:
+                print("❌ Cannot swap: artifact export failed")
+                return False
+            
             # Check if current production table exists
             cursor.execute(f"""
                 SELECT EXISTS (
@@ -270,7 +356,7 @@ class ProbabilityLookupTableManager:
             print(f"✅ Swapped {new_table} to production table: {self.analytics_schema}.{self.base_table_name}")
             
             conn.commit()
-            return True
+            return self.swap_production_artifact(artifact_version)
             
         except Exception as e:
             print(f"❌ Error during table swap: {e}")
@@ -318,6 +404,13 @@ def main():
     for table in versioned_tables:
         print(f"   {table}")
     print()
+    # List artifact versions
+    artifact_versions = manager.list_artifact_versions()
+    print(f"📦 Artifact versions found: {len(artifact_versions)} (production: {production_version(manager.symbol)})")
+    for version in artifact_versions:
+        print(f"   {version}")
+    print()
+    
     
     # Validate current production table
     print("🔍 Validating current production table...")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Batched strike probabilities for every consumer.
+
+The strike table, the active trade supervisor and main.py's probability
+endpoints all answer "what is prob_within for this strike" from the production
+lookup artifact (see probability_artifact.py). ProbabilityService is the one
+place that does it, so they agree:
+
+    service = get_probability_service("btc")
+    result = service.evaluate(prices, strikes, ttc_seconds, momentum_scores)
+    result["prob_within"], result["prob_within_positive"], result["prob_within_negative"]
+
+Inputs are arrays (scalars broadcast) and are quantized the way the strike
+table always has: whole seconds to close, whole buffer points and the momentum
+bucket round(momentum_score * 100). Answers for quantized inputs are kept in
+an LRU cache, which is cleared when a new artifact version is published.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.probability_artifact import ProbabilityLookupArtifact, ProductionArtifact
+
+DEFAULT_CACHE_SIZE = 200_000
+
+# Quantized inputs are packed into one int key: 21 bits each of buffer and TTC,
+# the rest for the momentum bucket. Inputs past these limits give the same
+# answers as the limits themselves (clamped TTC, out-of-range buffer).
+_FIELD_BITS = 21
+_FIELD_LIMIT = (1 << _FIELD_BITS) - 1
+_MOMENTUM_LIMIT = 1000
+
+
+def quantize(ttc_seconds, buffer_points, momentum_buckets) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Whole seconds, whole points (truncated, as the strike table does) and integer buckets."""
+    ttc = np.clip(np.round(np.asarray(ttc_seconds, dtype=float)), 0, _FIELD_LIMIT).astype(np.int64)
+    buffer = np.clip(np.abs(np.asarray(buffer_points, dtype=float)), 0, _FIELD_LIMIT).astype(np.int64)
+    momentum = np.clip(np.round(np.asarray(momentum_buckets, dtype=float)),
+                       -_MOMENTUM_LIMIT, _MOMENTUM_LIMIT).astype(np.int64)
+    return ttc, buffer, momentum
+
+
+def momentum_bucket(momentum_score) -> np.ndarray:
+    """Momentum bucket of a score, e.g. 0.043 -> 4."""
+    return np.round(np.asarray(momentum_score, dtype=float) * 100)
+
+
+class ProbabilityService:
+    """Vectorized, cached lookups against a symbol's production artifact."""
+
+    def __init__(self, symbol: str = "btc", directory: Optional[str] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.symbol = symbol.lower()
+        self.production = ProductionArtifact(self.symbol, directory)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # Version of the artifact the latest answers (and the cache) came from
+        self.artifact_version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def artifact(self) -> Optional[ProbabilityLookupArtifact]:
+        """The production artifact, or None if none is published."""
+        return self.production.get()
+
+    def lookup(self, ttc_seconds, buffer_points, momentum_buckets) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (prob_within_positive, prob_within_negative) for arrays of quantized inputs.
+
+        Returns None if no artifact is published.
+        """
+        artifact = self.artifact()
+        if artifact is None:
+            return None
+        ttc, buffer, momentum = np.broadcast_arrays(*quantize(ttc_seconds, buffer_points, momentum_buckets))
+        shape = ttc.shape
+        ttc, buffer, momentum = ttc.ravel(), buffer.ravel(), momentum.ravel()
+
+        # A batch larger than the cache would only evict itself
+        if len(ttc) > self.cache_size:
+            with self._lock:
+                self._use_version(artifact.version)
+            pos, neg = artifact.lookup(ttc, buffer, momentum)
+            return np.asarray(pos, dtype=float).reshape(shape), np.asarray(neg, dtype=float).reshape(shape)
+
+        keys = (((momentum + _MOMENTUM_LIMIT) << (2 * _FIELD_BITS)) | (ttc << _FIELD_BITS) | buffer).tolist()
+        with self._lock:
+            self._use_version(artifact.version)
+            cache = self._cache
+            found = [cache.get(key) for key in keys]
+            missing = [i for i, value in enumerate(found) if value is None]
+            for key, value in zip(keys, found):
+                if value is not None:
+                    cache.move_to_end(key)
+            if missing:
+                pos, neg = artifact.lookup(ttc[missing], buffer[missing], momentum[missing])
+                for i, value in zip(missing, zip(pos.tolist(), neg.tolist())):
+                    found[i] = value
+                    cache[keys[i]] = value
+                while len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        values = np.array(found, dtype=float).reshape(shape + (2,))
+        return values[..., 0], values[..., 1]
+
+    def _use_version(self, version: str):
+        """Drop cached answers from other artifact versions; call with the lock held."""
+        if version != self.artifact_version:
+            self._cache.clear()
+            self.artifact_version = version
+
+    def probability(self, ttc_seconds: float, buffer_points: float,
+                    momentum_bucket: int) -> Optional[Tuple[float, float]]:
+        result = self.lookup(ttc_seconds, buffer_points, momentum_bucket)
+        if result is None:
+            return None
+        return float(result[0]), float(result[1])
+
+    def evaluate(self, current_prices, strikes, ttc_seconds, momentum_scores) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Probabilities for arrays of (price, strike, ttc, momentum score).
+
+        prob_within uses the positive-move side for strikes below the price and
+        the negative-move side at or above it. Returns None if no artifact is
+        published.
+        """
+        prices, strikes, ttc_seconds, momentum_scores = np.broadcast_arrays(
+            np.asarray(current_prices, dtype=float), np.asarray(strikes, dtype=float),
+            np.asarray(ttc_seconds, dtype=float), np.asarray(momentum_scores, dtype=float))
+        result = self.lookup(ttc_seconds, np.abs(prices - strikes), momentum_bucket(momentum_scores))
+        if result is None:
+            return None
+        positive, negative = result
+        return {
+            "prob_within": np.where(strikes < prices, positive, negative),
+            "prob_within_positive": positive,
+            "prob_within_negative": negative,
+        }
+
+    def strike_probability(self, strike: float, current_price: float, ttc_seconds: float,
+                           momentum_score: float) -> Optional[float]:
+        result = self.evaluate(current_price, strike, ttc_seconds, momentum_score)
+        return None if result is None else float(result["prob_within"])
+
+    def cache_info(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "max_size": self.cache_size,
+                "artifact_version": self.artifact_version}
+
+
+_services: Dict[str, ProbabilityService] = {}
+_services_lock = threading.Lock()
+
+
+def get_probability_service(symbol: str = "btc") -> ProbabilityService:
+    """Get or create the process-wide service for a symbol."""
+    symbol = symbol.lower()
+    with _services_lock:
+        if symbol not in _services:
+            _services[symbol] = ProbabilityService(symbol)
+        return _services[symbol]
+
+
+def evaluate_probabilities(current_prices, strikes, ttc_seconds, momentum_scores,
+                           symbol: str = "btc") -> Optional[Dict[str, np.ndarray]]:
+    """ProbabilityService.evaluate() on the process-wide service for a symbol."""
+    return get_probability_service(symbol).evaluate(current_prices, strikes, ttc_seconds, momentum_scores)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Replay archived hours through the auto entry and auto stop rules.
+
+Each hour-event is loaded once into a compact HourEvent: numpy arrays of
+1-second prices/momentum and of the archived strike snapshots
+(historical_data.strike_snapshots), grouped by snapshot time. The replay then
+walks the seconds of the hour on simulated time:
+
+- every archived snapshot is priced into a ladder with the same functions the
+  strike table generator uses (price_strike, filter_watchlist) and run
+  through the auto entry rules (evaluate_watchlist, TradedStrikeIndex
+  cooldowns and already-traded checks);
+- every second, open positions are re-priced and run through the auto stop
+  rules (evaluate_probability_stops, evaluate_momentum_spike);
+- positions still open at the top of the hour settle against the last price.
+
+Fills are simulated at the decision ladder's ask (entries) and bid (stops),
+adjusted by a fixed slippage. Events are independent, so replay_events runs
+one hour-event per worker process and every config against it.
+
+Usage:
+    python backend/util/replay_engine.py KXBTCD-25AUG1515 KXBTCD-25AUG1516 \\
+        --min-probability 90 95 --stop-threshold 30 40 --workers 8
+"""
+
+import argparse
+import functools
+import itertools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.auto_entry_engine import TradedStrikeIndex, evaluate_watchlist
+from backend.util.auto_stop_engine import (
+    AutoStopSettings, AutoStopState, evaluate_momentum_spike, evaluate_probability_stops, trade_probability
+)
+from backend.util.watchlist import (
+    DEFAULT_WATCHLIST_MAX_ASK, DEFAULT_WATCHLIST_MIN_VOLUME, filter_watchlist, get_watchlist_filters, price_strike
+)
+
+# (ttc_seconds, buffer_points, momentum_bucket) -> (positive_probability, negative_probability)
+ProbabilityFn = Callable[[int, int, int], Tuple[float, float]]
+
+# The strike table generator prices the closest strikes to the current price
+LADDER_STRIKES = 21
+
+EASTERN = "America/New_York"
+
+
+@dataclass
+class HourEvent:
+    """Everything needed to replay one hourly event, as flat arrays."""
+    event_ticker: str
+    expiry: float               # Epoch seconds the event settles
+    price_ts: np.ndarray        # Epoch seconds, one entry per price tick
+    price: np.ndarray
+    momentum: np.ndarray        # Momentum score as a decimal (0.043 = 4.3%)
+    ladder_ts: np.ndarray       # Sorted snapshot times
+    ladder_start: np.ndarray    # Row offsets of each snapshot; len(ladder_ts) + 1 entries
+    strike: np.ndarray
+    yes_ask: np.ndarray         # Cents
+    no_ask: np.ndarray
+    yes_bid: np.ndarray         # Cents, NaN when not archived
+    no_bid: np.ndarray
+    volume: np.ndarray
+    ticker: np.ndarray          # Object array of market tickers
+
+    def ladder_rows(self, i: int) -> slice:
+        return slice(int(self.ladder_start[i]), int(self.ladder_start[i + 1]))
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    """Auto entry/stop settings and fill model for one replay run."""
+    min_probability: float = 95
+    min_differential: float = 0
+    min_time: int = 0
+    max_time: int = 3600
+    cooldown_seconds: float = 30
+    position_size: int = 1
+    watchlist_min_volume: float = DEFAULT_WATCHLIST_MIN_VOLUME
+    watchlist_max_ask: float = DEFAULT_WATCHLIST_MAX_ASK
+    auto_stop: AutoStopSettings = field(default_factory=AutoStopSettings)
+    slippage_cents: float = 0
+
+
+def _epoch_seconds(values) -> np.ndarray:
+    """Timestamps (naive values are Eastern time) as float epoch seconds."""
+    ts = pd.to_datetime(pd.Series(values))
+    if ts.dt.tz is None:
+        ts = ts.dt.tz_localize(EASTERN)
+    return ts.dt.tz_convert("UTC").astype("int64").to_numpy() / 1e9
+
+
+def _float_column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+
+
+def build_hour_event(event_ticker: str, snapshots: pd.DataFrame, prices: pd.DataFrame) -> HourEvent:
+    """
+    Build an HourEvent from archived snapshot rows and 1-second prices.
+
+    Args:
+        event_ticker: Event being replayed
+        snapshots: Rows with ts, strike, yes_ask, no_ask, volume, ticker and
+            optionally yes_bid/no_bid
+        prices: Rows with ts, price and momentum
+    """
+    snapshots = snapshots.assign(_ts=_epoch_seconds(snapshots["ts"])).sort_values("_ts", kind="stable")
+    prices = prices.assign(_ts=_epoch_seconds(prices["ts"])).sort_values("_ts", kind="stable")
+
+    snap_ts = snapshots["_ts"].to_numpy()
+    ladder_ts, ladder_start = np.unique(snap_ts, return_index=True)
+    # Settles at the top of the hour after the first snapshot (whole-hour UTC offsets keep this valid in ET)
+    expiry = (np.floor(snap_ts[0] / 3600) + 1) * 3600 if len(snap_ts) else 0.0
+
+    return HourEvent(
+        event_ticker=event_ticker,
+        expiry=float(expiry),
+        price_ts=prices["_ts"].to_numpy(),
+        price=prices["price"].to_numpy(dtype=float),
+        momentum=pd.to_numeric(prices["momentum"], errors="coerce").fillna(0).to_numpy(dtype=float),
+        ladder_ts=ladder_ts,
+        ladder_start=np.append(ladder_start, len(snap_ts)),
+        # Archived strikes use the market floor_strike (118499.99); the ladder uses 118500
+        strike=np.floor(_float_column(snapshots, "strike") + 0.01),
+        yes_ask=_float_column(snapshots, "yes_ask"),
+        no_ask=_float_column(snapshots, "no_ask"),
+        yes_bid=_float_column(snapshots, "yes_bid"),
+        no_bid=_float_column(snapshots, "no_bid"),
+        volume=_float_column(snapshots, "volume"),
+        ticker=snapshots["ticker"].to_numpy(dtype=object),
+    )
+
+
+def _price_ladder(event: HourEvent, ladder: int, current_price: float, ttc: int, momentum_bucket: int,
+                  probability_fn: ProbabilityFn) -> List[Dict[str, Any]]:
+    """Price one archived snapshot the way the strike table generator does."""
+    rows = event.ladder_rows(ladder)
+    strikes = event.strike[rows]
+    closest = np.argsort(np.abs(strikes - current_price), kind="stable")[:LADDER_STRIKES]
+    ladder = []
+    for j in closest:
+        yes_ask, no_ask = event.yes_ask[rows][j], event.no_ask[rows][j]
+        if np.isnan(yes_ask) or np.isnan(no_ask):
+            continue
+        strike = float(strikes[j])
+        pos_prob, neg_prob = probability_fn(ttc, int(abs(current_price - strike)), momentum_bucket)
+        probability, yes_diff, no_diff, active_side = price_strike(strike, current_price, pos_prob, neg_prob,
+                                                                   yes_ask, no_ask)
+        ladder.append({
+            "strike": strike, "probability": probability, "yes_ask": yes_ask, "no_ask": no_ask,
+            "yes_diff": yes_diff, "no_diff": no_diff, "volume": event.volume[rows][j],
+            "ticker": event.ticker[rows][j], "active_side": active_side,
+        })
+    return ladder
+
+
+def _exit_price_cents(event: HourEvent, ladder: int, ticker: str, side: str) -> Optional[float]:
+    """Price a position can be sold at: the side's bid, else 100 minus the other side's ask."""
+    rows = event.ladder_rows(ladder)
+    matches = np.flatnonzero(event.ticker[rows] == ticker)
+    if not len(matches):
+        return None
+    j = rows.start + int(matches[0])
+    bid, other_ask = (event.yes_bid[j], event.no_ask[j]) if side == "yes" else (event.no_bid[j], event.yes_ask[j])
+    if not np.isnan(bid):
+        return float(bid)
+    return None if np.isnan(other_ask) else 100.0 - float(other_ask)
+
+
+def replay_event(event: HourEvent, config: ReplayConfig, probability_fn: ProbabilityFn) -> List[Dict[str, Any]]:
+    """
+    Replay one hour-event and return one dict per simulated trade.
+
+    Trade dicts carry entry/exit times and prices (dollars per contract),
+    the exit reason ("auto_stop", "momentum_spike" or "settlement") and pnl.
+    """
+    clock = [0.0]
+    index = TradedStrikeIndex(config.cooldown_seconds, clock=lambda: clock[0])
+    index.ready = True
+    stop_state = AutoStopState()
+    filters = get_watchlist_filters({
+        "min_probability": config.min_probability,
+        "min_differential": config.min_differential,
+        "watchlist_min_volume": config.watchlist_min_volume,
+        "watchlist_max_ask": config.watchlist_max_ask,
+    })
+    slippage = config.slippage_cents
+
+    positions: Dict[int, Dict[str, Any]] = {}
+    trades = []
+    trade_ids = itertools.count(1)
+    next_ladder = 0
+    current_price = None
+
+    def close(position, t, exit_cents, reason, slippage_cents=slippage):
+        exit_price = max(0.0, exit_cents - slippage_cents) / 100.0
+        trades.append({
+            "event_ticker": event.event_ticker, "ticker": position["ticker"], "strike": position["strike"],
+            "side": position["side"], "entry_time": position["entry_time"], "exit_time": t,
+            "entry_price": position["entry_price"], "exit_price": exit_price, "exit_reason": reason,
+            "contracts": config.position_size,
+            "pnl": (exit_price - position["entry_price"]) * config.position_size,
+        })
+        index.apply_trade_event(position["trade_id"], position["ticker"], position["side"], "closed")
+        del positions[position["trade_id"]]
+
+    for k in range(len(event.price_ts)):
+        t = float(event.price_ts[k])
+        if t >= event.expiry:
+            break
+        clock[0] = t
+        current_price = float(event.price[k])
+        momentum = float(event.momentum[k])
+        ttc = int(event.expiry - t)
+        momentum_bucket = round(momentum * 100)
+
+        # Snapshots published since the last tick; entries are decided on the newest one
+        new_ladder = False
+        while next_ladder < len(event.ladder_ts) and event.ladder_ts[next_ladder] <= t:
+            next_ladder += 1
+            new_ladder = True
+        ladder = next_ladder - 1
+        if ladder < 0:
+            continue
+
+        if new_ladder and config.min_time <= ttc <= config.max_time:
+            strikes = _price_ladder(event, ladder, current_price, ttc, momentum_bucket, probability_fn)
+            watchlist = filter_watchlist(strikes, **filters)
+            for candidate in evaluate_watchlist({"strikes": watchlist}, config.min_probability,
+                                                config.min_differential):
+                if not index.try_start_cooldown(candidate["strike_key"]):
+                    continue
+                if index.is_traded(candidate["ticker"], candidate["side"]):
+                    continue
+                trade_id = next(trade_ids)
+                positions[trade_id] = {
+                    "trade_id": trade_id, "ticker": candidate["ticker"], "strike": candidate["strike"],
+                    "side": candidate["side"], "entry_time": t, "status": "active",
+                    "entry_price": candidate["buy_price"] + slippage / 100.0,
+                }
+                index.apply_trade_event(trade_id, candidate["ticker"], candidate["side"], "open")
+
+        if not positions:
+            continue
+
+        # Monitoring pass, as active_trade_supervisor runs once per second
+        open_trades = list(positions.values())
+        for position in open_trades:
+            pos_prob, neg_prob = probability_fn(ttc, int(abs(current_price - position["strike"])), momentum_bucket)
+            raw = pos_prob if position["strike"] < current_price else neg_prob
+            position["current_probability"] = trade_probability(raw, position["side"], position["strike"], current_price)
+            position["time_since_entry"] = int(t - position["entry_time"])
+
+        stops = [(p, "auto_stop") for p in evaluate_probability_stops(open_trades, config.auto_stop, stop_state, t)]
+        stops += [(p, "momentum_spike") for p in evaluate_momentum_spike(open_trades, momentum, config.auto_stop, stop_state)]
+        for position, reason in stops:
+            exit_cents = _exit_price_cents(event, ladder, position["ticker"], position["side"])
+            if exit_cents is not None and position["trade_id"] in positions:
+                close(position, t, exit_cents, reason)
+
+    # Settle what is still open against the last price before expiry
+    for position in list(positions.values()):
+        if current_price is None:
+            break
+        yes_wins = current_price >= position["strike"]
+        won = yes_wins if position["side"] == "yes" else not yes_wins
+        close(position, event.expiry, 100.0 if won else 0.0, "settlement", slippage_cents=0)
+
+    return trades
+
+
+# ---------- PARALLEL REPLAY ------------------------------------------------------------
+
+_worker_configs: Sequence[ReplayConfig] = ()
+_worker_probability_fn: Optional[ProbabilityFn] = None
+
+
+def _init_replay_worker(configs: Sequence[ReplayConfig], probability_fn: ProbabilityFn):
+    global _worker_configs, _worker_probability_fn
+    _worker_configs = configs
+    _worker_probability_fn = probability_fn
+
+
+def _replay_all_configs(event: HourEvent) -> List[Dict[str, Any]]:
+    rows = []
+    for config_id, config in enumerate(_worker_configs):
+        for trade in replay_event(event, config, _worker_probability_fn):
+            trade["config_id"] = config_id
+            rows.append(trade)
+    return rows
+
+
+def replay_events(events: Sequence[HourEvent], configs: Sequence[ReplayConfig], probability_fn: ProbabilityFn,
+                  max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Replay every config against every event, one event per worker task.
+
+    probability_fn must be picklable (a module-level function or an object
+    like LookupProbability). With max_workers=1 everything runs in this process.
+    """
+    if max_workers is None:
+        max_workers = min(multiprocessing.cpu_count(), len(events)) or 1
+    if max_workers == 1:
+        _init_replay_worker(configs, probability_fn)
+        results = [_replay_all_configs(event) for event in events]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_replay_worker,
+                                 initargs=(configs, probability_fn)) as pool:
+            results = list(pool.map(_replay_all_configs, events))
+    return pd.DataFrame(list(itertools.chain.from_iterable(results)))
+
+
+def summarize_replay(trades: pd.DataFrame, configs: Sequence[ReplayConfig]) -> pd.DataFrame:
+    """One row per config: trade count, total/average pnl, win rate and exits by reason."""
+    rows = []
+    for config_id, config in enumerate(configs):
+        subset = trades[trades["config_id"] == config_id] if len(trades) else trades
+        pnl = subset["pnl"].to_numpy() if len(subset) else np.zeros(0)
+        reasons = subset["exit_reason"].value_counts().to_dict() if len(subset) else {}
+        settings = {k: v for k, v in asdict(config).items() if k != "auto_stop"}
+        settings.update({f"stop_{k}": v for k, v in asdict(config.auto_stop).items()})
+        rows.append({
+            "config_id": config_id, **settings, "trades": len(pnl), "total_pnl": float(pnl.sum()),
+            "avg_pnl": float(pnl.mean()) if len(pnl) else None,
+            "win_rate": float((pnl > 0).mean()) if len(pnl) else None,
+            "auto_stops": reasons.get("auto_stop", 0), "momentum_spikes": reasons.get("momentum_spike", 0),
+        })
+    return pd.DataFrame(rows)
+
+
+# ---------- LOADING --------------------------------------------------------------------
+
+class LookupProbability:
+    """Picklable probability_fn backed by the production lookup table, cached per process."""
+
+    def __init__(self, symbol: str = "btc"):
+        self.symbol = symbol
+
+    def __getstate__(self):
+        return {"symbol": self.symbol}
+
+    def __setstate__(self, state):
+        self.symbol = state["symbol"]
+
+    @functools.cached_property
+    def _cached(self):
+        from backend.strike_table_generator import LookupProbabilityCalculator
+        calculator = LookupProbabilityCalculator(self.symbol)
+        return functools.lru_cache(maxsize=200000)(calculator.get_probability)
+
+    def __call__(self, ttc_seconds: int, buffer_points: int, momentum_bucket: int) -> Tuple[float, float]:
+        return self._cached(ttc_seconds, buffer_points, momentum_bucket)
+
+
+def load_hour_event(cursor, event_ticker: str, symbol: str = "btc") -> Optional[HourEvent]:
+    """Load one event's archived snapshots and the 1-second prices of its hour."""
+    from backend.util.strike_archive import load_strike_snapshots
+
+    rows = load_strike_snapshots(cursor, event_tickers=[event_ticker])
+    if not rows:
+        return None
+    snapshots = pd.DataFrame([{**(snapshot or {}), "strike": strike, "ts": ts}
+                              for _, strike, ts, snapshot in rows])
+    start = pd.Timestamp(snapshots["ts"].min()).tz_convert(EASTERN).floor("h")
+    cursor.execute(f"""
+        SELECT timestamp, price, momentum FROM live_data.live_price_log_1s_{symbol.lower()}
+        WHERE timestamp >= %s AND timestamp < %s ORDER BY timestamp
+    """, (start.tz_localize(None).isoformat(), (start + pd.Timedelta(hours=1)).tz_localize(None).isoformat()))
+    prices = pd.DataFrame(cursor.fetchall(), columns=["ts", "price", "momentum"])
+    if prices.empty:
+        return None
+    return build_hour_event(event_ticker, snapshots, prices)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay archived hours through auto entry/stop rules.")
+    parser.add_argument("events", nargs="+", help="Event tickers to replay")
+    parser.add_argument("--symbol", default="btc")
+    parser.add_argument("--min-probability", nargs="+", type=float, default=[95])
+    parser.add_argument("--min-differential", nargs="+", type=float, default=[0])
+    parser.add_argument("--stop-threshold", nargs="+", type=float, default=[40])
+    parser.add_argument("--slippage-cents", type=float, default=0)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    import psycopg2
+    conn = psycopg2.connect(
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=os.getenv('POSTGRES_PORT', '5432'),
+        database=os.getenv('POSTGRES_DB', 'rec_io_db'),
+        user=os.getenv('POSTGRES_USER', 'rec_io_user'),
+        password=os.getenv('POSTGRES_PASSWORD', 'rec_io_password')
+    )
+    try:
+        with conn.cursor() as cursor:
+            events = [e for e in (load_hour_event(cursor, ticker, args.symbol) for ticker in args.events) if e]
+    finally:
+        conn.close()
+    print(f"Loaded {len(events)} of {len(args.events)} events")
+
+    configs = [
+        ReplayConfig(min_probability=p, min_differential=d, slippage_cents=args.slippage_cents,
+                     auto_stop=replace(AutoStopSettings(), threshold=s))
+        for p, d, s in itertools.product(args.min_probability, args.min_differential, args.stop_threshold)
+    ]
+    trades = replay_events(events, configs, LookupProbability(args.symbol), max_workers=args.workers)
+    print(summarize_replay(trades, configs).sort_values("total_pnl", ascending=False).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Consolidated historical archive for live strike and header snapshots.
+
+Every hourly event used to get its own historical_data.<event>_strikes and
+<event>_header table. Instead, all events go into two tables partitioned by
+month:
+
+    historical_data.strike_snapshots (event_ticker, strike, ts, snapshot)
+    historical_data.header_snapshots (event_ticker, ts, snapshot)
+
+snapshot holds the full live row as JSONB, so the archive does not depend on
+the exact live table columns, while event_ticker/strike/ts are typed columns
+covered by the (event_ticker, strike, ts) index. A cross-event backtest is a
+single indexed query with partition pruning on ts.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ARCHIVE_SCHEMA = "historical_data"
+STRIKE_SNAPSHOTS_TABLE = f"{ARCHIVE_SCHEMA}.strike_snapshots"
+HEADER_SNAPSHOTS_TABLE = f"{ARCHIVE_SCHEMA}.header_snapshots"
+
+LIVE_STRIKES_TABLE = "live_data.btc_live_strikes"
+LIVE_HEADER_TABLE = "live_data.btc_live_header"
+
+# Live rows store naive Eastern-time timestamps as text
+LIVE_TIMEZONE = "America/New_York"
+
+CREATE_ARCHIVE_TABLES_SQL = f"""
+CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA};
+CREATE TABLE IF NOT EXISTS {STRIKE_SNAPSHOTS_TABLE} (
+    event_ticker TEXT NOT NULL,
+    strike NUMERIC,
+    ts TIMESTAMPTZ NOT NULL,
+    snapshot JSONB NOT NULL
+) PARTITION BY RANGE (ts);
+CREATE INDEX IF NOT EXISTS idx_strike_snapshots_event_strike_ts
+    ON {STRIKE_SNAPSHOTS_TABLE} (event_ticker, strike, ts);
+CREATE TABLE IF NOT EXISTS {HEADER_SNAPSHOTS_TABLE} (
+    event_ticker TEXT NOT NULL,
+    ts TIMESTAMPTZ NOT NULL,
+    snapshot JSONB NOT NULL
+) PARTITION BY RANGE (ts);
+CREATE INDEX IF NOT EXISTS idx_header_snapshots_event_ts
+    ON {HEADER_SNAPSHOTS_TABLE} (event_ticker, ts);
+"""
+
+# Key columns are read from the row's JSON form so either live column naming works
+_TS_EXPR = "COALESCE(NULLIF(r.j->>'timestamp', ''), NULLIF(r.j->>'ts', ''))::timestamp AT TIME ZONE %(tz)s"
+_STRIKE_EXPR = "COALESCE(NULLIF(r.j->>'strike', ''), NULLIF(r.j->>'strike_price', ''))::numeric"
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    """First day of the month after value's month."""
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Partition table name for a month, e.g. historical_data.strike_snapshots_y2025m08."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_ddl(table: str, month: date) -> str:
+    """CREATE TABLE statement for one monthly partition."""
+    start = month_start(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, start)} "
+        f"PARTITION OF {table} FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+    )
+
+
+def ensure_archive_tables(cursor) -> None:
+    """Create the partitioned archive tables and their indexes if missing."""
+    cursor.execute(CREATE_ARCHIVE_TABLES_SQL)
+
+
+def ensure_partitions(cursor, table: str, months: Iterable[date]) -> None:
+    """Create monthly partitions of table for each given month."""
+    for month in sorted({month_start(m) for m in months}):
+        cursor.execute(partition_ddl(table, month))
+
+
+def _source_months(cursor, source_table: str, event_ticker: str) -> List[date]:
+    cursor.execute(f"""
+        SELECT DISTINCT date_trunc('month', {_TS_EXPR})::date
+        FROM (SELECT to_jsonb(s) AS j FROM {source_table} s WHERE s.event_ticker = %(event)s) r
+    """, {"tz": LIVE_TIMEZONE, "event": event_ticker})
+    return [row[0] for row in cursor.fetchall() if row[0] is not None]
+
+
+def move_event_strikes(cursor, event_ticker: str, source_table: str = LIVE_STRIKES_TABLE) -> int:
+    """
+    Move one event's strike rows from the live table into strike_snapshots.
+
+    The delete and insert are a single statement, so the rows are read once
+    and either all move or none do. Returns the number of rows moved.
+    """
+    ensure_partitions(cursor, STRIKE_SNAPSHOTS_TABLE, _source_months(cursor, source_table, event_ticker))
+    cursor.execute(f"""
+        WITH moved AS (
+            DELETE FROM {source_table} s WHERE s.event_ticker = %(event)s RETURNING to_jsonb(s) AS j
+        )
+        INSERT INTO {STRIKE_SNAPSHOTS_TABLE} (event_ticker, strike, ts, snapshot)
+        SELECT r.j->>'event_ticker', {_STRIKE_EXPR}, {_TS_EXPR}, r.j
+        FROM moved r
+    """, {"tz": LIVE_TIMEZONE, "event": event_ticker})
+    return cursor.rowcount
+
+
+def move_event_header(cursor, event_ticker: str, source_table: str = LIVE_HEADER_TABLE) -> int:
+    """Move one event's header rows from the live table into header_snapshots."""
+    ensure_partitions(cursor, HEADER_SNAPSHOTS_TABLE, _source_months(cursor, source_table, event_ticker))
+    cursor.execute(f"""
+        WITH moved AS (
+            DELETE FROM {source_table} s WHERE s.event_ticker = %(event)s RETURNING to_jsonb(s) AS j
+        )
+        INSERT INTO {HEADER_SNAPSHOTS_TABLE} (event_ticker, ts, snapshot)
+        SELECT r.j->>'event_ticker', {_TS_EXPR}, r.j
+        FROM moved r
+    """, {"tz": LIVE_TIMEZONE, "event": event_ticker})
+    return cursor.rowcount
+
+
+def migrate_legacy_event_tables(cursor, drop: bool = True) -> Dict[str, int]:
+    """
+    Fold old historical_data.<event>_strikes/_header tables into the archive.
+
+    Each legacy table is moved with one INSERT ... SELECT and dropped (unless
+    drop is False). Returns rows moved per legacy table.
+    """
+    cursor.execute("""
+        SELECT table_name FROM information_schema.tables
+        WHERE table_schema = %s AND (table_name LIKE '%%\\_strikes' OR table_name LIKE '%%\\_header')
+          AND table_name NOT IN ('strike_snapshots', 'header_snapshots')
+        ORDER BY table_name
+    """, (ARCHIVE_SCHEMA,))
+    moved = {}
+    for (table_name,) in cursor.fetchall():
+        source = f"{ARCHIVE_SCHEMA}.{table_name}"
+        if table_name.endswith("_strikes"):
+            target, columns, select = (STRIKE_SNAPSHOTS_TABLE, "event_ticker, strike, ts, snapshot",
+                                       f"r.j->>'event_ticker', {_STRIKE_EXPR}, {_TS_EXPR}, r.j")
+        else:
+            target, columns, select = (HEADER_SNAPSHOTS_TABLE, "event_ticker, ts, snapshot",
+                                       f"r.j->>'event_ticker', {_TS_EXPR}, r.j")
+        cursor.execute(f"""
+            SELECT DISTINCT date_trunc('month', {_TS_EXPR})::date
+            FROM (SELECT to_jsonb(s) AS j FROM {source} s) r
+        """, {"tz": LIVE_TIMEZONE})
+        ensure_partitions(cursor, target, [row[0] for row in cursor.fetchall() if row[0] is not None])
+        cursor.execute(f"""
+            INSERT INTO {target} ({columns})
+            SELECT {select} FROM (SELECT to_jsonb(s) AS j FROM {source} s) r
+        """, {"tz": LIVE_TIMEZONE})
+        moved[table_name] = cursor.rowcount
+        if drop:
+            cursor.execute(f"DROP TABLE {source}")
+    return moved
+
+
+def build_snapshot_query(event_tickers: Optional[Sequence[str]] = None,
+                         start: Optional[datetime] = None,
+                         end: Optional[datetime] = None,
+                         strikes: Optional[Sequence[float]] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build a cross-event strike snapshot query.
+
+    Filters on ts prune partitions; event_ticker/strike filters use the
+    (event_ticker, strike, ts) index. Rows come back ordered by
+    event_ticker, strike, ts.
+    """
+    clauses, params = [], {}
+    if event_tickers:
+        clauses.append("event_ticker = ANY(%(event_tickers)s)")
+        params["event_tickers"] = list(event_tickers)
+    if strikes:
+        clauses.append("strike = ANY(%(strikes)s)")
+        params["strikes"] = list(strikes)
+    if start is not None:
+        clauses.append("ts >= %(start)s")
+        params["start"] = start
+    if end is not None:
+        clauses.append("ts < %(end)s")
+        params["end"] = end
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = (
+        f"SELECT event_ticker, strike, ts, snapshot FROM {STRIKE_SNAPSHOTS_TABLE}{where} "
+        f"ORDER BY event_ticker, strike, ts"
+    )
+    return query, params
+
+
+def load_strike_snapshots(cursor, **filters) -> List[Tuple]:
+    """Run build_snapshot_query(**filters) and return all rows."""
+    query, params = build_snapshot_query(**filters)
+    cursor.execute(query, params)
+    return cursor.fetchall()
@@ -0,0 +1,206 @@
+"""
+Supervisor status client shared by the system monitor and failure detector.
+
+Fetches every program's state from supervisord in one XML-RPC
+getAllProcessInfo call over its unix socket and caches the result for a
+monitoring cycle, instead of forking one supervisorctl per service. If the
+socket is unavailable it falls back to a single `supervisorctl status` call.
+"""
+
+import configparser
+import http.client
+import socket
+import subprocess
+import threading
+import time
+import xmlrpc.client
+from typing import Any, Dict, List, Optional
+
+from backend.util.paths import get_supervisor_config_path, get_supervisorctl_path
+
+DEFAULT_SUPERVISOR_SOCKET = "/tmp/supervisord.sock"
+
+# Long enough that every check in one monitoring cycle shares a snapshot,
+# short enough that the next cycle always sees fresh state
+DEFAULT_STATUS_MAX_AGE_SECONDS = 5.0
+
+RPC_TIMEOUT_SECONDS = 5
+
+
+def get_supervisor_socket_path(config_path: Optional[str] = None) -> str:
+    """
+    Get the supervisord unix socket path from supervisord.conf.
+
+    Uses the [supervisorctl] serverurl, then the [unix_http_server] file, and
+    falls back to /tmp/supervisord.sock.
+    """
+    parser = configparser.RawConfigParser()
+    try:
+        parser.read(config_path or get_supervisor_config_path())
+    except configparser.Error:
+        return DEFAULT_SUPERVISOR_SOCKET
+
+    serverurl = parser.get("supervisorctl", "serverurl", fallback="")
+    if serverurl.startswith("unix://"):
+        return serverurl[len("unix://"):]
+    return parser.get("unix_http_server", "file", fallback=DEFAULT_SUPERVISOR_SOCKET)
+
+
+class _UnixSocketHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class _UnixSocketTransport(xmlrpc.client.Transport):
+    def __init__(self, socket_path: str, timeout: float = RPC_TIMEOUT_SECONDS):
+        super().__init__()
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        return _UnixSocketHTTPConnection(self.socket_path, self.timeout)
+
+
+def parse_supervisorctl_status(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse `supervisorctl status` output into getAllProcessInfo-style dicts.
+
+    Only name, statename, pid and description are filled in.
+    """
+    processes = []
+    for line in output.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        name, statename = parts[0], parts[1]
+        description = parts[2].strip() if len(parts) > 2 else ""
+        pid = 0
+        if description.startswith("pid "):
+            try:
+                pid = int(description[4:].split(",", 1)[0])
+            except ValueError:
+                pid = 0
+        processes.append({
+            "name": name.split(":")[-1],
+            "group": name.split(":")[0],
+            "statename": statename,
+            "pid": pid,
+            "description": description,
+        })
+    return processes
+
+
+class SupervisorStatusPoller:
+    """
+    Cached view of supervisord's process table.
+
+    All lookups within max_age seconds of the last fetch are served from the
+    same snapshot, so a monitoring cycle costs one XML-RPC round trip no
+    matter how many services it checks.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None,
+                 max_age: float = DEFAULT_STATUS_MAX_AGE_SECONDS):
+        self.socket_path = socket_path or get_supervisor_socket_path()
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._processes: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._error: Optional[str] = None
+        self.source: Optional[str] = None
+
+    def _server(self):
+        return xmlrpc.client.ServerProxy(
+            "http://localhost/RPC2", transport=_UnixSocketTransport(self.socket_path)
+        )
+
+    def _fetch(self) -> List[Dict[str, Any]]:
+        try:
+            processes = self._server().supervisor.getAllProcessInfo()
+            self.source = "xmlrpc"
+            return processes
+        except (OSError, xmlrpc.client.Error, http.client.HTTPException) as rpc_error:
+            # Older setups without the rpcinterface section: one supervisorctl
+            # call for all programs instead of one per program
+            try:
+                result = subprocess.run(
+                    [get_supervisorctl_path(), "-c", get_supervisor_config_path(), "status"],
+                    capture_output=True, text=True, timeout=RPC_TIMEOUT_SECONDS
+                )
+            except Exception as e:
+                raise RuntimeError(f"supervisor unavailable: {rpc_error}; supervisorctl: {e}")
+            processes = parse_supervisorctl_status(result.stdout)
+            if not processes:
+                raise RuntimeError(f"supervisor unavailable: {rpc_error}")
+            self.source = "supervisorctl"
+            return processes
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch a new snapshot now, keyed by program name."""
+        with self._lock:
+            try:
+                processes = self._fetch()
+                self._processes = {p["name"]: p for p in processes}
+                self._error = None
+            except Exception as e:
+                self._processes = {}
+                self._error = str(e)
+            self._fetched_at = time.monotonic()
+            return self._processes
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        """Get the cached snapshot, refreshing it if older than max_age."""
+        with self._lock:
+            if time.monotonic() - self._fetched_at < self.max_age:
+                return self._processes
+        return self.refresh()
+
+    @property
+    def error(self) -> Optional[str]:
+        """Error from the last fetch, or None if it succeeded."""
+        return self._error
+
+    def get_process(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the getAllProcessInfo entry for a program, or None."""
+        return self.get_all().get(name)
+
+    def get_state(self, name: str) -> Optional[str]:
+        """Get a program's state name (RUNNING, STOPPED, FATAL, ...), or None."""
+        process = self.get_process(name)
+        return process["statename"] if process else None
+
+    def is_running(self, name: str) -> bool:
+        return self.get_state(name) == "RUNNING"
+
+    def status_line(self, name: str) -> str:
+        """Format a program's status like a `supervisorctl status` line."""
+        process = self.get_process(name)
+        if not process:
+            return f"{name}: ERROR (no such process)" if self._error is None else f"{name}: ERROR ({self._error})"
+        return f"{name} {process['statename']} {process.get('description', '')}".strip()
+
+    def get_supervisord_pid(self) -> Optional[int]:
+        """Get supervisord's own pid over XML-RPC, or None if unreachable."""
+        try:
+            return int(self._server().supervisor.getPID())
+        except Exception:
+            return None
+
+
+_shared_poller: Optional[SupervisorStatusPoller] = None
+_shared_poller_lock = threading.Lock()
+
+
+def get_supervisor_status_poller() -> SupervisorStatusPoller:
+    """Get the process-wide poller shared by all monitors."""
+    global _shared_poller
+    with _shared_poller_lock:
+        if _shared_poller is None:
+            _shared_poller = SupervisorStatusPoller()
+        return _shared_poller
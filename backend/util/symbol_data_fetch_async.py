@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Concurrent historical OHLCV fetch for several symbols with resumable checkpoints.
+
+Every symbol runs as its own asyncio task against one shared
+ccxt.async_support exchange. The exchange's built-in throttler spaces every
+request made through it, so all symbols together stay inside that
+exchange's rate limit while one symbol's page is loading and another's is
+in flight.
+
+Pages are loaded through OHLCVCopyWriter, which records the last bar of
+each page in historical_data.ohlcv_fetch_checkpoints in the same
+transaction as the page. After a crash or restart each symbol resumes one
+minute after its checkpoint (or after its newest stored bar, or five years
+back for a new symbol).
+
+Usage:
+    python backend/util/symbol_data_fetch_async.py                # BTC/USD and ETH/USD
+    python backend/util/symbol_data_fetch_async.py BTC/USD SOL/USD
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import ccxt.async_support as ccxt_async
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.util.symbol_data_fetch_pg import (
+    OHLCVCopyWriter, create_table_if_not_exists, ensure_checkpoint_table, get_checkpoint,
+    get_postgresql_connection, limit, timeframe,
+)
+
+DEFAULT_SYMBOLS = ['BTC/USD', 'ETH/USD']
+HISTORY_DAYS = 5 * 365
+RETRY_DELAY_SECONDS = 5
+BAR_MS = 60 * 1000
+
+
+def table_for_symbol(symbol: str) -> str:
+    """'BTC/USD' -> 'btc_price_history'"""
+    return f"{symbol.split('/')[0].lower()}_price_history"
+
+
+def _to_ms(timestamp: datetime) -> int:
+    """Naive UTC timestamp (as stored in historical_data) to epoch milliseconds."""
+    return int(timestamp.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def resume_since(connection_factory: Callable, symbol: str, now_ms: int) -> int:
+    """
+    Epoch milliseconds to resume fetching symbol from.
+
+    One minute after the symbol's checkpoint, else after its newest stored
+    bar, else HISTORY_DAYS before now_ms.
+    """
+    conn = connection_factory()
+    if not conn:
+        raise Exception("Failed to connect to PostgreSQL")
+    try:
+        cursor = conn.cursor()
+        ensure_checkpoint_table(cursor)
+        last_timestamp = get_checkpoint(cursor, symbol)
+        if last_timestamp is None:
+            cursor.execute(f"SELECT MAX(timestamp) FROM historical_data.{table_for_symbol(symbol)}")
+            row = cursor.fetchone()
+            last_timestamp = row[0] if row else None
+        conn.commit()
+    finally:
+        conn.close()
+
+    if last_timestamp is None:
+        return now_ms - int(timedelta(days=HISTORY_DAYS).total_seconds() * 1000)
+    return _to_ms(last_timestamp) + BAR_MS
+
+
+async def fetch_symbol(exchange, symbol: str, connection_factory: Callable = get_postgresql_connection,
+                       retry_delay: float = RETRY_DELAY_SECONDS) -> Dict:
+    """
+    Fetch symbol from its resume point to now and load it into its price history table.
+
+    Failed requests are retried after retry_delay seconds, except for
+    symbols the exchange does not list. The next page is requested while
+    the previous one is being loaded.
+
+    Returns:
+        Result dict in the same shape as update_all_symbols_pg
+    """
+    table_name = table_for_symbol(symbol)
+    now_ms = exchange.milliseconds()
+    since = await asyncio.to_thread(resume_since, connection_factory, symbol, now_ms)
+    print(f"[{symbol}] Fetching from {pd.to_datetime(since, unit='ms')} into historical_data.{table_name}")
+
+    writer = OHLCVCopyWriter(table_name, connection_factory=connection_factory, checkpoint_symbol=symbol)
+    await asyncio.to_thread(writer.__enter__)
+    try:
+        while since < now_ms:
+            try:
+                bars = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+            except ccxt_async.BadSymbol:
+                raise
+            except Exception as e:
+                print(f"[{symbol}] Error encountered, retrying in {retry_delay} seconds: {e}")
+                await asyncio.sleep(retry_delay)
+                continue
+            if not bars:
+                break
+            await asyncio.to_thread(writer.put, bars)
+            since = bars[-1][0] + BAR_MS
+    except BaseException:
+        await asyncio.to_thread(writer.__exit__, *sys.exc_info())
+        raise
+    await asyncio.to_thread(writer.__exit__, None, None, None)
+
+    print(f"[{symbol}] ✅ Added {writer.rows_added:,} rows in {writer.pages_loaded} pages")
+    return {
+        'table_name': table_name,
+        'rows_fetched': writer.rows_added,
+        'status': 'success'
+    }
+
+
+async def fetch_symbols(symbols: List[str], exchange=None,
+                        connection_factory: Callable = get_postgresql_connection,
+                        retry_delay: float = RETRY_DELAY_SECONDS) -> Dict[str, Dict]:
+    """
+    Fetch every symbol concurrently through one rate-limited exchange.
+
+    A failing symbol does not stop the others; its result has status 'error'.
+    """
+    own_exchange = exchange is None
+    if own_exchange:
+        exchange = ccxt_async.coinbase({'enableRateLimit': True})
+    try:
+        outcomes = await asyncio.gather(
+            *(fetch_symbol(exchange, symbol, connection_factory, retry_delay) for symbol in symbols),
+            return_exceptions=True
+        )
+    finally:
+        if own_exchange:
+            await exchange.close()
+
+    results = {}
+    for symbol, outcome in zip(symbols, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"Error processing {symbol}: {outcome}")
+            results[symbol] = {
+                'table_name': None,
+                'rows_fetched': 0,
+                'status': 'error',
+                'error': str(outcome)
+            }
+        else:
+            results[symbol] = outcome
+    return results
+
+
+def update_all_symbols_async(symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Concurrent counterpart of update_all_symbols_pg; creates missing tables first."""
+    symbols = symbols or DEFAULT_SYMBOLS
+    for symbol in symbols:
+        create_table_if_not_exists(symbol)
+    return asyncio.run(fetch_symbols(symbols))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch 1m OHLCV history for several symbols concurrently.")
+    parser.add_argument("symbols", nargs="*", default=DEFAULT_SYMBOLS, help="Symbols such as BTC/USD")
+    args = parser.parse_args()
+
+    results = update_all_symbols_async(args.symbols)
+    for symbol, result in results.items():
+        print(f"{symbol}: {result['status']} ({result['rows_fetched']:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
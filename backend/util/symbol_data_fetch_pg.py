@@ -1,16 +1,27 @@
 import ccxt
+import io
 import pandas as pd
 import os
 import psycopg2
+import queue
+import threading
 from datetime import datetime, timedelta, timezone
 import time
-from typing import Optional, Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
 
 # Use Coinbase (Kraken limits historical depth)
 exchange = ccxt.coinbase({'enableRateLimit': True})
 timeframe = '1m'
 limit = 1000  # max per fetch
 
+# Pages fetched ahead of the COPY writer before the fetch loop waits
+MAX_PENDING_PAGES = 4
+
+OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Last committed bar per symbol, so interrupted downloads resume where they stopped
+CHECKPOINT_TABLE = "historical_data.ohlcv_fetch_checkpoints"
+
 def get_postgresql_connection():
     """Get PostgreSQL connection"""
     try:
@@ -71,6 +82,197 @@ def get_latest_timestamp_from_db(symbol: str) -> Optional[datetime]:
     finally:
         conn.close()
 
+def ensure_checkpoint_table(cursor):
+    """Create the fetch checkpoint table if it doesn't exist."""
+    cursor.execute("CREATE SCHEMA IF NOT EXISTS historical_data")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+            symbol TEXT PRIMARY KEY,
+            last_timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
+        )
+    """)
+
+def get_checkpoint(cursor, symbol: str) -> Optional[datetime]:
+    """Timestamp of the last bar committed for symbol, or None if it has no checkpoint."""
+    cursor.execute(f"SELECT last_timestamp FROM {CHECKPOINT_TABLE} WHERE symbol = %s", (symbol,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def fetch_ohlcv_pages(symbol: str, since: int, until: Optional[int] = None) -> Iterator[List[list]]:
+    """
+    Yield pages of 1m OHLCV bars from the exchange, oldest first.
+    
+    Retries failed requests after 5 seconds and sleeps the exchange rate
+    limit between pages.
+    
+    Args:
+        symbol: Trading symbol (e.g., 'BTC/USD')
+        since: Start time in epoch milliseconds
+        until: Stop once this epoch millisecond time is reached (default: now)
+    """
+    current_time = until if until is not None else exchange.milliseconds()
+    fetched = 0
+    while since < current_time:
+        try:
+            bars = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+        except Exception as e:
+            print("Error encountered, retrying in 5 seconds:", e)
+            time.sleep(5)
+            continue
+        if not bars:
+            print("No more data returned.")
+            break
+        
+        print(f"Fetched {len(bars)} bars from {pd.to_datetime(bars[0][0], unit='ms')} to {pd.to_datetime(bars[-1][0], unit='ms')}")
+        fetched += len(bars)
+        if fetched % (limit * 10) == 0:
+            print(f"Progress: {fetched:,} rows — up to {pd.to_datetime(bars[-1][0], unit='ms')}")
+        yield bars
+        since = bars[-1][0] + 60 * 1000  # move 1m past last timestamp
+        
+        time.sleep(exchange.rateLimit / 1000)  # respect rate limit
+
+def bars_to_copy_buffer(bars: List[list]) -> io.StringIO:
+    """Format ccxt OHLCV bars as a tab-separated COPY buffer (timestamps as naive UTC)."""
+    buffer = io.StringIO()
+    for ts_ms, open_, high, low, close, volume in bars:
+        timestamp = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        buffer.write(f"{timestamp}\t{open_!r}\t{high!r}\t{low!r}\t{close!r}\t{volume!r}\n")
+    buffer.seek(0)
+    return buffer
+
+class OHLCVCopyWriter:
+    """
+    Load OHLCV pages into historical_data.<table> with COPY on a background thread.
+    
+    Each page is COPYed into a temporary staging table and merged with
+    INSERT ... ON CONFLICT (timestamp) DO NOTHING, so pages that overlap
+    existing rows are safe to load. The fetch loop hands pages over through a
+    bounded queue and keeps fetching while the previous page loads.
+    
+    Usage:
+        with OHLCVCopyWriter(table_name) as writer:
+            for bars in fetch_ohlcv_pages(symbol, since):
+                writer.put(bars)
+        print(writer.rows_added)
+    
+    Args:
+        table_name: Table in historical_data
+        replace: Delete existing rows first; the delete and every page are
+            committed together when the writer closes
+        connection_factory: Returns a new psycopg2 connection
+        checkpoint_symbol: Record each page's last bar for this symbol in
+            the checkpoint table, in the same transaction as the page
+    """
+    
+    def __init__(self, table_name: str, replace: bool = False,
+                 connection_factory: Callable = None, max_pending_pages: int = MAX_PENDING_PAGES,
+                 checkpoint_symbol: Optional[str] = None):
+        self.table_name = table_name
+        self.replace = replace
+        self.checkpoint_symbol = checkpoint_symbol
+        self.connection_factory = connection_factory or get_postgresql_connection
+        self.rows_added = 0
+        self.pages_loaded = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_pending_pages)
+        self._thread = None
+        self._conn = None
+    
+    def __enter__(self):
+        self._conn = self.connection_factory()
+        if not self._conn:
+            raise Exception("Failed to connect to PostgreSQL")
+        cursor = self._conn.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS ohlcv_staging (
+                timestamp TIMESTAMP WITHOUT TIME ZONE,
+                open NUMERIC(20,8),
+                high NUMERIC(20,8),
+                low NUMERIC(20,8),
+                close NUMERIC(20,8),
+                volume NUMERIC(20,8)
+            )
+        """)
+        if self.checkpoint_symbol:
+            ensure_checkpoint_table(cursor)
+        if self.replace:
+            cursor.execute(f"DELETE FROM historical_data.{self.table_name}")
+        self._thread = threading.Thread(target=self._run, args=(cursor,), name="ohlcv-copy-writer", daemon=True)
+        self._thread.start()
+        return self
+    
+    def put(self, bars: List[list]):
+        """Queue one page for loading; raises if the writer has failed."""
+        while True:
+            if self.error:
+                raise self.error
+            try:
+                self._queue.put(bars, timeout=1)
+                return
+            except queue.Full:
+                continue
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if exc_type is None and self.error is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self._conn.close()
+        if exc_type is None and self.error is not None:
+            raise self.error
+        return False
+    
+    def _run(self, cursor):
+        while True:
+            bars = self._queue.get()
+            if bars is None:
+                return
+            if self.error is not None:
+                continue  # Drain so the fetch loop is never blocked
+            try:
+                self._load_page(cursor, bars)
+            except Exception as e:
+                self.error = e
+    
+    def _load_page(self, cursor, bars: List[list]):
+        cursor.copy_expert(
+            f"COPY ohlcv_staging ({', '.join(OHLCV_COLUMNS)}) FROM STDIN",
+            bars_to_copy_buffer(bars)
+        )
+        cursor.execute(f"""
+            INSERT INTO historical_data.{self.table_name} ({', '.join(OHLCV_COLUMNS)})
+            SELECT {', '.join(OHLCV_COLUMNS)} FROM ohlcv_staging
+            ON CONFLICT (timestamp) DO NOTHING
+        """)
+        self.rows_added += cursor.rowcount
+        cursor.execute("TRUNCATE ohlcv_staging")
+        if self.checkpoint_symbol:
+            last_timestamp = datetime.fromtimestamp(bars[-1][0] / 1000, tz=timezone.utc).replace(tzinfo=None)
+            cursor.execute(f"""
+                INSERT INTO {CHECKPOINT_TABLE} (symbol, last_timestamp, updated_at)
+                VALUES (%s, %s, NOW())
+                ON CONFLICT (symbol) DO UPDATE
+                SET last_timestamp = GREATEST({CHECKPOINT_TABLE}.last_timestamp, EXCLUDED.last_timestamp),
+                    updated_at = NOW()
+            """, (self.checkpoint_symbol, last_timestamp))
+        if not self.replace:
+            # Incremental loads commit per page so an interrupted run keeps its progress
+            self._conn.commit()
+        self.pages_loaded += 1
+
+def stream_ohlcv_to_pg(symbol: str, table_name: str, since: int, replace: bool = False) -> int:
+    """Fetch OHLCV pages from since to now and COPY them into the table; returns rows added."""
+    with OHLCVCopyWriter(table_name, replace=replace) as writer:
+        for bars in fetch_ohlcv_pages(symbol, since):
+            writer.put(bars)
+    return writer.rows_added
+
 def fetch_full_5year_data_pg(symbol: str = 'BTC/USD') -> Tuple[str, int]:
     """
     Fetch full 5 years of symbol data from Coinbase API and store in PostgreSQL.
@@ -141,37 +343,14 @@ def _perform_incremental_update_pg(symbol: str, table_name: str) -> Tuple[str, i
     start_time = latest_timestamp + timedelta(minutes=1)
     print(f"Fetching from: {start_time}")
     
-    # Fetch new data from start_time to present
+    # Fetch new data from start_time to present, loading each page while the next is fetched
     since = exchange.parse8601(start_time.strftime('%Y-%m-%dT%H:%M:%SZ'))
-    current_time = exchange.milliseconds()
-    
-    new_bars = []
-    while since < current_time:
-        try:
-            bars = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
-            if not bars:
-                print("No more new data returned.")
-                break
-
-            print(f"Fetched {len(bars)} new bars from {pd.to_datetime(bars[0][0], unit='ms')} to {pd.to_datetime(bars[-1][0], unit='ms')}")
-            new_bars.extend(bars)
-            since = bars[-1][0] + 60 * 1000  # move 1m past last timestamp
-
-            time.sleep(exchange.rateLimit / 1000)  # respect rate limit
-        except Exception as e:
-            print("Error encountered, retrying in 5 seconds:", e)
-            time.sleep(5)
-            continue
+    rows_added = stream_ohlcv_to_pg(symbol, table_name, since)
     
-    if not new_bars:
+    if not rows_added:
         print("No new data to add.")
         return table_name, 0
     
-    # Create DataFrame for new data
-    new_df = pd.DataFrame(new_bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    new_df['timestamp'] = pd.to_datetime(new_df['timestamp'], unit='ms')
-    
-    # Insert new data into PostgreSQL
     conn = get_postgresql_connection()
     if not conn:
         raise Exception("Failed to connect to PostgreSQL")
@@ -179,31 +358,6 @@ def _perform_incremental_update_pg(symbol: str, table_name: str) -> Tuple[str, i
     try:
         cursor = conn.cursor()
         
-        # Insert new data
-        rows_added = 0
-        for _, row in new_df.iterrows():
-            try:
-                cursor.execute(f"""
-                    INSERT INTO historical_data.{table_name} 
-                    (timestamp, open, high, low, close, volume, momentum)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (timestamp) DO NOTHING
-                """, (
-                    row['timestamp'],
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume']),
-                    None  # momentum column
-                ))
-                rows_added += cursor.rowcount
-            except Exception as e:
-                print(f"Error inserting row {row['timestamp']}: {e}")
-                continue
-        
-        conn.commit()
-        
         # Get total count after update
         cursor.execute(f"SELECT COUNT(*) FROM historical_data.{table_name}")
         total_rows = cursor.fetchone()[0]
@@ -235,37 +389,15 @@ def _perform_rolling_update_pg(symbol: str, table_name: str) -> Tuple[str, int]:
     five_years_ago = datetime.now(timezone.utc) - timedelta(days=5 * 365)
     print(f"5-year window start: {five_years_ago}")
     
-    # Fetch new data from latest timestamp to present
+    # Fetch new data from latest timestamp to present, loading each page while the next is fetched
     since = exchange.parse8601((latest_timestamp + timedelta(minutes=1)).strftime('%Y-%m-%dT%H:%M:%SZ'))
-    current_time = exchange.milliseconds()
-    
-    new_bars = []
-    while since < current_time:
-        try:
-            bars = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
-            if not bars:
-                print("No more new data returned.")
-                break
-
-            print(f"Fetched {len(bars)} new bars from {pd.to_datetime(bars[0][0], unit='ms')} to {pd.to_datetime(bars[-1][0], unit='ms')}")
-            new_bars.extend(bars)
-            since = bars[-1][0] + 60 * 1000  # move 1m past last timestamp
-
-            time.sleep(exchange.rateLimit / 1000)  # respect rate limit
-        except Exception as e:
-            print("Error encountered, retrying in 5 seconds:", e)
-            time.sleep(5)
-            continue
+    rows_added = stream_ohlcv_to_pg(symbol, table_name, since)
     
-    if not new_bars:
+    if not rows_added:
         print("No new data to add.")
         return table_name, 0
     
-    # Create DataFrame for new data
-    new_df = pd.DataFrame(new_bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    new_df['timestamp'] = pd.to_datetime(new_df['timestamp'], unit='ms')
-    
-    # Insert new data and remove old data
+    # Remove old data
     conn = get_postgresql_connection()
     if not conn:
         raise Exception("Failed to connect to PostgreSQL")
@@ -273,29 +405,6 @@ def _perform_rolling_update_pg(symbol: str, table_name: str) -> Tuple[str, int]:
     try:
         cursor = conn.cursor()
         
-        # Insert new data
-        rows_added = 0
-        for _, row in new_df.iterrows():
-            try:
-                cursor.execute(f"""
-                    INSERT INTO historical_data.{table_name} 
-                    (timestamp, open, high, low, close, volume, momentum)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (timestamp) DO NOTHING
-                """, (
-                    row['timestamp'],
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume']),
-                    None  # momentum column
-                ))
-                rows_added += cursor.rowcount
-            except Exception as e:
-                print(f"Error inserting row {row['timestamp']}: {e}")
-                continue
-        
         # Remove data older than 5 years
         cursor.execute(f"""
             DELETE FROM historical_data.{table_name} 
@@ -331,81 +440,12 @@ def _perform_full_download_pg(symbol: str, table_name: str) -> Tuple[str, int]:
     since = exchange.parse8601(five_years_ago.strftime('%Y-%m-%dT%H:%M:%SZ'))
     print(f"Starting full download from {five_years_ago.strftime('%Y-%m-%d %H:%M:%S')} to present...")
     
-    all_bars = []
-    current_time = exchange.milliseconds()
-    
-    while since < current_time:
-        try:
-            bars = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
-            if not bars:
-                print("No more data returned. Exiting.")
-                break
-
-            print(f"Fetched {len(bars)} bars from {pd.to_datetime(bars[0][0], unit='ms')} to {pd.to_datetime(bars[-1][0], unit='ms')}")
-            all_bars.extend(bars)
-            since = bars[-1][0] + 60 * 1000  # move 1m past last timestamp
-
-            if len(all_bars) % (limit * 10) == 0:
-                latest_dt = pd.to_datetime(all_bars[-1][0], unit='ms')
-                print(f"Progress: {len(all_bars):,} rows — up to {latest_dt}")
-
-            time.sleep(exchange.rateLimit / 1000)  # respect rate limit
-        except Exception as e:
-            print("Error encountered, retrying in 5 seconds:", e)
-            time.sleep(5)
-            continue
-    
-    if not all_bars:
-        print("No data to save.")
-        return table_name, 0
-    
-    # Create DataFrame
-    df = pd.DataFrame(all_bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    # Existing rows are replaced in the same transaction that loads the new ones,
+    # so readers keep seeing the old data until the download completes
+    rows_inserted = stream_ohlcv_to_pg(symbol, table_name, since, replace=True)
+    print(f"Saved {rows_inserted:,} bars to table {table_name}")
     
-    # Insert into PostgreSQL
-    conn = get_postgresql_connection()
-    if not conn:
-        raise Exception("Failed to connect to PostgreSQL")
-    
-    try:
-        cursor = conn.cursor()
-        
-        # Clear existing data
-        cursor.execute(f"DELETE FROM historical_data.{table_name}")
-        
-        # Insert all data
-        rows_inserted = 0
-        for _, row in df.iterrows():
-            try:
-                cursor.execute(f"""
-                    INSERT INTO historical_data.{table_name} 
-                    (timestamp, open, high, low, close, volume, momentum)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    row['timestamp'],
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume']),
-                    None  # momentum column
-                ))
-                rows_inserted += 1
-            except Exception as e:
-                print(f"Error inserting row {row['timestamp']}: {e}")
-                continue
-        
-        conn.commit()
-        print(f"Saved {rows_inserted:,} bars to table {table_name}")
-        
-        return table_name, rows_inserted
-        
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
+    return table_name, rows_inserted
 
 def update_all_symbols_pg(symbols: Optional[list] = None) -> dict:
     """
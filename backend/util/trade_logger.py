@@ -1,8 +1,42 @@
+"""
+Trade event logging to users.trade_logs_0001.
+
+log_trade_event only timestamps the event and puts it on a bounded
+in-memory queue; a background writer thread drains the queue and inserts
+events in multi-row batches over one long-lived connection. When the queue
+is full, events are dropped and counted rather than blocking the order
+path. Pending events are flushed when the process exits.
+"""
+
+import atexit
 import psycopg2
+import queue
+import threading
+import time
 from datetime import datetime
+from typing import Callable, Optional
 from zoneinfo import ZoneInfo
 import os
 
+from psycopg2.extras import execute_values
+
+from backend.util.metrics import REGISTRY, time_db_query
+from backend.util.trade_query import build_trade_logs_query
+
+# Events waiting for the writer before new ones are dropped
+MAX_PENDING_EVENTS = 10000
+# Rows per INSERT
+BATCH_SIZE = 500
+# Longest an event waits before its batch is written
+FLUSH_INTERVAL_SECONDS = 0.25
+
+TRADE_LOG_EVENTS_DROPPED = REGISTRY.counter(
+    "trade_log_events_dropped_total",
+    "Trade log events dropped because the queue was full or the insert failed",
+    ("reason",)
+)
+
+
 def get_postgresql_connection():
     """Get PostgreSQL connection for trade logging"""
     try:
@@ -16,10 +50,158 @@ def get_postgresql_connection():
         print(f"Failed to connect to PostgreSQL: {e}")
         return None
 
+class TradeLogWriter:
+    """
+    Background writer that batches trade log events into multi-row INSERTs.
+    
+    Args:
+        connection_factory: Returns a new psycopg2 connection (None on failure)
+        max_pending: Queue bound; events beyond it are dropped and counted
+        batch_size: Maximum rows per INSERT
+        flush_interval: Seconds the writer waits to fill a batch
+    """
+    
+    def __init__(self, connection_factory: Callable = get_postgresql_connection,
+                 max_pending: int = MAX_PENDING_EVENTS, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.connection_factory = connection_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._conn = None
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="trade-log-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, row: tuple) -> bool:
+        """Queue one (ticket_id, message, timestamp, service, user_id) row; False if it was dropped."""
+        if self._stopping:
+            return False
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self._drop(1, "queue_full")
+            return False
+    
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued event has been written (or dropped)."""
+        done = threading.Event()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._queue.put(done, timeout=max(0.0, deadline - time.monotonic()))
+                break
+            except queue.Full:
+                return False
+        return done.wait(max(0.0, deadline - time.monotonic()))
+    
+    def close(self, timeout: float = 5.0):
+        """Flush pending events and stop the writer."""
+        if self._stopping:
+            return
+        self.flush(timeout)
+        self._stopping = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def _drop(self, count: int, reason: str):
+        self.dropped += count
+        TRADE_LOG_EVENTS_DROPPED.inc(count, reason=reason)
+        # Report the first drop and then every 1000th, not every event
+        if self.dropped == count or self.dropped // 1000 != (self.dropped - count) // 1000:
+            print(f"⚠️ Trade log events dropped: {self.dropped} ({reason})")
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._close_connection()
+                return
+            batch, markers = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    # A flush request writes what is queued without waiting to fill the batch
+                    deadline = 0
+                elif item is not None:
+                    batch.append(item)
+                if item is None or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                marker.set()
+            if item is None:
+                self._close_connection()
+                return
+    
+    def _write(self, batch):
+        for attempt in range(2):
+            try:
+                if self._conn is None:
+                    self._conn = self.connection_factory()
+                    if self._conn is None:
+                        raise Exception("Failed to connect to PostgreSQL")
+                with time_db_query("trade_log_batch"):
+                    with self._conn.cursor() as cursor:
+                        execute_values(cursor, """
+                            INSERT INTO users.trade_logs_0001
+                            (ticket_id, message, timestamp, service, user_id)
+                            VALUES %s
+                        """, batch, page_size=self.batch_size)
+                    self._conn.commit()
+                self.written += len(batch)
+                return
+            except Exception as e:
+                # Reconnect once; a dead connection is the common failure
+                self._close_connection()
+                if attempt:
+                    print(f"Error logging {len(batch)} trade events: {e}")
+                    self._drop(len(batch), "write_failed")
+    
+    def _close_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+_writer: Optional[TradeLogWriter] = None
+_writer_lock = threading.Lock()
+
+def get_trade_log_writer() -> TradeLogWriter:
+    """Process-wide writer, started on first use and flushed at exit."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = TradeLogWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+def flush_trade_logs(timeout: float = 5.0) -> bool:
+    """Block until queued trade events are written; for shutdown hooks and tests."""
+    return _writer.flush(timeout) if _writer is not None else True
+
 def log_trade_event(ticket_id: str, message: str, service: str = "unknown", user_id: str = "user_0001"):
     """
     Log trade events to PostgreSQL users.trade_logs_0001 table
     
+    The event is queued for the background writer; this call never waits on
+    the database.
+    
     Args:
         ticket_id: The ticket ID for the trade
         message: The log message
@@ -30,21 +212,7 @@ def log_trade_event(ticket_id: str, message: str, service: str = "unknown", user
         # Get timestamp in Eastern timezone
         timestamp = datetime.now(ZoneInfo("America/New_York"))
         
-        # Connect to PostgreSQL
-        conn = get_postgresql_connection()
-        if not conn:
-            print(f"Failed to log trade event: {message}")
-            return
-        
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO users.trade_logs_0001 
-                (ticket_id, message, timestamp, service, user_id)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (ticket_id, message, timestamp, service, user_id))
-            conn.commit()
-        
-        conn.close()
+        get_trade_log_writer().submit((ticket_id, message, timestamp, service, user_id))
         
         # Also print to console for immediate visibility
         formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
@@ -53,7 +221,8 @@ def log_trade_event(ticket_id: str, message: str, service: str = "unknown", user
     except Exception as e:
         print(f"Error logging trade event: {e}")
 
-def get_trade_logs(ticket_id: str = None, service: str = None, limit: int = 100, user_id: str = "user_0001"):
+def get_trade_logs(ticket_id: str = None, service: str = None, limit: int = 100, user_id: str = "user_0001",
+                   since_id: int = None, before_id: int = None):
     """
     Retrieve trade logs from PostgreSQL
     
@@ -62,6 +231,8 @@ def get_trade_logs(ticket_id: str = None, service: str = None, limit: int = 100,
         service: Filter by service name
         limit: Maximum number of logs to return
         user_id: The user ID to filter by
+        since_id: Only logs newer than this id, oldest first
+        before_id: Only logs older than this id, newest first
     
     Returns:
         List of log entries
@@ -71,19 +242,8 @@ def get_trade_logs(ticket_id: str = None, service: str = None, limit: int = 100,
         if not conn:
             return []
         
-        query = "SELECT ticket_id, message, timestamp, service FROM users.trade_logs_0001 WHERE user_id = %s"
-        params = [user_id]
-        
-        if ticket_id:
-            query += " AND ticket_id = %s"
-            params.append(ticket_id)
-        
-        if service:
-            query += " AND service = %s"
-            params.append(service)
-        
-        query += " ORDER BY timestamp DESC LIMIT %s"
-        params.append(limit)
+        query, params = build_trade_logs_query(user_id=user_id, ticket_id=ticket_id, service=service,
+                                               since_id=since_id, before_id=before_id, limit=limit)
         
         with conn.cursor() as cursor:
             cursor.execute(query, params)
@@ -93,10 +253,11 @@ def get_trade_logs(ticket_id: str = None, service: str = None, limit: int = 100,
         
         return [
             {
-                "ticket_id": row[0],
-                "message": row[1],
-                "timestamp": row[2].isoformat() if row[2] else None,
-                "service": row[3]
+                "id": row[0],
+                "ticket_id": row[1],
+                "message": row[2],
+                "timestamp": row[3].isoformat() if row[3] else None,
+                "service": row[4]
             }
             for row in results
         ]
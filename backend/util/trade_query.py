@@ -0,0 +1,285 @@
+"""
+Keyset-paginated and incremental queries over users.trades_0001 and users.trade_logs_0001.
+
+Pages are addressed by id rather than OFFSET, so every page is an index
+range scan regardless of how deep it is:
+
+    before_id=N  -> rows with id < N, newest first (scrolling back)
+    since_id=N   -> rows with id > N, oldest first (polling for new rows)
+
+Trades are also updated after insert (status, sell price, P&L), so new ids
+alone miss changes. Every insert or update of a trade stamps it with the id
+of the writing transaction, and deletes leave a tombstone with a version too.
+A client that remembers the last version it saw asks for changes since that
+version and only receives the rows that changed.
+
+Versions are only handed out below the oldest transaction still running, so
+a transaction that has stamped rows but not yet committed can never end up
+behind a version a client has already moved past.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+TRADES_TABLE = "users.trades_0001"
+TRADE_LOGS_TABLE = "users.trade_logs_0001"
+TRADE_DELETIONS_TABLE = "users.trades_0001_deletions"
+# Sequence that stamped versions before they were transaction ids; dropped on migration
+TRADE_VERSION_SEQUENCE = "users.trades_0001_version_seq"
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+# Channel users.trades_0001 changes are published on
+TRADES_CHANNEL = "trades_0001"
+
+CREATE_TRADE_QUERY_SCHEMA_SQL = f"""
+ALTER TABLE {TRADES_TABLE} ADD COLUMN IF NOT EXISTS row_version BIGINT;
+
+CREATE TABLE IF NOT EXISTS {TRADE_DELETIONS_TABLE} (
+    id INTEGER NOT NULL,
+    row_version BIGINT NOT NULL DEFAULT pg_current_xact_id()::text::bigint,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+ALTER TABLE {TRADE_DELETIONS_TABLE} ALTER COLUMN row_version SET DEFAULT pg_current_xact_id()::text::bigint;
+
+CREATE OR REPLACE FUNCTION users.trades_0001_stamp_version() RETURNS trigger AS $$
+BEGIN
+    NEW.row_version := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION users.trades_0001_record_deletion() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {TRADE_DELETIONS_TABLE} (id) VALUES (OLD.id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trades_0001_stamp_version ON {TRADES_TABLE};
+CREATE TRIGGER trades_0001_stamp_version BEFORE INSERT OR UPDATE ON {TRADES_TABLE}
+    FOR EACH ROW EXECUTE FUNCTION users.trades_0001_stamp_version();
+
+DROP TRIGGER IF EXISTS trades_0001_record_deletion ON {TRADES_TABLE};
+CREATE TRIGGER trades_0001_record_deletion AFTER DELETE ON {TRADES_TABLE}
+    FOR EACH ROW EXECUTE FUNCTION users.trades_0001_record_deletion();
+
+-- Every change is published on TRADES_CHANNEL for the auto entry supervisor
+CREATE OR REPLACE FUNCTION users.notify_trades_0001() RETURNS trigger AS $$
+DECLARE
+    rec RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+    ELSE
+        rec := NEW;
+    END IF;
+    PERFORM pg_notify('{TRADES_CHANNEL}', json_build_object(
+        'op', TG_OP,
+        'id', rec.id,
+        'ticker', rec.ticker,
+        'side', rec.side,
+        'status', CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE rec.status END
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trades_0001_notify ON {TRADES_TABLE};
+CREATE TRIGGER trades_0001_notify
+    AFTER INSERT OR DELETE OR UPDATE OF status, ticker, side ON {TRADES_TABLE}
+    FOR EACH ROW EXECUTE FUNCTION users.notify_trades_0001();
+
+-- Rows written in one transaction share its version
+DROP INDEX IF EXISTS users.idx_trades_0001_row_version;
+CREATE INDEX IF NOT EXISTS idx_trades_0001_row_version_id ON {TRADES_TABLE} (row_version, id);
+
+-- Sequence versions do not order with transaction ids, so restamp everything once
+DO $$
+BEGIN
+    IF to_regclass('{TRADE_VERSION_SEQUENCE}') IS NOT NULL THEN
+        UPDATE {TRADES_TABLE} SET row_version = NULL;
+        UPDATE {TRADE_DELETIONS_TABLE} SET row_version = DEFAULT;
+        DROP SEQUENCE {TRADE_VERSION_SEQUENCE};
+    END IF;
+END
+$$;
+
+-- Existing rows get a version through the trigger
+UPDATE {TRADES_TABLE} SET row_version = NULL WHERE row_version IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_trades_0001_status_id ON {TRADES_TABLE} (status, id DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_0001_date_id ON {TRADES_TABLE} (date, id DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_0001_ticker_id ON {TRADES_TABLE} (ticker, id DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_0001_deletions_version ON {TRADE_DELETIONS_TABLE} (row_version);
+
+-- The log table is created outside init_trades_db, so only index it when present
+DO $$
+BEGIN
+    IF to_regclass('{TRADE_LOGS_TABLE}') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_trade_logs_0001_user_id ON {TRADE_LOGS_TABLE} (user_id, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_trade_logs_0001_ticket_id ON {TRADE_LOGS_TABLE} (ticket_id, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_trade_logs_0001_service_id ON {TRADE_LOGS_TABLE} (service, id DESC);
+    END IF;
+END
+$$;
+"""
+
+
+def ensure_trade_query_schema(cursor):
+    """Create the version column, version and notify triggers, tombstone table and composite indexes."""
+    cursor.execute(CREATE_TRADE_QUERY_SCHEMA_SQL)
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit or limit <= 0:
+        return DEFAULT_PAGE_SIZE
+    return min(int(limit), MAX_PAGE_SIZE)
+
+
+def _keyset_query(table: str, columns: str, filters: List[Tuple[str, Any]], since_id: Optional[int],
+                  before_id: Optional[int], limit: Optional[int]) -> Tuple[str, List[Any]]:
+    clauses = [clause for clause, _ in filters]
+    params = [value for _, value in filters]
+    if since_id is not None:
+        clauses.append("id > %s")
+        params.append(since_id)
+    if before_id is not None:
+        clauses.append("id < %s")
+        params.append(before_id)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    # New rows come oldest first so a poller can continue from the last id it got
+    order = "ASC" if since_id is not None and before_id is None else "DESC"
+    query = f"SELECT {columns} FROM {table}{where} ORDER BY id {order}"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    return query, params
+
+
+def build_trades_query(since_id: Optional[int] = None, before_id: Optional[int] = None,
+                       status: Optional[str] = None, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None, ticker: Optional[str] = None,
+                       limit: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """
+    Keyset page over trades.
+
+    Args:
+        since_id: Only trades with a larger id, oldest first
+        before_id: Only trades with a smaller id, newest first
+        status: Exact status ('open', 'closed', ...)
+        date_from, date_to: Inclusive trade dates as YYYY-MM-DD
+        ticker: Exact market ticker
+        limit: Page size, capped at MAX_PAGE_SIZE; None for no limit
+    """
+    filters = []
+    if status:
+        filters.append(("status = %s", status))
+    if date_from:
+        filters.append(("date >= %s", date_from))
+    if date_to:
+        filters.append(("date <= %s", date_to))
+    if ticker:
+        filters.append(("ticker = %s", ticker))
+    return _keyset_query(TRADES_TABLE, "*", filters, since_id, before_id,
+                         clamp_limit(limit) if limit is not None else None)
+
+
+def build_trade_logs_query(user_id: str = "user_0001", ticket_id: Optional[str] = None,
+                           service: Optional[str] = None, since_id: Optional[int] = None,
+                           before_id: Optional[int] = None, limit: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """Keyset page over trade logs, with the same since_id / before_id semantics as trades."""
+    filters = [("user_id = %s", user_id)]
+    if ticket_id:
+        filters.append(("ticket_id = %s", ticket_id))
+    if service:
+        filters.append(("service = %s", service))
+    return _keyset_query(TRADE_LOGS_TABLE, "id, ticket_id, message, timestamp, service", filters,
+                         since_id, before_id, clamp_limit(limit))
+
+
+def page_cursors(rows: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """Ids a client passes back to continue from a page of rows."""
+    ids = [row["id"] for row in rows]
+    return {
+        "max_id": max(ids) if ids else None,
+        "min_id": min(ids) if ids else None,
+        "has_more": len(rows) >= limit,
+    }
+
+
+def fetch_trades_page(cursor, limit: Optional[int] = None, **filters) -> Dict[str, Any]:
+    """
+    Run build_trades_query on a RealDictCursor.
+
+    Returns:
+        {"trades": [...], "max_id", "min_id", "has_more"}
+    """
+    limit = clamp_limit(limit)
+    query, params = build_trades_query(limit=limit, **filters)
+    cursor.execute(query, params)
+    trades = [dict(row) for row in cursor.fetchall()]
+    return {"trades": trades, **page_cursors(trades, limit)}
+
+
+def _fetch_version_changes(cursor, condition: str, params: List[Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """(row_version, id, deleted) of changed and deleted trades matching a row_version condition."""
+    query = f"""
+        SELECT row_version, id, FALSE AS deleted FROM {TRADES_TABLE} WHERE {condition}
+        UNION ALL
+        SELECT row_version, id, TRUE AS deleted FROM {TRADE_DELETIONS_TABLE} WHERE {condition}
+        ORDER BY row_version, id
+    """
+    params = params + params
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+
+def fetch_trade_changes(cursor, since_version: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Trades inserted, updated or deleted after since_version, in version order.
+
+    Run on a RealDictCursor. A client starts at version 0 and keeps calling
+    with the returned version while has_more is true; after that it polls
+    with its last version and only receives changed rows.
+
+    Only versions of transactions older than every one still running are
+    returned, and a transaction's rows always arrive on the same page.
+
+    Returns:
+        {"trades": [...], "deleted_ids": [...], "version", "has_more"}
+    """
+    limit = clamp_limit(limit)
+    # Every transaction below the horizon has finished, and any later one gets a larger id
+    cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS horizon")
+    horizon = cursor.fetchone()["horizon"]
+    changes = _fetch_version_changes(cursor, "row_version > %s AND row_version < %s",
+                                     [since_version, horizon], limit)
+    has_more = len(changes) >= limit
+    if has_more:
+        # The page may have cut the last transaction short
+        last = changes[-1]["row_version"]
+        changes = [row for row in changes if row["row_version"] != last]
+        changes += _fetch_version_changes(cursor, "row_version = %s", [last])
+
+    changed_ids = [row["id"] for row in changes if not row["deleted"]]
+    trades = []
+    if changed_ids:
+        cursor.execute(f"SELECT * FROM {TRADES_TABLE} WHERE id = ANY(%s) ORDER BY row_version, id",
+                       (changed_ids,))
+        trades = [dict(row) for row in cursor.fetchall()]
+
+    if has_more:
+        version = changes[-1]["row_version"]
+    else:
+        # Nothing below the horizon is left, so an idle client can move up to it
+        version = max(since_version, horizon - 1)
+    return {
+        "trades": trades,
+        "deleted_ids": [row["id"] for row in changes if row["deleted"]],
+        "version": version,
+        "has_more": has_more,
+    }
@@ -0,0 +1,192 @@
+"""
+Server-side P&L and win/loss aggregates over closed trades in users.trades_0001.
+
+users.trade_stats_0001 holds one row per (dimension, bucket):
+
+    all           'all'
+    day           trade date (YYYY-MM-DD)
+    strategy      trade_strategy
+    close_method  close_method
+    momentum      momentum rounded to a whole number
+
+update_trade_status applies each close to these rows in the same
+transaction as the trade update, so a dashboard reads a few hundred
+aggregate rows however many years of trades there are.
+
+What each closed trade added is kept in users.trade_stats_0001_trades.
+Closing the same trade again replaces its contribution instead of counting
+it twice, and moving a trade out of 'closed' takes it back out.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+TRADES_TABLE = "users.trades_0001"
+TRADE_STATS_TABLE = "users.trade_stats_0001"
+TRADE_STATS_TRADES_TABLE = "users.trade_stats_0001_trades"
+
+DIMENSIONS = ["all", "day", "strategy", "close_method", "momentum"]
+UNKNOWN_BUCKET = "unknown"
+STAT_COLUMNS = ["trades", "wins", "losses", "pnl", "fees", "gross_profit", "gross_loss"]
+
+# Columns update_trade_status returns from the closing UPDATE, in this order
+CLOSED_TRADE_COLUMNS = "id, date, trade_strategy, close_method, momentum, pnl, fees, win_loss"
+
+CREATE_TRADE_STATS_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {TRADE_STATS_TABLE} (
+    dimension TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    trades INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    pnl DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fees DOUBLE PRECISION NOT NULL DEFAULT 0,
+    gross_profit DOUBLE PRECISION NOT NULL DEFAULT 0,
+    gross_loss DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (dimension, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS {TRADE_STATS_TRADES_TABLE} (
+    trade_id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    close_method TEXT NOT NULL,
+    momentum TEXT NOT NULL,
+    win_loss TEXT,
+    pnl DOUBLE PRECISION NOT NULL,
+    fees DOUBLE PRECISION NOT NULL
+);
+"""
+
+# (trade_id, day, strategy, close_method, momentum, win_loss, pnl, fees)
+Contribution = Tuple[int, str, str, str, str, Optional[str], float, float]
+
+
+def _bucket(value) -> str:
+    if value is None or value == "":
+        return UNKNOWN_BUCKET
+    return str(value)
+
+
+def momentum_bucket(momentum) -> str:
+    """Whole-number momentum bucket; trades store momentum as score * 100."""
+    try:
+        return str(int(round(float(momentum))))
+    except (TypeError, ValueError):
+        return UNKNOWN_BUCKET
+
+
+def contribution(trade_row: Sequence[Any]) -> Contribution:
+    """What a closed trade (columns as CLOSED_TRADE_COLUMNS) adds to the aggregates."""
+    trade_id, date, strategy, close_method, momentum, pnl, fees, win_loss = trade_row
+    return (trade_id, _bucket(date), _bucket(strategy), _bucket(close_method), momentum_bucket(momentum),
+            win_loss, float(pnl or 0.0), float(fees or 0.0))
+
+
+def stat_deltas(added: Iterable[Contribution], removed: Iterable[Contribution] = ()) -> Dict[Tuple[str, str], List[float]]:
+    """Net change to each (dimension, bucket) row, with STAT_COLUMNS values."""
+    deltas: Dict[Tuple[str, str], List[float]] = {}
+    for sign, contributions in ((1, added), (-1, removed)):
+        for _, day, strategy, close_method, momentum, win_loss, pnl, fees in contributions:
+            values = [1, win_loss == "W", win_loss == "L", pnl, fees, max(pnl, 0.0), min(pnl, 0.0)]
+            for key in zip(DIMENSIONS, ("all", day, strategy, close_method, momentum)):
+                row = deltas.setdefault(key, [0] * len(STAT_COLUMNS))
+                for i, value in enumerate(values):
+                    row[i] += sign * value
+    return deltas
+
+
+def _apply_deltas(cursor, deltas: Dict[Tuple[str, str], List[float]]):
+    rows = [(dimension, bucket, *values) for (dimension, bucket), values in deltas.items()
+            if any(values)]
+    if not rows:
+        return
+    updates = ", ".join(f"{column} = {TRADE_STATS_TABLE}.{column} + EXCLUDED.{column}" for column in STAT_COLUMNS)
+    # Sorted so concurrent closes lock the aggregate rows in the same order
+    execute_values(cursor, f"""
+        INSERT INTO {TRADE_STATS_TABLE} (dimension, bucket, {", ".join(STAT_COLUMNS)})
+        VALUES %s
+        ON CONFLICT (dimension, bucket) DO UPDATE SET {updates}, updated_at = NOW()
+    """, sorted(rows))
+
+
+def _take_contributions(cursor, trade_ids: List[int]) -> List[Contribution]:
+    cursor.execute(f"""
+        DELETE FROM {TRADE_STATS_TRADES_TABLE} WHERE trade_id = ANY(%s)
+        RETURNING trade_id, day, strategy, close_method, momentum, win_loss, pnl, fees
+    """, (trade_ids,))
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def record_closed_trades(cursor, trade_rows: Iterable[Sequence[Any]]):
+    """
+    Apply closed trades to the aggregates.
+
+    Run in the transaction that closed them, with rows in CLOSED_TRADE_COLUMNS
+    order. That UPDATE holds the trade row locks, so two closes of the same
+    trade cannot both add to the aggregates.
+    """
+    added = [contribution(row) for row in trade_rows]
+    if not added:
+        return
+    removed = _take_contributions(cursor, [c[0] for c in added])
+    execute_values(cursor, f"""
+        INSERT INTO {TRADE_STATS_TRADES_TABLE}
+            (trade_id, day, strategy, close_method, momentum, win_loss, pnl, fees)
+        VALUES %s
+    """, added)
+    _apply_deltas(cursor, stat_deltas(added, removed))
+
+
+def forget_trades(cursor, trade_ids: Iterable[int]):
+    """Take trades that are no longer closed back out of the aggregates."""
+    trade_ids = list(trade_ids)
+    if not trade_ids:
+        return
+    removed = _take_contributions(cursor, trade_ids)
+    if removed:
+        _apply_deltas(cursor, stat_deltas([], removed))
+
+
+def rebuild_trade_stats(cursor):
+    """Recompute the aggregates from every closed trade."""
+    cursor.execute(f"TRUNCATE {TRADE_STATS_TABLE}, {TRADE_STATS_TRADES_TABLE}")
+    cursor.execute(f"SELECT {CLOSED_TRADE_COLUMNS} FROM {TRADES_TABLE} WHERE status = 'closed'")
+    record_closed_trades(cursor, cursor.fetchall())
+
+
+def ensure_trade_stats_schema(cursor):
+    """Create the aggregate tables, filling them from existing trades the first time."""
+    cursor.execute(CREATE_TRADE_STATS_SCHEMA_SQL)
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {TRADE_STATS_TABLE})")
+    if not cursor.fetchone()[0]:
+        rebuild_trade_stats(cursor)
+
+
+def fetch_trade_stats(cursor, dimension: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Aggregates grouped by dimension; run on a RealDictCursor.
+
+    Returns:
+        {"all": [{"bucket": "all", "trades", "wins", "losses", "win_rate", "pnl", ...}], "day": [...], ...}
+    """
+    if dimension is not None and dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown dimension {dimension!r}; expected one of {DIMENSIONS}")
+    query = f"SELECT dimension, bucket, {', '.join(STAT_COLUMNS)} FROM {TRADE_STATS_TABLE} WHERE trades > 0"
+    params: List[Any] = []
+    if dimension is not None:
+        query += " AND dimension = %s"
+        params.append(dimension)
+    cursor.execute(query + " ORDER BY dimension, bucket", params)
+
+    stats: Dict[str, List[Dict[str, Any]]] = {name: [] for name in DIMENSIONS if dimension in (None, name)}
+    for row in cursor.fetchall():
+        row = dict(row)
+        decided = row["wins"] + row["losses"]
+        row["win_rate"] = round(row["wins"] / decided * 100, 2) if decided else None
+        for column in ("pnl", "fees", "gross_profit", "gross_loss"):
+            row[column] = round(row[column], 2)
+        stats[row.pop("dimension")].append(row)
+    return stats
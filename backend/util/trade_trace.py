@@ -0,0 +1,179 @@
+"""
+Tick-to-trade latency tracing.
+
+A trace is a small JSON-serializable dict that starts when the strike table
+generator builds a ladder from the latest tick and rides along with the
+watchlist notification, the auto entry ticket, trade_manager and
+trade_executor. Each hop stamps the stages it owns; the executor stores the
+finished trace in system.trade_traces keyed by trace id and ticket id.
+
+Stages are stamped with wall-clock epoch seconds (time.time()) because they
+are compared across processes on the same host; a per-process monotonic
+clock would not be comparable between services.
+"""
+
+import copy
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+# Pipeline order; latencies are reported between consecutive stamped stages
+TRACE_STAGES = (
+    "tick",               # price row the ladder was built from (second resolution)
+    "ladder_started",     # strike_table_generator starts building the ladder
+    "ladder_published",   # ladder and watchlist swap committed, NOTIFY being sent
+    "entry_received",     # auto_entry_supervisor receives the notification
+    "entry_decided",      # candidate passed all entry checks
+    "entry_sent",         # ticket POSTed to trade_manager
+    "manager_received",   # trade_manager accepted the ticket
+    "executor_sent",      # trade_manager forwards to trade_executor
+    "executor_received",  # trade_executor receives the ticket
+    "order_sent",         # order request sent to Kalshi
+    "order_acked",        # Kalshi response received
+)
+
+TRACE_TABLE = "system.trade_traces"
+
+CREATE_TRACE_TABLE_SQL = f"""
+CREATE SCHEMA IF NOT EXISTS system;
+CREATE TABLE IF NOT EXISTS {TRACE_TABLE} (
+    id BIGSERIAL PRIMARY KEY,
+    trace_id TEXT NOT NULL,
+    ticket_id TEXT,
+    ticker TEXT,
+    symbol TEXT,
+    outcome TEXT,
+    stages JSONB NOT NULL,
+    stage_latency_ms JSONB NOT NULL,
+    total_ms DOUBLE PRECISION,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_trade_traces_trace_id ON {TRACE_TABLE} (trace_id);
+CREATE INDEX IF NOT EXISTS idx_trade_traces_ticket_id ON {TRACE_TABLE} (ticket_id);
+CREATE INDEX IF NOT EXISTS idx_trade_traces_created_at ON {TRACE_TABLE} (created_at);
+"""
+
+_EASTERN = ZoneInfo("America/New_York")
+_table_ready = False
+
+
+def new_trace(symbol: Optional[str] = None, tick_time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Start a trace for one ladder version.
+
+    Args:
+        symbol: Symbol the ladder is for
+        tick_time: Epoch seconds of the price row the ladder is built from
+    """
+    trace = {"id": uuid.uuid4().hex[:16], "symbol": symbol, "stages": {}}
+    if tick_time is not None:
+        trace["stages"]["tick"] = tick_time
+    return trace
+
+
+def stamp(trace: Optional[Dict[str, Any]], stage: str, at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Record when a stage was reached. A None trace is passed through untouched."""
+    if trace is None:
+        return None
+    if stage not in TRACE_STAGES:
+        raise ValueError(f"Unknown trace stage: {stage}")
+    trace.setdefault("stages", {})[stage] = time.time() if at is None else at
+    return trace
+
+
+def fork(trace: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Copy a ladder trace for one ticket, keeping its id and earlier stages."""
+    return copy.deepcopy(trace) if trace is not None else None
+
+
+def tick_epoch(timestamp: Any) -> Optional[float]:
+    """
+    Convert a live_price_log timestamp to epoch seconds.
+
+    The price watchdogs write naive Eastern-time ISO strings; datetimes
+    without a timezone are treated the same way.
+    """
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            return None
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=_EASTERN)
+        return timestamp.timestamp()
+    return None
+
+
+def stage_latencies_ms(trace: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Latency between consecutive stamped stages, in milliseconds.
+
+    Keys are named "<from>-><to>"; stages that were never stamped are skipped.
+    """
+    stages = trace.get("stages") or {}
+    present = [s for s in TRACE_STAGES if stages.get(s) is not None]
+    return {
+        f"{a}->{b}": round((stages[b] - stages[a]) * 1000.0, 3)
+        for a, b in zip(present, present[1:])
+    }
+
+
+def total_latency_ms(trace: Dict[str, Any]) -> Optional[float]:
+    """Latency from the first to the last stamped stage, in milliseconds."""
+    stages = trace.get("stages") or {}
+    present = [stages[s] for s in TRACE_STAGES if stages.get(s) is not None]
+    if len(present) < 2:
+        return None
+    return round((present[-1] - present[0]) * 1000.0, 3)
+
+
+def save_trace(conn, trace: Dict[str, Any], ticket_id: Optional[str] = None,
+               ticker: Optional[str] = None, outcome: Optional[str] = None) -> None:
+    """
+    Insert a finished trace into system.trade_traces and commit.
+
+    Creates the table on first use.
+    """
+    global _table_ready
+    with conn.cursor() as cursor:
+        if not _table_ready:
+            cursor.execute(CREATE_TRACE_TABLE_SQL)
+        cursor.execute(f"""
+            INSERT INTO {TRACE_TABLE}
+                (trace_id, ticket_id, ticker, symbol, outcome, stages, stage_latency_ms, total_ms)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, (
+            trace.get("id"), ticket_id, ticker, trace.get("symbol"), outcome,
+            json.dumps(trace.get("stages") or {}),
+            json.dumps(stage_latencies_ms(trace)),
+            total_latency_ms(trace)
+        ))
+    conn.commit()
+    _table_ready = True
+
+
+def record_trace(trace: Optional[Dict[str, Any]], ticket_id: Optional[str] = None,
+                 ticker: Optional[str] = None, outcome: Optional[str] = None) -> None:
+    """Store a finished trace on its own connection, logging instead of raising."""
+    if not trace:
+        return
+    try:
+        import psycopg2
+        conn = psycopg2.connect(
+            host="localhost",
+            database="rec_io_db",
+            user="rec_io_user",
+            password="rec_io_password"
+        )
+        try:
+            save_trace(conn, trace, ticket_id, ticker, outcome)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error recording trade trace {trace.get('id')}: {e}")
@@ -0,0 +1,107 @@
+"""
+Watchlist filtering for the strike ladder.
+
+The watchlist is the subset of strikes the auto entry supervisor scans. It is
+derived in the strike table generator from the ladder it just built, written
+in the same transaction and published once it commits, so no service has to read the strike table
+back just to filter it.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+# Default filter values used when auto_trade_settings has no watchlist columns
+DEFAULT_WATCHLIST_MIN_VOLUME = 1000
+DEFAULT_WATCHLIST_MAX_ASK = 98
+
+# The watchlist is deliberately wider than the auto entry thresholds
+WATCHLIST_PROBABILITY_MARGIN = 5
+WATCHLIST_DIFFERENTIAL_MARGIN = 3
+
+# Column order for rows written to live_data.watchlist_<symbol>
+WATCHLIST_COLUMNS = (
+    "symbol", "current_price", "ttc_seconds", "broker", "event_ticker", "market_title",
+    "strike_tier", "market_status", "strike", "buffer", "buffer_pct", "probability",
+    "yes_ask", "no_ask", "yes_diff", "no_diff", "volume", "ticker", "active_side"
+)
+
+_REQUIRED_FIELDS = ("volume", "probability", "yes_ask", "no_ask", "yes_diff", "no_diff")
+
+
+def price_strike(strike: float, current_price: float, pos_prob: float, neg_prob: float,
+                 yes_ask: float, no_ask: float) -> Tuple[float, float, float, str]:
+    """
+    Price one ladder strike from the lookup probabilities and ask prices.
+
+    Strikes below the current price use the positive-move probability and
+    trade the YES side; strikes at or above it use the negative-move
+    probability and trade NO.
+
+    Returns:
+        (probability, yes_diff, no_diff, active_side)
+    """
+    if strike < current_price:
+        probability = pos_prob
+        return probability, probability - yes_ask, 100 - probability - no_ask, 'yes'
+    probability = neg_prob
+    return probability, 100 - probability - yes_ask, probability - no_ask, 'no'
+
+
+def get_watchlist_filters(settings: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Derive watchlist filter thresholds from auto entry settings.
+
+    Args:
+        settings: Auto entry settings with min_probability and min_differential
+
+    Returns:
+        Dict with min_probability, min_differential, min_volume and max_ask
+    """
+    return {
+        "min_probability": (settings.get("min_probability") or 0) - WATCHLIST_PROBABILITY_MARGIN,
+        "min_differential": float(settings.get("min_differential") or 0) - WATCHLIST_DIFFERENTIAL_MARGIN,
+        "min_volume": settings.get("watchlist_min_volume", DEFAULT_WATCHLIST_MIN_VOLUME),
+        "max_ask": settings.get("watchlist_max_ask", DEFAULT_WATCHLIST_MAX_ASK),
+    }
+
+
+def filter_watchlist(strikes: List[Dict[str, Any]], min_probability: float, min_differential: float,
+                     min_volume: float = DEFAULT_WATCHLIST_MIN_VOLUME,
+                     max_ask: float = DEFAULT_WATCHLIST_MAX_ASK) -> List[Dict[str, Any]]:
+    """
+    Filter a strike ladder down to the watchlist.
+
+    A strike is kept when its volume, probability and larger ask price pass the
+    thresholds and at least one side's differential does. Strikes with any
+    missing field are dropped.
+
+    Args:
+        strikes: Strike dicts as built by the strike table generator
+        min_probability: Probability must be strictly greater than this
+        min_differential: yes_diff or no_diff must be at least this
+        min_volume: Minimum traded volume
+        max_ask: Maximum of yes_ask/no_ask allowed
+
+    Returns:
+        Matching strike dicts sorted by probability, highest first
+    """
+    if not strikes:
+        return []
+
+    values = np.array(
+        [[np.nan if s.get(field) is None else float(s[field]) for field in _REQUIRED_FIELDS] for s in strikes],
+        dtype=float
+    )
+    volume, probability, yes_ask, no_ask, yes_diff, no_diff = values.T
+
+    mask = (
+        ~np.isnan(values).any(axis=1)
+        & (volume >= min_volume)
+        & (probability > min_probability)
+        & (np.maximum(yes_ask, no_ask) <= max_ask)
+        & ((yes_diff >= min_differential) | (no_diff >= min_differential))
+    )
+
+    selected = np.flatnonzero(mask)
+    order = selected[np.argsort(-probability[selected], kind="stable")]
+    return [strikes[i] for i in order]
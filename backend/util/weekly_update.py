@@ -3,32 +3,63 @@
 WEEKLY DATA UPDATE SCRIPT
 Runs every Saturday at 11:59:59 PM to update the entire data pipeline.
 
-Pipeline Steps:
-1. Update symbol master 5y datasets using symbol_data_fetch
-2. Run momentum generator on new master datasets
-3. Confirm new data is complete (5 years of 1m candlestick data, all rows with momentum score)
-4. Archive existing fingerprint files with dated zip file
-5. Run fingerprint_generator to generate updated fingerprints
-6. Record log of operations for review
+Pipeline Steps (run per symbol, symbols in parallel):
+1. dataset      - Update symbol master 5y dataset using symbol_data_fetch and
+                  detect which rows were appended and which fell out of the window
+2. momentum     - Compute momentum for the appended rows only
+3. verify       - Confirm data is complete (5 years of 1m candlestick data, all rows with momentum score)
+4. archive      - Archive existing fingerprint files with dated zip file
+5. fingerprints - Apply the change to the saved fingerprint counts and write
+                  updated fingerprints (full rebuild when no usable counts exist)
+6. Record per-step timing in system.weekly_update_steps and a summary log
+
+Steps declare their dependencies; a step is skipped when an upstream step
+failed or when the dataset did not change.
 """
 
 import os
 import sys
 import time
+import uuid
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from graphlib import TopologicalSorter
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
 import pandas as pd
-import subprocess
 import json
 
 # Add the util directory to the path so we can import our modules
 sys.path.append(os.path.dirname(__file__))
 
 from symbol_data_fetch import update_existing_csv
-from momentum_generator import fill_missing_momentum_inplace
+from momentum_generator import fill_missing_momentum
 from fingerprint_archiver import create_archive, find_fingerprint_files
-from fingerprint_generator import main as run_fingerprint_generator
+from fingerprint_counts import MOMENTUM_BUCKETS, FingerprintCounts
+from fingerprint_store import ensure_fingerprint_table, write_fingerprints
+from fingerprint_generator import (
+    get_postgresql_connection, create_analytics_schema, create_fingerprint_table, insert_fingerprint_data
+)
+
+STEP_HISTORY_TABLE = "system.weekly_update_steps"
+
+CREATE_STEP_HISTORY_SQL = f"""
+CREATE SCHEMA IF NOT EXISTS system;
+CREATE TABLE IF NOT EXISTS {STEP_HISTORY_TABLE} (
+    id BIGSERIAL PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL,
+    duration_seconds DOUBLE PRECISION NOT NULL,
+    detail JSONB
+);
+CREATE INDEX IF NOT EXISTS idx_weekly_update_steps_run_id ON {STEP_HISTORY_TABLE} (run_id);
+"""
 
 # Configure logging
 def setup_logging():
@@ -73,193 +104,293 @@ def get_symbols():
     
     return symbols
 
-def update_symbol_datasets(logger):
-    """Step 1: Update symbol master 5y datasets using symbol_data_fetch."""
-    logger.info("📊 Step 1: Updating symbol master datasets")
-    
-    symbols = get_symbols()
-    logger.info(f"Found symbols to update: {symbols}")
-    
-    updated_symbols = []
-    for symbol in symbols:
-        try:
-            logger.info(f"Updating {symbol.upper()} dataset...")
-            
-            # Construct the master file path - using absolute path
-            project_root = Path(__file__).parent.parent.parent
-            master_file = project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / f"{symbol}_1m_master_5y.csv"
-            
-            # Update the dataset
-            result = update_existing_csv(f"{symbol.upper()}/USD", str(master_file))
-            
-            if result:
-                logger.info(f"✅ {symbol.upper()} dataset updated successfully")
-                updated_symbols.append(symbol)
-            else:
-                logger.warning(f"⚠️ {symbol.upper()} dataset update failed or no new data")
-                
-        except Exception as e:
-            logger.error(f"❌ Error updating {symbol.upper()} dataset: {e}")
-    
-    logger.info(f"Updated {len(updated_symbols)} symbols: {updated_symbols}")
-    return updated_symbols
+def get_master_file(symbol):
+    """Path of a symbol's 1m master 5y dataset."""
+    project_root = Path(__file__).parent.parent.parent
+    return project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / f"{symbol}_1m_master_5y.csv"
 
-def run_momentum_generation(logger, symbols):
-    """Step 2: Run momentum generator on new master datasets."""
-    logger.info("📈 Step 2: Running momentum generation")
-    
-    processed_symbols = []
-    for symbol in symbols:
-        try:
-            logger.info(f"Generating momentum for {symbol.upper()}...")
-            
-            # Construct the master file path - using absolute path
-            project_root = Path(__file__).parent.parent.parent
-            master_file = project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / f"{symbol}_1m_master_5y.csv"
-            
-            # Run momentum generation
-            fill_missing_momentum_inplace(str(master_file))
-            
-            logger.info(f"✅ {symbol.upper()} momentum generation completed")
-            processed_symbols.append(symbol)
-            
-        except Exception as e:
-            logger.error(f"❌ Error generating momentum for {symbol.upper()}: {e}")
-    
-    logger.info(f"Momentum generation completed for {len(processed_symbols)} symbols")
-    return processed_symbols
+def get_fingerprint_output_dir(symbol):
+    """Directory the directional fingerprint CSVs (and their counts) are written to."""
+    project_root = Path(__file__).parent.parent.parent
+    return project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / "symbol_fingerprints"
 
-def verify_data_completeness(logger, symbols):
-    """Step 3: Confirm new data is complete (5 years of 1m candlestick data, all rows with momentum score)."""
-    logger.info("🔍 Step 3: Verifying data completeness")
-    
-    verification_results = {}
-    
-    for symbol in symbols:
-        try:
-            logger.info(f"Verifying {symbol.upper()} dataset...")
-            
-            # Load the dataset - using absolute path
-            project_root = Path(__file__).parent.parent.parent
-            master_file = project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / f"{symbol}_1m_master_5y.csv"
-            df = pd.read_csv(str(master_file))
-            
-            # Check data completeness
-            total_rows = len(df)
-            expected_rows = 5 * 365 * 24 * 60  # 5 years of 1-minute data
-            
-            # Check date range
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            date_range = df['timestamp'].max() - df['timestamp'].min()
-            days_covered = date_range.days
-            
-            # Check momentum completeness
-            momentum_complete = df['momentum'].notna().all()
-            
-            # Check for any missing values in critical columns
-            critical_columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'momentum']
-            missing_data = df[critical_columns].isnull().sum().sum() > 0
-            
-            verification_results[symbol] = {
-                'total_rows': total_rows,
-                'expected_rows': expected_rows,
-                'days_covered': days_covered,
-                'momentum_complete': momentum_complete,
-                'missing_data': missing_data,
-                'date_range_start': df['timestamp'].min(),
-                'date_range_end': df['timestamp'].max()
-            }
-            
-            logger.info(f"✅ {symbol.upper()} verification:")
-            logger.info(f"   - Rows: {total_rows:,} (expected ~{expected_rows:,})")
-            logger.info(f"   - Date range: {days_covered} days")
-            logger.info(f"   - Momentum complete: {momentum_complete}")
-            logger.info(f"   - Missing data: {missing_data}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error verifying {symbol.upper()}: {e}")
-            verification_results[symbol] = {'error': str(e)}
-    
-    return verification_results
+def get_counts_file(symbol):
+    return get_fingerprint_output_dir(symbol) / f"{symbol}_fingerprint_counts.npz"
 
-def archive_existing_fingerprints(logger, symbols):
+def load_master(master_file):
+    df = pd.read_csv(str(master_file))
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+@dataclass
+class DatasetChange:
+    """What the dataset update changed: rows dropped from the front and rows appended at the end."""
+    previous_first: Optional[pd.Timestamp]
+    previous_last: Optional[pd.Timestamp]
+    previous_rows: int
+    dropped: pd.DataFrame
+    appended_rows: int
+    # False when the new dataset is not the previous window shifted forward
+    contiguous: bool = True
+
+    @property
+    def changed(self):
+        return self.appended_rows > 0 or len(self.dropped) > 0 or not self.contiguous
+
+    def describe(self, df):
+        detail = {'rows_dropped': len(self.dropped), 'rows_appended': self.appended_rows,
+                  'contiguous': self.contiguous}
+        if len(self.dropped):
+            detail['dropped_range'] = [str(self.dropped['timestamp'].iloc[0]), str(self.dropped['timestamp'].iloc[-1])]
+        if self.appended_rows:
+            detail['appended_range'] = [str(df['timestamp'].iloc[-self.appended_rows]), str(df['timestamp'].iloc[-1])]
+        return detail
+
+def detect_change(previous, df):
+    """Compare the dataset before and after the update."""
+    if previous is None or previous.empty:
+        return DatasetChange(None, None, 0, df.iloc[:0], len(df), contiguous=False)
+    previous_first = previous['timestamp'].iloc[0]
+    previous_last = previous['timestamp'].iloc[-1]
+    dropped = previous[previous['timestamp'] < df['timestamp'].iloc[0]]
+    appended_rows = int((df['timestamp'] > previous_last).sum())
+    kept = previous.iloc[len(dropped):]
+    contiguous = (
+        len(kept) + appended_rows == len(df) and
+        kept['timestamp'].reset_index(drop=True).equals(df['timestamp'].iloc[:len(kept)].reset_index(drop=True))
+    )
+    return DatasetChange(previous_first, previous_last, len(previous), dropped.reset_index(drop=True),
+                         appended_rows, contiguous)
+
+@dataclass
+class SymbolContext:
+    """State passed between the steps of one symbol's pipeline."""
+    symbol: str
+    master_file: Path
+    df: Optional[pd.DataFrame] = None
+    change: Optional[DatasetChange] = None
+    outputs: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[[SymbolContext], Dict[str, Any]]
+    depends_on: Tuple[str, ...] = ()
+    # Skip the step (status 'unchanged') when this returns False
+    needed: Callable[[SymbolContext], bool] = lambda ctx: True
+
+def update_dataset(ctx):
+    """Step 1: Update the master dataset and detect what changed."""
+    previous = load_master(ctx.master_file) if ctx.master_file.exists() else None
+    _, rows_fetched = update_existing_csv(f"{ctx.symbol.upper()}/USD", str(ctx.master_file))
+    ctx.df = load_master(ctx.master_file)
+    ctx.change = detect_change(previous, ctx.df)
+    del previous
+    return {'rows_fetched': rows_fetched, **ctx.change.describe(ctx.df)}
+
+def generate_momentum(ctx):
+    """Step 2: Compute momentum for rows that don't have it (the appended rows)."""
+    filled = fill_missing_momentum(ctx.df)
+    if filled:
+        ctx.df.to_csv(str(ctx.master_file), index=False)
+    return {'rows_filled': filled}
+
+def verify_dataset(ctx):
+    """Step 3: Confirm data is complete (5 years of 1m candlestick data, all rows with momentum score)."""
+    df = ctx.df
+    expected_rows = 5 * 365 * 24 * 60  # 5 years of 1-minute data
+    critical_columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'momentum']
+    result = {
+        'total_rows': len(df),
+        'expected_rows': expected_rows,
+        'days_covered': (df['timestamp'].max() - df['timestamp'].min()).days,
+        # The first rows have no momentum, as momentum needs history
+        'momentum_complete': bool(df['momentum'].iloc[30:].notna().all()),
+        'missing_data': bool(df[critical_columns].iloc[30:].isnull().sum().sum() > 0),
+        'date_range_start': str(df['timestamp'].min()),
+        'date_range_end': str(df['timestamp'].max())
+    }
+    if not result['momentum_complete']:
+        raise Exception(f"Momentum missing for {int(df['momentum'].iloc[30:].isna().sum())} rows")
+    return result
+
+def archive_fingerprints(ctx):
     """Step 4: Archive existing fingerprint files with dated zip file."""
-    logger.info("📦 Step 4: Archiving existing fingerprint files")
-    
-    archived_files = {}
-    
-    for symbol in symbols:
-        try:
-            logger.info(f"Archiving {symbol.upper()} fingerprint files...")
-            
-            # Find fingerprint files - using absolute path
-            project_root = Path(__file__).parent.parent.parent
-            fingerprint_dir = project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / "symbol_fingerprints"
-            fingerprint_files = find_fingerprint_files(str(fingerprint_dir))
-            
-            if fingerprint_files:
-                # Create archive
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                archive_name = f"{symbol}_fingerprint_archive_{timestamp}"
-                output_dir = project_root / "backend" / "data" / "archives"
-                
-                archive_path = create_archive(fingerprint_files, str(output_dir), archive_name, symbol)
-                
-                if archive_path:
-                    logger.info(f"✅ {symbol.upper()} fingerprints archived: {archive_path}")
-                    archived_files[symbol] = archive_path
-                else:
-                    logger.warning(f"⚠️ Failed to archive {symbol.upper()} fingerprints")
-            else:
-                logger.info(f"ℹ️ No fingerprint files found for {symbol.upper()}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error archiving {symbol.upper()} fingerprints: {e}")
-    
-    return archived_files
+    fingerprint_files = find_fingerprint_files(str(get_fingerprint_output_dir(ctx.symbol)))
+    if not fingerprint_files:
+        return {'archive_path': None}
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent.parent.parent / "backend" / "data" / "archives"
+    archive_path = create_archive(fingerprint_files, str(output_dir), f"{ctx.symbol}_fingerprint_archive_{timestamp}", ctx.symbol)
+    if not archive_path:
+        raise Exception("Failed to create fingerprint archive")
+    return {'archive_path': archive_path}
 
-def generate_new_fingerprints(logger, symbols):
-    """Step 5: Run fingerprint_generator to generate updated fingerprints."""
-    logger.info("🔢 Step 5: Generating new fingerprint files")
-    
-    generated_symbols = []
-    
-    for symbol in symbols:
+def update_fingerprints(ctx):
+    """Step 5: Apply the dataset change to the saved counts and write the fingerprints."""
+    change = ctx.change
+    counts_file = get_counts_file(ctx.symbol)
+    counts = FingerprintCounts.load(str(counts_file))
+    incremental = (
+        counts is not None and change.contiguous and
+        counts.rows == change.previous_rows and
+        counts.first_timestamp == change.previous_first and
+        counts.last_timestamp == change.previous_last
+    )
+    if incremental:
+        counts.apply_update(change.dropped, ctx.df, change.appended_rows)
+    else:
+        counts = FingerprintCounts.build(ctx.df)
+
+    output_dir = get_fingerprint_output_dir(ctx.symbol)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    momentum_frames = {momentum_value: counts.fingerprint(momentum_value) for momentum_value in MOMENTUM_BUCKETS}
+    frames = {f"{ctx.symbol}_fingerprint_directional_baseline": counts.fingerprint()}
+    for momentum_value, frame in momentum_frames.items():
+        frames[f"{ctx.symbol}_fingerprint_directional_momentum_{momentum_value:03d}"] = frame
+    for name, frame in frames.items():
+        frame.to_csv(output_dir / f"{name}.csv")
+
+    db_conn = get_postgresql_connection()
+    if db_conn:
         try:
-            logger.info(f"Generating fingerprints for {symbol.upper()}...")
-            
-            # Construct the master file path - using absolute path
-            project_root = Path(__file__).parent.parent.parent
-            master_file = project_root / "backend" / "data" / "historical_data" / f"{symbol}_historical" / f"{symbol}_1m_master_5y.csv"
-            
-            # Run fingerprint generation using subprocess
-            result = subprocess.run([sys.executable, "fingerprint_generator.py", str(master_file)], 
-                                  capture_output=True, text=True, cwd=os.path.dirname(__file__))
-            
-            if result.returncode != 0:
-                raise Exception(f"Fingerprint generation failed: {result.stderr}")
-            
-            logger.info(f"✅ {symbol.upper()} fingerprint generation completed")
-            generated_symbols.append(symbol)
-            
-        except Exception as e:
-            logger.error(f"❌ Error generating fingerprints for {symbol.upper()}: {e}")
+            create_analytics_schema(db_conn)
+            for name, frame in frames.items():
+                create_fingerprint_table(db_conn, name, frame)
+                insert_fingerprint_data(db_conn, name, frame)
+            cursor = db_conn.cursor()
+            ensure_fingerprint_table(cursor)
+            write_fingerprints(cursor, ctx.symbol, momentum_frames,
+                               {b: counts.weight_totals(b) for b in MOMENTUM_BUCKETS})
+            db_conn.commit()
+        finally:
+            db_conn.close()
+
+    # Saved last, so a failed run rebuilds instead of double-applying the change
+    counts.save(str(counts_file))
+    return {'mode': 'incremental' if incremental else 'full', 'fingerprints': len(frames),
+            'database': db_conn is not None}
+
+def _dataset_changed(ctx):
+    return ctx.change.changed
+
+def _fingerprints_needed(ctx):
+    return ctx.change.changed or not get_counts_file(ctx.symbol).exists()
+
+PIPELINE = [
+    Step("dataset", update_dataset),
+    Step("momentum", generate_momentum, ("dataset",), _dataset_changed),
+    Step("verify", verify_dataset, ("momentum",)),
+    Step("archive", archive_fingerprints, ("verify",), _fingerprints_needed),
+    Step("fingerprints", update_fingerprints, ("verify", "archive"), _fingerprints_needed),
+]
+
+def run_symbol_pipeline(symbol, steps=PIPELINE):
+    """
+    Run the steps for one symbol in dependency order.
     
-    logger.info(f"Fingerprint generation completed for {len(generated_symbols)} symbols")
-    return generated_symbols
+    Returns:
+        One record per step: symbol, step, status ('success', 'failed',
+        'unchanged' or 'skipped'), started_at, duration_seconds, detail
+    """
+    logger = logging.getLogger(__name__)
+    ctx = SymbolContext(symbol, get_master_file(symbol))
+    by_name = {step.name: step for step in steps}
+    order = TopologicalSorter({step.name: step.depends_on for step in steps}).static_order()
+    statuses = {}
+    records = []
+
+    for name in order:
+        step = by_name[name]
+        started_at = datetime.now().astimezone()
+        start = time.time()
+        detail = {}
+        if any(statuses.get(dep) in ('failed', 'skipped') for dep in step.depends_on):
+            status = 'skipped'
+        elif not step.needed(ctx):
+            status = 'unchanged'
+        else:
+            logger.info(f"🚀 {symbol.upper()}: {name}")
+            try:
+                detail = step.run(ctx) or {}
+                status = 'success'
+            except Exception as e:
+                logger.error(f"❌ {symbol.upper()}: {name} failed: {e}")
+                detail = {'error': str(e)}
+                status = 'failed'
+        duration = time.time() - start
+        statuses[name] = status
+        if status == 'success':
+            logger.info(f"✅ {symbol.upper()}: {name} completed in {duration:.2f} seconds")
+        records.append({
+            'symbol': symbol,
+            'step': name,
+            'status': status,
+            'started_at': started_at,
+            'duration_seconds': duration,
+            'detail': detail
+        })
+    return records
+
+def run_pipelines(symbols, max_workers=None):
+    """Run every symbol's pipeline; symbols are independent and run in parallel processes."""
+    if not symbols:
+        return []
+    max_workers = max_workers or min(len(symbols), multiprocessing.cpu_count())
+    if max_workers == 1:
+        per_symbol = [run_symbol_pipeline(symbol) for symbol in symbols]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            per_symbol = list(pool.map(run_symbol_pipeline, symbols))
+    return [record for records in per_symbol for record in records]
+
+def record_step_history(logger, run_id, records):
+    """Write per-step timing to system.weekly_update_steps."""
+    conn = get_postgresql_connection()
+    if not conn:
+        logger.warning("⚠️ PostgreSQL unavailable - step history not recorded")
+        return False
+    try:
+        cursor = conn.cursor()
+        cursor.execute(CREATE_STEP_HISTORY_SQL)
+        for record in records:
+            cursor.execute(f"""
+                INSERT INTO {STEP_HISTORY_TABLE}
+                    (run_id, symbol, step, status, started_at, duration_seconds, detail)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (run_id, record['symbol'], record['step'], record['status'], record['started_at'],
+                  record['duration_seconds'], json.dumps(record['detail'], default=str)))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"❌ Failed to record step history: {e}")
+        return False
+    finally:
+        conn.close()
 
 def create_summary_report(logger, results):
     """Create a summary report of the weekly update."""
     logger.info("📋 Creating summary report...")
     
+    steps = results.get('steps', [])
+
+    def symbols_with(step, status='success'):
+        return [r['symbol'] for r in steps if r['step'] == step and r['status'] == status]
+
     summary = {
         'timestamp': datetime.now().isoformat(),
+        'run_id': results.get('run_id'),
         'symbols_processed': results.get('symbols', []),
-        'symbols_updated': results.get('updated_symbols', []),
-        'symbols_with_momentum': results.get('momentum_symbols', []),
-        'verification_results': results.get('verification_results', {}),
-        'archived_files': results.get('archived_files', {}),
-        'generated_symbols': results.get('generated_symbols', []),
+        'symbols_updated': [r['symbol'] for r in steps if r['step'] == 'dataset' and r['status'] == 'success'
+                            and (r['detail'].get('rows_appended') or r['detail'].get('rows_dropped'))],
+        'symbols_with_momentum': symbols_with('momentum'),
+        'verification_results': {r['symbol']: r['detail'] for r in steps if r['step'] == 'verify'},
+        'archived_files': {r['symbol']: r['detail'].get('archive_path') for r in steps
+                           if r['step'] == 'archive' and r['status'] == 'success'},
+        'generated_symbols': symbols_with('fingerprints'),
+        'failed_steps': [f"{r['symbol']}:{r['step']}" for r in steps if r['status'] == 'failed'],
+        'steps': steps,
         'total_duration': results.get('total_duration', 0)
     }
     
@@ -296,46 +427,31 @@ def main():
     logger.info(f"Log file: {log_file}")
     
     results = {
+        'run_id': uuid.uuid4().hex[:12],
         'symbols': [],
-        'updated_symbols': [],
-        'momentum_symbols': [],
-        'verification_results': {},
-        'archived_files': {},
-        'generated_symbols': [],
+        'steps': [],
         'total_duration': 0
     }
     
     try:
-        # Step 1: Update symbol datasets
-        step_start = log_step(logger, "Symbol dataset updates")
         results['symbols'] = get_symbols()
-        results['updated_symbols'] = update_symbol_datasets(logger)
-        log_step(logger, "Symbol dataset updates", step_start)
+        logger.info(f"Found symbols to update: {results['symbols']}")
         
-        # Step 2: Run momentum generation
-        step_start = log_step(logger, "Momentum generation")
-        results['momentum_symbols'] = run_momentum_generation(logger, results['updated_symbols'])
-        log_step(logger, "Momentum generation", step_start)
+        step_start = log_step(logger, "Symbol pipelines")
+        results['steps'] = run_pipelines(results['symbols'])
+        log_step(logger, "Symbol pipelines", step_start)
         
-        # Step 3: Verify data completeness
-        step_start = log_step(logger, "Data completeness verification")
-        results['verification_results'] = verify_data_completeness(logger, results['momentum_symbols'])
-        log_step(logger, "Data completeness verification", step_start)
-        
-        # Step 4: Archive existing fingerprints
-        step_start = log_step(logger, "Fingerprint archiving")
-        results['archived_files'] = archive_existing_fingerprints(logger, results['momentum_symbols'])
-        log_step(logger, "Fingerprint archiving", step_start)
-        
-        # Step 5: Generate new fingerprints
-        step_start = log_step(logger, "Fingerprint generation")
-        results['generated_symbols'] = generate_new_fingerprints(logger, results['momentum_symbols'])
-        log_step(logger, "Fingerprint generation", step_start)
+        record_step_history(logger, results['run_id'], results['steps'])
         
         # Create summary report
         results['total_duration'] = time.time() - start_time
         summary_file = create_summary_report(logger, results)
         
+        failed = [r for r in results['steps'] if r['status'] == 'failed']
+        if failed:
+            logger.error(f"❌ WEEKLY UPDATE FINISHED WITH {len(failed)} FAILED STEPS")
+            return False
+        
         logger.info("🎉 WEEKLY UPDATE COMPLETED SUCCESSFULLY!")
         logger.info(f"Total duration: {results['total_duration']:.2f} seconds")
         
@@ -348,4 +464,4 @@ def main():
 
 if __name__ == "__main__":
     success = main()
-    sys.exit(0 if success else 1) 
\ No newline at end of file
+    sys.exit(0 if success else 1)
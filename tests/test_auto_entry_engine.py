@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven auto entry decision engine helpers.
+"""
+
+import json
+import os
+import sys
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.auto_entry_engine import (
+    TradedStrikeIndex,
+    build_watchlist_notification,
+    evaluate_watchlist,
+    get_watchlist_channel
+)
+
+
+class TestEvaluateWatchlist(unittest.TestCase):
+    """Test candidate selection matches the polling loop's entry rules."""
+
+    def setUp(self):
+        self.watchlist = {
+            "strikes": [
+                {"strike": 110000, "active_side": "yes", "probability": 96.0, "yes_ask": 90,
+                 "no_ask": 11, "yes_diff": 6.0, "no_diff": -7.0, "ticker": "T-110000"},
+                {"strike": 111000, "active_side": "no", "probability": 95.0, "yes_ask": 8,
+                 "no_ask": 93, "yes_diff": -3.0, "no_diff": 2.0, "ticker": "T-111000"},
+                {"strike": 112000, "active_side": "no", "probability": 90.0, "yes_ask": 5,
+                 "no_ask": 85, "yes_diff": 5.0, "no_diff": 5.0, "ticker": "T-112000"},
+                {"strike": 110000, "active_side": "yes", "probability": 99.0, "yes_ask": 90,
+                 "no_ask": 11, "yes_diff": 6.0, "no_diff": -7.0, "ticker": "T-110000"},
+            ]
+        }
+
+    def test_thresholds(self):
+        candidates = evaluate_watchlist(self.watchlist, min_probability=95, min_differential=3)
+        self.assertEqual([c["strike_key"] for c in candidates], ["110000-yes"])
+        self.assertAlmostEqual(candidates[0]["buy_price"], 0.90)
+        self.assertEqual(candidates[0]["side"], "yes")
+
+    def test_differential_tolerance(self):
+        candidates = evaluate_watchlist(self.watchlist, min_probability=95, min_differential=2.5)
+        self.assertEqual([c["strike_key"] for c in candidates], ["110000-yes", "111000-no"])
+
+    def test_skip_differential_check(self):
+        candidates = evaluate_watchlist(self.watchlist, min_probability=90, min_differential=None)
+        self.assertEqual(len(candidates), 3)
+
+    def test_empty(self):
+        self.assertEqual(evaluate_watchlist({"strikes": None}, 0, 0), [])
+
+
+class TestNotificationPayload(unittest.TestCase):
+
+    def test_channel(self):
+        self.assertEqual(get_watchlist_channel("BTC"), "watchlist_btc")
+
+    def test_inline_strikes(self):
+        payload = json.loads(build_watchlist_notification({"ttc": 300}, [{"strike": 1}]))
+        self.assertEqual(payload["ttc"], 300)
+        self.assertEqual(payload["strikes"], [{"strike": 1}])
+        self.assertIn("published_at", payload)
+
+    def test_oversized_strikes_dropped(self):
+        strikes = [{"ticker": "X" * 100, "strike": i} for i in range(200)]
+        payload = json.loads(build_watchlist_notification({"ttc": 300}, strikes))
+        self.assertIsNone(payload["strikes"])
+
+
+class TestTradedStrikeIndex(unittest.TestCase):
+    """Test the in-memory traded strike and cooldown index."""
+
+    TICKER = "KXBTCD-25AUG1515-T118499.99"
+
+    def test_not_ready_until_warmed(self):
+        index = TradedStrikeIndex(cooldown_seconds=10)
+        self.assertFalse(index.ready)
+        index.warm([(1, self.TICKER, "Y")])
+        self.assertTrue(index.ready)
+        self.assertTrue(index.is_traded(self.TICKER, "yes"))
+        self.assertFalse(index.is_traded(self.TICKER, "no"))
+        index.invalidate()
+        self.assertFalse(index.ready)
+
+    def test_trade_events(self):
+        index = TradedStrikeIndex(cooldown_seconds=10)
+        index.warm([])
+        index.apply_trade_event(None, self.TICKER, "no", "pending")
+        self.assertTrue(index.is_traded(self.TICKER, "N"))
+        index.apply_trade_event(7, self.TICKER, "N", "pending")
+        index.apply_trade_event(7, self.TICKER, "N", "open")
+        self.assertEqual(index.active_for_event("KXBTCD-25AUG1515"), {(self.TICKER, "NO")})
+        index.apply_trade_event(7, self.TICKER, "N", "closed")
+        self.assertFalse(index.is_traded(self.TICKER, "no"))
+        self.assertEqual(index.active_count(), 0)
+
+    def test_pending_placeholders(self):
+        now = [100.0]
+        index = TradedStrikeIndex(cooldown_seconds=10, clock=lambda: now[0], pending_ttl_seconds=30)
+        index.warm([])
+
+        # A rejected send clears its placeholder
+        index.mark_pending(self.TICKER, "yes")
+        self.assertTrue(index.is_traded(self.TICKER, "Y"))
+        index.clear_pending(self.TICKER, "yes")
+        self.assertFalse(index.is_traded(self.TICKER, "Y"))
+
+        # The trade's own notification takes over from the placeholder
+        index.mark_pending(self.TICKER, "yes")
+        index.apply_trade_event(9, self.TICKER, "Y", "pending")
+        index.apply_trade_event(9, self.TICKER, "Y", "closed")
+        self.assertFalse(index.is_traded(self.TICKER, "Y"))
+
+        # A trade that is never inserted stops blocking after the TTL
+        index.mark_pending(self.TICKER, "no")
+        self.assertEqual(index.active_for_event("KXBTCD-25AUG1515"), {(self.TICKER, "NO")})
+        now[0] += 30
+        self.assertFalse(index.is_traded(self.TICKER, "N"))
+        self.assertEqual(index.active_for_event("KXBTCD-25AUG1515"), set())
+
+    def test_duplicate_trades_on_same_strike(self):
+        index = TradedStrikeIndex(cooldown_seconds=10)
+        index.warm([(1, self.TICKER, "Y"), (2, self.TICKER, "Y")])
+        index.apply_trade_event(1, self.TICKER, "Y", None)
+        self.assertTrue(index.is_traded(self.TICKER, "yes"))
+        index.apply_trade_event(2, self.TICKER, "Y", "expired")
+        self.assertFalse(index.is_traded(self.TICKER, "yes"))
+
+    def test_cooldowns(self):
+        index = TradedStrikeIndex(cooldown_seconds=60)
+        self.assertTrue(index.try_start_cooldown("118500-yes"))
+        self.assertFalse(index.try_start_cooldown("118500-yes"))
+        index.release_cooldown("118500-yes")
+        self.assertTrue(index.try_start_cooldown("118500-yes"))
+        self.assertEqual(index.prune_cooldowns(), 0)
+        index.cooldown_seconds = 0
+        self.assertEqual(index.prune_cooldowns(), 1)
+        self.assertEqual(index.cooldown_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
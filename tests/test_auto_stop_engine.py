@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared auto stop decision rules.
+"""
+
+import os
+import sys
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.auto_stop_engine import (
+    AutoStopSettings, AutoStopState, evaluate_momentum_spike, evaluate_probability_stops, trade_probability
+)
+
+
+def trade(trade_id, prob, since_entry=600, side="Y"):
+    return {"trade_id": trade_id, "current_probability": prob, "time_since_entry": since_entry,
+            "status": "active", "side": side}
+
+
+class TestAutoStopEngine(unittest.TestCase):
+
+    def test_stops_below_threshold_once(self):
+        state = AutoStopState()
+        settings = AutoStopSettings(threshold=40, min_ttc_seconds=60)
+        trades = [trade(1, 30), trade(2, 50), trade(3, 30, since_entry=10)]
+        self.assertEqual([t["trade_id"] for t in evaluate_probability_stops(trades, settings, state, 0)], [1])
+        self.assertEqual(evaluate_probability_stops(trades, settings, state, 1), [])
+
+    def test_verification_period(self):
+        state = AutoStopState()
+        settings = AutoStopSettings(threshold=40, verification_enabled=True, verification_seconds=10)
+        self.assertEqual(evaluate_probability_stops([trade(1, 30)], settings, state, 100), [])
+        self.assertEqual(evaluate_probability_stops([trade(1, 30)], settings, state, 105), [])
+        self.assertEqual(len(evaluate_probability_stops([trade(1, 35)], settings, state, 110)), 1)
+        # Recovered before the period ended: cancelled, no stop
+        evaluate_probability_stops([trade(2, 30)], settings, state, 200)
+        self.assertEqual(evaluate_probability_stops([trade(2, 60)], settings, state, 210), [])
+        self.assertNotIn(2, state.verification_pending)
+
+    def test_momentum_spike_closes_opposite_side(self):
+        state = AutoStopState()
+        state.verification_pending["n1"] = (0, 10)
+        trades = [trade("y1", 90, side="Y"), trade("n1", 90, side="N")]
+        closed = evaluate_momentum_spike(trades, 0.5, AutoStopSettings(momentum_spike_threshold=0.35), state)
+        self.assertEqual([t["trade_id"] for t in closed], ["n1"])
+        self.assertNotIn("n1", state.verification_pending)
+        self.assertEqual(evaluate_momentum_spike(trades, 0.1, AutoStopSettings(), state), [])
+
+    def test_trade_probability_flips_after_cross(self):
+        self.assertEqual(trade_probability(80, "Y", 100000, 100500), 80)
+        self.assertEqual(trade_probability(80, "Y", 100000, 99500), 20)
+        self.assertEqual(trade_probability(80, "N", 100000, 99500), 80)
+        self.assertIsNone(trade_probability(None, "N", 1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized backtest engine, checked against bar-by-bar loops.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.backtest_engine import (
+    NO_INDEX, Bars, ScalpParams, momentum_reversal_stats, next_true_index, param_grid,
+    run_momentum_scalp, sweep,
+)
+
+
+def random_bars(n=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    momentum = np.clip(np.round(np.cumsum(rng.normal(0, 4, n)) % 80 - 40), -40, 40)
+    return pd.DataFrame({"timestamp": np.arange(n), "open": close, "close": close, "momentum": momentum})
+
+
+def loop_scalp(df, threshold=20, stop_pct=0.20):
+    trades, position = [], None
+    for row in df.itertuples():
+        if position is None:
+            if row.momentum >= threshold:
+                position = ("long", row.close, row.timestamp)
+            elif row.momentum <= -threshold:
+                position = ("short", row.close, row.timestamp)
+            continue
+        side, entry, _ = position
+        stop = row.close <= entry * (1 - stop_pct) if side == "long" else row.close >= entry * (1 + stop_pct)
+        if stop or (side == "long" and row.momentum <= 0) or (side == "short" and row.momentum >= 0):
+            trades.append((position[2], row.timestamp, side))
+            position = None
+    return trades
+
+
+def loop_reversal(df, level):
+    changes = []
+    for idx in np.flatnonzero(df["momentum"].to_numpy() == level):
+        for j in range(idx + 1, len(df)):
+            m = df["momentum"].iat[j]
+            if (level < 0 and m >= 0) or (level > 0 and m <= 0):
+                changes.append((df["open"].iat[j] - df["open"].iat[idx]) / df["open"].iat[idx] * 100)
+                break
+    return changes
+
+
+class TestBacktestEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.df = random_bars()
+        self.bars = Bars.from_frame(self.df)
+
+    def test_next_true_index(self):
+        mask = np.array([False, True, False, False, True])
+        self.assertEqual(next_true_index(mask, np.array([0, 1, 4])).tolist(), [1, 4, NO_INDEX])
+
+    def test_scalp_matches_loop(self):
+        for stop in (0.20, 0.01):
+            trades = run_momentum_scalp(self.bars, ScalpParams(stop_pct=stop))
+            expected = loop_scalp(self.df, stop_pct=stop)
+            self.assertGreater(len(expected), 10)
+            self.assertEqual(list(zip(trades["entry_time"], trades["exit_time"], trades["side"])), expected)
+
+    def test_reversals_match_loop(self):
+        stats = momentum_reversal_stats(self.bars).set_index("momentum_level")
+        for level in (-25, -10, 12, 30):
+            changes = loop_reversal(self.df, level)
+            self.assertEqual(stats.loc[level, "count"], len(changes))
+            if changes:
+                self.assertAlmostEqual(stats.loc[level, "avg_price_change_pct"], np.mean(changes))
+
+    def test_sweep_in_process_pool(self):
+        grid = param_grid(ScalpParams(), entry_threshold=[15, 20], stop_pct=[0.05, 0.2])
+        pooled = sweep(self.bars, grid, max_workers=2)
+        inline = sweep(self.bars, grid, max_workers=1)
+        self.assertEqual(len(pooled), 4)
+        pd.testing.assert_frame_equal(pooled, inline)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for long-format fingerprint storage and the one-query cube loader.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.fingerprint_store import fingerprint_rows, load_fingerprint_cubes, write_fingerprints
+from backend.util.probability_benchmark import live_calculator, synthetic_fingerprint, write_synthetic_fingerprints
+
+
+class FakeConnection:
+    encoding = "UTF8"
+
+
+class FakeCursor:
+    """analytics.fingerprints in memory."""
+
+    def __init__(self):
+        self.connection = FakeConnection()
+        self.table = {}
+        self.values = []
+        self.rows = []
+
+    def mogrify(self, template, args):
+        self.values.append(tuple(args))
+        return b"?"
+
+    def execute(self, sql, params=None):
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        sql = " ".join(sql.split())
+        values, self.values = self.values, []
+        if sql.startswith("DELETE FROM analytics.fingerprints"):
+            symbol, buckets = params
+            self.table = {k: v for k, v in self.table.items() if not (k[0] == symbol and k[1] in buckets)}
+        elif sql.startswith("INSERT INTO analytics.fingerprints"):
+            self.table.update((row[:5], row) for row in values)
+        elif sql.startswith("SELECT bucket"):
+            self.rows = [row[1:] for key, row in sorted(self.table.items()) if key[0] == params[0]
+                         and (len(params) == 1 or key[1] in params[1])]
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestFingerprintStore(unittest.TestCase):
+
+    def test_cubes_match_calculator_parsing(self):
+        cursor = FakeCursor()
+        frames = {bucket: synthetic_fingerprint(bucket) for bucket in (-2, 0, 3)}
+        weights = {bucket: np.full((60, 41), 10.0 + bucket) for bucket in frames}
+        self.assertEqual(write_fingerprints(cursor, "BTC", frames, weights), 3 * 60 * 41 * 2)
+        # Rewriting a bucket replaces its rows
+        write_fingerprints(cursor, "btc", {0: frames[0]}, {0: weights[0]})
+        self.assertEqual(len(cursor.table), 3 * 60 * 41 * 2)
+
+        cubes = load_fingerprint_cubes(cursor, "btc")
+        self.assertEqual(cubes.buckets.tolist(), [-2, 0, 3])
+        self.assertEqual(cubes.prob.shape, (3, 60, 41, 2))
+        self.assertEqual(cubes.weight_total[2, 5, 7, 1], 13.0)
+        self.assertIsNone(load_fingerprint_cubes(cursor, "eth"))
+        self.assertEqual(load_fingerprint_cubes(cursor, "btc", [3]).buckets.tolist(), [3])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            calculator = live_calculator("btc", write_synthetic_fingerprints(tmp, "btc", [3]))
+        expected = calculator.momentum_fingerprints[3]
+        actual = cubes.fingerprint_data(3)
+        self.assertEqual(sorted(actual), sorted(expected))
+        for key in expected:
+            np.testing.assert_allclose(actual[key], expected[key], err_msg=key)
+        self.assertIsNone(cubes.fingerprint_data(1))
+
+    def test_rows_from_database_layout(self):
+        frame = pd.DataFrame({"pos_0_25": [12.5, 20.0], "neg_0_25": [11.0, None], "pos_1_00": [1.0, 2.5]},
+                             index=["01m TTC", "02m TTC"])
+        rows = fingerprint_rows("btc", -5, frame)
+        self.assertEqual(rows, [
+            ("btc", -5, 60, "positive", 0.25, 12.5, None), ("btc", -5, 120, "positive", 0.25, 20.0, None),
+            ("btc", -5, 60, "negative", 0.25, 11.0, None),
+            ("btc", -5, 60, "positive", 1.0, 1.0, None), ("btc", -5, 120, "positive", 1.0, 2.5, None),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
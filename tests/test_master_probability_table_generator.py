@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the fused multi-horizon master probability table generator.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.master_probability_table_generator import MasterProbabilityTableGenerator
+from backend.util.probability_artifact import ProbabilityLookupArtifact, production_version
+from backend.util.probability_benchmark import live_calculator, write_synthetic_fingerprints
+
+
+class TestMasterProbabilityTableGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        fingerprints = live_calculator("btc", write_synthetic_fingerprints(self.dir, "btc", [0, 2]))
+        self.loaded = []
+
+        def load_fingerprint_data(momentum_bucket):
+            self.loaded.append(momentum_bucket)
+            return fingerprints.momentum_fingerprints.get(momentum_bucket)
+
+        self.generator = MasterProbabilityTableGenerator("btc")
+        self.generator.load_fingerprint_data = load_fingerprint_data
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_horizons_share_one_pass(self):
+        results = self.generator.generate_master_tables(
+            ["hourly", "15min"], (0, 2000), [0, 1, 2], ttc_step=5, buffer_step=10,
+            write_tables=False, publish=True, artifact_dir=self.dir)
+
+        # Each bucket is loaded once for both horizons; bucket 1 has no fingerprint
+        self.assertEqual(sorted(self.loaded), [0, 1, 2])
+        self.assertEqual(results["hourly"]["rows"], 2 * 721 * 201)
+        self.assertEqual(results["15min"]["rows"], 2 * 181 * 201)
+        version = results["hourly"]["artifact_version"]
+        self.assertEqual(production_version("btc_master_15min", self.dir), version)
+
+        hourly = ProbabilityLookupArtifact.load("btc_master", directory=self.dir, verify=True)
+        quarter = ProbabilityLookupArtifact.load("btc_master_15min", directory=self.dir, verify=True)
+        self.assertEqual(quarter.axes["ttc"], [0, 5, 181])
+        np.testing.assert_array_equal(np.asarray(quarter.cube), np.asarray(hourly.cube)[:, :181])
+        self.assertTrue(np.isnan(hourly.cube[1]).all())
+        self.assertEqual(hourly.manifest["missing_cells"], 721 * 201)
+
+        # The grid matches the one-point-at-a-time interpolation
+        fingerprint = self.generator.load_fingerprint_data(2)
+        for ttc, buffer in [(0, 0), (95, 370), (900, 2000), (3600, 1230)]:
+            expected = self.generator.interpolate_probabilities(fingerprint, ttc, buffer / 120000 * 100)
+            actual = hourly.cube[2, ttc // 5, buffer // 10]
+            np.testing.assert_allclose(actual, expected, atol=0.0051)
+
+    def test_rejects_unknown_horizon(self):
+        with self.assertRaises(ValueError):
+            self.generator.generate_master_tables(["weekly"], (0, 2000), [0], write_tables=False)
+        self.assertEqual(self.loaded, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Prometheus-style metrics module.
+"""
+
+import os
+import sys
+import unittest
+import urllib.request
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.metrics import MetricsRegistry, get_websocket_backlog, start_metrics_server
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self):
+        counter = self.registry.counter("orders_total", "Orders", ("side",))
+        counter.inc(side="yes")
+        counter.inc(2, side="yes")
+        gauge = self.registry.gauge("queue_depth", "Depth")
+        gauge.set(5)
+        gauge.dec()
+        text = self.registry.render()
+        self.assertIn("# TYPE orders_total counter", text)
+        self.assertIn('orders_total{side="yes"} 3', text)
+        self.assertIn("queue_depth 4", text)
+        with self.assertRaises(ValueError):
+            counter.inc(-1, side="yes")
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, stage="db")
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{stage="db",le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{stage="db",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{stage="db",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{stage="db"} 4', text)
+        self.assertAlmostEqual(histogram.get_sum(stage="db"), 2.65)
+
+    def test_histogram_snapshot(self):
+        histogram = self.registry.histogram("decision_seconds", "Decisions", ("stage",), buckets=(0.001, 0.01))
+        for value in (0.0005, 0.001, 0.005, 0.05):
+            histogram.observe(value, stage="evaluation")
+        snapshot = histogram.snapshot(stage="evaluation")
+        self.assertEqual(snapshot["count"], 4)
+        self.assertEqual(snapshot["buckets"], {"0.001": 2, "0.01": 3, "+Inf": 4})
+        self.assertAlmostEqual(snapshot["sum"], 0.0565)
+        self.assertEqual(histogram.snapshot(stage="idle"), {"count": 0, "sum": 0.0,
+                                                           "buckets": {"0.001": 0, "0.01": 0, "+Inf": 0}})
+
+    def test_label_mismatch(self):
+        histogram = self.registry.histogram("h", "H", ("stage",))
+        with self.assertRaises(ValueError):
+            histogram.observe(1.0)
+        with self.assertRaises(ValueError):
+            self.registry.counter("h", "H", ("stage",))
+
+    def test_reregister_returns_same_metric(self):
+        first = self.registry.counter("c", "C")
+        self.assertIs(self.registry.counter("c", "C"), first)
+
+    def test_metrics_server(self):
+        self.registry.counter("served_total", "Served").inc()
+        server = start_metrics_server(0, host="127.0.0.1", registry=self.registry)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+            self.assertIn("served_total 1", body)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestWebsocketBacklog(unittest.TestCase):
+
+    def test_legacy_and_missing(self):
+        class Legacy:
+            messages = [1, 2, 3]
+        self.assertEqual(get_websocket_backlog(Legacy()), 3)
+        self.assertIsNone(get_websocket_backlog(object()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the time-weighted momentum quantile sketch.
+"""
+
+import json
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.momentum_profiler import MomentumProfiler
+from backend.util.momentum_sketch import MomentumSketch
+
+
+def history(rows=200_000, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.date_range("2021-01-01", periods=rows, freq="10min"),
+        'momentum': np.round(rng.standard_t(4, rows) * 0.05, 4),
+    })
+
+
+class TestMomentumSketch(unittest.TestCase):
+
+    def test_matches_weighted_profile(self):
+        df = history()
+        profiler = MomentumProfiler.__new__(MomentumProfiler)
+        profile = profiler.calculate_percentile_profile(df, profiler.calculate_time_weights(df))
+        sketch = MomentumSketch()
+        sketch.add_many(df['momentum'].values, df['timestamp'])
+
+        spread = df['momentum'].quantile(0.99) - df['momentum'].quantile(0.01)
+        for row in profile.itertuples():
+            self.assertAlmostEqual(sketch.quantile(row.percentile / 100), row.momentum_value, delta=0.01 * spread)
+            self.assertAlmostEqual(sketch.percentile(row.momentum_value), row.percentile, delta=0.5)
+        self.assertAlmostEqual(sketch.mean, profile['weighted_mean'].iloc[0], places=4)
+        self.assertAlmostEqual(sketch.std, profile['weighted_std'].iloc[0], places=4)
+        self.assertLessEqual(len(sketch.means), sketch.compression)
+
+    def test_merge_and_roundtrip(self):
+        df = history(50_000)
+        whole = MomentumSketch()
+        whole.add_many(df['momentum'].values, df['timestamp'])
+
+        first, second = MomentumSketch(), MomentumSketch()
+        first.add_many(df['momentum'].values[:45_000], df['timestamp'][:45_000])
+        for value, ts in zip(df['momentum'].values[45_000:], df['timestamp'][45_000:]):
+            second.add(value, ts)
+        first.merge(second)
+
+        restored = MomentumSketch.from_dict(json.loads(json.dumps(first.to_dict())))
+        for q in (0.005, 0.05, 0.5, 0.95, 0.995):
+            self.assertAlmostEqual(restored.quantile(q), whole.quantile(q), delta=0.003)
+        self.assertEqual(restored.count, len(df))
+        self.assertAlmostEqual(restored.z_score(0.1), whole.z_score(0.1), places=6)
+        self.assertEqual((restored.percentile(-10), restored.percentile(10)), (0.0, 100.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
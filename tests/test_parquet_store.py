@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the partitioned Parquet export and reader.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util import parquet_store
+
+
+class FakeNamedCursor:
+    """Server-side cursor that returns NUMERIC columns as Decimal unless cast to float8, like psycopg2."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.query = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.query = query
+
+    def fetchmany(self, size):
+        if not self.chunks:
+            return []
+        columns = self.query.split(" FROM ")[0][len("SELECT "):].split(", ")
+        return [tuple(float(value) if column.endswith("::float8") and value is not None else value
+                      for column, value in zip(columns, row)) for row in self.chunks.pop(0)]
+
+
+class FakeConnection:
+
+    def __init__(self, chunks):
+        self.named_cursor = FakeNamedCursor(chunks)
+
+    def cursor(self, name=None):
+        return self.named_cursor
+
+
+class TestParquetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_time_range_filters(self):
+        filters = parquet_store.time_range_filters("ts", datetime(2024, 3, 1), datetime(2025, 1, 1))
+        self.assertIn(("year", ">=", 2024), filters)
+        self.assertIn(("year", "<=", 2025), filters)
+        self.assertIn(("ts", "<", pd.Timestamp("2025-01-01")), filters)
+        self.assertEqual(parquet_store.time_range_filters("ts"), [])
+
+    def test_load_frame_csv_projection(self):
+        path = os.path.join(self.tmp.name, "btc.csv")
+        pd.DataFrame({"timestamp": ["2025-01-01"], "close": [1.0], "momentum": [5]}).to_csv(path, index=False)
+        df = parquet_store.load_frame(path, columns=["close", "momentum"])
+        self.assertEqual(list(df.columns), ["close", "momentum"])
+
+    @unittest.skipUnless(parquet_store.PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_monthly_round_trip_with_pushdown(self):
+        timestamps = pd.date_range("2025-01-31 23:58", periods=4, freq="min")
+        frame = pd.DataFrame({"timestamp": timestamps, "close": [1.0, 2.0, 3.0, 4.0], "momentum": [1, 2, 3, 4]})
+        dataset = os.path.join(self.tmp.name, "btc")
+        written = parquet_store.write_monthly_partitions(iter([frame.iloc[:3], frame.iloc[3:]]), dataset, "timestamp")
+        self.assertEqual(len(written), 2)
+        self.assertTrue(written[1].endswith(os.path.join("year=2025", "month=02", "data.parquet")))
+
+        df = parquet_store.read_dataset(
+            dataset, columns=["timestamp", "close"],
+            filters=parquet_store.time_range_filters("timestamp", datetime(2025, 2, 1)))
+        self.assertEqual(list(df.columns), ["timestamp", "close"])
+        self.assertEqual(df["close"].tolist(), [3.0, 4.0])
+        self.assertNotIn("year", parquet_store.load_frame(dataset).columns)
+
+    @unittest.skipUnless(parquet_store.PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_price_export_with_mixed_precision_decimals(self):
+        edt, est = timezone(timedelta(hours=-4)), timezone(timedelta(hours=-5))
+
+        def row(ts, close):
+            return (ts, Decimal("1.50"), Decimal(close), Decimal("1.5"), Decimal(close),
+                    Decimal("0.12345678"), Decimal("-0.0100"))
+
+        # Chunks of one month whose decimals (and UTC offsets, across DST) differ
+        chunks = [
+            [row(datetime(2025, 11, 1, 12, tzinfo=edt), "1.50")],
+            [row(datetime(2025, 11, 2, 12, tzinfo=est), "123456.25"),
+             row(datetime(2025, 11, 3, 12, tzinfo=est), "98765.4")],
+        ]
+        conn = FakeConnection(chunks)
+        written = parquet_store.export_price_history(conn, "BTC", root=self.tmp.name)
+        self.assertEqual(len(written), 1)
+        self.assertIn("close::float8", conn.named_cursor.query)
+
+        df = parquet_store.load_frame(parquet_store.price_history_path("btc", self.tmp.name))
+        self.assertEqual(df["close"].tolist(), [1.5, 123456.25, 98765.4])
+        self.assertEqual(df["momentum"].dtype, float)
+        self.assertEqual(df["timestamp"].iloc[1], pd.Timestamp("2025-11-02 17:00", tz="UTC"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the dense, memory-mapped probability lookup artifacts.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.probability_artifact import (
+    OUT_OF_RANGE_PROBABILITY, ProbabilityLookupArtifact, ProductionArtifact, artifact_paths, empty_cube,
+    fill_cube, production_version, publish_artifact, verify_artifact, write_artifact,
+)
+
+AXES = {"momentum": [-2, 1, 5], "ttc": [0, 5, 13], "buffer": [0, 10, 21]}
+
+
+def table_rows():
+    """Rows of a lookup table whose probabilities are linear in ttc and buffer."""
+    m, t, b = np.meshgrid(np.arange(-2, 3), np.arange(0, 61, 5), np.arange(0, 201, 10), indexing="ij")
+    m, t, b = m.ravel(), t.ravel(), b.ravel()
+    return t, b, m, 50 + b * 0.2 + m, 40 + t * 0.1 - m
+
+
+class TestProbabilityArtifact(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.cube = empty_cube(AXES)
+        fill_cube(self.cube, AXES, *table_rows())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookup_interpolates_grid(self):
+        write_artifact("btc", "v1", self.cube, AXES, directory=self.dir)
+        artifact = ProbabilityLookupArtifact.load("btc", "v1", directory=self.dir, verify=True)
+        self.assertIsInstance(artifact.cube, np.memmap)
+
+        pos, neg = artifact.lookup([12.5, 60, 999], [37, 200, 55], [1, 1, 9])
+        np.testing.assert_allclose(pos, [50 + 37 * 0.2 + 1, 50 + 200 * 0.2 + 1, 50 + 55 * 0.2 + 2], rtol=1e-5)
+        np.testing.assert_allclose(neg, [40 + 1.25 - 1, 40 + 6 - 1, 40 + 6 - 2], rtol=1e-5)
+        self.assertEqual(artifact.probability(10, 201, 0), (OUT_OF_RANGE_PROBABILITY, OUT_OF_RANGE_PROBABILITY))
+
+        # Strikes below the price take the positive side, at or above it the negative side
+        self.assertAlmostEqual(artifact.strike_probability(100_000, 100_020, 30, 0.004), 50 + 4 + 0, places=4)
+        self.assertAlmostEqual(artifact.strike_probability(100_020, 100_000, 30, 0.004), 40 + 3, places=4)
+
+    def test_publish_is_checked_and_picked_up(self):
+        production = ProductionArtifact("btc", directory=self.dir)
+        self.assertIsNone(production.get())
+
+        write_artifact("btc", "v1", self.cube, AXES, directory=self.dir)
+        publish_artifact("btc", "v1", directory=self.dir)
+        self.assertEqual(production.get().version, "v1")
+
+        write_artifact("btc", "v2", self.cube + 1, AXES, directory=self.dir)
+        npy_path, _ = artifact_paths("btc", "v2", directory=self.dir)
+        with open(npy_path, "r+b") as f:
+            f.seek(-4, os.SEEK_END)
+            f.write(b"\x00\x00\x00\x00")
+        self.assertFalse(verify_artifact("btc", "v2", directory=self.dir))
+        with self.assertRaises(ValueError):
+            publish_artifact("btc", "v2", directory=self.dir)
+        self.assertEqual(production_version("btc", directory=self.dir), "v1")
+
+        write_artifact("btc", "v3", self.cube + 1, AXES, directory=self.dir)
+        publish_artifact("btc", "v3", directory=self.dir)
+        artifact = production.get()
+        self.assertEqual(artifact.version, "v3")
+        self.assertAlmostEqual(artifact.probability(0, 0, 0)[0], 51.0, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic-fingerprint probability lookup benchmark.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.probability_benchmark import (
+    compare_to_baseline, load_baseline, run_benchmark, save_baseline,
+)
+
+
+class TestProbabilityBenchmark(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report = run_benchmark(engines=["griddata", "artifact", "artifact_batch"], buckets=[0, 3],
+                                   queries=200, live_queries=20)
+
+    def test_engines_agree_with_model_and_live(self):
+        engines = self.report["engines"]
+        self.assertEqual(list(engines), ["griddata", "artifact", "artifact_batch"])
+        self.assertEqual(engines["griddata"]["lookups"], 20)
+        self.assertEqual(engines["artifact_batch"]["batch_size"], 200)
+        self.assertEqual(engines["griddata"]["max_error_vs_live"], 0.0)
+        for stats in engines.values():
+            self.assertLess(stats["max_error"], 5.0)
+            self.assertGreater(stats["lookups_per_second"], 0)
+            self.assertLessEqual(stats["latency_us"]["p50"], stats["latency_us"]["max"])
+        # The lookup grid is a resampling of what the live calculator interpolates
+        self.assertLess(engines["artifact"]["max_error_vs_live"], 0.5)
+        self.assertEqual(engines["artifact"]["max_error"], engines["artifact_batch"]["max_error"])
+
+    def test_baseline_comparison(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            save_baseline(self.report, path)
+            baseline = load_baseline(path)
+        self.assertEqual(compare_to_baseline(self.report, baseline), [])
+
+        faster = copy.deepcopy(baseline)
+        faster["engines"]["artifact"]["lookups_per_second"] *= 10
+        faster["engines"]["griddata"]["max_error"] -= 1
+        regressions = compare_to_baseline(self.report, faster)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("griddata: max_error"))
+        self.assertTrue(regressions[1].startswith("artifact:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
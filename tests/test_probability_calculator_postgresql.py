@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the PostgreSQL probability calculator's prepared fingerprint cache.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import psycopg2
+from scipy.interpolate import griddata
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util import probability_calculator_postgresql as pg
+from backend.util.probability_benchmark import live_calculator, write_synthetic_fingerprints
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = None
+
+    def execute(self, sql, params=None):
+        self.conn.queries.append(" ".join(sql.split()))
+        if "FROM analytics.fingerprints" in sql:
+            if self.conn.store is None:
+                raise psycopg2.ProgrammingError('relation "analytics.fingerprints" does not exist')
+            self.result = [self.conn.store]
+        else:
+            self.result = self.conn.tables
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self, store=None, tables=()):
+        self.store = store
+        self.tables = list(tables)
+        self.queries = []
+        self.rolled_back = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rolled_back += 1
+
+    def close(self):
+        pass
+
+
+def make_calculator(conn):
+    calculator = pg.ProbabilityCalculatorPostgreSQL.__new__(pg.ProbabilityCalculatorPostgreSQL)
+    calculator.symbol = "btc"
+    calculator.momentum_fingerprints = {}
+    calculator.current_momentum_bucket = None
+    calculator.conn = conn
+    return calculator
+
+
+class TestFingerprintCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(pg, "get_fingerprint_cache_dir", return_value=self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.fingerprints = live_calculator("btc", write_synthetic_fingerprints(self.tmp.name, "btc", [-1, 2]))
+
+    def test_version_tracks_fingerprint_set(self):
+        conn = FakeConnection(store=(4920, "2026-10-18 04:00:00"))
+        version = make_calculator(conn)._fingerprint_set_version()
+        self.assertEqual(make_calculator(conn)._fingerprint_set_version(), version)
+        conn.store = (4920, "2026-10-19 04:00:00")
+        self.assertNotEqual(make_calculator(conn)._fingerprint_set_version(), version)
+
+        # Without the long-format table the per-bucket tables' identities and write counters are used
+        conn = FakeConnection(tables=[("btc_fingerprint_directional_momentum_000", 16400, 16400, 60, 0, 0)])
+        legacy = make_calculator(conn)._fingerprint_set_version()
+        self.assertEqual(conn.rolled_back, 1)
+        self.assertIn("pg_stat_user_tables", conn.queries[-1])
+        conn.tables.append(("btc_fingerprint_directional_momentum_001", 16410, 16410, 60, 0, 0))
+        added = make_calculator(conn)._fingerprint_set_version()
+        self.assertNotEqual(added, legacy)
+
+        # DROP and CREATE resets the counters to the same values, but the table gets a new OID
+        conn.tables[0] = ("btc_fingerprint_directional_momentum_000", 16420, 16420, 60, 0, 0)
+        self.assertNotEqual(make_calculator(conn)._fingerprint_set_version(), added)
+
+    def test_cache_round_trip(self):
+        built = make_calculator(FakeConnection())
+        built.momentum_fingerprints = self.fingerprints.momentum_fingerprints
+        built._prepare_interpolators()
+        built._save_fingerprint_cache("v1")
+        self.assertTrue(os.path.exists(pg.get_fingerprint_cache_path("BTC")))
+
+        self.assertFalse(make_calculator(FakeConnection())._load_fingerprint_cache("v2"))
+        self.assertFalse(make_calculator(FakeConnection())._load_fingerprint_cache(None))
+        cached = make_calculator(FakeConnection())
+        self.assertTrue(cached._load_fingerprint_cache("v1"))
+        self.assertEqual(sorted(cached.momentum_fingerprints), [-1, 2])
+
+        # Prebuilt interpolators answer exactly what griddata did per call
+        cached._switch_to_momentum_fingerprint(0.02)
+        data = cached.momentum_fingerprints[2]
+        for ttc, move in [(60, 0.0), (95, 0.31), (1800, 1.2), (3600, 2.0)]:
+            expected = griddata(data['positive_interp_points'], data['positive_interp_values'],
+                                np.array([[ttc, move]]), method='linear')[0]
+            positive, _ = cached.interpolate_directional_probability(ttc, move)
+            self.assertEqual(positive, float(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared batched probability service.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.probability_artifact import ProbabilityLookupArtifact, publish_artifact, write_artifact
+from backend.util.probability_service import ProbabilityService
+
+
+AXES = {"momentum": [-2, 1, 5], "ttc": [0, 10, 61], "buffer": [0, 10, 201]}
+
+
+def write_cube(directory, version, offset=0.0):
+    m, t, b = np.meshgrid(np.arange(5), np.arange(61), np.arange(201), indexing="ij")
+    cube = np.stack([50 + 0.2 * b + m + offset, 50 + 0.2 * b - m + offset], axis=-1).astype(np.float32)
+    write_artifact("btc", version, cube, AXES, directory=directory)
+    publish_artifact("btc", version, directory)
+
+
+class TestProbabilityService(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.service = ProbabilityService("btc", directory=self.tmp.name, cache_size=50)
+
+    def test_no_artifact(self):
+        self.assertIsNone(self.service.evaluate(120000, [119900, 120100], 300, 0.01))
+        self.assertIsNone(self.service.strike_probability(119900, 120000, 300, 0.01))
+
+    def test_batch_matches_artifact_and_caches(self):
+        write_cube(self.tmp.name, "v1")
+        artifact = ProbabilityLookupArtifact.load("btc", directory=self.tmp.name)
+        prices = np.array([120000.0, 120000.0, 120000.4, 120000.0])
+        strikes = np.array([119875.0, 120125.0, 120000.0, 122500.0])
+        result = self.service.evaluate(prices, strikes, 300.4, [0.01, 0.01, -0.02, 0.0])
+
+        # Buffers truncate to whole points and momentum rounds to its bucket, as in the strike table
+        pos, neg = artifact.lookup(300, [125, 125, 0, 2500], [1, 1, -2, 0])
+        np.testing.assert_allclose(result["prob_within_positive"], pos)
+        np.testing.assert_allclose(result["prob_within_negative"], neg)
+        np.testing.assert_allclose(result["prob_within"], [pos[0], neg[1], neg[2], 99.9])
+        self.assertEqual(self.service.strike_probability(119875, 120000, 300, 0.01), result["prob_within"][0])
+        info = self.service.cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["artifact_version"]), (1, 4, "v1"))
+
+        # Repeated quantized inputs are served from the cache in any shape
+        again = self.service.evaluate(120000, [[119874.8], [120125.9]], 300, 0.012)
+        self.assertEqual(again["prob_within"].shape, (2, 1))
+        np.testing.assert_allclose(again["prob_within"].ravel(), result["prob_within"][:2])
+        self.assertEqual(self.service.cache_info()["hits"], 3)
+
+        # Least recently used entries are evicted; batches larger than the cache bypass it
+        self.service.evaluate(120000, 120000 + np.arange(50) * 10, 600, 0.0)
+        self.assertEqual(self.service.cache_info()["size"], 50)
+        before = self.service.cache_info()
+        big = self.service.evaluate(120000, 120000 + np.arange(80) * 10, 600, 0.0)
+        self.assertEqual(len(big["prob_within"]), 80)
+        self.assertEqual(self.service.cache_info()["misses"], before["misses"])
+
+        # Publishing a new version drops cached answers
+        write_cube(self.tmp.name, "v2", offset=1.0)
+        updated = self.service.evaluate(prices, strikes, 300.4, [0.01, 0.01, -0.02, 0.0])
+        np.testing.assert_allclose(updated["prob_within_positive"][:3], pos[:3] + 1, rtol=1e-6)
+        self.assertEqual(self.service.cache_info()["artifact_version"], "v2")
+
+
+if __name__ == '__main__':
+    unittest.main()
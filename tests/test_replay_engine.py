@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the auto entry/stop replay engine on a synthetic hour.
+"""
+
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.auto_stop_engine import AutoStopSettings
+from backend.util.replay_engine import ReplayConfig, build_hour_event, replay_event, replay_events, summarize_replay
+
+HOUR = pd.Timestamp("2025-08-15 14:00", tz="America/New_York")
+
+
+def buffer_probability(ttc_seconds, buffer_points, momentum_bucket):
+    """Probability of staying on the current side grows with the buffer."""
+    probability = min(99.0, 50 + buffer_points / 10)
+    return probability, probability
+
+
+def synthetic_event(prices):
+    times = [HOUR + pd.Timedelta(seconds=i) for i in range(len(prices))]
+    price_frame = pd.DataFrame({"ts": times, "price": prices, "momentum": 0.0})
+    snapshots = pd.DataFrame([
+        {"ts": times[i], "strike": 99999.99, "yes_ask": 90, "no_ask": 12, "yes_bid": 88, "no_bid": 10,
+         "volume": 5000, "ticker": "KXBTCD-25AUG1515-T99999.99"}
+        for i in range(0, len(prices), 60)
+    ])
+    return build_hour_event("KXBTCD-25AUG1515", snapshots, price_frame)
+
+
+class TestReplayEngine(unittest.TestCase):
+
+    def test_entry_then_settlement(self):
+        event = synthetic_event([100500.0] * 3600)
+        trades = replay_event(event, ReplayConfig(min_probability=95), buffer_probability)
+        self.assertEqual(len(trades), 1)
+        trade = trades[0]
+        self.assertEqual((trade["side"], trade["exit_reason"]), ("yes", "settlement"))
+        self.assertAlmostEqual(trade["entry_price"], 0.90)
+        self.assertAlmostEqual(trade["pnl"], 0.10)
+
+    def test_auto_stop_sells_at_bid(self):
+        prices = [100500.0] * 120 + [99800.0] * 3480
+        config = ReplayConfig(min_probability=95, auto_stop=AutoStopSettings(threshold=40, min_ttc_seconds=30))
+        trades = replay_event(synthetic_event(prices), config, buffer_probability)
+        self.assertEqual(trades[0]["exit_reason"], "auto_stop")
+        self.assertAlmostEqual(trades[0]["exit_price"], 0.88)
+        # Re-entry is blocked while the price stays below the strike (active side is NO, asks too high)
+        self.assertEqual(len(trades), 1)
+
+    def test_parallel_matches_inline(self):
+        events = [synthetic_event([100500.0] * 3600), synthetic_event([100500.0] * 120 + [99800.0] * 3480)]
+        configs = [ReplayConfig(min_probability=95), ReplayConfig(min_probability=99.5)]
+        pooled = replay_events(events, configs, buffer_probability, max_workers=2)
+        inline = replay_events(events, configs, buffer_probability, max_workers=1)
+        pd.testing.assert_frame_equal(pooled, inline)
+        summary = summarize_replay(pooled, configs)
+        self.assertEqual(summary["trades"].tolist(), [2, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
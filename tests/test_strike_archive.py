@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the partitioned strike snapshot archive helpers.
+"""
+
+import os
+import sys
+import unittest
+from datetime import date, datetime
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util import strike_archive
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.executed = []
+        self.rows = rows or []
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestStrikeArchive(unittest.TestCase):
+
+    def test_partition_bounds_roll_over_year(self):
+        ddl = strike_archive.partition_ddl(strike_archive.STRIKE_SNAPSHOTS_TABLE, date(2025, 12, 17))
+        self.assertIn("historical_data.strike_snapshots_y2025m12 ", ddl)
+        self.assertIn("FROM ('2025-12-01') TO ('2026-01-01')", ddl)
+
+    def test_ensure_partitions_dedupes_months(self):
+        cursor = FakeCursor()
+        strike_archive.ensure_partitions(cursor, "t", [date(2025, 8, 3), date(2025, 8, 20), date(2025, 7, 1)])
+        self.assertEqual(len(cursor.executed), 2)
+        self.assertIn("t_y2025m07", cursor.executed[0][0])
+        self.assertIn("t_y2025m08", cursor.executed[1][0])
+
+    def test_move_creates_partitions_before_insert(self):
+        cursor = FakeCursor(rows=[(date(2025, 8, 1),)])
+        strike_archive.move_event_strikes(cursor, "KXBTCD-25AUG1515")
+        statements = [q for q, _ in cursor.executed]
+        self.assertIn("PARTITION OF", statements[1])
+        self.assertIn("DELETE FROM live_data.btc_live_strikes", statements[2])
+        self.assertEqual(cursor.executed[2][1]["event"], "KXBTCD-25AUG1515")
+
+    def test_snapshot_query_filters(self):
+        query, params = strike_archive.build_snapshot_query(
+            event_tickers=["A", "B"], start=datetime(2025, 8, 1), strikes=[100000.0])
+        self.assertIn("event_ticker = ANY(%(event_tickers)s)", query)
+        self.assertIn("ts >= %(start)s", query)
+        self.assertNotIn("%(end)s", query)
+        self.assertEqual(params["event_tickers"], ["A", "B"])
+        self.assertTrue(query.endswith("ORDER BY event_ticker, strike, ts"))
+
+    def test_snapshot_query_without_filters(self):
+        query, params = strike_archive.build_snapshot_query()
+        self.assertNotIn("WHERE", query)
+        self.assertEqual(params, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared supervisord XML-RPC status poller.
+"""
+
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import unittest
+from xmlrpc.server import SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.supervisor_status import (
+    SupervisorStatusPoller,
+    get_supervisor_socket_path,
+    parse_supervisorctl_status
+)
+
+
+class _UnixRequestHandler(SimpleXMLRPCRequestHandler):
+    # TCP_NODELAY is not supported on unix sockets
+    disable_nagle_algorithm = False
+
+
+class _UnixXMLRPCServer(socketserver.UnixStreamServer, SimpleXMLRPCDispatcher):
+    def __init__(self, path):
+        SimpleXMLRPCDispatcher.__init__(self, allow_none=True)
+        socketserver.UnixStreamServer.__init__(self, path, _UnixRequestHandler)
+        self.logRequests = False
+
+
+class _FakeSupervisor:
+    def __init__(self):
+        self.calls = 0
+
+    def getAllProcessInfo(self):
+        self.calls += 1
+        return [
+            {"name": "main_app", "group": "main_app", "statename": "RUNNING", "pid": 101,
+             "description": "pid 101, uptime 1:00:00"},
+            {"name": "trade_manager", "group": "trade_manager", "statename": "FATAL", "pid": 0,
+             "description": "Exited too quickly"},
+        ]
+
+    def getPID(self):
+        return os.getpid()
+
+
+class TestSupervisorStatusPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "supervisord.sock")
+        self.fake = _FakeSupervisor()
+        self.server = _UnixXMLRPCServer(self.socket_path)
+        self.server.register_function(self.fake.getAllProcessInfo, "supervisor.getAllProcessInfo")
+        self.server.register_function(self.fake.getPID, "supervisor.getPID")
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def test_one_call_per_cycle(self):
+        poller = SupervisorStatusPoller(socket_path=self.socket_path, max_age=60)
+        self.assertTrue(poller.is_running("main_app"))
+        self.assertFalse(poller.is_running("trade_manager"))
+        self.assertEqual(poller.get_state("trade_manager"), "FATAL")
+        self.assertIsNone(poller.get_state("missing"))
+        self.assertEqual(self.fake.calls, 1)
+        self.assertEqual(poller.source, "xmlrpc")
+        self.assertEqual(poller.status_line("main_app"), "main_app RUNNING pid 101, uptime 1:00:00")
+
+        poller.refresh()
+        self.assertEqual(self.fake.calls, 2)
+
+    def test_supervisord_pid(self):
+        poller = SupervisorStatusPoller(socket_path=self.socket_path)
+        self.assertEqual(poller.get_supervisord_pid(), os.getpid())
+
+
+class TestSupervisorStatusHelpers(unittest.TestCase):
+
+    def test_parse_supervisorctl_status(self):
+        output = (
+            "main_app                         RUNNING   pid 4242, uptime 2:03:04\n"
+            "trade_manager                    STOPPED   Aug 15 03:00 PM\n"
+        )
+        processes = parse_supervisorctl_status(output)
+        self.assertEqual([p["name"] for p in processes], ["main_app", "trade_manager"])
+        self.assertEqual(processes[0]["pid"], 4242)
+        self.assertEqual(processes[1]["statename"], "STOPPED")
+
+    def test_socket_path_from_config(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".conf", delete=False) as f:
+            f.write("[supervisorctl]\nserverurl=unix:///var/run/test.sock\n")
+        try:
+            self.assertEqual(get_supervisor_socket_path(f.name), "/var/run/test.sock")
+        finally:
+            os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent OHLCV fetcher against a local fake exchange and database.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from datetime import datetime
+
+import ccxt
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.symbol_data_fetch_async import BAR_MS, _to_ms, fetch_symbols
+
+LISTED_MS = 1704067200000  # 2024-01-01 00:00 UTC
+
+
+class FakeExchange:
+    """Serves synthetic 1m bars from LISTED_MS up to now_ms; fails the first request for fail_symbol."""
+
+    def __init__(self, now_ms, fail_symbol=None):
+        self.now_ms = now_ms
+        self.fail_symbol = fail_symbol
+        self.calls = []
+
+    def milliseconds(self):
+        return self.now_ms
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        await asyncio.sleep(0)
+        self.calls.append((symbol, since))
+        if symbol == "BAD/USD":
+            raise ccxt.BadSymbol("unknown market")
+        if symbol == self.fail_symbol:
+            self.fail_symbol = None
+            raise RuntimeError("rate limited")
+        start = max(since, LISTED_MS)
+        stop = min(start + limit * BAR_MS, self.now_ms)
+        return [[ts, 1.0, 1.0, 1.0, 1.0, 1.0] for ts in range(start, stop, BAR_MS)]
+
+
+class FakeDatabase:
+    """Enough of Postgres for OHLCVCopyWriter and resume_since, shared by every connection."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.checkpoints = {}
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+
+    def __init__(self, db):
+        self.db = db
+        self.staging = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.db = conn.db
+        self.rowcount = 0
+        self.result = None
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        with self.db.lock:
+            if sql.startswith("SELECT last_timestamp"):
+                ts = self.db.checkpoints.get(params[0])
+                self.result = (ts,) if ts else None
+            elif sql.startswith("SELECT MAX(timestamp)"):
+                rows = self.db.tables.get(sql.split("historical_data.")[1], set())
+                self.result = (max(rows) if rows else None,)
+            elif sql.startswith("INSERT INTO historical_data.ohlcv_fetch_checkpoints"):
+                symbol, ts = params
+                self.db.checkpoints[symbol] = max(ts, self.db.checkpoints.get(symbol, ts))
+            elif sql.startswith("INSERT INTO historical_data."):
+                table = self.db.tables.setdefault(sql.split()[2].split(".")[1], set())
+                new = set(self.conn.staging) - table
+                table.update(new)
+                self.rowcount = len(new)
+            elif sql.startswith("TRUNCATE"):
+                self.conn.staging = []
+
+    def fetchone(self):
+        return self.result
+
+    def copy_expert(self, sql, buffer):
+        for line in buffer.read().splitlines():
+            self.conn.staging.append(datetime.strptime(line.split("\t")[0], "%Y-%m-%d %H:%M:%S"))
+
+
+class TestSymbolDataFetchAsync(unittest.TestCase):
+
+    def test_concurrent_fetch_and_resume(self):
+        db = FakeDatabase()
+        now_ms = LISTED_MS + 2500 * BAR_MS
+        exchange = FakeExchange(now_ms, fail_symbol="ETH/USD")
+        results = asyncio.run(fetch_symbols(["BTC/USD", "ETH/USD"], exchange, db.connect, retry_delay=0))
+
+        for symbol, table in (("BTC/USD", "btc_price_history"), ("ETH/USD", "eth_price_history")):
+            self.assertEqual(results[symbol]["status"], "success")
+            self.assertEqual(results[symbol]["rows_fetched"], 2500)
+            self.assertEqual(len(db.tables[table]), 2500)
+            self.assertEqual(_to_ms(db.checkpoints[symbol]), now_ms - BAR_MS)
+
+        # Both symbols were in flight at the same time
+        symbols = [symbol for symbol, _ in exchange.calls]
+        self.assertLess(symbols.index("ETH/USD"), len(symbols) - symbols[::-1].index("BTC/USD") - 1)
+
+        # A later run resumes one bar after the checkpoint
+        exchange = FakeExchange(now_ms + 90 * BAR_MS)
+        results = asyncio.run(fetch_symbols(["BTC/USD"], exchange, db.connect, retry_delay=0))
+        self.assertEqual(exchange.calls[0], ("BTC/USD", now_ms))
+        self.assertEqual(results["BTC/USD"]["rows_fetched"], 90)
+
+    def test_failing_symbol_does_not_stop_others(self):
+        db = FakeDatabase()
+        exchange = FakeExchange(LISTED_MS + 10 * BAR_MS)
+        results = asyncio.run(fetch_symbols(["BTC/USD", "BAD/USD"], exchange, db.connect, retry_delay=0))
+        self.assertEqual(results["BTC/USD"]["rows_fetched"], 10)
+        self.assertEqual(results["BAD/USD"]["status"], "error")
+        self.assertNotIn("BAD/USD", db.checkpoints)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the COPY-based OHLCV loader in symbol_data_fetch_pg.
+"""
+
+import os
+import sys
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.symbol_data_fetch_pg import OHLCVCopyWriter, bars_to_copy_buffer
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.conn.log.append(" ".join(sql.split()))
+        if sql.lstrip().startswith("INSERT"):
+            self.rowcount = self.conn.staged
+            if self.conn.fail_insert:
+                raise RuntimeError("insert failed")
+        elif sql.lstrip().startswith("TRUNCATE"):
+            self.conn.staged = 0
+
+    def copy_expert(self, sql, buffer):
+        rows = buffer.read().splitlines()
+        self.conn.copied.append(rows)
+        self.conn.staged += len(rows)
+        self.conn.log.append(sql)
+
+
+class FakeConnection:
+
+    def __init__(self, fail_insert=False):
+        self.fail_insert = fail_insert
+        self.log, self.copied = [], []
+        self.staged = 0
+        self.commits = self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def page(start_ms, n):
+    return [[start_ms + i * 60000, 100.0 + i, 101.0, 99.5, 100.25, 1.5] for i in range(n)]
+
+
+class TestSymbolDataFetchPg(unittest.TestCase):
+
+    def test_copy_buffer_format(self):
+        rows = bars_to_copy_buffer(page(1704067200000, 2)).read().splitlines()
+        self.assertEqual(rows[0], "2024-01-01 00:00:00\t100.0\t101.0\t99.5\t100.25\t1.5")
+        self.assertTrue(rows[1].startswith("2024-01-01 00:01:00\t101.0"))
+
+    def test_pages_merged_through_staging(self):
+        conn = FakeConnection()
+        with OHLCVCopyWriter("btc_price_history", connection_factory=lambda: conn) as writer:
+            writer.put(page(1704067200000, 3))
+            writer.put(page(1704067380000, 2))
+        self.assertEqual(writer.rows_added, 5)
+        self.assertEqual([len(rows) for rows in conn.copied], [3, 2])
+        inserts = [sql for sql in conn.log if sql.startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        self.assertIn("ON CONFLICT (timestamp) DO NOTHING", inserts[0])
+        # One commit per page plus the final one
+        self.assertEqual(conn.commits, 3)
+        self.assertTrue(conn.closed)
+
+    def test_replace_is_one_transaction(self):
+        conn = FakeConnection()
+        with OHLCVCopyWriter("btc_price_history", replace=True, connection_factory=lambda: conn) as writer:
+            writer.put(page(1704067200000, 3))
+        self.assertIn("DELETE FROM historical_data.btc_price_history", conn.log)
+        self.assertEqual(conn.commits, 1)
+
+    def test_writer_error_rolls_back(self):
+        conn = FakeConnection(fail_insert=True)
+        with self.assertRaises(RuntimeError):
+            with OHLCVCopyWriter("btc_price_history", connection_factory=lambda: conn) as writer:
+                writer.put(page(1704067200000, 3))
+        self.assertEqual(conn.commits, 0)
+        self.assertEqual(conn.rollbacks, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched background trade log writer.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from datetime import datetime
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.trade_logger import TradeLogWriter
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.connection = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, template, args):
+        return repr(args).encode()
+
+    def execute(self, sql, params=None):
+        if self.connection.fail:
+            self.connection.fail -= 1
+            raise RuntimeError("connection lost")
+        self.connection.db.statements.append(sql)
+
+
+class FakeConnection:
+    encoding = "UTF8"
+
+    def __init__(self, db):
+        self.db = db
+        self.fail = db.fail_next_connection
+        db.fail_next_connection = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+
+    def __init__(self):
+        self.statements = []
+        self.connections = 0
+        self.fail_next_connection = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def connect(self):
+        self.gate.wait()
+        self.connections += 1
+        return FakeConnection(self)
+
+
+def row(i):
+    return (f"TICKET-{i}", f"message {i}", datetime(2025, 1, 1), "trade_manager", "user_0001")
+
+
+class TestTradeLogWriter(unittest.TestCase):
+
+    def test_events_written_in_batches(self):
+        db = FakeDatabase()
+        writer = TradeLogWriter(db.connect, batch_size=50, flush_interval=10)
+        for i in range(120):
+            self.assertTrue(writer.submit(row(i)))
+        self.assertTrue(writer.flush())
+        self.assertEqual(writer.written, 120)
+        self.assertLessEqual(len(db.statements), 4)
+        self.assertEqual(db.connections, 1)
+        writer.close()
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        db = FakeDatabase()
+        db.gate.clear()  # Writer is stuck connecting
+        writer = TradeLogWriter(db.connect, max_pending=5, flush_interval=0)
+        accepted = sum(writer.submit(row(i)) for i in range(20))
+        self.assertLess(accepted, 20)
+        self.assertEqual(writer.dropped, 20 - accepted)
+        db.gate.set()
+        writer.close()
+        self.assertEqual(writer.written, accepted)
+
+    def test_reconnects_after_failed_write(self):
+        db = FakeDatabase()
+        db.fail_next_connection = 1
+        writer = TradeLogWriter(db.connect)
+        writer.submit(row(1))
+        writer.close()
+        self.assertEqual((writer.written, writer.dropped, db.connections), (1, 0, 2))
+        self.assertFalse(writer.submit(row(2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset-paginated and incremental trade queries.
+"""
+
+import os
+import sys
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.trade_query import (
+    MAX_PAGE_SIZE, build_trade_logs_query, build_trades_query, fetch_trade_changes,
+)
+
+
+class FakeDatabase:
+    """users.trades_0001 and its tombstones, with transactions that stamp rows with their id."""
+
+    def __init__(self, next_xid=100):
+        self.next_xid = next_xid
+        self.running = {}
+        self.trades = {}
+        self.deletions = []
+
+    def begin(self):
+        xid = self.next_xid
+        self.next_xid += 1
+        self.running[xid] = ([], [])
+        return xid
+
+    def write(self, xid, trade_id, status):
+        self.running[xid][0].append({"id": trade_id, "row_version": xid, "status": status})
+
+    def delete(self, xid, trade_id):
+        self.running[xid][1].append(trade_id)
+
+    def commit(self, xid):
+        writes, deletes = self.running.pop(xid)
+        self.trades.update((row["id"], row) for row in writes)
+        for trade_id in deletes:
+            del self.trades[trade_id]
+            self.deletions.append((trade_id, xid))
+
+    def horizon(self):
+        return min(self.running, default=self.next_xid)
+
+
+class FakeCursor:
+    """Serves the queries fetch_trade_changes runs from committed rows."""
+
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, query, params=None):
+        if "pg_snapshot_xmin" in query:
+            self.rows = [{"horizon": self.db.horizon()}]
+        elif "UNION ALL" in query:
+            if "row_version = %s" in query:
+                match = lambda version: version == params[0]
+                limit = None
+            else:
+                match = lambda version: params[0] < version < params[1]
+                limit = params[-1]
+            changes = [{"row_version": t["row_version"], "id": t["id"], "deleted": False}
+                       for t in self.db.trades.values()]
+            changes += [{"row_version": v, "id": i, "deleted": True} for i, v in self.db.deletions]
+            self.rows = sorted((c for c in changes if match(c["row_version"])),
+                               key=lambda c: (c["row_version"], c["id"]))[:limit]
+        else:
+            ids = params[0]
+            self.rows = sorted((t for t in self.db.trades.values() if t["id"] in ids),
+                               key=lambda t: (t["row_version"], t["id"]))
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestTradeQuery(unittest.TestCase):
+
+    def test_keyset_directions(self):
+        query, params = build_trades_query(before_id=500, status="closed", limit=50)
+        self.assertIn("WHERE status = %s AND id < %s ORDER BY id DESC LIMIT %s", query)
+        self.assertEqual(params, ["closed", 500, 50])
+
+        query, params = build_trades_query(since_id=10, date_from="2025-01-01", ticker="KXBTCD-X", limit=5000)
+        self.assertIn("date >= %s AND ticker = %s AND id > %s ORDER BY id ASC", query)
+        self.assertEqual(params[-1], MAX_PAGE_SIZE)
+
+        query, params = build_trades_query(status="open")
+        self.assertNotIn("LIMIT", query)
+
+        query, params = build_trade_logs_query(ticket_id="T1", before_id=9)
+        self.assertIn("user_id = %s AND ticket_id = %s AND id < %s ORDER BY id DESC LIMIT %s", query)
+
+    def test_changes_since_version(self):
+        db = FakeDatabase()
+        for trade_id in (1, 2, 3, 4):
+            xid = db.begin()
+            db.write(xid, trade_id, "open")
+            db.commit(xid)
+        xid = db.begin()
+        db.delete(xid, 4)
+        db.commit(xid)
+        xid = db.begin()
+        db.write(xid, 1, "closed")
+        db.commit(xid)
+        cursor = FakeCursor(db)
+
+        first = fetch_trade_changes(cursor, 0, limit=3)
+        self.assertEqual([t["id"] for t in first["trades"]], [2, 3])
+        self.assertEqual(first["deleted_ids"], [4])
+        self.assertEqual((first["version"], first["has_more"]), (104, True))
+
+        rest = fetch_trade_changes(cursor, first["version"], limit=3)
+        self.assertEqual([t["id"] for t in rest["trades"]], [1])
+        self.assertEqual(rest["trades"][0]["status"], "closed")
+        self.assertEqual((rest["version"], rest["has_more"]), (105, False))
+
+        idle = fetch_trade_changes(cursor, rest["version"])
+        self.assertEqual((idle["trades"], idle["deleted_ids"], idle["version"]), ([], [], 105))
+
+    def test_uncommitted_lower_version_is_not_skipped(self):
+        db = FakeDatabase()
+        cursor = FakeCursor(db)
+        # The first transaction stamps its trade, then the second one commits ahead of it
+        slow = db.begin()
+        db.write(slow, 1, "pending")
+        fast = db.begin()
+        db.write(fast, 2, "open")
+        db.commit(fast)
+
+        early = fetch_trade_changes(cursor, 0)
+        self.assertEqual(early["trades"], [])
+        self.assertLess(early["version"], slow)
+
+        db.commit(slow)
+        late = fetch_trade_changes(cursor, early["version"])
+        self.assertEqual([t["id"] for t in late["trades"]], [1, 2])
+        self.assertEqual(late["version"], fast)
+
+    def test_transaction_is_not_split_across_pages(self):
+        db = FakeDatabase()
+        batch = db.begin()
+        for trade_id in (1, 2, 3):
+            db.write(batch, trade_id, "closed")
+        db.commit(batch)
+        xid = db.begin()
+        db.write(xid, 4, "open")
+        db.commit(xid)
+        cursor = FakeCursor(db)
+
+        page = fetch_trade_changes(cursor, 0, limit=2)
+        self.assertEqual([t["id"] for t in page["trades"]], [1, 2, 3])
+        self.assertEqual((page["version"], page["has_more"]), (batch, True))
+        page = fetch_trade_changes(cursor, page["version"], limit=2)
+        self.assertEqual([t["id"] for t in page["trades"]], [4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the incrementally maintained trade P&L aggregates.
+"""
+
+import os
+import sys
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.trade_stats import (
+    STAT_COLUMNS, contribution, fetch_trade_stats, forget_trades, rebuild_trade_stats,
+    record_closed_trades, stat_deltas,
+)
+
+
+class FakeConnection:
+    encoding = "UTF8"
+
+
+class FakeCursor:
+    """The aggregate and contribution tables in memory, plus a trades table for rebuilds."""
+
+    def __init__(self, trades=()):
+        self.connection = FakeConnection()
+        self.trades = list(trades)
+        self.stats = {}
+        self.contributions = {}
+        self.values = []
+        self.rows = []
+
+    def mogrify(self, template, args):
+        self.values.append(tuple(args))
+        return b"?"
+
+    def execute(self, sql, params=None):
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        sql = " ".join(sql.split())
+        values, self.values = self.values, []
+        if sql.startswith("DELETE FROM users.trade_stats_0001_trades"):
+            self.rows = [self.contributions.pop(i) for i in params[0] if i in self.contributions]
+        elif sql.startswith("INSERT INTO users.trade_stats_0001_trades"):
+            self.contributions.update((row[0], row) for row in values)
+        elif sql.startswith("INSERT INTO users.trade_stats_0001"):
+            for dimension, bucket, *delta in values:
+                row = self.stats.setdefault((dimension, bucket), [0] * len(STAT_COLUMNS))
+                row[:] = [a + b for a, b in zip(row, delta)]
+        elif sql.startswith("TRUNCATE"):
+            self.stats.clear()
+            self.contributions.clear()
+        elif sql.startswith("SELECT id, date"):
+            self.rows = list(self.trades)
+        elif sql.startswith("SELECT dimension"):
+            self.rows = [{"dimension": d, "bucket": b, **dict(zip(STAT_COLUMNS, v))}
+                         for (d, b), v in sorted(self.stats.items()) if v[0] > 0
+                         and (not params or d == params[0])]
+
+    def fetchall(self):
+        return self.rows
+
+
+def trade(id, date, pnl, win_loss, momentum=12.4, strategy="Hourly HTC", close_method="auto"):
+    return (id, date, strategy, close_method, momentum, pnl, 0.5, win_loss)
+
+
+class TestTradeStats(unittest.TestCase):
+
+    def test_incremental_matches_rebuild(self):
+        cursor = FakeCursor()
+        record_closed_trades(cursor, [trade(1, "2025-08-01", 4.0, "W"), trade(2, "2025-08-01", -3.0, "L")])
+        record_closed_trades(cursor, [trade(3, "2025-08-02", 2.5, "W", momentum=None, close_method=None)])
+        # Closing a trade again replaces its contribution
+        record_closed_trades(cursor, [trade(2, "2025-08-01", -1.0, "L")])
+        record_closed_trades(cursor, [trade(4, "2025-08-02", 9.0, "W")])
+        forget_trades(cursor, [4, 99])
+
+        final = [trade(1, "2025-08-01", 4.0, "W"), trade(2, "2025-08-01", -1.0, "L"),
+                 trade(3, "2025-08-02", 2.5, "W", momentum=None, close_method=None)]
+        expected = stat_deltas([contribution(t) for t in final])
+        self.assertEqual(cursor.stats, expected)
+        self.assertEqual(cursor.stats[("day", "2025-08-02")], [1, 1, 0, 2.5, 0.5, 2.5, 0.0])
+        self.assertEqual(cursor.stats[("close_method", "unknown")][0], 1)
+        self.assertEqual(sorted(cursor.contributions), [1, 2, 3])
+
+        rebuilt = FakeCursor(trades=final)
+        rebuild_trade_stats(rebuilt)
+        self.assertEqual(rebuilt.stats, expected)
+
+    def test_fetch_groups_by_dimension(self):
+        cursor = FakeCursor()
+        record_closed_trades(cursor, [trade(1, "2025-08-01", 4.0, "W"), trade(2, "2025-08-01", -3.0, "L"),
+                                      trade(3, "2025-08-02", 1.0, "W", momentum=-0.6)])
+        stats = fetch_trade_stats(cursor)
+        self.assertEqual(stats["all"], [{"bucket": "all", "trades": 3, "wins": 2, "losses": 1, "pnl": 2.0,
+                                         "fees": 1.5, "gross_profit": 5.0, "gross_loss": -3.0, "win_rate": 66.67}])
+        self.assertEqual([row["bucket"] for row in stats["momentum"]], ["-1", "12"])
+        self.assertEqual([row["trades"] for row in stats["day"]], [2, 1])
+
+        only_days = fetch_trade_stats(cursor, "day")
+        self.assertEqual(list(only_days), ["day"])
+        with self.assertRaises(ValueError):
+            fetch_trade_stats(cursor, "ticker")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for tick-to-trade latency tracing helpers.
+"""
+
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util import trade_trace
+from backend.util.auto_entry_engine import build_watchlist_notification
+
+
+class TestTradeTrace(unittest.TestCase):
+
+    def test_stage_latencies(self):
+        trace = trade_trace.new_trace("BTC", tick_time=100.0)
+        trade_trace.stamp(trace, "ladder_started", 100.5)
+        trade_trace.stamp(trace, "ladder_published", 100.75)
+        trade_trace.stamp(trace, "order_acked", 101.0)
+        self.assertEqual(trade_trace.stage_latencies_ms(trace), {
+            "tick->ladder_started": 500.0,
+            "ladder_started->ladder_published": 250.0,
+            "ladder_published->order_acked": 250.0,
+        })
+        self.assertEqual(trade_trace.total_latency_ms(trace), 1000.0)
+
+    def test_fork_keeps_id_and_is_independent(self):
+        trace = trade_trace.new_trace("BTC")
+        trade_trace.stamp(trace, "entry_received", 1.0)
+        child = trade_trace.stamp(trade_trace.fork(trace), "entry_decided", 2.0)
+        self.assertEqual(child["id"], trace["id"])
+        self.assertNotIn("entry_decided", trace["stages"])
+        self.assertIsNone(trade_trace.total_latency_ms(trace))
+
+    def test_none_trace_passes_through(self):
+        self.assertIsNone(trade_trace.stamp(None, "entry_sent"))
+        self.assertIsNone(trade_trace.fork(None))
+
+    def test_unknown_stage(self):
+        with self.assertRaises(ValueError):
+            trade_trace.stamp(trade_trace.new_trace(), "not_a_stage")
+
+    def test_tick_epoch_uses_eastern_time(self):
+        expected = datetime(2025, 8, 15, 19, 0, 0, tzinfo=timezone.utc).timestamp()
+        self.assertEqual(trade_trace.tick_epoch("2025-08-15T15:00:00"), expected)
+        self.assertIsNone(trade_trace.tick_epoch("garbage"))
+
+    def test_trace_survives_notification_payload(self):
+        trace = trade_trace.new_trace("BTC", tick_time=1.0)
+        payload = json.loads(build_watchlist_notification({"ttc": 60, "trace": trace}, []))
+        self.assertEqual(payload["trace"], trace)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized watchlist filter used by strike_table_generator.
+"""
+
+import os
+import sys
+import unittest
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.watchlist import filter_watchlist, get_watchlist_filters
+
+
+def make_strike(strike, probability, yes_ask=50, no_ask=50, yes_diff=0.0, no_diff=0.0, volume=5000):
+    return {
+        "strike": strike,
+        "probability": probability,
+        "yes_ask": yes_ask,
+        "no_ask": no_ask,
+        "yes_diff": yes_diff,
+        "no_diff": no_diff,
+        "volume": volume,
+    }
+
+
+class TestWatchlistFilter(unittest.TestCase):
+    """Test watchlist filtering matches the auto entry supervisor's rules."""
+
+    def test_filters_and_sorts_by_probability(self):
+        strikes = [
+            make_strike(100000, 90.0, yes_diff=5),
+            make_strike(101000, 95.0, no_diff=4),
+            make_strike(102000, 97.0, yes_diff=5, volume=10),   # volume too low
+            make_strike(103000, 98.0, yes_ask=99, yes_diff=5),  # ask too high
+            make_strike(104000, 85.0, yes_diff=5),              # probability too low
+            make_strike(105000, 96.0, yes_diff=1, no_diff=1),   # neither diff ok
+        ]
+        result = filter_watchlist(strikes, min_probability=85, min_differential=2)
+        self.assertEqual([s["strike"] for s in result], [101000, 100000])
+
+    def test_missing_fields_are_dropped(self):
+        strikes = [make_strike(100000, 95.0, yes_diff=5), make_strike(101000, 96.0, yes_diff=5)]
+        strikes[1]["no_ask"] = None
+        result = filter_watchlist(strikes, min_probability=80, min_differential=0)
+        self.assertEqual([s["strike"] for s in result], [100000])
+
+    def test_empty_ladder(self):
+        self.assertEqual(filter_watchlist([], min_probability=0, min_differential=0), [])
+
+    def test_filters_from_settings(self):
+        filters = get_watchlist_filters({"min_probability": 90, "min_differential": 2})
+        self.assertEqual(filters["min_probability"], 85)
+        self.assertEqual(filters["min_differential"], -1.0)
+        self.assertEqual(filters["min_volume"], 1000)
+        self.assertEqual(filters["max_ask"], 98)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental weekly update: additive fingerprint counts and step scheduling.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.util.fingerprint_counts import FingerprintCounts
+from backend.util.fingerprint_generator import generate_directional_fingerprint
+from backend.util.momentum_generator import calculate_momentum, fill_missing_momentum
+from backend.util.weekly_update import Step, detect_change, run_symbol_pipeline
+
+
+def random_bars(n=700, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-12-31 22:00", periods=n, freq="min"),
+        "close": 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, n))),
+        "momentum": rng.integers(-35, 36, n).astype(float),
+    })
+
+
+class TestWeeklyUpdate(unittest.TestCase):
+
+    def test_counts_match_generator(self):
+        df = random_bars()
+        counts = FingerprintCounts.build(df)
+        for momentum_value in (None, 5, -30):
+            expected = generate_directional_fingerprint(df.copy(), momentum_value)
+            pd.testing.assert_frame_equal(counts.fingerprint(momentum_value), expected)
+
+    def test_rolling_update_matches_rebuild(self):
+        df = random_bars()
+        previous = df.iloc[:600].reset_index(drop=True)
+        updated = df.iloc[100:].reset_index(drop=True)
+        change = detect_change(previous, updated)
+        self.assertTrue(change.contiguous)
+        self.assertEqual((len(change.dropped), change.appended_rows), (100, 100))
+
+        counts = FingerprintCounts.build(previous)
+        counts.apply_update(change.dropped, updated, change.appended_rows)
+        np.testing.assert_array_equal(counts.counts, FingerprintCounts.build(updated).counts)
+
+    def test_momentum_filled_for_new_rows_only(self):
+        df = random_bars(300)[["timestamp", "close"]]
+        expected = calculate_momentum(df.copy())
+        df["momentum"] = np.nan
+        df.loc[:249, "momentum"] = -99.0
+        self.assertEqual(fill_missing_momentum(df), 50)
+        self.assertTrue((df["momentum"].iloc[:250] == -99).all())
+        self.assertEqual(df["momentum"].iloc[250:].astype(int).tolist(), expected.iloc[250:].astype(int).tolist())
+
+    def test_steps_follow_dependencies(self):
+        calls = []
+
+        def step(name, fail=False):
+            def run(ctx):
+                calls.append(name)
+                if fail:
+                    raise RuntimeError("boom")
+                return {}
+            return run
+
+        steps = [
+            Step("c", step("c"), ("b",)),
+            Step("a", step("a")),
+            Step("b", step("b", fail=True), ("a",)),
+            Step("d", step("d"), ("a",), needed=lambda ctx: False),
+        ]
+        records = {r["step"]: r["status"] for r in run_symbol_pipeline("btc", steps)}
+        self.assertEqual(calls, ["a", "b"])
+        self.assertEqual(records, {"a": "success", "b": "failed", "c": "skipped", "d": "unchanged"})
+
+
+if __name__ == '__main__':
+    unittest.main()
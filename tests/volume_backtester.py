@@ -1,22 +1,23 @@
 
 
-import pandas as pd
 import os
+import sys
+
+# Add project root to path so the backtest engine can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.util.backtest_engine import Bars, volume_by_momentum
+from backend.util.parquet_store import load_frame
 
 def calculate_avg_volume_by_momentum(input_file):
-    df = pd.read_csv(input_file)
+    df = load_frame(input_file, columns=['timestamp', 'close', 'volume', 'momentum'])
 
     # Ensure required columns exist
     required_cols = {'timestamp', 'close', 'volume', 'momentum'}
     if not required_cols.issubset(df.columns):
         raise ValueError(f"Input file must contain columns: {required_cols}")
 
-    # Round momentum to nearest integer
-    df['momentum_rounded'] = df['momentum'].round().astype(int)
-
-    # Group by momentum tier and calculate average volume
-    grouped = df.groupby('momentum_rounded')['volume'].mean().reset_index()
-    grouped.rename(columns={'momentum_rounded': 'momentum_level', 'volume': 'average_volume'}, inplace=True)
+    # Average volume per rounded momentum tier
+    grouped = volume_by_momentum(Bars.from_frame(df))
 
     # Output CSV in the same directory as the input file
     output_file = os.path.join(os.path.dirname(input_file), "volume_by_momentum.csv")